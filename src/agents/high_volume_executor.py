@@ -45,6 +45,10 @@ def normalize_extraction_result(data):
     return data
 from agents.intelligent_analyzer import IntelligentAnalyzer, WebsiteAnalysis
 from agents.strategy_selector import StrategySelector, StrategyRecommendation
+from crawling.performance.result_sinks import ResultSink
+from crawling.performance.crawl_state import CrawlStateStore, FrontierEntry
+from crawling.performance.browser_pool import retain_browser_pool, release_browser_pool
+from crawling.performance.fetch_tier import retain_fetch_tier, release_fetch_tier
 
 logger = logging.getLogger("high_volume_executor")
 
@@ -75,6 +79,7 @@ class BatchJobConfig:
     enable_analytics: bool = True
     enable_quality_scoring: bool = True
     fallback_on_failure: bool = True
+    checkpoint_interval: float = 30.0
 
 @dataclass 
 class ExecutionResult:
@@ -129,7 +134,8 @@ class HighVolumeExecutor:
                  llm_service: LLMService = None,
                  vector_service: VectorService = None, 
                  sql_manager: SQLManager = None,
-                 data_analytics: DataAnalytics = None):
+                 data_analytics: DataAnalytics = None,
+                 state_store: CrawlStateStore = None):
         
         # Service dependencies
         self.llm_service = llm_service
@@ -137,6 +143,9 @@ class HighVolumeExecutor:
         self.sql_manager = sql_manager
         self.data_analytics = data_analytics
         
+        # Local checkpoint store that makes jobs resumable after a crash
+        self.state_store = state_store
+        
         # Core components
         self.intelligent_analyzer = None
         self.strategy_selector = None
@@ -147,6 +156,7 @@ class HighVolumeExecutor:
         self.worker_pool = []
         self.max_concurrent_jobs = 10
         self.is_running = False
+        self._retains_shared_pools = False
         
         # Performance tracking
         self.global_metrics = {
@@ -192,6 +202,12 @@ class HighVolumeExecutor:
             )
             await self.strategy_selector.initialize()
             
+            # Hold the process-wide browser pool and fetch tier until shutdown
+            if not self._retains_shared_pools:
+                retain_browser_pool()
+                retain_fetch_tier()
+                self._retains_shared_pools = True
+            
             # Start worker pool
             await self._start_worker_pool()
             
@@ -210,7 +226,8 @@ class HighVolumeExecutor:
                         description: str = None,
                         priority: JobPriority = JobPriority.NORMAL,
                         config: BatchJobConfig = None,
-                        metadata: Dict[str, Any] = None) -> str:
+                        metadata: Dict[str, Any] = None,
+                        sink: ResultSink = None) -> str:
         """
         Submit a high-volume extraction job
         
@@ -222,6 +239,7 @@ class HighVolumeExecutor:
             priority: Job priority level
             config: Batch processing configuration
             metadata: Additional job metadata
+            sink: Optional sink that receives every ExecutionResult as it completes
             
         Returns:
             job_id: Unique job identifier
@@ -240,6 +258,7 @@ class HighVolumeExecutor:
             "priority": priority,
             "config": config,
             "metadata": metadata,
+            "sink": sink,
             "status": JobStatus.PENDING,
             "created_at": time.time(),
             "total_urls": len(urls),
@@ -255,7 +274,7 @@ class HighVolumeExecutor:
         await self.job_queue.put(job_data)
         
         # Store in database for persistence
-        if self.sql_manager:
+        if self.sql_manager or self.state_store:
             await self._store_job_in_database(job_data)
         
         logger.info(f"Submitted job {job_id}: {len(urls)} URLs for {purpose}")
@@ -331,11 +350,58 @@ class HighVolumeExecutor:
         
         if job_id in self.active_jobs:
             if self.active_jobs[job_id]["status"] == JobStatus.PAUSED:
+                if self.state_store:
+                    # The worker stopped when the job paused; requeue what is left
+                    return await self.resume(job_id, sink=self.active_jobs[job_id].get("sink"))
                 self.active_jobs[job_id]["status"] = JobStatus.RUNNING
                 logger.info(f"Job {job_id} resumed")
                 return True
         return False
     
+    async def resume(self, job_id: str, sink: ResultSink = None) -> bool:
+        """
+        Resume a checkpointed job exactly where its last checkpoint left off
+        
+        Works for jobs that were paused, or that were interrupted because the
+        process died. URLs already completed are skipped; only the remaining
+        ones are queued again.
+        
+        Args:
+            job_id: Job to resume
+            sink: Optional sink for the results of the remaining URLs
+            
+        Returns:
+            True if the job was queued again
+        """
+        
+        if not self.state_store:
+            logger.warning(f"Cannot resume job {job_id}: no state store configured")
+            return False
+        
+        job = self.state_store.load_job(job_id)
+        if not job:
+            logger.warning(f"Cannot resume job {job_id}: not found in state store")
+            return False
+        if job["status"] in (JobStatus.COMPLETED.value, JobStatus.CANCELLED.value):
+            logger.info(f"Job {job_id} is {job['status']}, nothing to resume")
+            return False
+        
+        job_data = self._job_data_from_state(job)
+        completed = self.state_store.completed_urls(job_id)
+        job_data["urls"] = [
+            entry.url for entry in self.state_store.load_frontier(job_id)
+            if entry.url not in completed
+        ]
+        job_data["sink"] = sink
+        job_data["status"] = JobStatus.PENDING
+        
+        self.active_jobs[job_id] = job_data
+        self.state_store.set_status(job_id, JobStatus.PENDING.value)
+        await self.job_queue.put(job_data)
+        
+        logger.info(f"Resumed job {job_id}: {len(job_data['urls'])} of {job_data['total_urls']} URLs remaining")
+        return True
+    
     async def cancel_job(self, job_id: str) -> bool:
         """Cancel a job"""
         
@@ -439,48 +505,54 @@ class HighVolumeExecutor:
         # Update job status
         job_data["status"] = JobStatus.RUNNING
         job_data["started_at"] = time.time()
+        self._update_stored_status(job_id, JobStatus.RUNNING)
+        
+        sink = job_data.get("sink")
+        results_stream = self.stream_urls(urls, purpose, config, job_id)
         
         try:
-            # Process URLs in batches
+            # Stream results as they complete; only one batch is buffered for storage
             batch_size = config.batch_size
-            total_batches = (len(urls) + batch_size - 1) // batch_size
+            pending_batch: List[ExecutionResult] = []
+            last_checkpoint = time.monotonic()
             
-            for batch_idx in range(total_batches):
+            async for result in results_stream:
+                job_data["processed_urls"] += 1
+                if result.success:
+                    job_data["successful_urls"] += 1
+                else:
+                    job_data["failed_urls"] += 1
+                
+                if sink:
+                    await sink.write(result)
+                
+                pending_batch.append(result)
+                batch_full = len(pending_batch) >= batch_size
+                if batch_full or time.monotonic() - last_checkpoint >= config.checkpoint_interval:
+                    # Store batch results
+                    await self._store_batch_results(pending_batch, job_id)
+                    pending_batch = []
+                    last_checkpoint = time.monotonic()
+                    
+                    # Rate limiting between batches (no new URLs start meanwhile)
+                    if batch_full and config.rate_limit_delay > 0:
+                        await asyncio.sleep(config.rate_limit_delay)
+                
                 # Check if job is paused or cancelled
                 if job_data["status"] in [JobStatus.PAUSED, JobStatus.CANCELLED]:
                     logger.info(f"Job {job_id} {job_data['status'].value}, stopping processing")
+                    if pending_batch:
+                        await self._store_batch_results(pending_batch, job_id)
+                    self._update_stored_status(job_id, job_data["status"])
                     return
-                
-                start_idx = batch_idx * batch_size
-                end_idx = min(start_idx + batch_size, len(urls))
-                batch_urls = urls[start_idx:end_idx]
-                
-                logger.info(f"Processing batch {batch_idx + 1}/{total_batches} for job {job_id}")
-                
-                # Process batch with controlled concurrency
-                batch_results = await self._process_batch(
-                    batch_urls, purpose, config, job_id
-                )
-                
-                # Update job statistics
-                for result in batch_results:
-                    job_data["processed_urls"] += 1
-                    if result.success:
-                        job_data["successful_urls"] += 1
-                    else:
-                        job_data["failed_urls"] += 1
-                
-                # Store batch results
-                if self.sql_manager:
-                    await self._store_batch_results(batch_results, job_id)
-                
-                # Rate limiting between batches
-                if config.rate_limit_delay > 0:
-                    await asyncio.sleep(config.rate_limit_delay)
+            
+            if pending_batch:
+                await self._store_batch_results(pending_batch, job_id)
             
             # Job completed
             job_data["status"] = JobStatus.COMPLETED
             job_data["completed_at"] = time.time()
+            self._update_stored_status(job_id, JobStatus.COMPLETED)
             
             # Update global metrics
             self.global_metrics["total_jobs_processed"] += 1
@@ -492,44 +564,64 @@ class HighVolumeExecutor:
         except Exception as e:
             job_data["status"] = JobStatus.FAILED
             job_data["error"] = str(e)
+            self._update_stored_status(job_id, JobStatus.FAILED)
             logger.error(f"Job {job_id} failed: {e}")
+        
+        finally:
+            await results_stream.aclose()
+            if sink and job_data["status"] != JobStatus.PAUSED:
+                await sink.close()
     
-    async def _process_batch(self, 
-                           urls: List[str], 
-                           purpose: str, 
-                           config: BatchJobConfig,
-                           job_id: str) -> List[ExecutionResult]:
-        """Process a batch of URLs with intelligent extraction"""
-        
-        semaphore = asyncio.Semaphore(config.max_workers)
-        
-        async def process_single_url(url: str) -> ExecutionResult:
-            async with semaphore:
-                return await self._process_single_url(url, purpose, config, job_id)
-        
-        # Process all URLs in batch concurrently
-        results = await asyncio.gather(
-            *[process_single_url(url) for url in urls],
-            return_exceptions=True
-        )
-        
-        # Convert exceptions to failed results
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append(ExecutionResult(
-                    url=urls[i],
-                    success=False,
-                    extracted_data={},
-                    strategy_used="error",
-                    confidence_score=0.0,
-                    processing_time=0.0,
-                    error_message=str(result)
-                ))
-            else:
-                processed_results.append(result)
-        
-        return processed_results
+    async def stream_urls(self,
+                          urls: List[str],
+                          purpose: str,
+                          config: BatchJobConfig = None,
+                          job_id: str = None) -> AsyncGenerator[ExecutionResult, None]:
+        """
+        Process URLs and yield ExecutionResults in completion order
+        
+        At most ``config.max_workers`` URLs are in flight, and a new URL is
+        only started after the consumer takes a result, so memory stays flat
+        no matter how many URLs are submitted.
+        """
+        config = config or BatchJobConfig()
+        job_id = job_id or f"stream-{uuid.uuid4().hex[:8]}"
+        url_iter = iter(urls)
+        in_flight: Dict[asyncio.Task, str] = {}
+        
+        def fill_slots():
+            while len(in_flight) < config.max_workers:
+                url = next(url_iter, None)
+                if url is None:
+                    return
+                task = asyncio.create_task(self._process_single_url(url, purpose, config, job_id))
+                in_flight[task] = url
+        
+        try:
+            fill_slots()
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url = in_flight.pop(task)
+                    try:
+                        yield task.result()
+                    except Exception as e:
+                        # Convert exceptions to failed results
+                        yield ExecutionResult(
+                            url=url,
+                            success=False,
+                            extracted_data={},
+                            strategy_used="error",
+                            confidence_score=0.0,
+                            processing_time=0.0,
+                            error_message=str(e)
+                        )
+                fill_slots()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight.keys(), return_exceptions=True)
     
     async def _process_single_url(self, 
                                 url: str, 
@@ -662,6 +754,24 @@ class HighVolumeExecutor:
     async def _store_job_in_database(self, job_data: Dict[str, Any]):
         """Store job metadata in database"""
         
+        if self.state_store:
+            try:
+                self.state_store.create_job(job_data["job_id"], "high_volume", {
+                    "purpose": job_data["purpose"],
+                    "job_name": job_data["job_name"],
+                    "description": job_data["description"],
+                    "priority": job_data["priority"].value,
+                    "config": asdict(job_data["config"]),
+                    "metadata": job_data["metadata"],
+                    "total_urls": job_data["total_urls"]
+                }, status=JobStatus.PENDING.value)
+                self.state_store.checkpoint(
+                    job_data["job_id"],
+                    frontier=(FrontierEntry(url=url) for url in job_data["urls"])
+                )
+            except Exception as e:
+                logger.error(f"Failed to checkpoint job {job_data['job_id']}: {e}")
+        
         if not self.sql_manager:
             return
         
@@ -674,6 +784,11 @@ class HighVolumeExecutor:
     async def _load_job_from_database(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Load job metadata from database"""
         
+        if self.state_store:
+            job = self.state_store.load_job(job_id)
+            if job:
+                return self._job_data_from_state(job)
+        
         if not self.sql_manager:
             return None
         
@@ -688,6 +803,21 @@ class HighVolumeExecutor:
     async def _store_batch_results(self, results: List[ExecutionResult], job_id: str):
         """Store batch processing results in database"""
         
+        if self.state_store:
+            job_data = self.active_jobs.get(job_id, {})
+            try:
+                self.state_store.checkpoint(
+                    job_id,
+                    completed=[asdict(r) for r in results],
+                    counters={
+                        "processed_urls": job_data.get("processed_urls", 0),
+                        "successful_urls": job_data.get("successful_urls", 0),
+                        "failed_urls": job_data.get("failed_urls", 0)
+                    }
+                )
+            except Exception as e:
+                logger.error(f"Failed to checkpoint results for job {job_id}: {e}")
+        
         if not self.sql_manager:
             return
         
@@ -697,6 +827,36 @@ class HighVolumeExecutor:
         except Exception as e:
             logger.error(f"Failed to store batch results: {e}")
     
+    def _update_stored_status(self, job_id: str, status: JobStatus):
+        """Mirror a job status change into the state store"""
+        if self.state_store:
+            try:
+                self.state_store.set_status(job_id, status.value)
+            except Exception as e:
+                logger.error(f"Failed to update stored status for job {job_id}: {e}")
+    
+    def _job_data_from_state(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild in-memory job data from a state store record"""
+        params = job["params"]
+        successful = job["successful_urls"]
+        return {
+            "job_id": job["job_id"],
+            "urls": [],
+            "purpose": params["purpose"],
+            "job_name": params["job_name"],
+            "description": params["description"],
+            "priority": JobPriority(params["priority"]),
+            "config": BatchJobConfig(**params["config"]),
+            "metadata": params.get("metadata", {}),
+            "sink": None,
+            "status": JobStatus(job["status"]),
+            "created_at": job["created_at"],
+            "total_urls": params["total_urls"],
+            "processed_urls": job["completed_urls"],
+            "successful_urls": successful,
+            "failed_urls": job["completed_urls"] - successful
+        }
+    
     async def _get_worker_statistics(self) -> Dict[str, Any]:
         """Get worker pool statistics"""
         
@@ -732,6 +892,13 @@ class HighVolumeExecutor:
         if self.strategy_selector:
             await self.strategy_selector.cleanup()
         
+        # Pooled browsers and the HTTP fetch session are process-wide; they
+        # close once every analyzer and executor using them has released them
+        if self._retains_shared_pools:
+            self._retains_shared_pools = False
+            await release_browser_pool()
+            await release_fetch_tier()
+        
         logger.info("High volume executor shutdown complete")
 
 # Convenience functions for common job types
@@ -12,10 +12,12 @@ from dataclasses import dataclass
 from enum import Enum
 import time
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from crawl4ai import BrowserConfig, CrawlerRunConfig
 from crawl4ai.extraction_strategy import LLMExtractionStrategy, ExtractionStrategy, JsonCssExtractionStrategy
 
 from services import VectorService
+from crawling.performance.browser_pool import get_browser_pool, retain_browser_pool, release_browser_pool
+from crawling.performance.fetch_tier import get_fetch_tier, retain_fetch_tier, release_fetch_tier
 from ai_core.core.hybrid_ai_service import HybridAIService, create_production_ai_service
 
 logger = logging.getLogger("intelligent_analyzer")
@@ -82,6 +84,7 @@ class IntelligentAnalyzer:
         # Analysis cache for performance
         self.analysis_cache = {}
         self.cache_ttl = 3600  # 1 hour cache
+        self._retains_shared_pools = False
         
     async def initialize(self) -> bool:
         """Initialize the analyzer with required services"""
@@ -97,6 +100,12 @@ class IntelligentAnalyzer:
                 self.vector_service = VectorService(llm_service=self.llm_service)
                 await self.vector_service.initialize()
             
+            # The browser pool and fetch tier are process-wide; hold them until cleanup
+            if not self._retains_shared_pools:
+                retain_browser_pool()
+                retain_fetch_tier()
+                self._retains_shared_pools = True
+            
             logger.info("Intelligent analyzer initialized successfully")
             return True
             
@@ -128,81 +137,84 @@ class IntelligentAnalyzer:
         
         try:
             # Step 1: Reconnaissance crawl with enhanced data collection
-            async with AsyncWebCrawler(config=self.browser_config) as crawler:
-                recon_config = CrawlerRunConfig(
-                    cache_mode="bypass",
-                    wait_for="css:body",
-                    timeout=15000,
-                    js_code=self._get_enhanced_analysis_javascript(),
-                    exclude_external_links=True
-                )
-                
+            recon_config = CrawlerRunConfig(
+                cache_mode="bypass",
+                wait_for="css:body",
+                timeout=15000,
+                js_code=self._get_enhanced_analysis_javascript(),
+                exclude_external_links=True
+            )
+            
+            async with get_browser_pool().lease(self.browser_config) as crawler:
                 result = await crawler.arun(url=url, config=recon_config)
+            
+            # Step 2: Technical analysis from browser data
+            tech_analysis = await self._extract_enhanced_technical_data(result)
+            
+            # Step 3: AI-powered comprehensive content analysis
+            ai_analysis = await self._ai_analyze_content_comprehensive(
+                url, result.cleaned_html[:12000], result.metadata
+            )
+            
+            # Step 4: Performance and quality assessment
+            quality_metrics = self._assess_data_quality(result, tech_analysis)
+            
+            # Step 5: Security and accessibility analysis
+            security_analysis = self._analyze_security_features(result.html)
+            accessibility_score = self._calculate_accessibility_score(result.html)
+            
+            # Step 6: Check for similar analyzed websites
+            similar_sites = await self._find_similar_analyzed_sites(ai_analysis)
+            
+            analysis_time = time.time() - start_time
+            
+            # Create comprehensive analysis
+            analysis = WebsiteAnalysis(
+                url=url,
+                website_type=WebsiteType(ai_analysis.get("website_type", "unknown")),
+                has_javascript=tech_analysis.get("hasJavaScript", True),
+                has_infinite_scroll=tech_analysis.get("hasInfiniteScroll", False),
+                has_forms=tech_analysis.get("formsCount", 0) > 0,
+                has_auth_required=self._detect_auth_required(result.cleaned_html),
+                has_captcha=tech_analysis.get("hasCaptcha", False),
+                content_dynamically_loaded=len(tech_analysis.get("frameworks", [])) > 0,
+                estimated_complexity=ai_analysis.get("complexity", "medium"),
+                detected_frameworks=tech_analysis.get("frameworks", []),
+                anti_bot_measures=tech_analysis.get("antiBot", []),
+                content_patterns=ai_analysis.get("content_patterns", []),
                 
-                # Step 2: Technical analysis from browser data
-                tech_analysis = await self._extract_enhanced_technical_data(result)
-                
-                # Step 3: AI-powered comprehensive content analysis
-                ai_analysis = await self._ai_analyze_content_comprehensive(
-                    url, result.cleaned_html[:12000], result.metadata
-                )
-                
-                # Step 4: Performance and quality assessment
-                quality_metrics = self._assess_data_quality(result, tech_analysis)
-                
-                # Step 5: Security and accessibility analysis
-                security_analysis = self._analyze_security_features(result.html)
-                accessibility_score = self._calculate_accessibility_score(result.html)
-                
-                # Step 6: Check for similar analyzed websites
-                similar_sites = await self._find_similar_analyzed_sites(ai_analysis)
-                
-                analysis_time = time.time() - start_time
-                
-                # Create comprehensive analysis
-                analysis = WebsiteAnalysis(
-                    url=url,
-                    website_type=WebsiteType(ai_analysis.get("website_type", "unknown")),
-                    has_javascript=tech_analysis.get("hasJavaScript", True),
-                    has_infinite_scroll=tech_analysis.get("hasInfiniteScroll", False),
-                    has_forms=tech_analysis.get("formsCount", 0) > 0,
-                    has_auth_required=self._detect_auth_required(result.cleaned_html),
-                    has_captcha=tech_analysis.get("hasCaptcha", False),
-                    content_dynamically_loaded=len(tech_analysis.get("frameworks", [])) > 0,
-                    estimated_complexity=ai_analysis.get("complexity", "medium"),
-                    detected_frameworks=tech_analysis.get("frameworks", []),
-                    anti_bot_measures=tech_analysis.get("antiBot", []),
-                    content_patterns=ai_analysis.get("content_patterns", []),
-                    
-                    # Enhanced fields
-                    data_quality_indicators=quality_metrics,
-                    performance_metrics={
-                        "analysis_time": analysis_time,
-                        "page_load_estimate": tech_analysis.get("estimatedLoadTime", 0),
-                        "content_size": len(result.cleaned_html),
-                        "link_count": len(result.links) if hasattr(result, 'links') else 0
-                    },
-                    accessibility_score=accessibility_score,
-                    seo_indicators={
-                        "title_present": bool(result.metadata.get("title")),
-                        "description_present": bool(result.metadata.get("description")),
-                        "structured_data": tech_analysis.get("structuredData", False),
-                        "meta_tags_count": tech_analysis.get("metaTagsCount", 0)
-                    },
-                    security_features=security_analysis,
-                    analysis_confidence=ai_analysis.get("confidence", 0.5),
-                    analysis_timestamp=time.time()
-                )
-                
-                # Cache the analysis
-                if cache_enabled:
-                    self.analysis_cache[url] = (analysis, time.time())
-                
-                # Store analysis in vector service for learning
-                await self._store_analysis_for_learning(analysis, ai_analysis)
-                
-                logger.info(f"Website analysis completed for {url} in {analysis_time:.2f}s")
-                return analysis
+                # Enhanced fields
+                data_quality_indicators=quality_metrics,
+                performance_metrics={
+                    "analysis_time": analysis_time,
+                    "page_load_estimate": tech_analysis.get("estimatedLoadTime", 0),
+                    "content_size": len(result.cleaned_html),
+                    "link_count": len(result.links) if hasattr(result, 'links') else 0
+                },
+                accessibility_score=accessibility_score,
+                seo_indicators={
+                    "title_present": bool(result.metadata.get("title")),
+                    "description_present": bool(result.metadata.get("description")),
+                    "structured_data": tech_analysis.get("structuredData", False),
+                    "meta_tags_count": tech_analysis.get("metaTagsCount", 0)
+                },
+                security_features=security_analysis,
+                analysis_confidence=ai_analysis.get("confidence", 0.5),
+                analysis_timestamp=time.time()
+            )
+            
+            # Let the HTTP fetch tier know whether this domain needs rendering
+            get_fetch_tier().record_analysis(analysis)
+            
+            # Cache the analysis
+            if cache_enabled:
+                self.analysis_cache[url] = (analysis, time.time())
+            
+            # Store analysis in vector service for learning
+            await self._store_analysis_for_learning(analysis, ai_analysis)
+            
+            logger.info(f"Website analysis completed for {url} in {analysis_time:.2f}s")
+            return analysis
                 
         except Exception as e:
             logger.error(f"Website analysis failed for {url}: {e}")
@@ -744,4 +756,11 @@ Respond in valid JSON format with confidence scores:
         if self.vector_service:
             await self.vector_service.cleanup()
         
+        # Pooled browsers and the HTTP fetch session are process-wide; they
+        # close once every analyzer and executor using them has released them
+        if self._retains_shared_pools:
+            self._retains_shared_pools = False
+            await release_browser_pool()
+            await release_fetch_tier()
+        
         logger.info("Intelligent analyzer cleanup completed")
@@ -0,0 +1,153 @@
+"""
+Provider Circuit Breaker
+Closed/open/half-open breaker driven by the error rate and latency of provider calls
+"""
+
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"        # Provider healthy, requests flow
+    OPEN = "open"            # Provider failing, requests are skipped
+    HALF_OPEN = "half_open"  # Cool-down elapsed, trial requests allowed
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Configuration for per-provider circuit breakers"""
+    window_size: int = 20
+    min_calls: int = 5
+    failure_rate_threshold: float = 0.5
+    consecutive_failures_threshold: int = 3
+    slow_call_threshold: Optional[float] = None  # Seconds; None uses half the provider timeout
+    open_duration: float = 30.0
+    half_open_max_calls: int = 1
+    probe_interval: float = 15.0
+
+
+class ProviderCircuitBreaker:
+    """
+    Circuit breaker for a single AI provider
+
+    Outcomes are kept in a rolling window; slow calls count as failures. The
+    circuit opens when the window's failure rate reaches the threshold (after
+    min_calls) or after consecutive_failures_threshold failures in a row.
+    After open_duration it becomes half-open and admits a limited number of
+    trial calls: a success closes it again, a failure re-opens it.
+    """
+
+    def __init__(self, name: str, config: CircuitBreakerConfig = None,
+                 provider_timeout: float = 30.0):
+        self.name = name
+        self.config = config or CircuitBreakerConfig()
+        self.slow_call_threshold = (self.config.slow_call_threshold
+                                    if self.config.slow_call_threshold is not None
+                                    else provider_timeout / 2)
+        self._outcomes: deque = deque(maxlen=self.config.window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._trial_started: deque = deque()
+
+        # Statistics
+        self.times_opened = 0
+        self.rejected_calls = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving OPEN to HALF_OPEN once the cool-down has elapsed"""
+        if (self._state == CircuitState.OPEN and
+                time.monotonic() - self._opened_at >= self.config.open_duration):
+            self._state = CircuitState.HALF_OPEN
+            self._trial_started.clear()
+            logger.info(f"Circuit for {self.name} half-open, allowing trial requests")
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Check whether a call may be sent, reserving a trial slot when half-open"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.OPEN:
+            self.rejected_calls += 1
+            return False
+
+        # Trials that never reported back (e.g. cancelled) expire after a cool-down
+        now = time.monotonic()
+        while self._trial_started and now - self._trial_started[0] > self.config.open_duration:
+            self._trial_started.popleft()
+        if len(self._trial_started) >= self.config.half_open_max_calls:
+            self.rejected_calls += 1
+            return False
+        self._trial_started.append(now)
+        return True
+
+    def record(self, success: bool, response_time: float = 0.0):
+        """Record the outcome of a call"""
+        failed = not success or response_time > self.slow_call_threshold
+        state = self.state
+
+        if state == CircuitState.HALF_OPEN:
+            if self._trial_started:
+                self._trial_started.popleft()
+            if failed:
+                self._open()
+            else:
+                self._close()
+            return
+
+        self._outcomes.append(failed)
+        self._consecutive_failures = self._consecutive_failures + 1 if failed else 0
+
+        if state == CircuitState.CLOSED and self._should_open():
+            self._open()
+
+    def failure_rate(self) -> float:
+        """Failure rate over the rolling window"""
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def reset(self):
+        """Force the circuit closed"""
+        self._close()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get breaker statistics"""
+        return {
+            "state": self.state.value,
+            "failure_rate": self.failure_rate(),
+            "window_calls": len(self._outcomes),
+            "consecutive_failures": self._consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected_calls
+        }
+
+    def _should_open(self) -> bool:
+        if self._consecutive_failures >= self.config.consecutive_failures_threshold:
+            return True
+        return (len(self._outcomes) >= self.config.min_calls and
+                self.failure_rate() >= self.config.failure_rate_threshold)
+
+    def _open(self):
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._trial_started.clear()
+        self.times_opened += 1
+        logger.warning(f"Circuit for {self.name} opened (failure rate {self.failure_rate():.0%})")
+
+    def _close(self):
+        if self._state != CircuitState.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self._state = CircuitState.CLOSED
+        self._outcomes.clear()
+        self._consecutive_failures = 0
+        self._trial_started.clear()
@@ -0,0 +1,289 @@
+"""
+Context Builder
+Relevance-pruned page context for LLM prompts
+"""
+
+import re
+import math
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Iterable, NamedTuple
+
+from .parsed_page import ParsedPage, PageSection, BOILERPLATE_REGIONS, PERIPHERAL_REGIONS
+from .llm_chunking import CHARS_PER_TOKEN, estimate_tokens, split_text
+
+logger = logging.getLogger(__name__)
+
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+_WORD = re.compile(r"[^\W_]+")
+_IDENTIFIER_PART = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+# Entities recognized in block text, indexed as their class name so that
+# schema fields such as "emails" or "phone" match the values themselves
+_ENTITY_TERMS = (
+    (re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"), "email"),
+    (re.compile(r"(?:\+\d{1,3}[\s.-]?)?\(?\d{2,4}\)?[\s.-]\d{3,4}[\s.-]\d{3,4}"), "phone"),
+    (re.compile(r"https?://|www\.", re.IGNORECASE), "url"),
+    (re.compile(r"[$€£]\s?\d"), "price"),
+    (re.compile(r"\b(?:19|20)\d{2}\b"), "date"),
+)
+
+# Query terms implied by schema field and purpose words
+QUERY_EXPANSIONS = {
+    "contact": ("email", "phone", "address", "contact"),
+    "email": ("email", "mail"),
+    "phone": ("phone", "tel", "telephone", "call", "mobile", "fax"),
+    "telephone": ("phone", "tel", "call"),
+    "address": ("address", "street", "suite", "road", "avenue", "city", "zip"),
+    "location": ("location", "address", "city", "office"),
+    "social": ("facebook", "twitter", "linkedin", "instagram", "youtube"),
+    "website": ("url", "website", "www"),
+    "url": ("url", "www"),
+    "company": ("company", "inc", "ltd", "llc", "corporation"),
+    "founded": ("founded", "established", "since", "date"),
+    "employee": ("employee", "staff", "team", "people"),
+    "leadership": ("ceo", "founder", "president", "director", "chief", "team"),
+    "price": ("price", "cost", "sale", "buy"),
+    "author": ("author", "by", "written"),
+    "publish": ("published", "date", "updated"),
+    "date": ("date", "published", "updated"),
+    "hour": ("hours", "open", "closed", "monday", "daily"),
+}
+
+# Words that carry no relevance signal in purposes and field names
+QUERY_STOPWORDS = frozenset((
+    "a", "an", "and", "the", "of", "for", "to", "in", "on", "info", "information",
+    "data", "detail", "details", "content", "discovery", "type", "key", "main", "other"
+))
+
+
+@dataclass
+class ContextBuilderConfig:
+    """Configuration for relevance-pruned LLM context"""
+    enabled: bool = True
+    max_tokens: int = 2000  # Budget of a prompt's page content, all chunks included
+    chunked_max_tokens: Optional[int] = None  # Opt-in larger total budget for chunked extraction
+    max_block_tokens: int = 200  # Sections are grouped into blocks of at most this size
+    drop_boilerplate: bool = True  # Navigation and cookie/consent banners
+    peripheral_weight: float = 0.5  # Score multiplier for page header/footer/sidebar blocks
+    drop_unmatched: bool = False  # Drop blocks matching no query term even if the budget allows
+    k1: float = 1.5  # BM25 term frequency saturation
+    b: float = 0.75  # BM25 length normalization
+
+
+class ContextBlock(NamedTuple):
+    """Consecutive sections scored as one unit"""
+    position: int
+    text: str
+    region: str
+
+
+@dataclass
+class BuiltContext:
+    """Page content selected for a prompt, with what pruning it saved"""
+    text: str
+    blocks: List[str]
+    original_tokens: int
+    context_tokens: int
+    blocks_total: int  # Blocks after dropping boilerplate
+    blocks_kept: int
+    boilerplate_dropped: int  # Navigation/consent sections dropped
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.context_tokens)
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "original_tokens": self.original_tokens,
+            "context_tokens": self.context_tokens,
+            "tokens_saved": self.tokens_saved,
+            "blocks_kept": self.blocks_kept,
+            "blocks_total": self.blocks_total,
+            "boilerplate_dropped": self.boilerplate_dropped
+        }
+
+
+class ContextBuilder:
+    """
+    Builds the page content of an LLM prompt from its most relevant blocks
+
+    The page's sections (ParsedPage.sections) are grouped into blocks that
+    start at headings, navigation and cookie/consent banners are dropped,
+    and every block is scored with BM25 against query terms taken from the
+    extraction purpose and the field names of its schema (expanded with
+    related words, and with emails, phone numbers, URLs, prices and years in
+    the text indexed by their class). The best blocks are packed into the
+    token budget and emitted in document order; when the whole page fits,
+    only boilerplate is removed.
+
+    Usage:
+        builder = ContextBuilder()
+        built = builder.build(parse_page(html, url), purpose, schema)
+        prompt = f"...{built.text}..."
+    """
+
+    def __init__(self, config: ContextBuilderConfig = None):
+        self.config = config or ContextBuilderConfig()
+
+        # Statistics
+        self.contexts_built = 0
+        self.original_tokens = 0
+        self.context_tokens = 0
+
+    def build(self, page: ParsedPage, purpose: str, schema: Optional[Dict[str, Any]] = None,
+              max_tokens: Optional[int] = None, extra_terms: Iterable[str] = ()) -> BuiltContext:
+        """Select the page content to send for a purpose, within ``max_tokens`` (default: config)"""
+        budget = (max_tokens or self.config.max_tokens) * CHARS_PER_TOKEN
+        blocks, dropped = self._blocks(page.sections)
+
+        scores = self._score(blocks, query_terms(purpose, schema, extra_terms))
+        ranked = sorted(range(len(blocks)), key=lambda i: (-scores[i], i))
+
+        kept = []
+        size = 0
+        for index in ranked:
+            if self.config.drop_unmatched and scores[index] <= 0:
+                break
+            cost = len(blocks[index].text) + 1
+            if size + cost <= budget:
+                kept.append(index)
+                size += cost
+
+        texts = [blocks[index].text for index in sorted(kept)]
+        built = BuiltContext(
+            text="\n".join(texts),
+            blocks=texts,
+            original_tokens=estimate_tokens(page.llm_text),
+            context_tokens=estimate_tokens("\n".join(texts)),
+            blocks_total=len(blocks),
+            blocks_kept=len(texts),
+            boilerplate_dropped=dropped
+        )
+
+        self.contexts_built += 1
+        self.original_tokens += built.original_tokens
+        self.context_tokens += built.context_tokens
+        logger.debug(f"LLM context: kept {built.blocks_kept}/{built.blocks_total} blocks, "
+                     f"{built.context_tokens} of {built.original_tokens} tokens")
+        return built
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get context building statistics"""
+        saved = max(0, self.original_tokens - self.context_tokens)
+        return {
+            "contexts_built": self.contexts_built,
+            "original_tokens": self.original_tokens,
+            "context_tokens": self.context_tokens,
+            "tokens_saved": saved,
+            "reduction": saved / self.original_tokens if self.original_tokens else 0.0
+        }
+
+    def _blocks(self, sections: List[PageSection]):
+        """Group sections into blocks starting at headings and region changes"""
+        max_chars = self.config.max_block_tokens * CHARS_PER_TOKEN
+        blocks: List[ContextBlock] = []
+        lines: List[str] = []
+        region = ""
+        size = 0
+        dropped = 0
+
+        def flush():
+            if lines:
+                blocks.append(ContextBlock(len(blocks), "\n".join(lines), region))
+                lines.clear()
+
+        for section in sections:
+            if self.config.drop_boilerplate and section.region in BOILERPLATE_REGIONS:
+                dropped += 1
+                continue
+            if section.tag in HEADING_TAGS or section.region != region:
+                flush()
+                region = section.region
+                size = 0
+            # Oversized sections are split so each block can fit a budget
+            for piece in split_text(section.text, max_chars):
+                if size + len(piece) > max_chars:
+                    flush()
+                    size = 0
+                lines.append(piece)
+                size += len(piece) + 1
+        flush()
+        return blocks, dropped
+
+    def _score(self, blocks: List[ContextBlock], terms: List[str]) -> List[float]:
+        """BM25 score of each block for the query terms"""
+        if not blocks or not terms:
+            return [0.0] * len(blocks)
+
+        counts = [Counter(tokenize(block.text)) for block in blocks]
+        lengths = [sum(c.values()) for c in counts]
+        avg_length = sum(lengths) / len(lengths) or 1.0
+        document_frequency = Counter(term for c in counts for term in set(terms) if term in c)
+
+        k1, b = self.config.k1, self.config.b
+        scores = []
+        for block, count, length in zip(blocks, counts, lengths):
+            score = 0.0
+            for term in terms:
+                frequency = count.get(term)
+                if not frequency:
+                    continue
+                df = document_frequency[term]
+                idf = math.log(1 + (len(blocks) - df + 0.5) / (df + 0.5))
+                score += idf * frequency * (k1 + 1) / (frequency + k1 * (1 - b + b * length / avg_length))
+            if block.region in PERIPHERAL_REGIONS:
+                score *= self.config.peripheral_weight
+            scores.append(score)
+        return scores
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, lightly stemmed words plus entity class terms (email, phone, ...)"""
+    terms = [stem(word) for word in _WORD.findall(text.lower())]
+    for pattern, term in _ENTITY_TERMS:
+        terms.extend(term for _ in pattern.finditer(text))
+    return terms
+
+
+def stem(word: str) -> str:
+    """Strip plural endings so that field names match their values' words"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def query_terms(purpose: str, schema: Optional[Dict[str, Any]] = None,
+                extra_terms: Iterable[str] = ()) -> List[str]:
+    """Distinct query terms for a purpose, the field names of its schema and extra words"""
+    words = list(_identifier_words(purpose or ""))
+    for name in list(_schema_fields(schema or {})) + list(extra_terms):
+        words.extend(_identifier_words(name))
+
+    terms = []
+    for word in words:
+        if word in QUERY_STOPWORDS:
+            continue
+        terms.append(word)
+        terms.extend(stem(w) for w in QUERY_EXPANSIONS.get(word, ()))
+    return list(dict.fromkeys(terms))
+
+
+def _identifier_words(name: str) -> Iterable[str]:
+    """Words of a purpose or field name: snake_case, camelCase or plain text"""
+    for part in _IDENTIFIER_PART.findall(name):
+        yield stem(part.lower())
+
+
+def _schema_fields(schema: Dict[str, Any]) -> Iterable[str]:
+    """Property names of a JSON schema, including nested objects and array items"""
+    for name, prop in (schema.get("properties") or {}).items():
+        yield name
+        if isinstance(prop, dict):
+            yield from _schema_fields(prop)
+            if isinstance(prop.get("items"), dict):
+                yield from _schema_fields(prop["items"])
@@ -0,0 +1,326 @@
+"""
+Embedding Cache
+Content-hash keyed embedding cache with an in-memory LRU over memory-mapped float32 vectors
+"""
+
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import logging
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_CACHE_DIR = "./embedding_cache"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    text_hash TEXT PRIMARY KEY,
+    row INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def text_hash(text: str) -> str:
+    """128-bit content hash of an embedding input"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embedding cache for a single embedding model
+
+    Vectors are kept as float32 in an in-memory LRU. With a directory set,
+    they are also appended to a fixed-width float32 file that is read back
+    through mmap, with a SQLite index from content hash to row. Files are
+    named after ``model_key`` (model name plus version), so changing the
+    embedding model starts a fresh cache instead of returning stale vectors.
+    Rows are appended under an exclusive lock on the vector file and taken
+    from its size, so several processes can share a directory.
+
+    Usage:
+        cache = get_embedding_cache("ollama:nomic-embed-text")
+        vector = cache.get(text)
+        if vector is None:
+            vector = await embed(text)
+            cache.put(text, vector)
+    """
+
+    def __init__(self, model_key: str, directory: Optional[str] = None,
+                 max_memory_entries: int = 50_000):
+        self.model_key = model_key
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._dimension: Optional[int] = None
+        self._rows = 0
+
+        # Statistics
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        if directory:
+            self._open_disk()
+
+    def get(self, text: str, record_miss: bool = True) -> Optional[List[float]]:
+        """
+        Get the cached embedding for a text, or None
+
+        Pass record_miss=False for a fast-path probe that is followed by a
+        counted lookup for the same text.
+        """
+        key = text_hash(text)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector.tolist()
+
+            vector = self._read_disk(key)
+            if vector is not None:
+                self._remember(key, vector)
+                self.hits += 1
+                self.disk_hits += 1
+                return vector.tolist()
+
+            if record_miss:
+                self.misses += 1
+            return None
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Get cached embeddings for several texts, None where missing"""
+        return [self.get(text) for text in texts]
+
+    def put(self, text: str, embedding: Sequence[float]):
+        """Cache the embedding of a text"""
+        self.put_many([text], [embedding])
+
+    def put_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]):
+        """Cache several embeddings, writing them to disk in one transaction"""
+        with self._lock:
+            new_rows = []
+            for text, embedding in zip(texts, embeddings):
+                if not embedding:
+                    continue
+                key = text_hash(text)
+                vector = array("f", embedding)
+                self._remember(key, vector)
+                self.stores += 1
+                new_rows.append((key, vector))
+
+            if self._conn is not None and new_rows:
+                self._write_disk(new_rows)
+
+    def __len__(self) -> int:
+        return self._rows if self._conn is not None else len(self._memory)
+
+    def close(self):
+        """Close the backing files"""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "model_key": self.model_key,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._rows,
+            "dimension": self._dimension,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "directory": self.directory
+        }
+
+    def _remember(self, key: str, vector: array):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _open_disk(self):
+        """Open the vector file and its index for this model"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            name = "embeddings-" + hashlib.sha1(self.model_key.encode("utf-8")).hexdigest()[:12]
+            base = os.path.join(self.directory, name)
+
+            self._conn = sqlite3.connect(base + ".db", check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            with self._conn:
+                self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('model_key', ?)",
+                                   (self.model_key,))
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'dimension'").fetchone()
+            self._dimension = int(row[0]) if row else None
+            self._rows = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+            self._file = open(base + ".f32", "a+b")
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Embedding cache persistence disabled: {e}")
+            self.close()
+
+    def _read_disk(self, key: str) -> Optional[array]:
+        if self._conn is None or not self._dimension:
+            return None
+
+        row = self._conn.execute("SELECT row FROM entries WHERE text_hash = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        width = self._dimension * 4
+        offset = row[0] * width
+        if self._mmap is None or offset + width > len(self._mmap):
+            self._remap()
+            if self._mmap is None or offset + width > len(self._mmap):
+                return None
+
+        vector = array("f")
+        vector.frombytes(self._mmap[offset:offset + width])
+        return vector
+
+    def _write_disk(self, rows: List[tuple]):
+        if self._dimension is None:
+            self._dimension = len(rows[0][1])
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dimension', ?)",
+                                   (str(self._dimension),))
+
+        width = self._dimension * 4
+        try:
+            with self._file_lock():
+                # Rows come from the file size, so rows written by other
+                # processes, or orphaned by a rolled-back commit, are never reused
+                size = self._file.seek(0, os.SEEK_END)
+                if size % width:
+                    # Drop a partially written trailing row left by a crash
+                    size = self._file.truncate(size - size % width)
+                next_row = size // width
+
+                written = 0
+                with self._conn:
+                    for key, vector in rows:
+                        if len(vector) != self._dimension:
+                            logger.warning(f"Embedding dimension {len(vector)} does not match cache "
+                                           f"dimension {self._dimension}, not persisting")
+                            continue
+                        exists = self._conn.execute(
+                            "SELECT 1 FROM entries WHERE text_hash = ?", (key,)
+                        ).fetchone()
+                        if exists:
+                            continue
+                        self._file.write(vector.tobytes())
+                        self._conn.execute("INSERT INTO entries (text_hash, row) VALUES (?, ?)",
+                                           (key, next_row + written))
+                        written += 1
+                    self._file.flush()
+                self._rows += written
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Failed to persist embeddings: {e}")
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock on the vector file across processes"""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _remap(self):
+        """Map the vector file again after it has grown"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.flush()
+        if os.fstat(self._file.fileno()).st_size > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class CachedEmbeddingFunction:
+    """
+    ChromaDB embedding function that consults an EmbeddingCache first
+
+    Wraps a collection's embedding function so both stored documents and
+    query texts are only embedded once per distinct text.
+    """
+
+    def __init__(self, embedding_function, cache: EmbeddingCache):
+        self.embedding_function = embedding_function
+        self.cache = cache
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        cached = self.cache.get_many(input)
+        missing = [text for text, vector in zip(input, cached) if vector is None]
+        if missing:
+            unique = list(dict.fromkeys(missing))
+            computed = [list(map(float, v)) for v in self.embedding_function(unique)]
+            self.cache.put_many(unique, computed)
+            by_text = dict(zip(unique, computed))
+            cached = [vector if vector is not None else by_text[text]
+                      for text, vector in zip(input, cached)]
+        return cached
+
+    def __getattr__(self, name):
+        # Expose the wrapped function's name/config hooks to ChromaDB
+        if name == "embedding_function":
+            raise AttributeError(name)
+        return getattr(self.embedding_function, name)
+
+
+# Process-wide embedding caches, one per embedding model
+_embedding_caches: Dict[str, EmbeddingCache] = {}
+
+
+def get_embedding_cache(model_key: str, directory: Optional[str] = DEFAULT_EMBEDDING_CACHE_DIR,
+                        max_memory_entries: int = 50_000) -> EmbeddingCache:
+    """Get the process-wide embedding cache for a model, creating it on first use"""
+    cache = _embedding_caches.get(model_key)
+    if cache is None:
+        cache = EmbeddingCache(model_key, directory, max_memory_entries)
+        _embedding_caches[model_key] = cache
+    return cache
+
+
+def close_embedding_caches():
+    """Close all process-wide embedding caches"""
+    for cache in _embedding_caches.values():
+        cache.close()
+    _embedding_caches.clear()
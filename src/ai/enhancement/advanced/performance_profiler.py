@@ -4,6 +4,8 @@ Tracks and optimizes tool execution performance with detailed metrics
 """
 
 import time
+import math
+import random
 import psutil
 import asyncio
 import json
@@ -12,9 +14,12 @@ from typing import Dict, Any, List, Optional, Tuple, Callable
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from contextvars import ContextVar
 import statistics
+import sys
 import tracemalloc
 import threading
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +40,7 @@ class PerformanceMetrics:
     input_size: Optional[int] = None
     output_size: Optional[int] = None
     parameters: Dict[str, Any] = field(default_factory=dict)
+    sampled: bool = True  # False when resource usage was not collected
     
     @property
     def memory_used(self) -> float:
@@ -49,6 +55,162 @@ class PerformanceMetrics:
         return None
 
 
+class LatencyHistogram:
+    """
+    Streaming histogram for percentile estimates
+
+    Values fall into logarithmic buckets with a bounded relative error
+    (1% by default), so percentiles are read in O(buckets) without storing
+    or sorting individual samples, in the style of an HDR histogram.
+    """
+
+    def __init__(self, relative_error: float = 0.01, min_value: float = 1e-6):
+        self.min_value = min_value
+        self._log_base = math.log1p(2 * relative_error)
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+
+    def record(self, value: float):
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+
+    def percentile(self, percentile: float) -> float:
+        """Estimate the value at a percentile (0-100)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return self._value(index)
+        return self._value(max(self._counts))
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_base) + 1
+
+    def _value(self, index: int) -> float:
+        if index == 0:
+            return 0.0
+        # Midpoint of the bucket, within relative_error of any value in it
+        return self.min_value * math.exp((index - 0.5) * self._log_base)
+
+
+@dataclass
+class ExecutionSample:
+    """Resource samples attributed to one in-flight tool execution"""
+    tool_name: str
+    start_time: float
+    parent: Optional['ExecutionSample'] = None
+    active_children: int = 0
+    cpu_total: float = 0.0
+    cpu_samples: int = 0
+    peak_memory: float = 0.0
+
+
+# The execution a coroutine is running under, inherited by the tasks it spawns
+_current_execution: ContextVar[Optional[ExecutionSample]] = ContextVar(
+    'current_tool_execution', default=None
+)
+
+
+class ResourceSampler:
+    """
+    Background thread sampling process CPU and memory
+
+    Each tick reads process-wide CPU usage and RSS (or traced memory) without
+    blocking, and attributes it to the executions in flight: CPU is split
+    between the innermost active executions, so overlapping calls are not
+    each charged for the whole process, and rolled up into the executions
+    that called them. The thread idles while no execution is active.
+    """
+
+    def __init__(self, interval: float = 0.1, trace_memory: bool = False):
+        self.interval = interval
+        self.trace_memory = trace_memory
+        self.process = psutil.Process()
+        self.last_cpu_percent = 0.0
+        self._active: Dict[int, ExecutionSample] = {}
+        self._lock = threading.Lock()
+        self._has_work = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, sample: ExecutionSample):
+        with self._lock:
+            self._active[id(sample)] = sample
+            if sample.parent is not None:
+                sample.parent.active_children += 1
+            sample.peak_memory = self.current_memory_mb()
+        self._has_work.set()
+        self._ensure_thread()
+
+    def unregister(self, sample: ExecutionSample):
+        with self._lock:
+            self._active.pop(id(sample), None)
+            if sample.parent is not None:
+                sample.parent.active_children -= 1
+            sample.peak_memory = max(sample.peak_memory, self.current_memory_mb())
+            if not self._active:
+                self._has_work.clear()
+
+    def current_memory_mb(self) -> float:
+        """
+        Current memory (MB): traced memory while tracemalloc tracking is on, else process RSS
+
+        Before, after and peak figures all come from here, so they can be compared.
+        """
+        if self.trace_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        return self.process.memory_info().rss / 1024 / 1024
+
+    def stop(self):
+        self._stop.set()
+        self._has_work.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='tool-profiler-sampler', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        self.process.cpu_percent(None)  # Prime the non-blocking CPU counter
+        while not self._stop.is_set():
+            if not self._has_work.wait(timeout=1.0):
+                continue
+            if self._stop.wait(self.interval):
+                break
+            try:
+                cpu = self.process.cpu_percent(None)
+                memory = self.current_memory_mb()
+            except psutil.Error:
+                continue
+            self.last_cpu_percent = cpu
+
+            with self._lock:
+                leaves = [s for s in self._active.values() if s.active_children == 0]
+                share = cpu / len(leaves) if leaves else 0.0
+                for sample in self._active.values():
+                    sample.peak_memory = max(sample.peak_memory, memory)
+                    sample.cpu_samples += 1
+                for sample in leaves:
+                    # Nested executions also count towards the executions that called them
+                    node = sample
+                    while node is not None:
+                        if id(node) in self._active:
+                            node.cpu_total += share
+                        node = node.parent
+
+
 @dataclass
 class ToolProfile:
     """Aggregated performance profile for a tool"""
@@ -64,10 +226,13 @@ class ToolProfile:
     success_rate: float = 0.0
     common_errors: Dict[str, int] = field(default_factory=dict)
     execution_history: deque = field(default_factory=lambda: deque(maxlen=100))
+    latency_histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    _window_sums: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0, 0], repr=False)
     
     def update(self, metrics: PerformanceMetrics):
         """Update profile with new metrics"""
         self.total_executions += 1
+        self.latency_histogram.record(metrics.execution_time)
         
         if metrics.success:
             self.successful_executions += 1
@@ -80,32 +245,53 @@ class ToolProfile:
         self.min_execution_time = min(self.min_execution_time, metrics.execution_time)
         self.max_execution_time = max(self.max_execution_time, metrics.execution_time)
         
-        # Add to history
+        # Add to history, keeping running sums over the history window
+        if len(self.execution_history) == self.execution_history.maxlen:
+            self._add_to_window(self.execution_history[0], -1)
         self.execution_history.append(metrics)
+        self._add_to_window(metrics, 1)
         
-        # Recalculate averages from history
-        if self.execution_history:
-            self.avg_execution_time = statistics.mean(
-                m.execution_time for m in self.execution_history
-            )
-            self.avg_memory_used = statistics.mean(
-                m.memory_used for m in self.execution_history
-            )
-            self.avg_cpu_percent = statistics.mean(
-                m.cpu_percent for m in self.execution_history
-            )
+        # Averages over the history window; resource averages cover sampled executions only
+        window_time, window_memory, window_cpu, window_sampled = self._window_sums
+        self.avg_execution_time = window_time / len(self.execution_history)
+        if window_sampled:
+            self.avg_memory_used = window_memory / window_sampled
+            self.avg_cpu_percent = window_cpu / window_sampled
         
         self.success_rate = self.successful_executions / self.total_executions if self.total_executions > 0 else 0
+    
+    def _add_to_window(self, metrics: PerformanceMetrics, sign: int):
+        self._window_sums[0] += sign * metrics.execution_time
+        if metrics.sampled:
+            self._window_sums[1] += sign * metrics.memory_used
+            self._window_sums[2] += sign * metrics.cpu_percent
+            self._window_sums[3] += sign
 
 
 class ToolPerformanceProfiler:
-    """Tracks and analyzes tool execution performance"""
+    """
+    Tracks and analyzes tool execution performance
+    
+    Every execution records its time and outcome. Resource usage (CPU,
+    memory, input/output sizes) is collected for a ``sampling_rate``
+    fraction of executions by a background sampler thread, so profiling
+    never blocks the event loop. ``enable_memory_tracking`` switches memory
+    figures from process RSS to tracemalloc, at a noticeable allocation cost.
+    """
+    
+    # Bounds for input/output size estimation
+    SIZE_ESTIMATE_ITEMS = 32
+    SIZE_ESTIMATE_DEPTH = 4
     
-    def __init__(self, enable_memory_tracking: bool = True):
+    def __init__(self, enable_memory_tracking: bool = False,
+                 sampling_rate: float = 1.0,
+                 sample_interval: float = 0.1):
         self.profiles: Dict[str, ToolProfile] = {}
         self.enable_memory_tracking = enable_memory_tracking
+        self.sampling_rate = sampling_rate
         self.current_executions: Dict[str, Dict] = {}
         self._lock = threading.Lock()
+        self.sampler = ResourceSampler(sample_interval, trace_memory=enable_memory_tracking)
         
         # Performance thresholds for alerts
         self.thresholds = {
@@ -160,20 +346,20 @@ class ToolPerformanceProfiler:
         """
         # Initialize tracking
         execution_id = f"{tool_name}_{time.time()}"
-        
-        # Measure input size
-        input_size = self._estimate_size(parameters)
-        
-        # Get initial measurements
-        process = psutil.Process()
-        memory_before = process.memory_info().rss / 1024 / 1024  # MB
-        cpu_before = process.cpu_percent(interval=0.1)
-        
-        if self.enable_memory_tracking:
-            tracemalloc.reset_peak()
+        sampled = self.sampling_rate >= 1.0 or random.random() < self.sampling_rate
         
         # Record start
         start_time = time.time()
+        sample = ExecutionSample(
+            tool_name=tool_name,
+            start_time=start_time,
+            parent=_current_execution.get()
+        )
+        memory_before = 0.0
+        if sampled:
+            memory_before = self.sampler.current_memory_mb()
+            self.sampler.register(sample)
+        token = _current_execution.set(sample)
         
         # Track current execution
         with self._lock:
@@ -201,18 +387,21 @@ class ToolPerformanceProfiler:
         finally:
             # Record end
             end_time = time.time()
+            _current_execution.reset(token)
             
-            # Get final measurements
-            memory_after = process.memory_info().rss / 1024 / 1024  # MB
-            cpu_after = process.cpu_percent(interval=0.1)
-            
-            memory_peak = memory_after
-            if self.enable_memory_tracking:
-                _, peak = tracemalloc.get_traced_memory()
-                memory_peak = peak / 1024 / 1024  # MB
-            
-            # Estimate output size
-            output_size = self._estimate_size(result) if result else 0
+            memory_after = memory_before
+            memory_peak = memory_before
+            cpu_percent = 0.0
+            input_size = output_size = None
+            if sampled:
+                self.sampler.unregister(sample)
+                memory_after = self.sampler.current_memory_mb()
+                memory_peak = sample.peak_memory
+                # Executions shorter than one tick take the latest process-wide reading
+                cpu_percent = (sample.cpu_total / sample.cpu_samples if sample.cpu_samples
+                               else self.sampler.last_cpu_percent)
+                input_size = self._estimate_size(parameters)
+                output_size = self._estimate_size(result) if result else 0
             
             # Create metrics
             metrics = PerformanceMetrics(
@@ -223,12 +412,13 @@ class ToolPerformanceProfiler:
                 memory_before=memory_before,
                 memory_after=memory_after,
                 memory_peak=memory_peak,
-                cpu_percent=(cpu_before + cpu_after) / 2,
+                cpu_percent=cpu_percent,
                 success=success,
                 error=error,
                 input_size=input_size,
                 output_size=output_size,
-                parameters={k: type(v).__name__ for k, v in parameters.items()}
+                parameters={k: type(v).__name__ for k, v in parameters.items()},
+                sampled=sampled
             )
             
             # Update profile
@@ -243,6 +433,15 @@ class ToolPerformanceProfiler:
         
         return result, metrics
     
+    @staticmethod
+    def current_execution() -> Optional[ExecutionSample]:
+        """The profiled execution the calling code is running under, if any"""
+        return _current_execution.get()
+    
+    def close(self):
+        """Stop the background sampler"""
+        self.sampler.stop()
+    
     def _update_profile(self, metrics: PerformanceMetrics):
         """Update tool profile with new metrics"""
         with self._lock:
@@ -298,8 +497,7 @@ class ToolPerformanceProfiler:
         if not profile:
             return {'error': f'No performance data for tool: {tool_name}'}
         
-        # Calculate percentiles from history
-        execution_times = [m.execution_time for m in profile.execution_history]
+        histogram = profile.latency_histogram
         
         performance_data = {
             'tool_name': tool_name,
@@ -309,8 +507,9 @@ class ToolPerformanceProfiler:
                 'avg_execution_time': profile.avg_execution_time,
                 'min_execution_time': profile.min_execution_time,
                 'max_execution_time': profile.max_execution_time,
-                'p50_execution_time': statistics.median(execution_times) if execution_times else 0,
-                'p95_execution_time': self._percentile(execution_times, 95) if execution_times else 0,
+                'p50_execution_time': histogram.percentile(50),
+                'p95_execution_time': histogram.percentile(95),
+                'p99_execution_time': histogram.percentile(99),
                 'avg_memory_used': profile.avg_memory_used,
                 'avg_cpu_percent': profile.avg_cpu_percent
             },
@@ -426,32 +625,54 @@ class ToolPerformanceProfiler:
         
         return suggestions
     
-    def _estimate_size(self, obj: Any) -> int:
-        """Estimate the size of an object in bytes"""
+    def _estimate_size(self, obj: Any, depth: int = 0) -> int:
+        """
+        Estimate the size of an object in bytes
+        
+        Large containers are estimated from their first items and nesting
+        is cut off at a fixed depth, so the cost is bounded regardless of
+        how big the parameters or results are.
+        """
         if obj is None:
             return 0
         
         if isinstance(obj, (str, bytes)):
             return len(obj)
+        elif depth >= self.SIZE_ESTIMATE_DEPTH:
+            return 0
         elif isinstance(obj, (list, tuple)):
-            return sum(self._estimate_size(item) for item in obj)
+            head = obj[:self.SIZE_ESTIMATE_ITEMS]
+            if not head:
+                return 0
+            sampled = sum(self._estimate_size(item, depth + 1) for item in head)
+            return sampled * len(obj) // len(head)
         elif isinstance(obj, dict):
-            return sum(
-                self._estimate_size(k) + self._estimate_size(v) 
-                for k, v in obj.items()
+            if not obj:
+                return 0
+            head = list(islice(obj.items(), self.SIZE_ESTIMATE_ITEMS))
+            sampled = sum(
+                self._estimate_size(k, depth + 1) + self._estimate_size(v, depth + 1)
+                for k, v in head
             )
+            return sampled * len(obj) // len(head)
+        elif isinstance(obj, (int, float, bool)):
+            return 8
         else:
-            # Rough estimate for other types
-            return len(str(obj))
+            # Shallow size; converting arbitrary objects to text can be expensive
+            try:
+                return sys.getsizeof(obj)
+            except TypeError:
+                return 0
     
     def _percentile(self, data: List[float], percentile: float) -> float:
         """Calculate percentile of a dataset"""
         if not data:
             return 0
         
-        sorted_data = sorted(data)
-        index = int(len(sorted_data) * percentile / 100)
-        return sorted_data[min(index, len(sorted_data) - 1)]
+        histogram = LatencyHistogram()
+        for value in data:
+            histogram.record(value)
+        return histogram.percentile(percentile)
     
     def export_metrics(self, filepath: str):
         """Export all metrics to a JSON file"""
@@ -9,12 +9,17 @@ import asyncio
 from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
-import requests
-import openai
-from anthropic import Anthropic
+import math
 import os
+import time
 from datetime import datetime
 
+from .circuit_breaker import CircuitBreakerConfig, CircuitState, ProviderCircuitBreaker
+from .provider_transport import ProviderTransport, measure_provider_time
+from .provider_limits import DEFAULT_MAX_CONCURRENT_REQUESTS
+from .response_cache import LLMResponseCache, get_response_cache, make_cache_key
+from .llm_chunking import ChunkingConfig, chunk_html, merge_extractions
+
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +47,47 @@ class AIConfig:
     timeout: int = 30
     enabled: bool = True
     priority: int = 1  # Lower number = higher priority
+    # Connection pool limits for this provider's client
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    # Requests in flight to this provider, shared by every caller in the process
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+    # Estimated price, used to cap the extra spend of hedged requests
+    cost_per_1k_tokens: float = 0.0
+
+
+@dataclass
+class HedgingConfig:
+    """
+    Configuration for hedged provider racing in generate_structured
+
+    The primary provider is started first; if it has not answered after its
+    learned latency percentile, the next provider is started as a hedge and
+    the first schema-valid answer wins. Hedges are limited to
+    ``max_hedge_ratio`` of requests and to providers whose estimated cost
+    per request is within ``max_hedge_cost``.
+    """
+    enabled: bool = False
+    latency_percentile: float = 0.95
+    min_samples: int = 5
+    sample_window: int = 100
+    default_hedge_delay: float = 2.0  # Used until a provider has min_samples
+    min_hedge_delay: float = 0.25
+    max_parallel: int = 2
+    max_hedge_ratio: float = 0.2
+    max_hedge_cost: Optional[float] = None
+
+
+# Providers with a structured-output implementation
+STRUCTURED_PROVIDERS = {
+    AIProvider.LOCAL_OLLAMA,
+    AIProvider.OPENAI,
+    AIProvider.ANTHROPIC,
+    AIProvider.GROQ,
+    AIProvider.DEEPSEEK,
+    AIProvider.OPENROUTER
+}
 
 
 class HybridAIService:
@@ -49,15 +95,25 @@ class HybridAIService:
     Unified AI service that supports multiple providers with automatic fallback
     """
     
-    def __init__(self, configs: List[AIConfig] = None):
+    def __init__(self, configs: List[AIConfig] = None,
+                 response_cache: LLMResponseCache = None,
+                 hedging: HedgingConfig = None,
+                 circuit_breaker: CircuitBreakerConfig = None,
+                 chunking: ChunkingConfig = None):
         """
         Initialize with provider configurations
         
         Args:
             configs: List of AI provider configurations
+            response_cache: Response cache (defaults to the process-wide cache)
+            hedging: Hedged racing configuration for generate_structured
+            circuit_breaker: Per-provider circuit breaker configuration
+            chunking: Chunking of long pages in analyze_website_content
         """
         self.configs = configs or self._load_default_configs()
-        self.clients = {}
+        self.transport = ProviderTransport()
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        self.chunking = chunking or ChunkingConfig()
         self._initialize_clients()
         
         # Sort by priority
@@ -68,8 +124,24 @@ class HybridAIService:
             'requests_by_provider': {},
             'success_rates': {},
             'avg_response_times': {},
+            'schema_failures': {},
             'last_used': {}
         }
+        
+        # Hedged racing
+        self.hedging = hedging or HedgingConfig()
+        self._hedge_budget = 1.0
+        self.hedge_stats = {
+            'races': 0,
+            'hedges_sent': 0,
+            'hedge_wins': 0,
+            'hedges_denied': 0
+        }
+        
+        # Health-aware routing
+        self.circuit_breaker_config = circuit_breaker or CircuitBreakerConfig()
+        self.circuit_breakers: Dict[AIProvider, ProviderCircuitBreaker] = {}
+        self._probe_task: Optional[asyncio.Task] = None
     
     def _load_default_configs(self) -> List[AIConfig]:
         """Load configurations from environment variables"""
@@ -146,43 +218,27 @@ class HybridAIService:
         return configs
     
     def _initialize_clients(self):
-        """Initialize API clients for each provider"""
+        """Initialize pooled async API clients for each provider"""
         for config in self.configs:
             if not config.enabled:
                 continue
                 
             try:
-                if config.provider == AIProvider.OPENAI:
-                    self.clients[config.provider] = openai.OpenAI(
-                        api_key=config.api_key
-                    )
-                elif config.provider == AIProvider.ANTHROPIC:
-                    self.clients[config.provider] = Anthropic(
-                        api_key=config.api_key
-                    )
-                elif config.provider == AIProvider.GROQ:
-                    self.clients[config.provider] = openai.OpenAI(
-                        api_key=config.api_key,
-                        base_url=config.base_url
-                    )
-                elif config.provider == AIProvider.DEEPSEEK:
-                    self.clients[config.provider] = openai.OpenAI(
-                        api_key=config.api_key,
-                        base_url=config.base_url
-                    )
-                elif config.provider == AIProvider.OPENROUTER:
-                    self.clients[config.provider] = openai.OpenAI(
-                        api_key=config.api_key,
-                        base_url=config.base_url
-                    )
-                # Local Ollama doesn't need a client
-                
+                self.transport.register(config)
                 logger.info(f"Initialized {config.provider.value} with model {config.model}")
                 
             except Exception as e:
                 logger.error(f"Failed to initialize {config.provider.value}: {e}")
                 config.enabled = False
     
+    async def close(self):
+        """Stop health probing and close provider clients and their connection pools"""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            await asyncio.gather(self._probe_task, return_exceptions=True)
+            self._probe_task = None
+        await self.transport.close()
+    
     async def generate_plan(self, user_request: str, tools: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
         """
         Generate an execution plan using the best available AI provider
@@ -196,37 +252,42 @@ class HybridAIService:
         """
         prompt = self._build_planning_prompt(user_request, tools)
         
-        # Try providers in priority order
-        for config in self.configs:
-            if not config.enabled:
+        cached_config, cached_plan = self._cached_response("plan", prompt)
+        if cached_plan is not None:
+            logger.info(f"Using cached plan from {cached_config.provider.value}")
+            return cached_plan, cached_plan.get('confidence', 0.8)
+        
+        # Try healthy providers in priority order, skipping open circuits
+        for config in self._routable_configs():
+            if not self._breaker(config.provider).allow_request():
                 continue
                 
             try:
-                start_time = datetime.now()
-                
                 logger.info(f"Trying {config.provider.value} for planning")
                 
-                if config.provider == AIProvider.LOCAL_OLLAMA:
-                    response = await self._call_ollama(prompt, config)
-                elif config.provider == AIProvider.OPENAI:
-                    response = await self._call_openai(prompt, config)
-                elif config.provider == AIProvider.ANTHROPIC:
-                    response = await self._call_anthropic(prompt, config)
-                elif config.provider == AIProvider.GROQ:
-                    response = await self._call_groq(prompt, config)
-                elif config.provider == AIProvider.DEEPSEEK:
-                    response = await self._call_deepseek(prompt, config)
-                elif config.provider == AIProvider.OPENROUTER:
-                    response = await self._call_openrouter(prompt, config)
-                else:
-                    continue
+                with measure_provider_time() as timer:
+                    if config.provider == AIProvider.LOCAL_OLLAMA:
+                        response = await self._call_ollama(prompt, config)
+                    elif config.provider == AIProvider.OPENAI:
+                        response = await self._call_openai(prompt, config)
+                    elif config.provider == AIProvider.ANTHROPIC:
+                        response = await self._call_anthropic(prompt, config)
+                    elif config.provider == AIProvider.GROQ:
+                        response = await self._call_groq(prompt, config)
+                    elif config.provider == AIProvider.DEEPSEEK:
+                        response = await self._call_deepseek(prompt, config)
+                    elif config.provider == AIProvider.OPENROUTER:
+                        response = await self._call_openrouter(prompt, config)
+                    else:
+                        continue
                 
                 # Parse and validate response
                 plan_data = self._parse_response(response)
                 confidence = plan_data.get('confidence', 0.8)
+                self.response_cache.set(self._cache_key("plan", config, prompt), plan_data)
                 
                 # Update statistics
-                response_time = (datetime.now() - start_time).total_seconds()
+                response_time = timer.elapsed
                 self._update_stats(config.provider, True, response_time)
                 
                 logger.info(f"Successfully generated plan using {config.provider.value}")
@@ -243,109 +304,102 @@ class HybridAIService:
     
     async def _call_ollama(self, prompt: str, config: AIConfig) -> str:
         """Call local Ollama API"""
-        response = requests.post(
-            f"{config.base_url}/api/generate",
-            json={
-                "model": config.model,
-                "prompt": prompt,
-                "format": "json",
-                "stream": False,
-                "options": {
-                    "temperature": config.temperature,
-                    "num_predict": config.max_tokens
-                }
-            },
-            timeout=config.timeout
+        return await self.transport.ollama_generate(
+            config,
+            prompt,
+            max_tokens=config.max_tokens,
+            temperature=config.temperature,
+            json_format=True
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("response", "{}")
-        else:
-            raise Exception(f"Ollama API error: {response.status_code}")
     
     async def _call_openai(self, prompt: str, config: AIConfig) -> str:
         """Call OpenAI API"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
+        return await self.transport.chat(
+            config,
             messages=[
                 {"role": "system", "content": "You are an AI planning assistant. Return only valid JSON."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=config.max_tokens,
             temperature=config.temperature,
-            response_format={"type": "json_object"}
+            json_mode=True
         )
-        
-        return response.choices[0].message.content
     
     async def _call_anthropic(self, prompt: str, config: AIConfig) -> str:
         """Call Anthropic Claude API"""
-        client = self.clients[config.provider]
-        
-        response = client.messages.create(
-            model=config.model,
+        return await self.transport.messages(
+            config,
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=config.max_tokens,
-            temperature=config.temperature,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
+            temperature=config.temperature
         )
-        
-        return response.content[0].text
     
     async def _call_groq(self, prompt: str, config: AIConfig) -> str:
         """Call Groq API"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
+        return await self.transport.chat(
+            config,
             messages=[
                 {"role": "system", "content": "You are an AI planning assistant. Return only valid JSON."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=config.max_tokens,
             temperature=config.temperature,
-            response_format={"type": "json_object"}
+            json_mode=True
         )
-        
-        return response.choices[0].message.content
     
     async def _call_deepseek(self, prompt: str, config: AIConfig) -> str:
         """Call DeepSeek API"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
+        return await self.transport.chat(
+            config,
             messages=[
                 {"role": "system", "content": "You are an AI planning assistant. Return only valid JSON."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=config.max_tokens,
             temperature=config.temperature,
-            response_format={"type": "json_object"}
+            json_mode=True
         )
-        
-        return response.choices[0].message.content
     
     async def _call_openrouter(self, prompt: str, config: AIConfig) -> str:
         """Call OpenRouter API"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
+        return await self.transport.chat(
+            config,
             messages=[
                 {"role": "system", "content": "You are an AI planning assistant. Return only valid JSON."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=config.max_tokens,
             temperature=config.temperature,
-            # Note: Not all OpenRouter models support response_format
+            json_mode=False  # Not all OpenRouter models support response_format
         )
-        
-        return response.choices[0].message.content
+    
+    def _cache_key(self, kind: str, config: AIConfig, prompt: str,
+                   schema: Dict[str, Any] = None, temperature: float = None,
+                   max_tokens: int = None) -> str:
+        """Response cache key for a request sent to one provider"""
+        return make_cache_key(
+            config.provider.value,
+            config.model,
+            prompt,
+            schema=schema,
+            temperature=temperature if temperature is not None else config.temperature,
+            max_tokens=max_tokens if max_tokens is not None else config.max_tokens,
+            kind=kind
+        )
+    
+    def _cached_response(self, kind: str, prompt: str, **key_params) -> Tuple[Optional[AIConfig], Any]:
+        """Find a cached response from any enabled provider, in priority order"""
+        for config in self.configs:
+            if not config.enabled:
+                continue
+            cached = self.response_cache.get(
+                self._cache_key(kind, config, prompt, **key_params), record_miss=False
+            )
+            if cached is not None:
+                return config, cached
+        
+        self.response_cache.record_miss()
+        return None, None
     
     def _build_planning_prompt(self, request: str, tools: Dict[str, Any]) -> str:
         """Build optimized prompt for any AI provider"""
@@ -375,6 +429,14 @@ Return this exact JSON structure:
       "parameters": {{"param1": "value1", "param2": "value2"}},
       "depends_on": [],
       "error_handling": "retry"
+    }},
+    {{
+      "step_id": 2,
+      "tool": "exact_tool_name_from_list_above",
+      "description": "What this step does with the output of step 1",
+      "parameters": {{"data": "{{step_1}}"}},
+      "depends_on": [1],
+      "error_handling": "retry"
     }}
   ]
 }}
@@ -385,6 +447,8 @@ Rules:
 - If request mentions "analyze", use analyze_content
 - If request mentions "export" or "CSV", use export_csv
 - Make step_id sequential (1, 2, 3...)
+- Steps run in parallel unless ordered: list in "depends_on" the step_ids a step must wait for
+- Pass a previous step's output as "{{step_N}}" (or "{{step_N.field}}") and list N in "depends_on"
 - Set confidence between 0.0 and 1.0
 - Return ONLY the JSON, nothing else"""
     
@@ -433,6 +497,72 @@ Rules:
         if success:
             self.stats['avg_response_times'][provider_name].append(response_time)
         self.stats['last_used'][provider_name] = datetime.now().isoformat()
+        
+        breaker = self._breaker(provider)
+        breaker.record(success, response_time)
+        if breaker.state != CircuitState.CLOSED:
+            self._ensure_health_probes()
+    
+    def _record_schema_failure(self, provider: AIProvider):
+        """Count a response that did not match the requested schema as a failed request"""
+        failures = self.stats['schema_failures']
+        failures[provider.value] = failures.get(provider.value, 0) + 1
+        self._update_stats(provider, False, 0)
+    
+    def _breaker(self, provider: AIProvider) -> ProviderCircuitBreaker:
+        """Get the circuit breaker for a provider, creating it on first use"""
+        breaker = self.circuit_breakers.get(provider)
+        if breaker is None:
+            timeout = next((c.timeout for c in self.configs if c.provider == provider), 30)
+            breaker = ProviderCircuitBreaker(provider.value, self.circuit_breaker_config, timeout)
+            self.circuit_breakers[provider] = breaker
+        return breaker
+    
+    def _routable_configs(self, providers: set = None) -> List[AIConfig]:
+        """
+        Enabled providers that may receive requests
+        
+        Closed circuits come first in priority order, followed by half-open
+        ones awaiting a trial; open circuits are skipped.
+        """
+        closed, half_open = [], []
+        for config in self.configs:
+            if not config.enabled or (providers is not None and config.provider not in providers):
+                continue
+            state = self._breaker(config.provider).state
+            if state == CircuitState.CLOSED:
+                closed.append(config)
+            elif state == CircuitState.HALF_OPEN:
+                half_open.append(config)
+        return closed + half_open
+    
+    def _ensure_health_probes(self):
+        """Start background probing of unhealthy providers if it is not running"""
+        if self._probe_task is not None and not self._probe_task.done():
+            return
+        try:
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_unhealthy_providers())
+        except RuntimeError:
+            # No running loop; circuits still recover through request trials
+            pass
+    
+    async def _probe_unhealthy_providers(self):
+        """Probe providers with half-open circuits through health_check until all recover"""
+        while True:
+            await asyncio.sleep(self.circuit_breaker_config.probe_interval)
+            
+            unhealthy = [c for c in self.configs
+                         if c.enabled and self._breaker(c.provider).state != CircuitState.CLOSED]
+            if not unhealthy:
+                return
+            
+            trial = [c.provider for c in unhealthy
+                     if self._breaker(c.provider).state == CircuitState.HALF_OPEN
+                     and self._breaker(c.provider).allow_request()]
+            if trial:
+                health = await self.health_check(providers=trial)
+                results = {name: h['status'] for name, h in health.items()}
+                logger.info(f"Probed recovering providers: {results}")
     
     def get_provider_status(self) -> Dict[str, Any]:
         """Get status and statistics for all providers"""
@@ -454,6 +584,12 @@ Rules:
                 if response_times:
                     avg_response_time = sum(response_times) / len(response_times)
             
+            breaker = self._breaker(config.provider)
+            if breaker.state == CircuitState.OPEN:
+                health = 'unhealthy'
+            else:
+                health = 'healthy' if success_rate > 0.8 else 'degraded' if success_rate > 0.5 else 'unhealthy'
+            
             status[provider_name] = {
                 'enabled': config.enabled,
                 'model': config.model,
@@ -461,8 +597,10 @@ Rules:
                 'total_requests': total_requests,
                 'success_rate': success_rate,
                 'avg_response_time': avg_response_time,
+                'schema_failures': self.stats['schema_failures'].get(provider_name, 0),
                 'last_used': self.stats['last_used'].get(provider_name),
-                'status': 'healthy' if success_rate > 0.8 else 'degraded' if success_rate > 0.5 else 'unhealthy'
+                'circuit': breaker.get_statistics(),
+                'status': health
             }
         
         return status
@@ -495,7 +633,8 @@ Rules:
                 break
     
     async def generate_structured(self, prompt: str, schema: Dict[str, Any],
-                                model: str = None, max_retries: int = 3) -> Dict[str, Any]:
+                                model: str = None, max_retries: int = 3,
+                                hedge: bool = None) -> Dict[str, Any]:
         """
         Generate structured JSON output using the best available AI provider
         
@@ -504,6 +643,7 @@ Rules:
             schema: JSON schema for the expected output
             model: Optional model override
             max_retries: Maximum retry attempts
+            hedge: Race providers with hedged requests (defaults to HedgingConfig.enabled)
             
         Returns:
             Dict containing the structured response
@@ -523,43 +663,43 @@ Requirements:
 - Do not include any text outside the JSON response
 """
         
-        # Try providers in priority order
-        for config in self.configs:
-            if not config.enabled:
+        cached_config, cached_result = self._cached_response("structured", structured_prompt, schema=schema)
+        if cached_result is not None:
+            logger.debug(f"Using cached structured output from {cached_config.provider.value}")
+            return cached_result
+        
+        if hedge is None:
+            hedge = self.hedging.enabled
+        if hedge:
+            return await self._generate_structured_hedged(structured_prompt, schema)
+        
+        # Try healthy providers in priority order, skipping open circuits
+        for config in self._routable_configs(STRUCTURED_PROVIDERS):
+            if not self._breaker(config.provider).allow_request():
                 continue
                 
             try:
-                start_time = datetime.now()
-                
                 logger.debug(f"Trying {config.provider.value} for structured generation")
                 
-                if config.provider == AIProvider.LOCAL_OLLAMA:
-                    response = await self._call_ollama_structured(structured_prompt, config)
-                elif config.provider == AIProvider.OPENAI:
-                    response = await self._call_openai_structured(structured_prompt, config)
-                elif config.provider == AIProvider.ANTHROPIC:
-                    response = await self._call_anthropic_structured(structured_prompt, config)
-                elif config.provider == AIProvider.GROQ:
-                    response = await self._call_groq_structured(structured_prompt, config)
-                elif config.provider == AIProvider.DEEPSEEK:
-                    response = await self._call_deepseek_structured(structured_prompt, config)
-                elif config.provider == AIProvider.OPENROUTER:
-                    response = await self._call_openrouter_structured(structured_prompt, config)
-                else:
-                    continue
+                with measure_provider_time() as timer:
+                    response = await self._call_structured(structured_prompt, config)
                 
                 # Parse and validate response
                 result = self._parse_response(response)
                 
                 # Validate against schema
                 if self._validate_schema(result, schema):
-                    response_time = (datetime.now() - start_time).total_seconds()
+                    response_time = timer.elapsed
                     self._update_stats(config.provider, True, response_time)
+                    self.response_cache.set(
+                        self._cache_key("structured", config, structured_prompt, schema=schema), result
+                    )
                     
                     logger.debug(f"Successfully generated structured output using {config.provider.value}")
                     return result
                 else:
                     logger.warning(f"Schema validation failed for {config.provider.value}")
+                    self._record_schema_failure(config.provider)
                     continue
                 
             except Exception as e:
@@ -571,6 +711,147 @@ Requirements:
         logger.error("All AI providers failed for structured generation")
         return {"error": "All providers failed", "schema": schema}
     
+    async def _generate_structured_hedged(self, structured_prompt: str,
+                                          schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Race providers for structured output with hedged requests
+        
+        Providers start in priority order: a failed or schema-invalid answer
+        starts the next one immediately (up to ``max_parallel`` in flight),
+        and a slow provider gets a hedge once it exceeds its latency
+        percentile. The first schema-valid answer wins and the remaining
+        requests are cancelled.
+        """
+        candidates = self._routable_configs(STRUCTURED_PROVIDERS)
+        pending: Dict[asyncio.Task, Tuple[AIConfig, bool]] = {}
+        next_index = 0
+        hedge_at: Optional[float] = None
+        
+        self.hedge_stats['races'] += 1
+        self._hedge_budget = min(1.0, self._hedge_budget + self.hedging.max_hedge_ratio)
+        
+        def launch(is_hedge: bool) -> bool:
+            nonlocal next_index, hedge_at
+            while next_index < len(candidates):
+                config = candidates[next_index]
+                next_index += 1
+                if self._breaker(config.provider).allow_request():
+                    break
+            else:
+                return False
+            
+            task = asyncio.create_task(self._timed_structured_call(structured_prompt, config))
+            pending[task] = (config, is_hedge)
+            hedge_at = time.monotonic() + self._hedge_delay(config)
+            logger.debug(f"Racing {config.provider.value} for structured generation"
+                         f"{' (hedge)' if is_hedge else ''}")
+            return True
+        
+        try:
+            while pending or next_index < len(candidates):
+                if not pending and not launch(is_hedge=False):
+                    # Everything in flight failed: fail over without waiting
+                    break
+                
+                timeout = None
+                if (hedge_at is not None and next_index < len(candidates) and
+                        len(pending) < self.hedging.max_parallel):
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                
+                done, _ = await asyncio.wait(pending.keys(), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    if not (self._try_spend_hedge(candidates[next_index]) and launch(is_hedge=True)):
+                        hedge_at = None
+                    continue
+                
+                failed = False
+                for task in done:
+                    config, is_hedge = pending.pop(task)
+                    try:
+                        response, response_time = task.result()
+                        result = self._parse_response(response)
+                    except Exception as e:
+                        logger.warning(f"{config.provider.value} structured generation failed: {e}")
+                        self._update_stats(config.provider, False, 0)
+                        failed = True
+                        continue
+                    
+                    if not self._validate_schema(result, schema):
+                        logger.warning(f"Schema validation failed for {config.provider.value}")
+                        self._record_schema_failure(config.provider)
+                        failed = True
+                        continue
+                    
+                    self._update_stats(config.provider, True, response_time)
+                    self.response_cache.set(
+                        self._cache_key("structured", config, structured_prompt, schema=schema), result
+                    )
+                    if is_hedge:
+                        self.hedge_stats['hedge_wins'] += 1
+                    logger.debug(f"Successfully generated structured output using {config.provider.value}")
+                    return result
+                
+                # Fail over while other requests are still in flight; with
+                # nothing in flight the next iteration starts the next provider
+                if failed and pending and len(pending) < self.hedging.max_parallel:
+                    launch(is_hedge=False)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending.keys(), return_exceptions=True)
+        
+        logger.error("All AI providers failed for structured generation")
+        return {"error": "All providers failed", "schema": schema}
+    
+    def _hedge_delay(self, config: AIConfig) -> float:
+        """Time to wait for a provider before hedging, from its latency history"""
+        samples = self.stats['avg_response_times'].get(config.provider.value, [])
+        samples = samples[-self.hedging.sample_window:]
+        if len(samples) < self.hedging.min_samples:
+            delay = self.hedging.default_hedge_delay
+        else:
+            ordered = sorted(samples)
+            index = max(0, math.ceil(self.hedging.latency_percentile * len(ordered)) - 1)
+            delay = ordered[index]
+        return min(max(delay, self.hedging.min_hedge_delay), config.timeout)
+    
+    def _try_spend_hedge(self, config: AIConfig) -> bool:
+        """Check the hedge budget and the hedge target's cost cap, spending a hedge if allowed"""
+        estimated_cost = config.cost_per_1k_tokens * config.max_tokens / 1000
+        if ((self.hedging.max_hedge_cost is not None and estimated_cost > self.hedging.max_hedge_cost)
+                or self._hedge_budget < 1.0):
+            self.hedge_stats['hedges_denied'] += 1
+            return False
+        
+        self._hedge_budget -= 1.0
+        self.hedge_stats['hedges_sent'] += 1
+        return True
+    
+    async def _timed_structured_call(self, prompt: str, config: AIConfig) -> Tuple[str, float]:
+        """_call_structured() and the provider latency of the call, without limiter waits"""
+        with measure_provider_time() as timer:
+            response = await self._call_structured(prompt, config)
+        return response, timer.elapsed
+    
+    async def _call_structured(self, prompt: str, config: AIConfig) -> str:
+        """Call a provider for structured output"""
+        if config.provider == AIProvider.LOCAL_OLLAMA:
+            return await self._call_ollama_structured(prompt, config)
+        elif config.provider == AIProvider.OPENAI:
+            return await self._call_openai_structured(prompt, config)
+        elif config.provider == AIProvider.ANTHROPIC:
+            return await self._call_anthropic_structured(prompt, config)
+        elif config.provider == AIProvider.GROQ:
+            return await self._call_groq_structured(prompt, config)
+        elif config.provider == AIProvider.DEEPSEEK:
+            return await self._call_deepseek_structured(prompt, config)
+        elif config.provider == AIProvider.OPENROUTER:
+            return await self._call_openrouter_structured(prompt, config)
+        raise ValueError(f"Structured output not supported for {config.provider.value}")
+    
     async def generate_text(self, prompt: str, model: str = None, 
                            temperature: float = None, max_tokens: int = None) -> Dict[str, Any]:
         """
@@ -586,38 +867,56 @@ Requirements:
             Dict containing response content and metadata
         """
         
-        # Try providers in priority order
-        for config in self.configs:
-            if not config.enabled:
+        cached_config, cached_content = self._cached_response(
+            "text", prompt, temperature=temperature, max_tokens=max_tokens
+        )
+        if cached_content is not None:
+            return {
+                "content": cached_content,
+                "provider": cached_config.provider.value,
+                "model": cached_config.model,
+                "success": True,
+                "response_time": 0.0,
+                "cached": True
+            }
+        
+        # Try healthy providers in priority order, skipping open circuits
+        for config in self._routable_configs():
+            if not self._breaker(config.provider).allow_request():
                 continue
                 
             try:
-                start_time = datetime.now()
-                
                 # Override config values if provided
                 effective_temp = temperature if temperature is not None else config.temperature
                 effective_tokens = max_tokens if max_tokens is not None else config.max_tokens
                 
                 logger.debug(f"Trying {config.provider.value} for text generation")
                 
-                if config.provider == AIProvider.LOCAL_OLLAMA:
-                    response = await self._call_ollama_text(prompt, config, effective_temp, effective_tokens)
-                elif config.provider == AIProvider.OPENAI:
-                    response = await self._call_openai_text(prompt, config, effective_temp, effective_tokens)
-                elif config.provider == AIProvider.ANTHROPIC:
-                    response = await self._call_anthropic_text(prompt, config, effective_temp, effective_tokens)
-                elif config.provider == AIProvider.GROQ:
-                    response = await self._call_groq_text(prompt, config, effective_temp, effective_tokens)
-                elif config.provider == AIProvider.DEEPSEEK:
-                    response = await self._call_deepseek_text(prompt, config, effective_temp, effective_tokens)
-                elif config.provider == AIProvider.OPENROUTER:
-                    response = await self._call_openrouter_text(prompt, config, effective_temp, effective_tokens)
-                else:
-                    continue
+                with measure_provider_time() as timer:
+                    if config.provider == AIProvider.LOCAL_OLLAMA:
+                        response = await self._call_ollama_text(prompt, config, effective_temp, effective_tokens)
+                    elif config.provider == AIProvider.OPENAI:
+                        response = await self._call_openai_text(prompt, config, effective_temp, effective_tokens)
+                    elif config.provider == AIProvider.ANTHROPIC:
+                        response = await self._call_anthropic_text(prompt, config, effective_temp, effective_tokens)
+                    elif config.provider == AIProvider.GROQ:
+                        response = await self._call_groq_text(prompt, config, effective_temp, effective_tokens)
+                    elif config.provider == AIProvider.DEEPSEEK:
+                        response = await self._call_deepseek_text(prompt, config, effective_temp, effective_tokens)
+                    elif config.provider == AIProvider.OPENROUTER:
+                        response = await self._call_openrouter_text(prompt, config, effective_temp, effective_tokens)
+                    else:
+                        continue
                 
-                response_time = (datetime.now() - start_time).total_seconds()
+                response_time = timer.elapsed
                 self._update_stats(config.provider, True, response_time)
                 
+                self.response_cache.set(
+                    self._cache_key("text", config, prompt, temperature=effective_temp,
+                                    max_tokens=effective_tokens),
+                    response
+                )
+                
                 logger.debug(f"Successfully generated text using {config.provider.value}")
                 return {
                     "content": response,
@@ -644,206 +943,133 @@ Requirements:
     
     async def _call_ollama_structured(self, prompt: str, config: AIConfig) -> str:
         """Call Ollama for structured output"""
-        response = requests.post(
-            f"{config.base_url}/api/generate",
-            json={
-                "model": config.model,
-                "prompt": prompt,
-                "format": "json",
-                "stream": False,
-                "options": {
-                    "temperature": config.temperature,
-                    "num_predict": config.max_tokens
-                }
-            },
-            timeout=config.timeout
+        return await self.transport.ollama_generate(
+            config,
+            prompt,
+            max_tokens=config.max_tokens,
+            temperature=config.temperature,
+            json_format=True
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("response", "{}")
-        else:
-            raise Exception(f"Ollama API error: {response.status_code}")
     
     async def _call_openai_structured(self, prompt: str, config: AIConfig) -> str:
         """Call OpenAI for structured output"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
+        return await self.transport.chat(
+            config,
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that responds only in valid JSON format."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=config.max_tokens,
             temperature=config.temperature,
-            response_format={"type": "json_object"}
+            json_mode=True
         )
-        
-        return response.choices[0].message.content
     
     async def _call_anthropic_structured(self, prompt: str, config: AIConfig) -> str:
         """Call Anthropic for structured output"""
-        client = self.clients[config.provider]
-        
-        response = client.messages.create(
-            model=config.model,
+        return await self.transport.messages(
+            config,
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=config.max_tokens,
-            temperature=config.temperature,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
+            temperature=config.temperature
         )
-        
-        return response.content[0].text
     
     async def _call_groq_structured(self, prompt: str, config: AIConfig) -> str:
         """Call Groq for structured output"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
+        return await self.transport.chat(
+            config,
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that responds only in valid JSON format."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=config.max_tokens,
             temperature=config.temperature,
-            response_format={"type": "json_object"}
+            json_mode=True
         )
-        
-        return response.choices[0].message.content
     
     async def _call_deepseek_structured(self, prompt: str, config: AIConfig) -> str:
         """Call DeepSeek for structured output"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
+        return await self.transport.chat(
+            config,
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that responds only in valid JSON format."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=config.max_tokens,
             temperature=config.temperature,
-            response_format={"type": "json_object"}
+            json_mode=True
         )
-        
-        return response.choices[0].message.content
     
     async def _call_openrouter_structured(self, prompt: str, config: AIConfig) -> str:
         """Call OpenRouter for structured output"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
+        return await self.transport.chat(
+            config,
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that responds only in valid JSON format."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=config.max_tokens,
-            temperature=config.temperature
-            # Note: Not all OpenRouter models support response_format
+            temperature=config.temperature,
+            json_mode=False  # Not all OpenRouter models support response_format
         )
-        
-        return response.choices[0].message.content
     
     async def _call_ollama_text(self, prompt: str, config: AIConfig, temperature: float, max_tokens: int) -> str:
         """Call Ollama for plain text"""
-        response = requests.post(
-            f"{config.base_url}/api/generate",
-            json={
-                "model": config.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
-            },
-            timeout=config.timeout
+        return await self.transport.ollama_generate(
+            config,
+            prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            json_format=False
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("response", "")
-        else:
-            raise Exception(f"Ollama API error: {response.status_code}")
     
     async def _call_openai_text(self, prompt: str, config: AIConfig, temperature: float, max_tokens: int) -> str:
         """Call OpenAI for plain text"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
+        return await self.transport.chat(
+            config,
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            json_mode=False
         )
-        
-        return response.choices[0].message.content
     
     async def _call_anthropic_text(self, prompt: str, config: AIConfig, temperature: float, max_tokens: int) -> str:
         """Call Anthropic for plain text"""
-        client = self.clients[config.provider]
-        
-        response = client.messages.create(
-            model=config.model,
+        return await self.transport.messages(
+            config,
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
-            temperature=temperature,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
+            temperature=temperature
         )
-        
-        return response.content[0].text
     
     async def _call_groq_text(self, prompt: str, config: AIConfig, temperature: float, max_tokens: int) -> str:
         """Call Groq for plain text"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
+        return await self.transport.chat(
+            config,
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            json_mode=False
         )
-        
-        return response.choices[0].message.content
     
     async def _call_deepseek_text(self, prompt: str, config: AIConfig, temperature: float, max_tokens: int) -> str:
         """Call DeepSeek for plain text"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
+        return await self.transport.chat(
+            config,
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            json_mode=False
         )
-        
-        return response.choices[0].message.content
     
     async def _call_openrouter_text(self, prompt: str, config: AIConfig, temperature: float, max_tokens: int) -> str:
         """Call OpenRouter for plain text"""
-        client = self.clients[config.provider]
-        
-        response = client.chat.completions.create(
-            model=config.model,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
+        return await self.transport.chat(
+            config,
+            messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            json_mode=False
         )
-        
-        return response.choices[0].message.content
     
     async def analyze_website_content(self, url: str, html_content: str, 
                                     purpose: str) -> Dict[str, Any]:
@@ -857,14 +1083,25 @@ Requirements:
             
         Returns:
             Dict containing analysis results
+            
+        Long pages are analyzed in chunks of markup (split at block elements,
+        without scripts and styles) concurrently, and the per-chunk analyses
+        merged; scores are averaged over the chunks.
         """
         
-        prompt = f"""
+        if self.chunking.enabled:
+            chunks = chunk_html(html_content, self.chunking.max_chunk_tokens, self.chunking.overlap_tokens)
+            chunks = chunks[:self.chunking.max_chunks] or [""]
+        else:
+            chunks = [html_content[:5000]]
+        
+        def build_prompt(markup: str, part: str = "") -> str:
+            return f"""
 Analyze this website for optimal web scraping strategy:
 
 URL: {url}
 Purpose: {purpose}
-HTML Content (first 5000 chars): {html_content[:5000]}
+HTML Content{part}: {markup}
 
 Provide a comprehensive analysis including:
 1. Website type (e-commerce, directory, social, news, corporate, etc.)
@@ -900,7 +1137,26 @@ Focus on practical, actionable insights for web scraping.
             "required": ["website_type", "extraction_strategy", "confidence", "reasoning"]
         }
         
-        return await self.generate_structured(prompt=prompt, schema=schema)
+        if len(chunks) == 1:
+            return await self.generate_structured(prompt=build_prompt(chunks[0]), schema=schema)
+        
+        # Concurrency is capped per provider by the transport's provider limiter
+        async def analyze_chunk(index: int, chunk: str) -> Dict[str, Any]:
+            return await self.generate_structured(
+                prompt=build_prompt(chunk, f" (part {index + 1} of {len(chunks)})"), schema=schema
+            )
+        
+        results = await asyncio.gather(*(analyze_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+        analyses = [result for result in results if "error" not in result]
+        if not analyses:
+            return results[0]
+        
+        merged = merge_extractions(analyses)
+        for score in ("confidence", "success_probability"):
+            values = [a[score] for a in analyses if isinstance(a.get(score), (int, float))]
+            if values:
+                merged[score] = sum(values) / len(values)
+        return merged
     
     async def generate(self, prompt: str, model: str = None, 
                       format: str = None, system: str = None,
@@ -999,12 +1255,19 @@ Focus on practical, actionable insights for web scraping.
         
         return True
     
-    async def health_check(self) -> Dict[str, Any]:
-        """Perform health check on all providers"""
+    async def health_check(self, providers: List[AIProvider] = None) -> Dict[str, Any]:
+        """
+        Perform health check on all providers, or only the given ones
+        
+        Results are fed to the providers' circuit breakers, so a passing
+        check closes a half-open circuit and a failing one re-opens it.
+        """
         health_status = {}
         test_prompt = "Generate JSON: {\"test\": \"success\"}"
         
         for config in self.configs:
+            if providers is not None and config.provider not in providers:
+                continue
             if not config.enabled:
                 health_status[config.provider.value] = {
                     'status': 'disabled',
@@ -1014,26 +1277,28 @@ Focus on practical, actionable insights for web scraping.
                 continue
             
             try:
-                start_time = datetime.now()
-                
-                if config.provider == AIProvider.LOCAL_OLLAMA:
-                    response = await self._call_ollama(test_prompt, config)
-                elif config.provider == AIProvider.OPENAI:
-                    response = await self._call_openai(test_prompt, config)
-                elif config.provider == AIProvider.ANTHROPIC:
-                    response = await self._call_anthropic(test_prompt, config)
-                elif config.provider == AIProvider.GROQ:
-                    response = await self._call_groq(test_prompt, config)
-                elif config.provider == AIProvider.DEEPSEEK:
-                    response = await self._call_deepseek(test_prompt, config)
-                elif config.provider == AIProvider.OPENROUTER:
-                    response = await self._call_openrouter(test_prompt, config)
+                with measure_provider_time() as timer:
+                    if config.provider == AIProvider.LOCAL_OLLAMA:
+                        response = await self._call_ollama(test_prompt, config)
+                    elif config.provider == AIProvider.OPENAI:
+                        response = await self._call_openai(test_prompt, config)
+                    elif config.provider == AIProvider.ANTHROPIC:
+                        response = await self._call_anthropic(test_prompt, config)
+                    elif config.provider == AIProvider.GROQ:
+                        response = await self._call_groq(test_prompt, config)
+                    elif config.provider == AIProvider.DEEPSEEK:
+                        response = await self._call_deepseek(test_prompt, config)
+                    elif config.provider == AIProvider.OPENROUTER:
+                        response = await self._call_openrouter(test_prompt, config)
+                    else:
+                        continue
                 
-                response_time = (datetime.now() - start_time).total_seconds()
+                response_time = timer.elapsed
                 
                 # Try to parse response
                 parsed = self._parse_response(response)
                 
+                self._breaker(config.provider).record(True, response_time)
                 health_status[config.provider.value] = {
                     'status': 'healthy',
                     'response_time': response_time,
@@ -1041,6 +1306,7 @@ Focus on practical, actionable insights for web scraping.
                 }
                 
             except Exception as e:
+                self._breaker(config.provider).record(False)
                 health_status[config.provider.value] = {
                     'status': 'unhealthy',
                     'response_time': None,
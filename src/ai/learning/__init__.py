@@ -9,10 +9,12 @@ This package provides learning capabilities that allow the AI to:
 """
 
 from .memory import LearningMemory, LearningPattern
+from .aggregates import LearningAggregates
 from .trainer import PatternTrainer
 
 __all__ = [
     'LearningMemory',
     'LearningPattern', 
+    'LearningAggregates',
     'PatternTrainer'
 ]
@@ -0,0 +1,266 @@
+"""
+Learning Aggregates - Incrementally maintained statistics over learning patterns
+
+Per-tool counters and hourly rollups are updated as patterns are stored, so
+success rates and tool performance are O(tools) to read instead of a scan
+over the whole pattern history.
+"""
+
+import json
+import sqlite3
+import threading
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SECONDS = 3600
+RECENT_LIMIT = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS totals (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tool_stats (
+    tool TEXT PRIMARY KEY,
+    uses INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    total_time REAL NOT NULL DEFAULT 0,
+    patterns INTEGER NOT NULL DEFAULT 0,
+    pattern_successes INTEGER NOT NULL DEFAULT 0,
+    feedback INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    bucket INTEGER NOT NULL,
+    tool TEXT NOT NULL,
+    patterns INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    total_time REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, tool)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS recent (
+    pattern_id TEXT PRIMARY KEY,
+    request TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Rollup rows for all patterns regardless of tool
+ALL_TOOLS = ""
+
+
+class LearningAggregates:
+    """
+    SQLite-backed aggregate store for LearningMemory
+
+    Counters follow the semantics of the original scans: per-tool ``uses``
+    count plan steps, while ``patterns``/``pattern_successes`` count patterns
+    that used the tool at least once (the basis of per-tool success rates).
+    Hourly rollups hold pattern counts per tool for trend queries.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or ":memory:"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def record_pattern(self, metadata: Dict[str, Any]):
+        """Add a stored pattern to the aggregates"""
+        with self._lock, self._conn:
+            self._apply(metadata)
+            self._trim_recent()
+
+    def record_feedback(self, metadata: Dict[str, Any]):
+        """
+        Count user feedback for a pattern
+
+        Pass the metadata as it was before the update; patterns that already
+        had feedback are not counted twice.
+        """
+        if metadata.get("user_feedback"):
+            return
+        with self._lock, self._conn:
+            self._apply_feedback(metadata)
+
+    def rebuild(self, metadatas: Iterable[Dict[str, Any]]):
+        """Replace all aggregates with ones computed from the given patterns"""
+        with self._lock, self._conn:
+            for table in ("totals", "tool_stats", "rollups", "recent"):
+                self._conn.execute(f"DELETE FROM {table}")
+            for metadata in metadatas:
+                if metadata:
+                    self._apply(metadata)
+                    if metadata.get("user_feedback"):
+                        self._apply_feedback(metadata)
+            self._trim_recent()
+
+    def total_patterns(self) -> int:
+        return int(self._total("patterns"))
+
+    def successful_patterns(self) -> int:
+        return int(self._total("successes"))
+
+    def success_rate(self, tool: Optional[str] = None) -> float:
+        """Success rate over all patterns, or over patterns that used a tool"""
+        if tool is None:
+            total = self.total_patterns()
+            return self.successful_patterns() / total if total else 0.0
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT patterns, pattern_successes FROM tool_stats WHERE tool = ?", (tool,)
+            ).fetchone()
+        if not row or not row[0]:
+            return 0.0
+        return row[1] / row[0]
+
+    def tool_performance(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tool step counts, outcomes and timings"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tool, uses, successes, failures, total_time, feedback "
+                "FROM tool_stats WHERE uses > 0"
+            ).fetchall()
+        return {
+            tool: {
+                "total_uses": uses,
+                "successes": successes,
+                "failures": failures,
+                "total_time": total_time,
+                "avg_time": total_time / uses,
+                "success_rate": successes / uses,
+                "feedback_count": feedback
+            }
+            for tool, uses, successes, failures, total_time, feedback in rows
+        }
+
+    def recent_requests(self, limit: int = 5) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT request FROM recent ORDER BY timestamp DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def rollups(self, tool: Optional[str] = None, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Hourly pattern counts, success rates and average times, oldest first"""
+        start = int(since.timestamp()) // BUCKET_SECONDS * BUCKET_SECONDS if since else 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket, patterns, successes, total_time FROM rollups "
+                "WHERE tool = ? AND bucket >= ? ORDER BY bucket",
+                (tool or ALL_TOOLS, start)
+            ).fetchall()
+        return [
+            {
+                "bucket_start": datetime.fromtimestamp(bucket, timezone.utc).isoformat(),
+                "patterns": patterns,
+                "successes": successes,
+                "success_rate": successes / patterns if patterns else 0.0,
+                "avg_time": total_time / patterns if patterns else 0.0
+            }
+            for bucket, patterns, successes, total_time in rows
+        ]
+
+    def feedback_count(self) -> int:
+        return int(self._total("feedback"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _apply(self, metadata: Dict[str, Any]):
+        """Fold one pattern into the counters (caller holds the lock and transaction)"""
+        success = metadata.get("outcome") == "success"
+        execution_time = float(metadata.get("execution_time", 0) or 0)
+        tools = self._tools(metadata)
+
+        self._add_total("patterns", 1)
+        if success:
+            self._add_total("successes", 1)
+
+        for tool in tools:
+            self._conn.execute(
+                "INSERT INTO tool_stats (tool, uses, successes, failures, total_time) "
+                "VALUES (?, 1, ?, ?, ?) ON CONFLICT(tool) DO UPDATE SET "
+                "uses = uses + 1, successes = successes + excluded.successes, "
+                "failures = failures + excluded.failures, total_time = total_time + excluded.total_time",
+                (tool, int(success), int(not success), execution_time)
+            )
+
+        bucket = self._bucket(metadata.get("timestamp"))
+        for tool in set(tools):
+            self._conn.execute(
+                "INSERT INTO tool_stats (tool, patterns, pattern_successes) VALUES (?, 1, ?) "
+                "ON CONFLICT(tool) DO UPDATE SET patterns = patterns + 1, "
+                "pattern_successes = pattern_successes + excluded.pattern_successes",
+                (tool, int(success))
+            )
+        for tool in set(tools) | {ALL_TOOLS}:
+            self._conn.execute(
+                "INSERT INTO rollups (bucket, tool, patterns, successes, total_time) "
+                "VALUES (?, ?, 1, ?, ?) ON CONFLICT(bucket, tool) DO UPDATE SET "
+                "patterns = patterns + 1, successes = successes + excluded.successes, "
+                "total_time = total_time + excluded.total_time",
+                (bucket, tool, int(success), execution_time)
+            )
+
+        if metadata.get("pattern_id"):
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recent (pattern_id, request, timestamp) VALUES (?, ?, ?)",
+                (metadata["pattern_id"], metadata.get("request", ""), metadata.get("timestamp", ""))
+            )
+
+    def _apply_feedback(self, metadata: Dict[str, Any]):
+        self._add_total("feedback", 1)
+        for tool in set(self._tools(metadata)):
+            self._conn.execute(
+                "INSERT INTO tool_stats (tool, feedback) VALUES (?, 1) "
+                "ON CONFLICT(tool) DO UPDATE SET feedback = feedback + 1",
+                (tool,)
+            )
+
+    def _add_total(self, name: str, amount: float):
+        self._conn.execute(
+            "INSERT INTO totals (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def _total(self, name: str) -> float:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM totals WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def _trim_recent(self):
+        self._conn.execute(
+            "DELETE FROM recent WHERE pattern_id NOT IN "
+            "(SELECT pattern_id FROM recent ORDER BY timestamp DESC LIMIT ?)",
+            (RECENT_LIMIT,)
+        )
+
+    @staticmethod
+    def _tools(metadata: Dict[str, Any]) -> List[str]:
+        plan = metadata.get("plan", {})
+        if isinstance(plan, str):
+            try:
+                plan = json.loads(plan)
+            except ValueError:
+                return []
+        return [step.get("tool") for step in plan.get("steps", []) if step.get("tool")]
+
+    @staticmethod
+    def _bucket(timestamp: Optional[str]) -> int:
+        try:
+            moment = datetime.fromisoformat(timestamp) if timestamp else datetime.now(timezone.utc)
+        except ValueError:
+            moment = datetime.now(timezone.utc)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return int(moment.timestamp()) // BUCKET_SECONDS * BUCKET_SECONDS
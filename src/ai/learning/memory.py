@@ -6,20 +6,25 @@ enabling the AI to improve over time by learning from past interactions.
 """
 
 import json
+import os
 import logging
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, asdict
 import hashlib
 
 try:
     import chromadb
     from chromadb.config import Settings
+    from chromadb.utils import embedding_functions
 except ImportError:
     chromadb = None
     Settings = None
+    embedding_functions = None
 
 from ..planner import ExecutionPlan, PlanStep, PlanStatus
+from ..embedding_cache import CachedEmbeddingFunction, get_embedding_cache, DEFAULT_EMBEDDING_CACHE_DIR
+from .aggregates import LearningAggregates
 
 
 logger = logging.getLogger(__name__)
@@ -61,7 +66,9 @@ class LearningMemory:
     def __init__(self, 
                  chromadb_host: str = "localhost",
                  chromadb_port: int = 8000,
-                 collection_name: str = "ai_learning_patterns"):
+                 collection_name: str = "ai_learning_patterns",
+                 embedding_cache_dir: Optional[str] = DEFAULT_EMBEDDING_CACHE_DIR,
+                 aggregates_dir: Optional[str] = "./learning_aggregates"):
         """
         Initialize Learning Memory
         
@@ -69,10 +76,14 @@ class LearningMemory:
             chromadb_host: ChromaDB host
             chromadb_port: ChromaDB port
             collection_name: Name of the collection to use
+            embedding_cache_dir: Directory for cached request embeddings (None keeps them in memory)
+            aggregates_dir: Directory for the statistics aggregate store (None keeps it in memory)
         """
         self.collection_name = collection_name
         self.client = None
         self.collection = None
+        self.aggregates: Optional[LearningAggregates] = None
+        self._aggregates_checked = False
         
         if chromadb:
             try:
@@ -83,13 +94,31 @@ class LearningMemory:
                     settings=Settings(anonymized_telemetry=False)
                 )
                 
+                # Request embeddings go through the shared embedding cache, so
+                # repeated requests are embedded once for storage and lookup.
+                # The key includes chromadb's version, since its default model can
+                # change between releases
+                default_function = embedding_functions.DefaultEmbeddingFunction()
+                model_name = getattr(default_function, "MODEL_NAME", type(default_function).__name__)
+                embedding_function = CachedEmbeddingFunction(
+                    default_function,
+                    get_embedding_cache(f"chroma:{model_name}@{chromadb.__version__}", embedding_cache_dir)
+                )
+                
                 # Get or create collection
                 self.collection = self.client.get_or_create_collection(
                     name=self.collection_name,
-                    metadata={"description": "AI learning patterns from user interactions"}
+                    metadata={"description": "AI learning patterns from user interactions"},
+                    embedding_function=embedding_function
                 )
                 
                 logger.info(f"Initialized ChromaDB collection: {self.collection_name}")
+                
+                aggregates_path = None
+                if aggregates_dir:
+                    os.makedirs(aggregates_dir, exist_ok=True)
+                    aggregates_path = os.path.join(aggregates_dir, f"{self.collection_name}.db")
+                self.aggregates = LearningAggregates(aggregates_path)
             except Exception as e:
                 logger.error(f"Failed to initialize ChromaDB: {e}")
                 self.client = None
@@ -158,6 +187,7 @@ class LearningMemory:
                 metadatas=[pattern.to_dict()],
                 ids=[pattern_id]
             )
+            self.aggregates.record_pattern(pattern.to_dict())
             
             logger.info(f"Stored learning pattern: {pattern_id} (outcome: {outcome})")
             return pattern_id
@@ -230,30 +260,8 @@ class LearningMemory:
             return 0.0
         
         try:
-            # Get all patterns
-            all_results = self.collection.get()
-            
-            if not all_results["metadatas"]:
-                return 0.0
-            
-            # Filter by tool if specified
-            relevant_patterns = []
-            for metadata in all_results["metadatas"]:
-                if tool:
-                    # Check if tool is used in any step
-                    plan = metadata.get("plan", {})
-                    steps = plan.get("steps", [])
-                    if any(step.get("tool") == tool for step in steps):
-                        relevant_patterns.append(metadata)
-                else:
-                    relevant_patterns.append(metadata)
-            
-            if not relevant_patterns:
-                return 0.0
-            
-            # Calculate success rate
-            successes = sum(1 for p in relevant_patterns if p.get("outcome") == "success")
-            return successes / len(relevant_patterns)
+            await self._ensure_aggregates()
+            return self.aggregates.success_rate(tool)
             
         except Exception as e:
             logger.error(f"Failed to calculate success rate: {e}")
@@ -270,49 +278,37 @@ class LearningMemory:
             return {}
         
         try:
-            # Get all patterns
-            all_results = self.collection.get()
-            
-            # Aggregate by tool
-            tool_metrics = {}
-            
-            for metadata in all_results.get("metadatas", []):
-                plan = metadata.get("plan", {})
-                steps = plan.get("steps", [])
-                outcome = metadata.get("outcome", "failure")
-                execution_time = metadata.get("execution_time", 0)
-                
-                for step in steps:
-                    tool_name = step.get("tool")
-                    if tool_name:
-                        if tool_name not in tool_metrics:
-                            tool_metrics[tool_name] = {
-                                "total_uses": 0,
-                                "successes": 0,
-                                "failures": 0,
-                                "total_time": 0,
-                                "avg_time": 0,
-                                "success_rate": 0
-                            }
-                        
-                        metrics = tool_metrics[tool_name]
-                        metrics["total_uses"] += 1
-                        
-                        if outcome == "success":
-                            metrics["successes"] += 1
-                        else:
-                            metrics["failures"] += 1
-                        
-                        metrics["total_time"] += execution_time
-                        metrics["avg_time"] = metrics["total_time"] / metrics["total_uses"]
-                        metrics["success_rate"] = metrics["successes"] / metrics["total_uses"]
-            
-            return tool_metrics
+            await self._ensure_aggregates()
+            return self.aggregates.tool_performance()
             
         except Exception as e:
             logger.error(f"Failed to get tool performance: {e}")
             return {}
     
+    async def get_performance_rollups(self, tool: Optional[str] = None,
+                                      hours: int = 24) -> List[Dict[str, Any]]:
+        """
+        Get hourly pattern counts and success rates
+        
+        Args:
+            tool: Tool name to filter by (None for all patterns)
+            hours: How many hours of history to return
+            
+        Returns:
+            Hourly buckets, oldest first
+        """
+        if not self.collection:
+            return []
+        
+        try:
+            await self._ensure_aggregates()
+            since = datetime.now(timezone.utc) - timedelta(hours=hours)
+            return self.aggregates.rollups(tool, since)
+            
+        except Exception as e:
+            logger.error(f"Failed to get performance rollups: {e}")
+            return []
+    
     async def get_failure_patterns(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Analyze failed patterns to identify common issues
@@ -379,6 +375,7 @@ class LearningMemory:
             
             if result["metadatas"]:
                 metadata = result["metadatas"][0]
+                previous = dict(metadata)
                 metadata["user_feedback"] = feedback
                 
                 # Update in collection
@@ -386,6 +383,7 @@ class LearningMemory:
                     ids=[pattern_id],
                     metadatas=[metadata]
                 )
+                self.aggregates.record_feedback(previous)
                 
                 logger.info(f"Updated feedback for pattern: {pattern_id}")
                 return True
@@ -411,9 +409,8 @@ class LearningMemory:
             }
         
         try:
-            # Get all patterns
-            all_results = self.collection.get()
-            total = len(all_results.get("metadatas", []))
+            await self._ensure_aggregates()
+            total = self.aggregates.total_patterns()
             
             if total == 0:
                 return {
@@ -422,26 +419,16 @@ class LearningMemory:
                     "status": "No patterns stored yet"
                 }
             
-            # Calculate statistics
-            successes = sum(1 for m in all_results["metadatas"] if m.get("outcome") == "success")
-            
-            # Get tool performance
-            tool_performance = await self.get_tool_performance()
-            
-            # Get recent patterns
-            recent_patterns = sorted(
-                all_results["metadatas"],
-                key=lambda x: x.get("timestamp", ""),
-                reverse=True
-            )[:5]
+            successes = self.aggregates.successful_patterns()
             
             return {
                 "total_patterns": total,
                 "successful_patterns": successes,
                 "failed_patterns": total - successes,
                 "success_rate": successes / total,
-                "tool_performance": tool_performance,
-                "recent_requests": [p.get("request", "") for p in recent_patterns],
+                "feedback_count": self.aggregates.feedback_count(),
+                "tool_performance": self.aggregates.tool_performance(),
+                "recent_requests": self.aggregates.recent_requests(5),
                 "status": "operational"
             }
             
@@ -453,6 +440,43 @@ class LearningMemory:
                 "status": f"Error: {str(e)}"
             }
     
+    async def rebuild_aggregates(self, page_size: int = 1000) -> int:
+        """
+        Recompute the statistics aggregates from the stored patterns
+        
+        Args:
+            page_size: Patterns fetched per collection read
+            
+        Returns:
+            Number of patterns aggregated
+        """
+        if not self.collection:
+            return 0
+        
+        def iter_metadatas():
+            offset = 0
+            while True:
+                page = self.collection.get(include=["metadatas"], limit=page_size, offset=offset)
+                metadatas = page.get("metadatas") or []
+                yield from metadatas
+                if len(metadatas) < page_size:
+                    return
+                offset += page_size
+        
+        self.aggregates.rebuild(iter_metadatas())
+        self._aggregates_checked = True
+        total = self.aggregates.total_patterns()
+        logger.info(f"Rebuilt learning aggregates from {total} patterns")
+        return total
+    
+    async def _ensure_aggregates(self):
+        """Rebuild the aggregates once if they are out of step with the collection"""
+        if self._aggregates_checked:
+            return
+        if self.collection.count() != self.aggregates.total_patterns():
+            await self.rebuild_aggregates()
+        self._aggregates_checked = True
+    
     def _generate_pattern_id(self, request: str, plan_id: str) -> str:
         """Generate unique pattern ID"""
         content = f"{request}:{plan_id}:{datetime.now(timezone.utc).isoformat()}"
@@ -0,0 +1,258 @@
+"""
+LLM Chunking
+Token-budgeted chunking of page content and merging of per-chunk extraction results
+"""
+
+import re
+import copy
+import json
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Iterable
+
+from .parsed_page import PageSection
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate for English text and markup
+CHARS_PER_TOKEN = 4
+
+# Fields that identify an object in a result list, most specific first
+IDENTITY_FIELDS = ("email", "url", "name", "title", "id")
+
+# Markup with no value for page analysis
+_NON_CONTENT_MARKUP = re.compile(
+    r"<(script|style|noscript|svg)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL
+)
+# Opening tags of block elements, where markup chunks may be split
+_BLOCK_TAG_START = re.compile(
+    r"(?=<(?:section|article|main|header|footer|nav|aside|div|ul|ol|li|table|tr|form|h[1-6])\b)",
+    re.IGNORECASE
+)
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+@dataclass
+class ChunkingConfig:
+    """Configuration for chunked (map-reduce) LLM extraction"""
+    enabled: bool = True
+    max_chunk_tokens: int = 2000  # Content tokens per LLM call
+    overlap_tokens: int = 150  # Content repeated from the end of the previous chunk
+    max_chunks: int = 12  # Chunks beyond this are not sent
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def chunk_sections(sections: Iterable[str], max_tokens: int = 2000,
+                   overlap_tokens: int = 150) -> List[str]:
+    """
+    Pack consecutive sections into chunks of at most ``max_tokens``
+
+    Chunks are only split between sections; a section larger than a chunk
+    is split between lines (and a line larger than a chunk at the budget).
+    Each chunk after the first starts with the trailing sections of the
+    previous one, up to ``overlap_tokens``, so items at a boundary are seen
+    whole by at least one chunk.
+    """
+    budget = max(1, max_tokens) * CHARS_PER_TOKEN
+    overlap = min(max(0, overlap_tokens) * CHARS_PER_TOKEN, budget // 2)
+
+    units: List[str] = []
+    for section in sections:
+        units.extend(split_text(section, budget - 1))
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for unit in units:
+        cost = len(unit) + 1
+        if current and size + cost > budget:
+            chunks.append("\n".join(current))
+            current = _tail(current, overlap)
+            size = sum(len(u) + 1 for u in current)
+            if size + cost > budget:
+                current, size = [], 0
+        current.append(unit)
+        size += cost
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def chunk_with_config(sections: Iterable[str], config: ChunkingConfig) -> List[str]:
+    """chunk_sections() with a config's budgets, capped at ``config.max_chunks``"""
+    chunks = chunk_sections(sections, config.max_chunk_tokens, config.overlap_tokens)
+    if len(chunks) > config.max_chunks:
+        logger.info(f"Page split into {len(chunks)} chunks; only the first {config.max_chunks} are used")
+        chunks = chunks[:config.max_chunks]
+    return chunks
+
+
+def chunk_html(html: str, max_tokens: int = 2000, overlap_tokens: int = 150) -> List[str]:
+    """
+    Split markup into chunks at block element boundaries
+
+    Scripts, styles, inline SVG and comments are dropped first, so the
+    chunks carry the page structure rather than its assets.
+    """
+    markup = _NON_CONTENT_MARKUP.sub("", html or "")
+    pieces = (piece.strip() for piece in _BLOCK_TAG_START.split(markup))
+    return chunk_sections((piece for piece in pieces if piece), max_tokens, overlap_tokens)
+
+
+def page_outline(sections: List[PageSection], max_tokens: int = 1000, line_chars: int = 120) -> str:
+    """
+    Compact outline of a whole page: headings in full, other sections by their first line
+
+    Used where an LLM needs the structure of the page rather than its
+    details, so sections lower on the page are still represented.
+    """
+    budget = max(1, max_tokens) * CHARS_PER_TOKEN
+    lines: List[str] = []
+    size = 0
+    for section in sections:
+        if section.tag in _HEADING_TAGS:
+            line = f"## {section.text}"
+        else:
+            first = section.text.split("\n", 1)[0]
+            line = first if len(first) <= line_chars else first[:line_chars] + "..."
+        if size + len(line) + 1 > budget:
+            break
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def merge_extractions(parts: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-chunk extraction results into one, in chunk order
+
+    Scalars keep the first non-empty value, nested objects are merged
+    recursively, and lists are concatenated without duplicates: strings
+    are compared ignoring case and whitespace, objects by their identity
+    fields (email, url, name, ...) - objects sharing one of them and agreeing
+    on all they both have are taken to be the same item found in different
+    chunks and merged into one.
+    """
+    merged: Dict[str, Any] = {}
+    for part in parts:
+        if isinstance(part, dict):
+            _merge_into(merged, part)
+    return merged
+
+
+def _merge_into(target: Dict[str, Any], source: Dict[str, Any]):
+    for key, value in source.items():
+        if _is_empty(value):
+            continue
+        current = target.get(key)
+        if _is_empty(current):
+            target[key] = _extend_unique([], value) if isinstance(value, list) else copy.deepcopy(value)
+        elif isinstance(current, list):
+            _extend_unique(current, value if isinstance(value, list) else [value])
+        elif isinstance(current, dict) and isinstance(value, dict):
+            _merge_into(current, value)
+
+
+def _extend_unique(items: List[Any], new_items: List[Any]) -> List[Any]:
+    """Append items not already present, merging duplicate objects"""
+    seen: Dict[str, List[Any]] = {}
+    for item in items:
+        _index(seen, item)
+    for item in new_items:
+        if _is_empty(item):
+            continue
+        candidates = (other for key in _identities(item) for other in seen.get(key, ()))
+        existing = next((other for other in candidates if _same_item(other, item)), None)
+        if existing is None:
+            existing = copy.deepcopy(item)
+            items.append(existing)
+        elif isinstance(existing, dict) and isinstance(item, dict):
+            _merge_into(existing, item)
+        _index(seen, existing)
+    return items
+
+
+def _index(seen: Dict[str, List[Any]], item: Any):
+    for key in _identities(item):
+        bucket = seen.setdefault(key, [])
+        if not any(other is item for other in bucket):
+            bucket.append(item)
+
+
+def _same_item(a: Any, b: Any) -> bool:
+    """
+    Whether two items sharing an identity key are the same item
+
+    Objects must agree on every identity field both of them have, so
+    records that only share, say, a job title stay distinct.
+    """
+    if isinstance(a, dict) and isinstance(b, dict):
+        fields_a, fields_b = _identity_fields(a), _identity_fields(b)
+        if fields_a and fields_b:
+            return all(fields_a[field] == fields_b[field] for field in fields_a.keys() & fields_b.keys())
+    return True
+
+
+def _identity_fields(item: Dict[str, Any]) -> Dict[str, str]:
+    """Normalized identity field values of an object"""
+    return {
+        field: _normalize(item[field]) for field in IDENTITY_FIELDS
+        if isinstance(item.get(field), str) and item[field].strip()
+    }
+
+
+def _identities(item: Any) -> List[str]:
+    """Keys under which an item may be a duplicate of another"""
+    if isinstance(item, str):
+        return [_normalize(item)]
+    if isinstance(item, dict):
+        keys = [f"{field}:{value}" for field, value in _identity_fields(item).items()]
+        if keys:
+            return keys
+    return [json.dumps(item, sort_keys=True, default=str)]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split()).rstrip(".,;:")
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return not value.strip()
+    if isinstance(value, (list, dict)):
+        return not value
+    return False
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """A text as is, or its lines (hard-split if needed) when it is longer than ``max_chars``"""
+    if len(text) <= max_chars:
+        return [text]
+    max_chars = max(1, max_chars)
+    pieces = []
+    for line in text.split("\n"):
+        while len(line) > max_chars:
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if line:
+            pieces.append(line)
+    return pieces
+
+
+def _tail(units: List[str], overlap: int) -> List[str]:
+    """Trailing units whose total size fits in the overlap"""
+    tail: List[str] = []
+    size = 0
+    for unit in reversed(units):
+        size += len(unit) + 1
+        if size > overlap:
+            break
+        tail.append(unit)
+    tail.reverse()
+    return tail
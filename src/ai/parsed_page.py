@@ -0,0 +1,337 @@
+"""
+Parsed Page
+Parse-once document model shared by extraction strategies and analyzers
+"""
+
+import re
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, NamedTuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, NavigableString, CData, Tag
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = "lxml"
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+
+logger = logging.getLogger(__name__)
+
+# Context key under which coordinators hand the shared page to sub-strategies
+PARSED_PAGE_KEY = "parsed_page"
+
+# String types BeautifulSoup's get_text() returns (excludes comments, script/style bodies, ...)
+TEXT_STRING_TYPES = (NavigableString, CData)
+NON_CONTENT_TAGS = ("script", "style")
+LLM_EXCLUDED_TAGS = ("script", "style", "noscript")
+
+# Elements that start a new section of the page text
+SECTION_TAGS = frozenset((
+    "article", "section", "main", "header", "footer", "nav", "aside",
+    "h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "tr", "table", "dl",
+    "form", "address", "blockquote", "figure"
+))
+
+
+# Page regions: boilerplate (never page content) and peripheral (page chrome around the content)
+BOILERPLATE_REGIONS = ("nav", "consent")
+PERIPHERAL_REGIONS = ("header", "footer", "aside")
+_REGION_TAGS = {"nav": "nav", "header": "header", "footer": "footer", "aside": "aside"}
+_REGION_ROLES = {"navigation": "nav", "banner": "header", "contentinfo": "footer", "complementary": "aside"}
+_CONSENT_HINT = re.compile(r"cookie|consent|gdpr", re.IGNORECASE)
+_NAV_HINT = re.compile(
+    r"(?<![a-z])(?:nav|navbar|navigation|breadcrumbs?|skip-link|main-menu|site-menu|mega-menu)(?![a-z])",
+    re.IGNORECASE
+)
+# Elements whose header/footer/aside belong to the content, not the page chrome
+CONTENT_TAGS = ("article", "main")
+
+
+class PageSection(NamedTuple):
+    """Text of one DOM section: its lines joined with newlines"""
+    tag: str
+    text: str
+    region: str = ""  # Enclosing boilerplate/peripheral region, "" for page content
+
+
+class ParsedPage:
+    """
+    HTML document parsed once, with memoized derived views
+
+    The tree is built lazily with the fastest available parser (lxml when
+    installed) and shared read-only: derived views such as text without
+    script/style, links and JSON-LD are computed without modifying it, and
+    selector results are memoized. Code that needs to modify a tree should
+    call mutable_soup() for a private copy.
+
+    Usage:
+        page = parse_page(html_content, url)
+        titles = page.select("h1")
+        text = page.get_text(separator="\\n", strip=True)
+    """
+
+    def __init__(self, html: str, url: Optional[str] = None, parser: str = None):
+        self.html = html or ""
+        self.url = url
+        self.parser = parser or DEFAULT_PARSER
+        self._soup: Optional[BeautifulSoup] = None
+        self._texts: Dict[Tuple, str] = {}
+        self._selections: Dict[str, List[Tag]] = {}
+        self._first_matches: Dict[str, Optional[Tag]] = {}
+        self._links: Optional[List[Dict[str, str]]] = None
+        self._json_ld: Optional[List[Any]] = None
+        self._sections: Optional[List[PageSection]] = None
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """Shared parse tree; treat as read-only"""
+        if self._soup is None:
+            self._soup = self._parse()
+        return self._soup
+
+    def mutable_soup(self) -> BeautifulSoup:
+        """A fresh parse tree the caller may modify"""
+        return self._parse()
+
+    def select(self, selector: str) -> List[Tag]:
+        """Memoized soup.select()"""
+        matches = self._selections.get(selector)
+        if matches is None:
+            matches = self._selections[selector] = self.soup.select(selector)
+        return list(matches)
+
+    def select_one(self, selector: str) -> Optional[Tag]:
+        """Memoized soup.select_one()"""
+        if selector not in self._first_matches:
+            cached = self._selections.get(selector)
+            self._first_matches[selector] = (
+                (cached[0] if cached else None) if cached is not None
+                else self.soup.select_one(selector)
+            )
+        return self._first_matches[selector]
+
+    def get_text(self, separator: str = "", strip: bool = False,
+                 exclude: Tuple[str, ...] = NON_CONTENT_TAGS) -> str:
+        """
+        Document text without the contents of ``exclude`` tags
+
+        Matches removing those tags and calling soup.get_text(separator, strip),
+        without modifying the shared tree.
+        """
+        key = (separator, strip, tuple(exclude))
+        text = self._texts.get(key)
+        if text is None:
+            text = self._texts[key] = self.element_text(self.soup, separator, strip, exclude)
+        return text
+
+    def element_text(self, element: Tag, separator: str = "", strip: bool = False,
+                     exclude: Tuple[str, ...] = NON_CONTENT_TAGS) -> str:
+        """Text of one element of this page without the contents of ``exclude`` tags"""
+        strings = self._iter_strings(element, set(exclude))
+        if strip:
+            strings = (s.strip() for s in strings)
+            strings = (s for s in strings if s)
+        return separator.join(strings)
+
+    @property
+    def text(self) -> str:
+        """Newline-separated, stripped text without scripts and styles"""
+        return self.get_text(separator="\n", strip=True)
+
+    @property
+    def llm_text(self) -> str:
+        """Cleaned text for LLM prompts: no scripts/styles/noscript, one non-empty line per string"""
+        key = ("llm",)
+        text = self._texts.get(key)
+        if text is None:
+            raw = self.get_text(separator="\n", strip=True, exclude=LLM_EXCLUDED_TAGS)
+            lines = (line.strip() for line in raw.split("\n"))
+            text = self._texts[key] = "\n".join(line for line in lines if line)
+        return text
+
+    @property
+    def sections(self) -> List[PageSection]:
+        """
+        llm_text split at DOM section boundaries (headings, paragraphs, list items, ...)
+
+        Each section is tagged with the nearest enclosing section element
+        and the page region it is in (navigation, cookie banner, page
+        header/footer, ...); joining all section texts with newlines gives
+        llm_text.
+        """
+        if self._sections is None:
+            self._sections = self._split_sections()
+        return list(self._sections)
+
+    @property
+    def title(self) -> str:
+        title = self.soup.title
+        return title.get_text(strip=True) if title else ""
+
+    @property
+    def links(self) -> List[Dict[str, str]]:
+        """Anchors with an href: raw href, absolute url and link text"""
+        if self._links is None:
+            base = self.url or ""
+            self._links = [
+                {
+                    "href": a["href"],
+                    "url": urljoin(base, a["href"]) if base else a["href"],
+                    "text": a.get_text(strip=True)
+                }
+                for a in self.soup.find_all("a", href=True)
+            ]
+        return list(self._links)
+
+    @property
+    def json_ld(self) -> List[Any]:
+        """Parsed JSON-LD blocks; invalid blocks are skipped"""
+        if self._json_ld is None:
+            blocks = []
+            for script in self.soup.find_all("script", type="application/ld+json"):
+                raw = script.string or script.get_text()
+                if not raw or not raw.strip():
+                    continue
+                try:
+                    blocks.append(json.loads(raw))
+                except (json.JSONDecodeError, TypeError):
+                    continue
+            self._json_ld = blocks
+        return list(self._json_ld)
+
+    def _parse(self) -> BeautifulSoup:
+        try:
+            return BeautifulSoup(self.html, self.parser)
+        except Exception as e:
+            if self.parser == "html.parser":
+                raise
+            logger.debug(f"{self.parser} parser failed, falling back to html.parser: {e}")
+            self.parser = "html.parser"
+            return BeautifulSoup(self.html, self.parser)
+
+    def _split_sections(self) -> List[PageSection]:
+        sections: List[PageSection] = []
+        lines: List[str] = []
+        # (tag, region, inside article/main) of the enclosing sections
+        open_sections = [("body", "", False)]
+
+        def flush():
+            if lines:
+                tag, region, _ = open_sections[-1]
+                sections.append(PageSection(tag, "\n".join(lines), region))
+                lines.clear()
+
+        # (children iterator, whether the element is a section)
+        stack = [(iter(self.soup.contents), False)]
+        while stack:
+            children, is_section = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if is_section:
+                    flush()
+                    open_sections.pop()
+            elif isinstance(child, Tag):
+                if child.name in LLM_EXCLUDED_TAGS:
+                    continue
+                _, region, in_content = open_sections[-1]
+                child_region = self._child_region(child, region, in_content)
+                starts_section = child.name in SECTION_TAGS or child_region != region
+                if starts_section:
+                    flush()
+                    open_sections.append((child.name, child_region, in_content or child.name in CONTENT_TAGS))
+                stack.append((iter(child.contents), starts_section))
+            elif type(child) in TEXT_STRING_TYPES:
+                for line in str(child).split("\n"):
+                    line = line.strip()
+                    if line:
+                        lines.append(line)
+        flush()
+        return sections
+
+    @staticmethod
+    def _child_region(element: Tag, region: str, in_content: bool) -> str:
+        """Region of an element, given the region and content flag of its parent section"""
+        if region in BOILERPLATE_REGIONS:
+            return region
+
+        classes = element.get("class") or []
+        hints = " ".join([element.get("id") or ""] + (classes.split() if isinstance(classes, str) else classes))
+        if hints.strip() and _CONSENT_HINT.search(hints):
+            return "consent"
+        label = _REGION_TAGS.get(element.name) or _REGION_ROLES.get(element.get("role") or "")
+        if label is None and hints.strip() and _NAV_HINT.search(hints):
+            label = "nav"
+
+        if label in BOILERPLATE_REGIONS:
+            return label
+        if label and not region and not in_content:
+            return label
+        return region
+
+    @staticmethod
+    def _iter_strings(node: Tag, exclude: set):
+        """Text strings in document order, skipping the subtrees of excluded tags"""
+        stack = [iter(node.contents)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+            elif isinstance(child, Tag):
+                if child.name not in exclude:
+                    stack.append(iter(child.contents))
+            elif type(child) in TEXT_STRING_TYPES:
+                yield str(child)
+
+
+# Recently parsed pages, so strategies run on the same HTML share one parse
+_page_cache: "OrderedDict[str, ParsedPage]" = OrderedDict()
+_page_cache_lock = threading.Lock()
+PAGE_CACHE_SIZE = 8
+
+
+def parse_page(html: str, url: Optional[str] = None) -> ParsedPage:
+    """Get the ParsedPage for an HTML document, reusing a recent parse of the same content"""
+    html = html or ""
+    with _page_cache_lock:
+        page = _page_cache.get(html)
+        if page is not None:
+            _page_cache.move_to_end(html)
+            if url and not page.url:
+                page.url = url
+            return page
+
+    page = ParsedPage(html, url)
+    with _page_cache_lock:
+        _page_cache[html] = page
+        while len(_page_cache) > PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+    return page
+
+
+def get_parsed_page(html: str, context: Optional[Dict[str, Any]] = None,
+                    url: Optional[str] = None) -> ParsedPage:
+    """
+    Get the page handed over in a strategy context, or parse it
+
+    The page is stored back into ``context`` so later consumers of the same
+    context reuse it.
+    """
+    if context is not None:
+        page = context.get(PARSED_PAGE_KEY)
+        if isinstance(page, ParsedPage) and (page.html is html or page.html == html):
+            return page
+
+    page = parse_page(html, url)
+    if context is not None:
+        context[PARSED_PAGE_KEY] = page
+    return page
+
+
+def strip_parsed_page(context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy of a strategy context without the shared page, e.g. for serializing into prompts"""
+    return {k: v for k, v in (context or {}).items() if k != PARSED_PAGE_KEY}
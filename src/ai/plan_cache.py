@@ -0,0 +1,476 @@
+"""
+Plan Cache
+Two-tier cache of execution plans with parameter-slot templating
+"""
+
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+import zlib
+import logging
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Request fragments that vary between otherwise identical requests, in match order
+SLOT_PATTERNS = [
+    ("url", re.compile(r'https?://[^\s<>"\']+|\bwww\.[^\s<>"\']+', re.IGNORECASE)),
+    ("email", re.compile(r'\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b')),
+    ("domain", re.compile(r'\b(?:[a-z0-9-]+\.)+(?:com|org|net|io|dev|ai|co|edu|gov|de|uk|fr|info|biz)\b(?:/[^\s<>"\']*)?',
+                          re.IGNORECASE)),
+    ("text", re.compile(r'"([^"]+)"|(?<!\w)\'([^\']+)\'(?!\w)')),
+    ("number", re.compile(r'(?<![\w.])\d+(?:\.\d+)?(?![\w.])')),
+]
+TRAILING_PUNCTUATION = ".,;:!?)"
+SLOT_REFERENCE = re.compile(r'\{slot:(\w+?)(?::(int|float))?\}')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+TEMPLATE_TOKEN = re.compile(r'<\w+>|\w+')
+
+# Words that may differ between two requests sharing a plan; any other
+# differing word (csv/excel, prices/names, ...) can change what the plan must do
+PLAN_STOPWORDS = frozenset((
+    "a", "an", "the", "and", "then", "also", "please", "all", "any", "some", "every",
+    "of", "from", "for", "to", "on", "in", "at", "with", "by", "into", "as",
+    "me", "my", "i", "we", "us", "our", "you", "can", "could", "would", "will",
+    "it", "its", "them", "their", "this", "that", "these", "those", "just", "now"
+))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plans (
+    key TEXT PRIMARY KEY,
+    template TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+EmbeddingFunction = Callable[[List[str]], List[Sequence[float]]]
+
+
+@dataclass
+class PlanCacheConfig:
+    """Configuration for the plan cache"""
+    enabled: bool = True
+    max_entries: int = 1000
+    ttl_seconds: float = 7 * 24 * 3600.0
+    similarity_threshold: float = 0.85  # Cosine similarity for nearest-neighbour hits
+    similarity_enabled: bool = True  # Nearest-neighbour tier (only for templates differing in stopwords)
+    persist_path: Optional[str] = None  # SQLite file for plans shared across runs
+
+
+def extract_slots(request: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Split a request into a normalized template and its slot values
+
+    "Crawl https://a.com and get 10 items" becomes
+    ("crawl <url> and get <number> items", {"url_0": "https://a.com", "number_0": "10"}).
+    """
+    slots: Dict[str, str] = {}
+    counts: Dict[str, int] = {}
+    template = request
+
+    for kind, pattern in SLOT_PATTERNS:
+        def replace(match, kind=kind):
+            value = next((g for g in match.groups() if g), None) if match.groups() else match.group(0)
+            trailing = ""
+            if kind in ("url", "domain"):
+                stripped = value.rstrip(TRAILING_PUNCTUATION)
+                trailing = value[len(stripped):]
+                value = stripped
+            index = counts.get(kind, 0)
+            counts[kind] = index + 1
+            slots[f"{kind}_{index}"] = value
+            return f"\x00{kind}\x00{trailing}"
+        template = pattern.sub(replace, template)
+
+    template = WHITESPACE_PATTERN.sub(" ", template.lower()).strip()
+    template = re.sub(r'\x00(\w+)\x00', r'<\1>', template)
+    return template, slots
+
+
+def template_plan(plan: Dict[str, Any], slots: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """
+    Replace slot values in a serialized plan's step parameters with {slot:name} placeholders
+
+    Only step parameters are templated; step ids, dependencies, retry and
+    error handling settings are structure and kept as they are. Returns None
+    when the mapping is ambiguous and the plan should not be cached: a value
+    used in the parameters equals more than one slot, or a number slot
+    matches more than one parameter value.
+    """
+    # Longest values first so a URL is not partially replaced by a shorter domain
+    ordered = sorted(slots.items(), key=lambda item: len(item[1]), reverse=True)
+    used: Dict[str, int] = {}
+
+    def matching(predicate) -> List[str]:
+        names = [name for name, slot_value in ordered if predicate(name, slot_value)]
+        for name in names:
+            used[name] = used.get(name, 0) + 1
+        return names
+
+    def convert(value):
+        if isinstance(value, dict):
+            return {k: convert(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [convert(v) for v in value]
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            names = matching(lambda name, slot_value: name.startswith("number_")
+                             and _as_number(slot_value) == value)
+            return f"{{slot:{names[0]}:{type(value).__name__}}}" if names else value
+        if isinstance(value, str):
+            names = matching(lambda name, slot_value: name.startswith("number_") and value == slot_value)
+            if names:
+                return f"{{slot:{names[0]}}}"
+            original = value
+            for name in matching(lambda name, slot_value: not name.startswith("number_")
+                                 and slot_value in original):
+                value = value.replace(slots[name], f"{{slot:{name}}}")
+            return value
+        return value
+
+    templated = dict(plan)
+    templated["steps"] = [
+        {**step, "parameters": convert(step.get("parameters") or {})}
+        for step in plan.get("steps", [])
+    ]
+
+    values = [slots[name] for name in used]
+    if len(set(values)) < len(values):
+        logger.debug("Plan not cached: a parameter value matches several request slots")
+        return None
+    if any(count > 1 for name, count in used.items() if name.startswith("number_")):
+        logger.debug("Plan not cached: a request number matches several parameter values")
+        return None
+    return templated
+
+
+def fill_plan(plan: Dict[str, Any], slots: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Substitute slot values into a templated plan, or None if a slot is missing"""
+    missing = []
+
+    def substitute(match):
+        name = match.group(1)
+        if name not in slots:
+            missing.append(name)
+            return match.group(0)
+        return slots[name]
+
+    def convert(value):
+        if isinstance(value, dict):
+            return {k: convert(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [convert(v) for v in value]
+        if isinstance(value, str):
+            whole = SLOT_REFERENCE.fullmatch(value)
+            if whole and whole.group(2):
+                if whole.group(1) not in slots:
+                    missing.append(whole.group(1))
+                    return value
+                number = _as_number(slots[whole.group(1)])
+                return int(number) if whole.group(2) == "int" else float(number)
+            return SLOT_REFERENCE.sub(substitute, value)
+        return value
+
+    filled = convert(plan)
+    return None if missing else filled
+
+
+def templates_compatible(a: str, b: str) -> bool:
+    """Whether two request templates differ only in stopwords (PLAN_STOPWORDS)"""
+    words_a = Counter(TEMPLATE_TOKEN.findall(a))
+    words_b = Counter(TEMPLATE_TOKEN.findall(b))
+    differing = (words_a - words_b) + (words_b - words_a)
+    return all(word in PLAN_STOPWORDS for word in differing)
+
+
+def lexical_embedding(text: str) -> Dict[int, float]:
+    """Sparse, L2-normalized hashed word and word-bigram vector"""
+    words = TEMPLATE_TOKEN.findall(text.lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    vector: Dict[int, float] = {}
+    for feature in features:
+        index = zlib.crc32(feature.encode("utf-8")) & 0xFFFFF
+        vector[index] = vector.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {k: v / norm for k, v in vector.items()} if norm else {}
+
+
+class PlanCache:
+    """
+    Cache of execution plans keyed by request template
+
+    Requests are reduced to a template (URLs, domains, emails, quoted text
+    and numbers become typed slots) and plans are stored with those values
+    replaced by placeholders, so "crawl a.com" and "crawl b.com" share one
+    entry. Lookups try an exact hash of template + scope (tool manifest
+    version and planning context) first, then the nearest cached template
+    by cosine similarity within the same scope. A similar template is only
+    reused when the words that differ are stopwords ("export to csv" and
+    "export them to csv" share a plan, "... to excel" does not).
+
+    Template vectors use a local hashed bag-of-words embedding unless an
+    ``embedding_function`` (texts -> vectors, as used by ChromaDB) is given.
+
+    Usage:
+        cache = get_plan_cache()
+        scope = cache.make_scope(tool_registry.manifest_version(), context)
+        plan_dict = cache.get(request, scope)
+        if plan_dict is None:
+            plan = await plan_with_llm(request)
+            cache.set(request, scope, plan_to_dict(plan))
+    """
+
+    def __init__(self, config: PlanCacheConfig = None,
+                 embedding_function: Optional[EmbeddingFunction] = None):
+        self.config = config or PlanCacheConfig()
+        self.embedding_function = embedding_function
+        # key -> (created_at, template, scope, templated plan)
+        self._entries: "OrderedDict[str, Tuple[float, str, str, Dict[str, Any]]]" = OrderedDict()
+        self._vectors: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # Statistics
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.rejected_similar = 0  # Similar templates differing in more than stopwords
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0  # Plans not cached because their slots were ambiguous
+
+        if self.config.enabled and self.config.persist_path:
+            self._open_disk()
+
+    @staticmethod
+    def make_scope(manifest_version: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """Scope string for plans made against a tool manifest and planning context"""
+        context_json = json.dumps(context or {}, sort_keys=True, default=str)
+        return f"{manifest_version}:{hashlib.sha256(context_json.encode('utf-8')).hexdigest()[:16]}"
+
+    def get(self, request: str, scope: str) -> Optional[Dict[str, Any]]:
+        """Get a plan for a request with its slot values filled in, or None"""
+        if not self.config.enabled:
+            return None
+
+        template, slots = extract_slots(request)
+        key = self._key(template, scope)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.config.ttl_seconds:
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                plan = fill_plan(entry[3], slots)
+                if plan is not None:
+                    self._entries.move_to_end(key)
+                    self.exact_hits += 1
+                    return plan
+
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if self.config.similarity_enabled and e[2] == scope and k != key
+                and now - e[0] <= self.config.ttl_seconds
+            ]
+
+        if candidates:
+            query = self._embed([template])[0]
+            scored = sorted(
+                ((self._similarity(query, self._vectors[k]), k, e) for k, e in candidates if k in self._vectors),
+                key=lambda item: item[0], reverse=True
+            )
+            for similarity, k, e in scored:
+                if similarity < self.config.similarity_threshold:
+                    break
+                if not templates_compatible(template, e[1]):
+                    with self._lock:
+                        self.rejected_similar += 1
+                    continue
+                plan = fill_plan(e[3], slots)
+                if plan is not None:
+                    with self._lock:
+                        if k in self._entries:
+                            self._entries.move_to_end(k)
+                        self.similar_hits += 1
+                    logger.debug(f"Plan cache similarity hit ({similarity:.2f}): {e[1]}")
+                    return plan
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, request: str, scope: str, plan: Dict[str, Any]):
+        """Cache a serialized plan for a request"""
+        if not self.config.enabled:
+            return
+
+        template, slots = extract_slots(request)
+        templated = template_plan(plan, slots)
+        if templated is None:
+            with self._lock:
+                self.skipped += 1
+            return
+        key = self._key(template, scope)
+        vector = self._embed([template])[0]
+        created_at = time.time()
+
+        with self._lock:
+            self._remember(key, created_at, template, scope, templated, vector)
+            self.stores += 1
+            if self._conn is not None:
+                try:
+                    with self._conn:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO plans (key, template, scope, plan, created_at) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (key, template, scope, json.dumps(templated, default=str), created_at)
+                        )
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to persist cached plan: {e}")
+
+    def invalidate(self, request: str, scope: str):
+        """Drop the cached plan for a request's template"""
+        template, _ = extract_slots(request)
+        key = self._key(template, scope)
+        with self._lock:
+            self._remove(key)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM plans WHERE key = ?", (key,))
+
+    def clear(self):
+        """Remove all entries, including persisted ones"""
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM plans")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self):
+        """Close the persistence file"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            "enabled": self.config.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.config.max_entries,
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "rejected_similar": self.rejected_similar,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.similar_hits) / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "skipped": self.skipped,
+            "persist_path": self.config.persist_path
+        }
+
+    @staticmethod
+    def _key(template: str, scope: str) -> str:
+        return hashlib.sha256(f"{scope}\n{template}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, created_at: float, template: str, scope: str,
+                  templated: Dict[str, Any], vector: Any):
+        self._entries[key] = (created_at, template, scope, templated)
+        self._entries.move_to_end(key)
+        self._vectors[key] = vector
+        while len(self._entries) > self.config.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._vectors.pop(evicted, None)
+
+    def _remove(self, key: str):
+        self._entries.pop(key, None)
+        self._vectors.pop(key, None)
+
+    def _embed(self, texts: List[str]) -> List[Any]:
+        if self.embedding_function is not None:
+            try:
+                return [self._normalize(v) for v in self.embedding_function(texts)]
+            except Exception as e:
+                logger.warning(f"Plan cache embedding failed, using lexical vectors: {e}")
+        return [lexical_embedding(text) for text in texts]
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> List[float]:
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else list(vector)
+
+    @staticmethod
+    def _similarity(a: Any, b: Any) -> float:
+        if isinstance(a, dict) and isinstance(b, dict):
+            if len(a) > len(b):
+                a, b = b, a
+            return sum(v * b.get(k, 0.0) for k, v in a.items())
+        if isinstance(a, dict) or isinstance(b, dict):
+            return 0.0
+        return sum(x * y for x, y in zip(a, b))
+
+    def _open_disk(self):
+        """Open the persistence file and load the most recent unexpired plans"""
+        try:
+            self._conn = sqlite3.connect(self.config.persist_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            cutoff = time.time() - self.config.ttl_seconds
+            with self._conn:
+                self._conn.execute("DELETE FROM plans WHERE created_at < ?", (cutoff,))
+            rows = self._conn.execute(
+                "SELECT key, template, scope, plan, created_at FROM plans "
+                "ORDER BY created_at DESC LIMIT ?", (self.config.max_entries,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Plan cache persistence disabled: {e}")
+            self._conn = None
+            return
+
+        rows.reverse()
+        vectors = self._embed([row[1] for row in rows]) if rows else []
+        for (key, template, scope, plan, created_at), vector in zip(rows, vectors):
+            self._remember(key, created_at, template, scope, json.loads(plan), vector)
+
+
+def _as_number(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Process-wide plan cache shared by planner instances
+_plan_cache: Optional[PlanCache] = None
+
+
+def get_plan_cache(config: PlanCacheConfig = None) -> PlanCache:
+    """Get the process-wide plan cache, creating it on first use"""
+    global _plan_cache
+    if _plan_cache is None:
+        _plan_cache = PlanCache(config)
+    return _plan_cache
+
+
+def close_plan_cache():
+    """Close the process-wide plan cache"""
+    global _plan_cache
+    if _plan_cache is not None:
+        _plan_cache.close()
+        _plan_cache = None
@@ -5,16 +5,19 @@ This module consolidates all planner functionality into a single, comprehensive
 planning system that combines the best features from all previous planners.
 """
 
+import asyncio
+import inspect
 import json
 import logging
 import time
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple, Set, Callable, AsyncIterator
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 from datetime import datetime
 import requests
 
 from .registry import tool_registry
+from .plan_cache import PlanCache, get_plan_cache
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +29,7 @@ class PlanStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     RETRY = "retry"
+    SKIPPED = "skipped"
 
 
 @dataclass
@@ -42,6 +46,7 @@ class PlanStep:
     status: PlanStatus = PlanStatus.PENDING
     result: Any = None
     error: Optional[str] = None
+    execution_time: Optional[float] = None
 
 
 @dataclass
@@ -56,6 +61,7 @@ class ExecutionPlan:
     status: PlanStatus = PlanStatus.PENDING
     result: Any = None
     source: str = "unified_planner"
+    cache_scope: Optional[str] = None  # Plan cache scope the plan was created under
 
 
 class UnifiedAIPlanner:
@@ -73,7 +79,9 @@ class UnifiedAIPlanner:
                  teacher_ai_url: Optional[str] = None,
                  confidence_threshold: float = 0.7,
                  enable_learning: bool = True,
-                 enable_hybrid_ai: bool = True):
+                 enable_hybrid_ai: bool = True,
+                 plan_cache: Optional[PlanCache] = None,
+                 enable_plan_cache: bool = True):
         """
         Initialize the Unified AI Planner
         
@@ -84,6 +92,8 @@ class UnifiedAIPlanner:
             confidence_threshold: Minimum confidence to use local AI
             enable_learning: Whether to enable learning features
             enable_hybrid_ai: Whether to enable hybrid AI providers
+            plan_cache: Plan cache to use (defaults to the shared process-wide cache)
+            enable_plan_cache: Whether to reuse cached plans for repeat requests
         """
         self.local_ai_url = local_ai_url
         self.local_model = local_model
@@ -91,6 +101,10 @@ class UnifiedAIPlanner:
         self.confidence_threshold = confidence_threshold
         self.enable_learning = enable_learning
         self.enable_hybrid_ai = enable_hybrid_ai
+        if plan_cache is not None:
+            self.plan_cache = plan_cache
+        else:
+            self.plan_cache = get_plan_cache() if enable_plan_cache else None
         
         # Initialize components based on availability
         self._init_learning_components()
@@ -153,6 +167,30 @@ class UnifiedAIPlanner:
         
         start_time = time.time()
         
+        # Step 0: Reuse a cached plan for the same or a near-identical request
+        scope = None
+        if self.plan_cache is not None:
+            scope = self.plan_cache.make_scope(tool_registry.manifest_version(), context)
+            cached = self.plan_cache.get(user_request, scope)
+            if cached:
+                plan = self._plan_from_dict(cached, user_request, source="plan_cache")
+                plan.cache_scope = scope
+                planning_time = time.time() - start_time
+                logger.info(f"Plan created via plan cache in {planning_time * 1000:.1f}ms")
+                return plan
+        
+        plan = await self._create_plan_uncached(user_request, context, start_time)
+        
+        if scope is not None and plan.steps and plan.confidence >= self.confidence_threshold:
+            self.plan_cache.set(user_request, scope, self._plan_to_dict(plan))
+            plan.cache_scope = scope
+        
+        return plan
+    
+    async def _create_plan_uncached(self, user_request: str, context: Dict[str, Any],
+                                    start_time: float) -> ExecutionPlan:
+        """Create a plan without consulting the plan cache"""
+        
         # Step 1: Check for similar patterns if learning is enabled
         if self.memory:
             similar_patterns = await self.memory.find_similar_requests(user_request, k=3)
@@ -203,25 +241,107 @@ class UnifiedAIPlanner:
         """Generate unique plan ID"""
         import uuid
         return str(uuid.uuid4())
+    
+    @staticmethod
+    def _plan_to_dict(plan: ExecutionPlan) -> Dict[str, Any]:
+        """Serialize the reusable parts of a plan"""
+        return {
+            "description": plan.description,
+            "confidence": plan.confidence,
+            "steps": [
+                {
+                    "step_id": step.step_id,
+                    "tool": step.tool,
+                    "parameters": step.parameters,
+                    "description": step.description,
+                    "depends_on": step.depends_on,
+                    "error_handling": step.error_handling,
+                    "max_retries": step.max_retries
+                }
+                for step in plan.steps
+            ]
+        }
+    
+    def _plan_from_dict(self, data: Dict[str, Any], user_request: str, source: str) -> ExecutionPlan:
+        """Build a fresh, unexecuted plan from a serialized one"""
+        return ExecutionPlan(
+            plan_id=self._generate_plan_id(),
+            request=user_request,
+            description=data.get("description", ""),
+            steps=[
+                PlanStep(
+                    step_id=step["step_id"],
+                    tool=step["tool"],
+                    parameters=step.get("parameters") or {},
+                    description=step.get("description", ""),
+                    depends_on=step.get("depends_on"),
+                    error_handling=step.get("error_handling", "fail"),
+                    max_retries=step.get("max_retries", 3)
+                )
+                for step in data.get("steps", [])
+            ],
+            created_at=datetime.now().isoformat(),
+            confidence=data.get("confidence", 0.0),
+            source=source
+        )
+
+
+@dataclass
+class StepEvent:
+    """Progress event emitted while a plan executes"""
+    plan_id: str
+    step_id: int
+    tool: str
+    status: PlanStatus
+    result: Any = None
+    error: Optional[str] = None
+    execution_time: Optional[float] = None
+    timestamp: float = field(default_factory=time.time)
+
+
+StepEventCallback = Callable[[StepEvent], Any]
+
+# error_handling values that let the rest of the plan continue after a step fails
+CONTINUE_ON_ERROR = {"continue", "skip", "ignore"}
 
 
 class PlanExecutor:
-    """Enhanced plan executor with monitoring and optimization"""
+    """
+    Enhanced plan executor with monitoring and optimization
+    
+    Steps form a dependency graph from their ``depends_on`` lists and the
+    ``{step_N...}`` references in their parameters. Each step starts as soon
+    as the steps it depends on have completed, with at most
+    ``max_concurrency`` steps running at once, so independent crawls run
+    side by side instead of one after another. A plan without any declared
+    dependencies runs its steps in order.
+    
+    A failed step is retried when its error_handling is "retry" (up to
+    max_retries). If it still fails, its dependents are skipped; with
+    error_handling "fail" or "retry" no further steps are started either,
+    while "continue" lets independent branches finish.
+    """
     
-    def __init__(self, planner: UnifiedAIPlanner):
+    def __init__(self, planner: UnifiedAIPlanner, max_concurrency: int = 4):
         self.planner = planner
         self.registry = tool_registry
+        self.max_concurrency = max(1, max_concurrency)
     
-    async def execute_plan(self, plan: ExecutionPlan) -> ExecutionPlan:
-        """Execute a plan with full monitoring and optimization"""
+    async def execute_plan(self, plan: ExecutionPlan,
+                           on_event: Optional[StepEventCallback] = None) -> ExecutionPlan:
+        """
+        Execute a plan with full monitoring and optimization
+        
+        Args:
+            plan: Plan to execute
+            on_event: Optional callback (sync or async) receiving a StepEvent
+                whenever a step starts, retries, completes, fails or is skipped
+        """
         plan.status = PlanStatus.EXECUTING
-        step_results = {}
         
         try:
-            for step in plan.steps:
-                # Execute step with monitoring
-                step_result = await self._execute_step_with_monitoring(step, step_results)
-                step_results[step.step_id] = step_result
+            dependencies = self._build_dependencies(plan)
+            await self._run_dependency_graph(plan, dependencies, on_event)
             
             # Determine overall plan status
             plan.status = PlanStatus.COMPLETED if all(
@@ -232,12 +352,182 @@ class PlanExecutor:
             plan.status = PlanStatus.FAILED
             logger.error(f"Plan execution failed: {e}")
         
+        # Failed plans are not reused for later requests
+        plan_cache = getattr(self.planner, "plan_cache", None)
+        if plan.status == PlanStatus.FAILED and plan_cache is not None and plan.cache_scope:
+            plan_cache.invalidate(plan.request, plan.cache_scope)
+        
         return plan
     
+    async def stream_plan(self, plan: ExecutionPlan) -> AsyncIterator[StepEvent]:
+        """
+        Execute a plan, yielding a StepEvent as each step changes state
+        
+        The plan object holds the final status once the iterator is exhausted.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self.execute_plan(plan, on_event=queue.put_nowait))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+    
+    async def _run_dependency_graph(self, plan: ExecutionPlan, dependencies: Dict[int, Set[int]],
+                                    on_event: Optional[StepEventCallback]):
+        """Start each step once its dependencies complete, up to max_concurrency at a time"""
+        steps = {step.step_id: step for step in plan.steps}
+        pending = [step.step_id for step in plan.steps]
+        running: Dict[asyncio.Task, int] = {}
+        step_results: Dict[int, Any] = {}
+        aborted = False
+        
+        try:
+            while pending or running:
+                if aborted:
+                    # Steps that were never started stay pending
+                    pending.clear()
+                else:
+                    for step_id in list(pending):
+                        if len(running) >= self.max_concurrency:
+                            break
+                        step = steps[step_id]
+                        upstream = [steps[d] for d in dependencies[step_id]]
+                        
+                        failed = [u for u in upstream if u.status in (PlanStatus.FAILED, PlanStatus.SKIPPED)]
+                        if failed:
+                            pending.remove(step_id)
+                            step.status = PlanStatus.SKIPPED
+                            step.error = f"Skipped: step {failed[0].step_id} did not complete"
+                            await self._emit(on_event, plan, step)
+                            continue
+                        
+                        if all(u.status == PlanStatus.COMPLETED for u in upstream):
+                            pending.remove(step_id)
+                            task = asyncio.create_task(self._run_step(plan, step, step_results, on_event))
+                            running[task] = step_id
+                
+                if not running:
+                    if pending and not aborted:
+                        # Skips can unblock or skip further steps; anything else would be a cycle
+                        if any(steps[d].status in (PlanStatus.FAILED, PlanStatus.SKIPPED)
+                               for step_id in pending for d in dependencies[step_id]):
+                            continue
+                        raise RuntimeError(f"Steps {pending} can never run")
+                    continue
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = steps[running.pop(task)]
+                    if step.status == PlanStatus.COMPLETED:
+                        step_results[step.step_id] = step.result
+                    elif step.error_handling not in CONTINUE_ON_ERROR:
+                        aborted = True
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+    
+    async def _run_step(self, plan: ExecutionPlan, step: PlanStep, step_results: Dict[int, Any],
+                        on_event: Optional[StepEventCallback]):
+        """Run a step with retries, recording the outcome on the step instead of raising"""
+        step.status = PlanStatus.EXECUTING
+        await self._emit(on_event, plan, step)
+        
+        while True:
+            try:
+                await self._execute_step_with_monitoring(step, step_results)
+                break
+            except Exception as e:
+                if step.error_handling == "retry" and step.retry_count < step.max_retries:
+                    step.retry_count += 1
+                    step.status = PlanStatus.RETRY
+                    logger.warning(f"Step {step.step_id} ({step.tool}) failed, retry "
+                                   f"{step.retry_count}/{step.max_retries}: {e}")
+                    await self._emit(on_event, plan, step)
+                    continue
+                logger.error(f"Step {step.step_id} ({step.tool}) failed: {e}")
+                break
+        
+        await self._emit(on_event, plan, step)
+    
+    async def _emit(self, on_event: Optional[StepEventCallback], plan: ExecutionPlan, step: PlanStep):
+        if on_event is None:
+            return
+        event = StepEvent(
+            plan_id=plan.plan_id,
+            step_id=step.step_id,
+            tool=step.tool,
+            status=step.status,
+            result=step.result if step.status == PlanStatus.COMPLETED else None,
+            error=step.error,
+            execution_time=step.execution_time
+        )
+        try:
+            outcome = on_event(event)
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception as e:
+            logger.warning(f"Step event callback failed: {e}")
+    
+    def _build_dependencies(self, plan: ExecutionPlan) -> Dict[int, Set[int]]:
+        """
+        Map each step to the steps it depends on (depends_on plus {step_N} references)
+        
+        A plan that declares no dependencies at all runs as a chain in step
+        order, since planners that don't state dependencies expect the steps
+        to run one after another (crawl, then analyze, then export).
+        """
+        step_ids = {step.step_id for step in plan.steps}
+        dependencies = {}
+        
+        for step in plan.steps:
+            upstream = set(step.depends_on or [])
+            for value in (step.parameters or {}).values():
+                reference = self._parse_step_reference(value)
+                if reference:
+                    upstream.add(reference[0])
+            
+            unknown = upstream - step_ids
+            if unknown:
+                logger.warning(f"Step {step.step_id} depends on unknown steps {sorted(unknown)}")
+            dependencies[step.step_id] = (upstream & step_ids) - {step.step_id}
+        
+        if len(plan.steps) > 1 and not any(dependencies.values()):
+            dependencies = {
+                step.step_id: {previous.step_id} if previous else set()
+                for previous, step in zip([None] + plan.steps[:-1], plan.steps)
+            }
+        
+        self._check_acyclic(dependencies)
+        return dependencies
+    
+    @staticmethod
+    def _check_acyclic(dependencies: Dict[int, Set[int]]):
+        """Raise if the step dependencies contain a cycle"""
+        remaining = {step_id: set(upstream) for step_id, upstream in dependencies.items()}
+        while remaining:
+            ready = [step_id for step_id, upstream in remaining.items() if not upstream]
+            if not ready:
+                raise ValueError(f"Circular step dependencies between steps {sorted(remaining)}")
+            for step_id in ready:
+                del remaining[step_id]
+            for upstream in remaining.values():
+                upstream.difference_update(ready)
+    
     async def _execute_step_with_monitoring(self, step: PlanStep, previous_results: Dict[int, Any]) -> Any:
         """Execute a single step with monitoring"""
-        import time
         start_time = time.time()
+        step.error = None
         
         try:
             # Get and execute tool
@@ -263,27 +553,32 @@ class PlanExecutor:
             step.execution_time = time.time() - start_time
             raise
     
+    @staticmethod
+    def _parse_step_reference(value: Any) -> Optional[Tuple[int, List[str]]]:
+        """Parse a "{step_N}" or "{step_N.field.sub}" reference into (N, [field, sub])"""
+        if not (isinstance(value, str) and value.startswith("{step_") and value.endswith("}")):
+            return None
+        
+        step_ref = value[1:-1]  # Remove { }
+        parts = step_ref.split(".")
+        try:
+            step_id = int(parts[0].split("_")[1])
+        except (IndexError, ValueError):
+            return None
+        return step_id, parts[1:]
+    
     def _prepare_parameters(self, params: Dict[str, Any], previous_results: Dict[int, Any]) -> Dict[str, Any]:
         """Prepare parameters with result substitution"""
         prepared = {}
         
         for key, value in params.items():
-            if isinstance(value, str) and value.startswith("{step_") and value.endswith("}"):
-                # Extract step reference
-                step_ref = value[1:-1]  # Remove { }
-                step_id = int(step_ref.split("_")[1].split(".")[0])
-                
-                if step_id in previous_results:
-                    if "." in step_ref:
-                        parts = step_ref.split(".")[1:]
-                        result = previous_results[step_id]
-                        for part in parts:
-                            result = result.get(part) if isinstance(result, dict) else getattr(result, part, None)
-                        prepared[key] = result
-                    else:
-                        prepared[key] = previous_results[step_id]
-                else:
-                    prepared[key] = value
+            reference = self._parse_step_reference(value)
+            if reference and reference[0] in previous_results:
+                step_id, path = reference
+                result = previous_results[step_id]
+                for part in path:
+                    result = result.get(part) if isinstance(result, dict) else getattr(result, part, None)
+                prepared[key] = result
             else:
                 prepared[key] = value
                 
@@ -291,4 +586,4 @@ class PlanExecutor:
 
 
 # Export main classes
-__all__ = ['UnifiedAIPlanner', 'PlanExecutor', 'ExecutionPlan', 'PlanStep', 'PlanStatus']
+__all__ = ['UnifiedAIPlanner', 'PlanExecutor', 'ExecutionPlan', 'PlanStep', 'PlanStatus', 'StepEvent']
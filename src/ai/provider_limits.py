@@ -0,0 +1,98 @@
+"""
+Provider Limits
+Process-wide limits on concurrent requests to each LLM provider
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+
+class ProviderLimiter:
+    """
+    Limits the requests in flight to one provider
+
+    Shared by every client, strategy and call that reaches the provider, so
+    chunked extractions from several pages (or strategies) together stay
+    within the provider's limit. The underlying semaphore is rebuilt when
+    the limiter is used from a new event loop.
+
+    Usage:
+        async with get_provider_limiter("local_ollama", 4):
+            response = await call_provider(...)
+    """
+
+    def __init__(self, provider: str, max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS):
+        self.provider = provider
+        self.max_concurrent = max(1, max_concurrent)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Statistics
+        self.in_flight = 0
+        self.requests = 0
+        self.waited = 0
+
+    async def __aenter__(self):
+        semaphore = self._get_semaphore()
+        if semaphore.locked():
+            self.waited += 1
+        await semaphore.acquire()
+        self.in_flight += 1
+        self.requests += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        return {
+            "provider": self.provider,
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "waited": self.waited
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+            self.in_flight = 0
+        return self._semaphore
+
+
+# Process-wide limiters, one per provider
+_provider_limiters: Dict[str, ProviderLimiter] = {}
+_provider_limiters_lock = threading.Lock()
+
+
+def get_provider_limiter(provider: str,
+                         max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS) -> ProviderLimiter:
+    """
+    Get the process-wide limiter for a provider, creating it on first use
+
+    The limit given when the limiter is created applies; later callers
+    share that limiter whatever limit they pass.
+    """
+    with _provider_limiters_lock:
+        limiter = _provider_limiters.get(provider)
+        if limiter is None:
+            limiter = _provider_limiters[provider] = ProviderLimiter(provider, max_concurrent)
+        elif limiter.max_concurrent != max(1, max_concurrent):
+            logger.debug(f"{provider} is already limited to {limiter.max_concurrent} concurrent requests")
+        return limiter
+
+
+def get_provider_limits_statistics() -> Dict[str, Dict[str, Any]]:
+    """Statistics of every provider limiter"""
+    with _provider_limiters_lock:
+        return {name: limiter.get_statistics() for name, limiter in _provider_limiters.items()}
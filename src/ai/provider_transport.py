@@ -0,0 +1,298 @@
+"""
+Provider Transport
+Native async LLM provider clients over shared keep-alive connection pools
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterator, List, Optional
+import aiohttp
+import httpx
+import openai
+from anthropic import AsyncAnthropic
+
+from .provider_limits import get_provider_limiter
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderCallTimer:
+    """Seconds provider calls spent at the provider, excluding waits on the provider limiter"""
+
+    def __init__(self):
+        self.elapsed = 0.0
+
+
+_call_timer: ContextVar[Optional[ProviderCallTimer]] = ContextVar("provider_call_timer", default=None)
+
+
+@contextmanager
+def measure_provider_time() -> Iterator[ProviderCallTimer]:
+    """
+    Measure the provider latency of the transport calls made inside the block
+
+    Time queued on the process-wide provider limiter is not counted, so
+    latency recorded for circuit breakers and hedging does not grow with
+    local concurrency (e.g. the calls of a chunked extraction).
+
+    Usage:
+        with measure_provider_time() as timer:
+            response = await transport.chat(config, messages, ...)
+        breaker.record(True, timer.elapsed)
+    """
+    timer = ProviderCallTimer()
+    token = _call_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _call_timer.reset(token)
+
+
+@contextmanager
+def _provider_call():
+    """Add the block's duration to the current measure_provider_time() timer, if any"""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        timer = _call_timer.get()
+        if timer is not None:
+            timer.elapsed += time.monotonic() - started
+
+
+class ProviderTransport:
+    """
+    Async, connection-pooled clients for every configured AI provider
+
+    Each provider gets one long-lived client whose HTTP connection pool is
+    sized by its AIConfig (max_connections, max_keepalive_connections,
+    keepalive_expiry), so concurrent calls reuse warm connections instead of
+    blocking the event loop or opening a new TLS session per request.
+
+    OpenAI-compatible providers (OpenAI, Groq, DeepSeek, OpenRouter) use
+    openai.AsyncOpenAI, Anthropic uses AsyncAnthropic, both over a shared
+    httpx.AsyncClient. Ollama is called over a pooled aiohttp session.
+
+    Connection pools belong to the event loop that opened them, so clients
+    are rebuilt transparently when the transport is used from a new loop.
+
+    Requests in flight to a provider are capped by its AIConfig
+    max_concurrent_requests through the process-wide provider limiter, so
+    the cap holds across transports, services and strategies. Use
+    measure_provider_time() to time calls without the limiter wait.
+    """
+
+    def __init__(self):
+        self._configs: Dict[Any, Any] = {}
+        self._clients: Dict[Any, Any] = {}
+        self._sessions: Dict[Any, aiohttp.ClientSession] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: set = set()  # Tasks closing pools of a previous loop
+
+        # Statistics
+        self.requests_by_provider: Dict[str, int] = {}
+        self.clients_created = 0
+
+    def register(self, config):
+        """
+        Register a provider and build its client
+
+        Raises if the client cannot be created (e.g. missing API key), so the
+        caller can disable the provider up front.
+        """
+        self._configs[config.provider] = config
+        if self._uses_sdk_client(config):
+            self._clients[config.provider] = self._create_client(config)
+
+    async def chat(self, config, messages: List[Dict[str, str]], max_tokens: int,
+                   temperature: float, json_mode: bool = False) -> str:
+        """Call an OpenAI-compatible chat completions endpoint"""
+        client = self._get_client(config)
+        kwargs: Dict[str, Any] = {}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+
+        async with self._limiter(config):
+            with _provider_call():
+                response = await client.chat.completions.create(
+                    model=config.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    **kwargs
+                )
+        return response.choices[0].message.content
+
+    async def messages(self, config, messages: List[Dict[str, str]], max_tokens: int,
+                       temperature: float) -> str:
+        """Call the Anthropic messages endpoint"""
+        client = self._get_client(config)
+        async with self._limiter(config):
+            with _provider_call():
+                response = await client.messages.create(
+                    model=config.model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    messages=messages
+                )
+        return response.content[0].text
+
+    async def ollama_generate(self, config, prompt: str, max_tokens: int,
+                              temperature: float, json_format: bool = False) -> str:
+        """Call the Ollama generate endpoint"""
+        session = await self._get_session(config)
+        payload: Dict[str, Any] = {
+            "model": config.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens
+            }
+        }
+        if json_format:
+            payload["format"] = "json"
+
+        async with self._limiter(config):
+            with _provider_call():
+                async with session.post(f"{config.base_url}/api/generate", json=payload) as response:
+                    if response.status != 200:
+                        raise Exception(f"Ollama API error: {response.status}")
+                    result = await response.json()
+        return result.get("response", "{}" if json_format else "")
+
+    async def close(self):
+        """Close all provider clients and their connection pools"""
+        await self._close_pools(dict(self._clients), dict(self._sessions))
+        self._clients.clear()
+        self._sessions.clear()
+        self._loop = None
+
+    async def _close_pools(self, clients: Dict[Any, Any], sessions: Dict[Any, aiohttp.ClientSession]):
+        """Close SDK clients (and their httpx pools) and aiohttp sessions"""
+        for provider, client in clients.items():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close {self._name(provider)} client: {e}")
+        for provider, session in sessions.items():
+            try:
+                if not session.closed:
+                    await session.close()
+            except Exception as e:
+                logger.warning(f"Failed to close {self._name(provider)} session: {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get transport statistics"""
+        return {
+            "providers": [self._name(p) for p in self._configs],
+            "open_clients": len(self._clients) + len(self._sessions),
+            "clients_created": self.clients_created,
+            "requests_by_provider": dict(self.requests_by_provider),
+            "concurrency": {
+                self._name(p): self._limiter(config).get_statistics()
+                for p, config in self._configs.items()
+            }
+        }
+
+    def _get_client(self, config):
+        """Get the pooled SDK client for a provider on the running loop"""
+        self._bind_loop()
+        self._count_request(config)
+        client = self._clients.get(config.provider)
+        if client is None:
+            self._configs[config.provider] = config
+            client = self._clients[config.provider] = self._create_client(config)
+        return client
+
+    async def _get_session(self, config) -> aiohttp.ClientSession:
+        """Get the pooled aiohttp session for a provider on the running loop"""
+        self._bind_loop()
+        self._count_request(config)
+        session = self._sessions.get(config.provider)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=config.max_connections,
+                keepalive_timeout=config.keepalive_expiry
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=config.timeout)
+            )
+            self._sessions[config.provider] = session
+            self.clients_created += 1
+        return session
+
+    def _bind_loop(self):
+        """
+        Replace pools opened on a different event loop; they cannot be reused here
+
+        The old pools are closed on their own loop if it is still running,
+        otherwise (best effort) on the current one.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            logger.debug("Event loop changed, rebuilding provider connection pools")
+            old_clients, old_sessions = self._clients, dict(self._sessions)
+            self._sessions.clear()
+            self._clients = {
+                provider: self._create_client(config)
+                for provider, config in self._configs.items()
+                if provider in old_clients
+            }
+            closing = self._close_pools(old_clients, old_sessions)
+            if self._loop.is_running() and not self._loop.is_closed():
+                asyncio.run_coroutine_threadsafe(closing, self._loop)
+            else:
+                task = loop.create_task(closing)
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+        self._loop = loop
+
+    def _create_client(self, config):
+        """Build an async SDK client over a pooled httpx client"""
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry
+            ),
+            timeout=config.timeout
+        )
+        self.clients_created += 1
+
+        if self._name(config.provider) == "anthropic":
+            return AsyncAnthropic(
+                api_key=config.api_key,
+                timeout=config.timeout,
+                http_client=http_client
+            )
+
+        kwargs: Dict[str, Any] = {}
+        if config.base_url:
+            kwargs["base_url"] = config.base_url
+        return openai.AsyncOpenAI(
+            api_key=config.api_key,
+            timeout=config.timeout,
+            http_client=http_client,
+            **kwargs
+        )
+
+    def _uses_sdk_client(self, config) -> bool:
+        return self._name(config.provider) != "local_ollama"
+
+    def _limiter(self, config):
+        return get_provider_limiter(self._name(config.provider), config.max_concurrent_requests)
+
+    def _count_request(self, config):
+        name = self._name(config.provider)
+        self.requests_by_provider[name] = self.requests_by_provider.get(name, 0) + 1
+
+    @staticmethod
+    def _name(provider) -> str:
+        return getattr(provider, "value", str(provider))
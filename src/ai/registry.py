@@ -5,6 +5,7 @@ This module implements the tool registration system that allows AI to discover
 and understand available capabilities.
 """
 
+import hashlib
 import json
 from typing import Dict, Any, Callable, List, Optional
 from functools import wraps
@@ -50,11 +51,13 @@ class ToolRegistry:
     def __init__(self):
         self.tools: Dict[str, Dict[str, Any]] = {}
         self._tool_instances: Dict[str, Callable] = {}
+        self._manifest_version: Optional[str] = None
     
     def register(self, tool_info: ToolInfo, tool_callable: Callable):
         """Register a tool with its metadata and callable"""
         self.tools[tool_info.name] = asdict(tool_info)
         self._tool_instances[tool_info.name] = tool_callable
+        self._manifest_version = None
     
     def get_tool(self, name: str) -> Optional[Callable]:
         """Get a tool instance by name"""
@@ -103,6 +106,13 @@ class ToolRegistry:
         
         return manifest
     
+    def manifest_version(self) -> str:
+        """Short hash of the tool manifest, changing whenever a tool is (re-)registered"""
+        if self._manifest_version is None:
+            encoded = json.dumps(self.get_tool_manifest(), sort_keys=True, default=str)
+            self._manifest_version = hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+        return self._manifest_version
+    
     def search_tools_by_capability(self, capability: str) -> List[str]:
         """Find tools that match a specific capability"""
         matching_tools = []
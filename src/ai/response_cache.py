@@ -0,0 +1,244 @@
+"""
+LLM Response Cache
+Content-addressed, size-bounded cache of LLM responses shared by all AI entry points
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class ResponseCacheConfig:
+    """Configuration for the LLM response cache"""
+    enabled: bool = True
+    max_entries: int = 10_000
+    ttl_seconds: float = 24 * 3600.0
+    persist_path: Optional[str] = None  # SQLite file for responses shared across runs
+
+
+def make_cache_key(provider: str, model: str, prompt: str,
+                   schema: Optional[Dict[str, Any]] = None,
+                   temperature: Optional[float] = None, **params) -> str:
+    """
+    Content-addressed key for an LLM request
+
+    The prompt is whitespace-normalized so formatting-only differences in
+    prompt templates share an entry. Extra params (system prompt, output
+    format, max tokens, ...) are part of the key.
+    """
+    payload = {
+        "provider": provider,
+        "model": model,
+        "prompt": WHITESPACE_PATTERN.sub(" ", prompt).strip(),
+        "schema": schema,
+        "temperature": temperature,
+        "params": params
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    LRU + TTL cache of LLM responses with optional on-disk persistence
+
+    Values are stored as JSON, so every hit returns a fresh copy the caller
+    may mutate freely. With ``persist_path`` set, entries are written through
+    to a local SQLite file and memory misses fall back to it, so re-crawls in
+    a new process reuse earlier responses.
+
+    Usage:
+        cache = get_response_cache()
+        key = make_cache_key("openai", "gpt-4o-mini", prompt, schema, 0.1)
+        result = cache.get(key)
+        if result is None:
+            result = await call_llm(prompt)
+            cache.set(key, result)
+    """
+
+    def __init__(self, config: ResponseCacheConfig = None):
+        self.config = config or ResponseCacheConfig()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # Statistics
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if self.config.enabled and self.config.persist_path:
+            self._open_disk()
+
+    def get(self, key: str, record_miss: bool = True) -> Optional[Any]:
+        """
+        Get a cached response, or None on a miss
+
+        Pass record_miss=False when probing several candidate keys for one
+        request, and call record_miss() once if none of them hit.
+        """
+        if not self.config.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(value)
+                del self._entries[key]
+                self.expirations += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._remember(key, row[1], row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return json.loads(row[0])
+
+            if record_miss:
+                self.misses += 1
+            return None
+
+    def record_miss(self):
+        """Count a miss for a request whose candidate keys were probed without recording"""
+        with self._lock:
+            self.misses += 1
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Cache a JSON-serializable response"""
+        if not self.config.enabled or value is None:
+            return
+
+        try:
+            encoded = json.dumps(value, default=str)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Response not cacheable: {e}")
+            return
+
+        expires_at = time.time() + (ttl_seconds if ttl_seconds is not None else self.config.ttl_seconds)
+        with self._lock:
+            self._remember(key, expires_at, encoded)
+            self.stores += 1
+            if self._conn is not None:
+                try:
+                    with self._conn:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                            (key, encoded, expires_at)
+                        )
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to persist cached response: {e}")
+
+    def invalidate(self, key: str):
+        """Remove a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        """Remove all entries, including persisted ones"""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self):
+        """Close the persistence file"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.config.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.config.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "persist_path": self.config.persist_path
+        }
+
+    def _remember(self, key: str, expires_at: float, encoded: str):
+        """Insert into the in-memory LRU, evicting the least recently used entries"""
+        self._entries[key] = (expires_at, encoded)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.config.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _open_disk(self):
+        """Open the persistence file and drop expired entries"""
+        try:
+            self._conn = sqlite3.connect(self.config.persist_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            with self._conn:
+                self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache persistence disabled: {e}")
+            self._conn = None
+
+
+# Process-wide response cache shared by HybridAIService, LLMService and the AI strategies
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_response_cache(config: ResponseCacheConfig = None) -> LLMResponseCache:
+    """Get the process-wide response cache, creating it on first use"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LLMResponseCache(config)
+    return _response_cache
+
+
+def close_response_cache():
+    """Close the process-wide response cache"""
+    global _response_cache
+    if _response_cache is not None:
+        _response_cache.close()
+        _response_cache = None
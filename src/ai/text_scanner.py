@@ -0,0 +1,285 @@
+"""
+Text Scanner
+Multi-pattern regex scanner with literal-anchor prefiltering over chunked text
+"""
+
+import re
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Union, Iterable, NamedTuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+PatternSpec = Union[str, "re.Pattern"]
+
+DIGITS = tuple("0123456789")
+
+# Lowercase literals at least one of which every match of the pattern contains
+EMAIL_ANCHORS = ("@",)
+URL_ANCHORS = ("http",)
+CURRENCY_ANCHORS = ("$", "€", "£", "usd", "eur", "gbp", "jpy", "cad", "aud")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_OVERLAP = 256
+DEFAULT_PARALLEL_THRESHOLD = 4 * 1024 * 1024
+
+
+class ScanMatch(NamedTuple):
+    """One pattern match at an absolute offset of the scanned text"""
+    name: str
+    start: int
+    end: int
+    text: str
+    groups: Tuple[str, ...]
+
+    @property
+    def value(self) -> Union[str, Tuple[str, ...]]:
+        """What re.findall() would return for this match"""
+        if not self.groups:
+            return self.text
+        if len(self.groups) == 1:
+            return self.groups[0]
+        return self.groups
+
+
+class MultiPatternScanner:
+    """
+    Scans text for many named patterns in one pass over its chunks
+
+    The text is split into chunks (with an overlap so matches crossing a
+    boundary are still found). For each chunk, only patterns whose literal
+    anchors occur in it are run - a page without '@' never runs the email
+    pattern - and a pattern with sparse anchors only runs around them.
+    Each match is reported once, by the chunk it starts in. Patterns whose
+    matches can be longer than the overlap (unbounded repeats such as
+    ``[\\w\\s]+``) would be cut short at chunk and anchor boundaries, so they
+    are run once over the whole text instead, skipped only if none of their
+    anchors occurs anywhere in it. Pages above ``parallel_threshold``
+    characters are scanned across a process pool when ``max_workers`` is set.
+
+    Results follow re.finditer()/findall() per pattern, in pattern order
+    then document order.
+
+    Usage:
+        scanner = MultiPatternScanner(
+            {"email": r"[\\w.+-]+@[\\w-]+\\.[\\w.]+", "phone": r"\\d{3}-\\d{4}"},
+            anchors={"email": EMAIL_ANCHORS, "phone": DIGITS}
+        )
+        found = scanner.findall(text)
+    """
+
+    def __init__(self, patterns: Dict[str, Union[PatternSpec, List[PatternSpec]]],
+                 anchors: Optional[Dict[str, Iterable[str]]] = None,
+                 flags: int = re.IGNORECASE,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 overlap: int = DEFAULT_OVERLAP,
+                 parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+                 max_workers: int = 0):
+        anchors = anchors or {}
+        self.chunk_size = max(1, chunk_size)
+        self.overlap = max(0, overlap)
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers
+
+        # (name, compiled pattern, lowercase anchors or () to always run)
+        self.patterns: List[Tuple[str, "re.Pattern", Tuple[str, ...]]] = []
+        for name, specs in patterns.items():
+            if not isinstance(specs, (list, tuple)):
+                specs = [specs]
+            name_anchors = tuple(a.lower() for a in anchors.get(name, ()))
+            for spec in specs:
+                compiled = spec if isinstance(spec, re.Pattern) else re.compile(spec, flags)
+                self.patterns.append((name, compiled, name_anchors))
+
+        # Indexes of patterns that fit the chunk overlap, and of those scanned whole
+        self._windowed = [i for i, (_, compiled, _) in enumerate(self.patterns)
+                          if max_match_length(compiled) <= self.overlap]
+        self._full_text = [i for i in range(len(self.patterns)) if i not in self._windowed]
+
+        # Statistics
+        self.chunks_scanned = 0
+        self.pattern_runs = 0
+        self.pattern_runs_skipped = 0
+
+    def scan(self, text: str) -> Dict[str, List[ScanMatch]]:
+        """All matches per pattern name; names without matches are omitted"""
+        per_pattern: List[List[tuple]] = [[] for _ in self.patterns]
+
+        if self._full_text:
+            specs = [self.patterns[i][1:] for i in self._full_text]
+            matches, runs, skipped = _scan_window(specs, text, 0, 0, len(text), radius=0)
+            self.pattern_runs += runs
+            self.pattern_runs_skipped += skipped
+            for index, found in zip(self._full_text, matches):
+                per_pattern[index].extend(found)
+
+        if self._windowed:
+            self._scan_chunks(text, per_pattern)
+
+        results: Dict[str, List[ScanMatch]] = {}
+        for (name, _, _), found in zip(self.patterns, per_pattern):
+            if found:
+                results.setdefault(name, []).extend(ScanMatch(name, *match) for match in found)
+        return results
+
+    def _scan_chunks(self, text: str, per_pattern: List[List[tuple]]):
+        """Scan the patterns that fit the overlap chunk by chunk"""
+        spans = self._spans(len(text))
+        specs = [self.patterns[i][1:] for i in self._windowed]
+
+        if self.max_workers and len(text) >= self.parallel_threshold and len(spans) > 1:
+            pool = get_scan_pool(self.max_workers)
+            chunk_results = list(pool.map(
+                _scan_window,
+                [specs] * len(spans),
+                [text[ws:we] for _, _, ws, we in spans],
+                [ws for _, _, ws, _ in spans],
+                [start for start, _, _, _ in spans],
+                [end for _, end, _, _ in spans],
+                [self.overlap] * len(spans)
+            ))
+        else:
+            chunk_results = [
+                _scan_window(specs, text[ws:we], ws, start, end, self.overlap)
+                for start, end, ws, we in spans
+            ]
+
+        for matches, runs, skipped in chunk_results:
+            self.chunks_scanned += 1
+            self.pattern_runs += runs
+            self.pattern_runs_skipped += skipped
+            for index, found in zip(self._windowed, matches):
+                per_pattern[index].extend(found)
+
+    def findall(self, text: str) -> Dict[str, List[Any]]:
+        """re.findall()-compatible values per pattern name"""
+        return {name: [m.value for m in matches] for name, matches in self.scan(text).items()}
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get scanning statistics"""
+        runs = self.pattern_runs + self.pattern_runs_skipped
+        return {
+            "patterns": len(self.patterns),
+            "full_text_patterns": len(self._full_text),
+            "chunks_scanned": self.chunks_scanned,
+            "pattern_runs": self.pattern_runs,
+            "pattern_runs_skipped": self.pattern_runs_skipped,
+            "skip_rate": self.pattern_runs_skipped / runs if runs else 0.0
+        }
+
+    def _spans(self, length: int) -> List[Tuple[int, int, int, int]]:
+        """(start, end, window_start, window_end) per chunk"""
+        if length <= self.chunk_size:
+            return [(0, length, 0, length)]
+        return [
+            (start, min(start + self.chunk_size, length),
+             max(0, start - self.overlap), min(length, start + self.chunk_size + self.overlap))
+            for start in range(0, length, self.chunk_size)
+        ]
+
+
+def max_match_length(pattern: "re.Pattern") -> float:
+    """Longest possible match of a pattern, or infinity if it is unbounded"""
+    try:
+        _, high = sre_parse.parse(pattern.pattern, pattern.flags).getwidth()
+    except Exception:
+        return float("inf")
+    return float("inf") if high >= sre_parse.MAXREPEAT else high
+
+
+def _scan_window(specs: List[Tuple["re.Pattern", Tuple[str, ...]]], window: str,
+                 window_start: int, start: int, end: int, radius: int = DEFAULT_OVERLAP):
+    """
+    Run the patterns whose anchors occur in a window of text
+
+    A pattern whose anchors occur only a few times is run just on the
+    ranges within ``radius`` of them; frequent anchors fall back to a scan
+    of the whole window. Returns per-pattern (start, end, text, groups)
+    tuples for matches that begin within [start, end), plus counts of
+    patterns run and skipped. Module-level so it can run in a worker process.
+    """
+    lowered = window.lower()
+    # Offsets only line up if lowercasing kept the length
+    can_probe = len(lowered) == len(window)
+    probe_limit = len(window) // (4 * radius) + 1 if radius else 0
+
+    matches = []
+    runs = skipped = 0
+    for compiled, anchors in specs:
+        ranges = [(0, len(window))]
+        if anchors:
+            if can_probe and probe_limit:
+                probed = _anchor_ranges(lowered, anchors, radius, probe_limit)
+                if probed is not None:
+                    ranges = probed
+            elif not any(anchor in lowered for anchor in anchors):
+                ranges = []
+        if not ranges:
+            matches.append(())
+            skipped += 1
+            continue
+
+        runs += 1
+        found = []
+        for range_start, range_end in ranges:
+            for match in compiled.finditer(window, range_start, range_end):
+                match_start = window_start + match.start()
+                if match_start < start:
+                    continue
+                if match_start >= end:
+                    break
+                found.append((match_start, window_start + match.end(), match.group(0), match.groups("")))
+        matches.append(found)
+    return matches, runs, skipped
+
+
+def _anchor_ranges(lowered: str, anchors: Tuple[str, ...], radius: int,
+                   limit: int) -> Optional[List[Tuple[int, int]]]:
+    """Merged ranges around anchor occurrences; None if there are more than ``limit``"""
+    positions = []
+    for anchor in anchors:
+        position = lowered.find(anchor)
+        while position != -1:
+            positions.append((position, position + len(anchor)))
+            if len(positions) > limit:
+                return None
+            position = lowered.find(anchor, position + 1)
+
+    ranges: List[List[int]] = []
+    for anchor_start, anchor_end in sorted(positions):
+        low = max(0, anchor_start - radius)
+        high = min(len(lowered), anchor_end + radius)
+        if ranges and low <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], high)
+        else:
+            ranges.append([low, high])
+    return [(low, high) for low, high in ranges]
+
+
+# Process-wide pool for scanning very large pages
+_scan_pool: Optional[ProcessPoolExecutor] = None
+_scan_pool_lock = threading.Lock()
+
+
+def get_scan_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Get the process pool used for parallel scans, creating it on first use"""
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is None:
+            _scan_pool = ProcessPoolExecutor(max_workers=max_workers)
+        return _scan_pool
+
+
+def close_scan_pool():
+    """Shut down the scan process pool"""
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is not None:
+            _scan_pool.shutdown(wait=True)
+            _scan_pool = None
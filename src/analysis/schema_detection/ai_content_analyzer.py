@@ -9,6 +9,7 @@ import re
 from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlparse
 
+from ...text_scanner import MultiPatternScanner, DIGITS, EMAIL_ANCHORS
 from .models import ContentType, DataType, SchemaElement
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,14 @@ class AIContentAnalyzer:
     def __init__(self):
         self.content_indicators = self._initialize_content_indicators()
         self.entity_patterns = self._initialize_entity_patterns()
+        self.entity_scanner = MultiPatternScanner(self.entity_patterns, anchors={
+            'price': ('$', '€', '£', 'usd', 'eur', 'gbp', 'dollar', 'euro', 'pound', 'price'),
+            'email': EMAIL_ANCHORS,
+            'phone': DIGITS,
+            'date': DIGITS,
+            'url': ('.', 'http'),
+            'company': ('inc', 'llc', 'co', 'ltd', 'limited', '&')
+        })
         self.relationship_types = self._initialize_relationship_types()
     
     def _initialize_content_indicators(self) -> Dict[ContentType, Dict[str, Any]]:
@@ -201,27 +210,25 @@ class AIContentAnalyzer:
         try:
             entities = []
             
-            # Extract entities using regex patterns
-            for entity_type, patterns in self.entity_patterns.items():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        entity_text = match.group(0).strip()
-                        if len(entity_text) > 2:  # Filter out very short matches
-                            # Calculate confidence based on pattern quality and context
-                            confidence = self._calculate_entity_confidence(entity_text, entity_type, content)
-                            
-                            # Get surrounding context
-                            start_pos = max(0, match.start() - 50)
-                            end_pos = min(len(content), match.end() + 50)
-                            context = content[start_pos:end_pos].strip()
-                            
-                            entities.append(Entity(
-                                text=entity_text,
-                                entity_type=entity_type,
-                                confidence=confidence,
-                                context=context
-                            ))
+            # Extract entities using all regex patterns in one scan
+            for entity_type, matches in self.entity_scanner.scan(content).items():
+                for match in matches:
+                    entity_text = match.text.strip()
+                    if len(entity_text) > 2:  # Filter out very short matches
+                        # Calculate confidence based on pattern quality and context
+                        confidence = self._calculate_entity_confidence(entity_text, entity_type, content)
+                        
+                        # Get surrounding context
+                        start_pos = max(0, match.start - 50)
+                        end_pos = min(len(content), match.end + 50)
+                        context = content[start_pos:end_pos].strip()
+                        
+                        entities.append(Entity(
+                            text=entity_text,
+                            entity_type=entity_type,
+                            confidence=confidence,
+                            context=context
+                        ))
             
             # Remove duplicates and low-confidence entities
             entities = self._deduplicate_entities(entities)
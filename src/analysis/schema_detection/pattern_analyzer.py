@@ -11,6 +11,7 @@ from collections import defaultdict, Counter
 from bs4 import BeautifulSoup, Tag
 import difflib
 
+from ...parsed_page import parse_page
 from .models import (
     PatternType, DataType, ContentPattern, SchemaElement
 )
@@ -64,7 +65,7 @@ class ContentPatternAnalyzer:
     async def find_repeating_patterns(self, html: str) -> List[ContentPattern]:
         """Find repeating content patterns on the page"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = parse_page(html).soup
             patterns = []
             
             # Find patterns by structure similarity
@@ -88,7 +89,7 @@ class ContentPatternAnalyzer:
     async def detect_product_listings(self, html: str) -> List[ContentPattern]:
         """Detect product listing patterns"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = parse_page(html).soup
             
             # Look for common product container patterns
             product_containers = []
@@ -122,7 +123,7 @@ class ContentPatternAnalyzer:
     async def detect_article_content(self, html: str) -> ContentPattern:
         """Detect main article content pattern"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = parse_page(html).soup
             
             # Look for article indicators
             article_elements = soup.find_all(['article', '[role="main"]'])
@@ -146,7 +147,7 @@ class ContentPatternAnalyzer:
     async def detect_contact_info(self, html: str) -> ContentPattern:
         """Detect contact information pattern"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = parse_page(html).soup
             
             # Find contact indicators
             contact_elements = []
@@ -184,7 +185,7 @@ class ContentPatternAnalyzer:
     async def detect_pricing_data(self, html: str) -> List[ContentPattern]:
         """Detect pricing/plan patterns"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = parse_page(html).soup
             
             # Find pricing containers
             pricing_elements = []
@@ -11,6 +11,7 @@ from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup, Tag
 from collections import Counter
 
+from ...parsed_page import parse_page
 from .models import (
     SchemaType, DataType, DetectedSchema, SchemaElement
 )
@@ -106,7 +107,7 @@ class SchemaDetector:
     async def detect_schemas(self, html_content: str, url: str) -> List[DetectedSchema]:
         """Main method to detect all schemas on a webpage"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = parse_page(html_content).soup
             detected_schemas = []
             
             # Detect different types of schemas
@@ -136,7 +137,7 @@ class SchemaDetector:
     async def analyze_structured_data(self, html: str) -> Dict[str, Any]:
         """Analyze JSON-LD, microdata, and other structured data"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = parse_page(html).soup
             structured_data = {}
             
             # JSON-LD detection
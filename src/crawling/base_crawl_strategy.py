@@ -4,13 +4,18 @@ Provides foundation for all deep crawling implementations
 """
 
 import asyncio
+import re
 import time
+import uuid
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from typing import Dict, Any, List, Optional, Set
 from urllib.parse import urljoin, urlparse
 import logging
 
+from .performance.crawl_store import SeenStore, ContentSpillStore, create_seen_store, url_fingerprint
+from .performance.crawl_state import CrawlStateStore, FrontierEntry
+
 logger = logging.getLogger("deep_crawling")
 
 @dataclass 
@@ -39,6 +44,7 @@ class DeepCrawlConfig:
     max_depth: int = 3
     max_pages: int = 100
     max_concurrent: int = 10
+    max_concurrent_per_host: int = 2
     delay_between_requests: float = 1.0
     respect_robots_txt: bool = True
     follow_redirects: bool = True
@@ -46,6 +52,14 @@ class DeepCrawlConfig:
     include_patterns: List[str] = None
     exclude_patterns: List[str] = None
     allowed_domains: List[str] = None
+    use_fetch_tier: bool = True
+    seen_store: str = "exact"  # "exact", "fingerprint" or "bloom"
+    expected_urls: int = 100_000
+    bloom_error_rate: float = 0.001
+    spill_content_dir: Optional[str] = None
+    state_path: Optional[str] = None  # SQLite file for resumable checkpoints
+    job_id: Optional[str] = None
+    checkpoint_interval: float = 30.0
     
     def __post_init__(self):
         if self.include_patterns is None:
@@ -62,8 +76,23 @@ class DeepCrawlStrategy(ABC):
     
     def __init__(self, config: DeepCrawlConfig = None):
         self.config = config or DeepCrawlConfig()
-        self.visited_urls: Set[str] = set()
+        self.visited_urls: SeenStore = create_seen_store(
+            self.config.seen_store,
+            expected_items=self.config.expected_urls,
+            error_rate=self.config.bloom_error_rate
+        )
         self.crawled_pages: List[CrawlResult] = []
+        self.content_store: Optional[ContentSpillStore] = None
+        if self.config.spill_content_dir:
+            self.content_store = ContentSpillStore(self.config.spill_content_dir)
+        
+        # Resumable crawl state, enabled by config.state_path
+        self.job_id: Optional[str] = self.config.job_id
+        self.state_store: Optional[CrawlStateStore] = None
+        self._seen_journal: List[int] = []
+        self._completed_journal: List[Dict[str, Any]] = []
+        self._last_checkpoint = 0.0
+        self._checkpoint_lock: Optional[asyncio.Lock] = None
         self.url_queue: List[str] = []
         self.logger = logging.getLogger(f"deep_crawl.{self.__class__.__name__}")
         
@@ -80,6 +109,15 @@ class DeepCrawlStrategy(ABC):
         """
         pass
     
+    async def resume(self, job_id: str) -> List[CrawlResult]:
+        """
+        Resume a checkpointed crawl exactly as of its last checkpoint
+        
+        Requires config.state_path to point at the store the job was
+        checkpointed to.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support resuming")
+    
     def _normalize_url(self, url: str, base_url: str = None) -> str:
         """Normalize URL for consistent handling"""
         if base_url and not url.startswith(('http://', 'https://')):
@@ -137,15 +175,14 @@ class DeepCrawlStrategy(ABC):
         """
         Extract all links from HTML content
         """
-        from bs4 import BeautifulSoup
+        from ..parsed_page import parse_page
         
         try:
-            soup = BeautifulSoup(content, 'html.parser')
             links = []
             
             # Extract all href attributes from anchor tags
-            for link_tag in soup.find_all('a', href=True):
-                href = link_tag['href']
+            for link in parse_page(content).links:
+                href = link['href']
                 normalized_url = self._normalize_url(href, base_url)
                 
                 # Only include HTTP/HTTPS links
@@ -167,7 +204,30 @@ class DeepCrawlStrategy(ABC):
         
         try:
             # Import here to avoid circular imports
-            from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+            from crawl4ai import BrowserConfig, CrawlerRunConfig
+            from .performance.browser_pool import get_browser_pool
+            from .performance.fetch_tier import get_fetch_tier
+            
+            # Serve static pages from the HTTP tier without touching a browser
+            http_result = None
+            if self.config.use_fetch_tier:
+                http_result = await get_fetch_tier().fetch(url)
+                
+                if not http_result.needs_browser:
+                    if http_result.success:
+                        return self._build_page_result(
+                            url, http_result.html, self._extract_title(http_result.html),
+                            http_result.status_code, depth, parent_url, start_time,
+                            fetch_tier="http"
+                        )
+                    return CrawlResult(
+                        url=url,
+                        success=False,
+                        depth=depth,
+                        parent_url=parent_url,
+                        crawl_time=time.time() - start_time,
+                        error=f"HTTP {http_result.status_code}"
+                    )
             
             browser_config = BrowserConfig(
                 headless=True,
@@ -180,39 +240,31 @@ class DeepCrawlStrategy(ABC):
                 wait_for="networkidle"
             )
             
-            async with AsyncWebCrawler(config=browser_config) as crawler:
+            # Lease a shared browser only for the page load itself
+            async with get_browser_pool().lease(browser_config) as crawler:
                 result = await crawler.arun(url=url, config=run_config)
+            
+            if result.success:
+                if http_result is not None:
+                    get_fetch_tier().record_browser_outcome(url, http_result, result.html)
                 
-                if result.success:
-                    # Extract links for further crawling
-                    links = self._extract_links_from_content(result.html, url)
-                    
-                    crawl_result = CrawlResult(
-                        url=url,
-                        success=True,
-                        content=result.cleaned_html or result.html,
-                        title=result.metadata.get('title', ''),
-                        links=links,
-                        depth=depth,
-                        parent_url=parent_url,
-                        crawl_time=time.time() - start_time,
-                        metadata={
-                            'status_code': result.status_code,
-                            'content_length': len(result.html) if result.html else 0,
-                            'links_found': len(links)
-                        }
-                    )
-                else:
-                    crawl_result = CrawlResult(
-                        url=url,
-                        success=False,
-                        depth=depth,
-                        parent_url=parent_url,
-                        crawl_time=time.time() - start_time,
-                        error=result.error_message or "Unknown error"
-                    )
-                    
-                return crawl_result
+                crawl_result = self._build_page_result(
+                    url, result.html, result.metadata.get('title', ''),
+                    result.status_code, depth, parent_url, start_time,
+                    content=result.cleaned_html or result.html,
+                    fetch_tier="browser"
+                )
+            else:
+                crawl_result = CrawlResult(
+                    url=url,
+                    success=False,
+                    depth=depth,
+                    parent_url=parent_url,
+                    crawl_time=time.time() - start_time,
+                    error=result.error_message or "Unknown error"
+                )
+                
+            return crawl_result
                 
         except Exception as e:
             self.logger.error(f"Failed to crawl {url}: {e}")
@@ -225,6 +277,186 @@ class DeepCrawlStrategy(ABC):
                 error=str(e)
             )
     
+    def _mark_seen(self, url: str):
+        """Add a URL to the seen-store, journaling it for the next checkpoint"""
+        self.visited_urls.add(url)
+        if self.state_store is not None:
+            self._seen_journal.append(url_fingerprint(url))
+    
+    def _store_page(self, result: CrawlResult, journal: bool = True) -> CrawlResult:
+        """
+        Record a crawled page, spilling its content to disk when configured
+        
+        Spilled results keep an empty ``content`` and a ``content_ref`` in
+        their metadata; use get_page_content() to load the content back.
+        """
+        if journal and self.state_store is not None:
+            self._completed_journal.append(asdict(result))
+        
+        if self.content_store is not None and result.content:
+            result.metadata['content_length'] = len(result.content)
+            result.metadata['content_ref'] = self.content_store.put(result.content)
+            result.content = ""
+        
+        self.crawled_pages.append(result)
+        return result
+    
+    def get_page_content(self, result: CrawlResult) -> str:
+        """Get a page's content, loading it from the spill store if needed"""
+        ref = result.metadata.get('content_ref')
+        if ref is not None and self.content_store is not None:
+            return self.content_store.get(ref)
+        return result.content
+    
+    def _content_length(self, result: CrawlResult) -> int:
+        """Length of a page's content without loading spilled content"""
+        if 'content_ref' in result.metadata:
+            return result.metadata.get('content_length', 0)
+        return len(result.content)
+    
+    def close(self):
+        """Release the content spill store and the state store"""
+        if self.content_store is not None:
+            self.content_store.close()
+            self.content_store = None
+        if self.state_store is not None:
+            self.state_store.close()
+            self.state_store = None
+    
+    def _begin_job(self, starting_url: str):
+        """Register a new checkpointed job when config.state_path is set"""
+        if not self.config.state_path:
+            return
+        
+        self.state_store = CrawlStateStore(self.config.state_path)
+        self.job_id = self.job_id or str(uuid.uuid4())
+        self.state_store.create_job(self.job_id, self.__class__.__name__, {
+            "starting_url": starting_url,
+            "config": asdict(self.config)
+        })
+        self._last_checkpoint = time.monotonic()
+        self.logger.info(f"Checkpointing crawl job {self.job_id} to {self.config.state_path}")
+    
+    def _restore_job(self, job_id: str) -> List[FrontierEntry]:
+        """
+        Reload completed pages and the seen-store from a checkpoint
+        
+        Returns the checkpointed frontier for the strategy to re-queue.
+        """
+        if not self.config.state_path:
+            raise ValueError("Resuming a crawl requires DeepCrawlConfig.state_path")
+        
+        store = CrawlStateStore(self.config.state_path)
+        job = store.load_job(job_id)
+        if job is None:
+            store.close()
+            raise ValueError(f"Unknown crawl job: {job_id}")
+        if job["kind"] != self.__class__.__name__:
+            store.close()
+            raise ValueError(f"Job {job_id} was created by {job['kind']}, not {self.__class__.__name__}")
+        
+        self.state_store = store
+        self.job_id = job_id
+        
+        for record in store.iter_completed(job_id):
+            result = CrawlResult(**record)
+            self.visited_urls.add(result.url)
+            self._store_page(result, journal=False)
+        
+        frontier = store.load_frontier(job_id)
+        for entry in frontier:
+            self.visited_urls.add(entry.url)
+        
+        # Fingerprints also cover URLs that were pruned from the frontier
+        if hasattr(self.visited_urls, "add_fingerprint"):
+            for fingerprint in store.iter_seen(job_id):
+                self.visited_urls.add_fingerprint(fingerprint)
+        
+        store.set_status(job_id, "running")
+        self._last_checkpoint = time.monotonic()
+        self.logger.info(f"Resuming crawl job {job_id}: {len(self.crawled_pages)} pages done, "
+                         f"{len(frontier)} URLs pending")
+        return frontier
+    
+    def _frontier_snapshot(self) -> List[FrontierEntry]:
+        """Pending URLs to checkpoint, including pages still in flight"""
+        return []
+    
+    async def _checkpoint(self, status: Optional[str] = None):
+        """
+        Write a checkpoint to the state store
+        
+        The journals and frontier are captured on the event loop; the SQLite
+        transaction runs in a worker thread so pages keep crawling meanwhile.
+        """
+        if self._checkpoint_lock is None:
+            self._checkpoint_lock = asyncio.Lock()
+        
+        async with self._checkpoint_lock:
+            seen, self._seen_journal = self._seen_journal, []
+            completed, self._completed_journal = self._completed_journal, []
+            self._last_checkpoint = time.monotonic()
+            try:
+                await asyncio.to_thread(
+                    self.state_store.checkpoint,
+                    self.job_id,
+                    frontier=self._frontier_snapshot(),
+                    seen=seen,
+                    completed=completed,
+                    counters={
+                        "pages_crawled": len(self.crawled_pages),
+                        "successful_pages": sum(1 for r in self.crawled_pages if r.success),
+                        "seen_urls": len(self.visited_urls)
+                    },
+                    status=status
+                )
+            except Exception:
+                # Keep the journals for the next checkpoint
+                self._seen_journal[:0] = seen
+                self._completed_journal[:0] = completed
+                raise
+    
+    async def _maybe_checkpoint(self):
+        """Checkpoint if config.checkpoint_interval has elapsed"""
+        if self.state_store is None:
+            return
+        if time.monotonic() - self._last_checkpoint >= self.config.checkpoint_interval:
+            await self._checkpoint()
+    
+    async def _finish_job(self):
+        """Write the final checkpoint and mark the job completed"""
+        if self.state_store is not None:
+            await self._checkpoint(status="completed")
+    
+    def _build_page_result(self, url: str, html: str, title: str, status_code: int,
+                           depth: int, parent_url: str, start_time: float,
+                           content: str = None, fetch_tier: str = "browser") -> CrawlResult:
+        """Build a successful CrawlResult from fetched HTML"""
+        # Extract links for further crawling
+        links = self._extract_links_from_content(html, url)
+        
+        return CrawlResult(
+            url=url,
+            success=True,
+            content=content or html,
+            title=title,
+            links=links,
+            depth=depth,
+            parent_url=parent_url,
+            crawl_time=time.time() - start_time,
+            metadata={
+                'status_code': status_code,
+                'content_length': len(html) if html else 0,
+                'links_found': len(links),
+                'fetch_tier': fetch_tier
+            }
+        )
+    
+    def _extract_title(self, html: str) -> str:
+        """Extract the document title from raw HTML"""
+        match = re.search(r'<title[^>]*>(.*?)</title>', html or "", re.IGNORECASE | re.DOTALL)
+        return match.group(1).strip() if match else ""
+    
     def get_crawl_statistics(self) -> Dict[str, Any]:
         """
         Get statistics about the crawling operation
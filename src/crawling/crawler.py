@@ -5,10 +5,13 @@ This tool wraps Crawl4AI functionality and makes it available to the AI planner.
 """
 
 import asyncio
+import json
 import time
-from typing import Dict, Any, Optional, List
+from urllib.parse import urlparse
+from typing import Dict, Any, Optional, List, AsyncIterator
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from crawl4ai.extraction_strategy import LLMExtractionStrategy, CSSExtractionStrategy
+from crawl4ai.html2text import HTML2Text
 
 from ..registry import ai_tool, create_example, ToolExample
 from .deep_crawling.bfs_strategy import BFSDeepCrawlStrategy
@@ -20,10 +23,14 @@ from .deep_crawling.scorers import CommonScorers, ScoringEngine
 from .content_processing.filters import BM25ContentFilter, LLMContentFilter, PruningContentFilter, RelevantContentFilter, ContentFilterChain
 from .content_processing.chunking import RegexChunking, SemanticChunking, HierarchicalChunking
 from .content_processing.quality import ContentQualityAssessor, ContentEnhancer
-from .performance.dispatchers import MemoryAdaptiveDispatcher, SemaphoreDispatcher
-from .performance.rate_limiter import TokenBucketLimiter, AdaptiveRateLimiter
+from .performance.dispatchers import MemoryAdaptiveDispatcher, SemaphoreDispatcher, DispatcherConfig
 from .performance.proxy_manager import ProxyManager, RoundRobinProxyStrategy, WeightedProxyStrategy
 from .performance.monitor import CrawlerMonitor
+from .performance.browser_pool import get_browser_pool
+from .performance.fetch_tier import get_fetch_tier, FetchResult
+from .performance.host_scheduler import HostAwareScheduler, HostSchedulerConfig
+from .performance.rate_limiter import DistributedRateLimiter
+from .performance.result_sinks import ResultSink, JSONLFileSink
 
 
 @ai_tool(
@@ -74,7 +81,8 @@ async def crawl_web(
     wait_for: Optional[str] = None,
     screenshot: bool = False,
     proxy: Optional[str] = None,
-    headers: Optional[Dict[str, str]] = None
+    headers: Optional[Dict[str, str]] = None,
+    fetch_mode: str = "browser"
 ) -> Dict[str, Any]:
     """
     Crawl a web page and extract data using specified strategy
@@ -89,11 +97,26 @@ async def crawl_web(
         screenshot: Whether to take a screenshot
         proxy: Proxy URL to use
         headers: Custom headers to send
+        fetch_mode: 'browser' always renders, 'auto' tries plain HTTP first and
+            escalates to the browser when the page needs JavaScript (only when
+            js_render is False), 'http' never uses the browser
         
     Returns:
         Dictionary containing extracted data, metadata, and status
     """
     try:
+        # Try the lightweight HTTP tier unless browser-only features are requested
+        http_result = None
+        use_http = fetch_mode == "http" or (fetch_mode == "auto" and not js_render)
+        if use_http and not screenshot and not wait_for and strategy != "llm":
+            # An explicit 'http' request fetches even domains known to need the browser
+            http_result = await get_fetch_tier().fetch(
+                url, headers=headers, proxy=proxy, use_cached_decision=fetch_mode != "http"
+            )
+            
+            if fetch_mode == "http" or (http_result.success and not http_result.needs_browser):
+                return _build_http_crawl_result(url, http_result, strategy, css_selectors)
+        
         # Configure browser
         browser_config = BrowserConfig(
             headless=True,
@@ -138,14 +161,18 @@ async def crawl_web(
                 overlap=100
             )
         
-        # Perform crawl
-        async with AsyncWebCrawler(config=browser_config) as crawler:
+        # Perform crawl on a pooled browser
+        async with get_browser_pool().lease(browser_config) as crawler:
             result = await crawler.arun(
                 url=url,
                 config=crawler_config,
                 extraction_strategy=extraction_strategy
             )
             
+            # Learn whether the browser was actually needed for this domain
+            if http_result is not None and result.success:
+                get_fetch_tier().record_browser_outcome(url, http_result, result.html)
+            
             # Process results
             extracted_data = {}
             
@@ -157,7 +184,7 @@ async def crawl_web(
                     "content": result.markdown,
                     "title": result.metadata.get("title", ""),
                     "description": result.metadata.get("description", ""),
-                    "links": result.links[:20] if result.links else []
+                    "links": _first_links(result.links, 20)
                 }
             
             return {
@@ -169,7 +196,9 @@ async def crawl_web(
                     "description": result.metadata.get("description"),
                     "status_code": result.status_code,
                     "content_length": len(result.html) if result.html else 0,
-                    "extraction_strategy": strategy
+                    "extraction_strategy": strategy,
+                    "fetch_tier": "browser",
+                    "escalation_reason": http_result.reason if http_result else None
                 },
                 "screenshot": result.screenshot if screenshot else None,
                 "error": result.error_message if not result.success else None
@@ -185,6 +214,100 @@ async def crawl_web(
         }
 
 
+def _build_http_crawl_result(
+    url: str,
+    http_result: FetchResult,
+    strategy: str,
+    css_selectors: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """Build a crawl_web response from a page fetched by the HTTP tier"""
+    from ..parsed_page import ParsedPage
+    
+    if not http_result.success:
+        return {
+            "success": False,
+            "url": url,
+            "data": {},
+            "metadata": {
+                "status_code": http_result.status_code,
+                "fetch_tier": "http"
+            },
+            "error": http_result.error or f"HTTP {http_result.status_code}"
+        }
+    
+    page = ParsedPage(http_result.html, http_result.final_url or url)
+    title = page.title
+    description_tag = page.soup.find('meta', attrs={'name': 'description'})
+    description = description_tag.get('content', '') if description_tag else ""
+    
+    # Same shapes as the browser tier: extracted_content as a JSON string of
+    # items, markdown content and links grouped as internal/external dicts
+    extracted_data = {}
+    if strategy == "css" and css_selectors:
+        item = {}
+        for key, selector in css_selectors.items():
+            element = page.select_one(selector)
+            if element is not None:
+                item[key] = element.get_text(strip=True)
+        extracted_data = json.dumps([item], indent=4, default=str, ensure_ascii=False)
+    elif strategy == "auto":
+        converter = HTML2Text(baseurl=page.url or url)
+        converter.body_width = 0
+        extracted_data = {
+            "content": converter.handle(http_result.html),
+            "title": title,
+            "description": description,
+            "links": _first_links(_group_links(page), 20)
+        }
+    
+    return {
+        "success": True,
+        "url": url,
+        "data": extracted_data,
+        "metadata": {
+            "title": title,
+            "description": description,
+            "status_code": http_result.status_code,
+            "content_length": len(http_result.html),
+            "extraction_strategy": strategy,
+            "fetch_tier": "http",
+            "fetch_time": http_result.fetch_time,
+            "truncated": http_result.truncated
+        },
+        "screenshot": None,
+        "error": None
+    }
+
+
+def _group_links(page) -> Dict[str, List[Dict[str, str]]]:
+    """A page's links grouped like crawl4ai's CrawlResult.links"""
+    base_domain = urlparse(page.url or "").netloc.lower()
+    grouped = {"internal": [], "external": []}
+    seen = set()
+    for link in page.links:
+        href = link["url"]
+        if href in seen or not href.startswith(("http://", "https://")):
+            continue
+        seen.add(href)
+        domain = urlparse(href).netloc.lower()
+        grouped["internal" if domain == base_domain else "external"].append({
+            "href": href,
+            "text": link["text"],
+            "title": "",
+            "base_domain": domain
+        })
+    return grouped
+
+
+def _first_links(links: Any, limit: int) -> Any:
+    """At most ``limit`` links of each group (or of a flat list)"""
+    if not links:
+        return []
+    if isinstance(links, dict):
+        return {group: items[:limit] for group, items in links.items()}
+    return list(links)[:limit]
+
+
 @ai_tool(
     name="process_content_intelligently",
     description="Advanced content processing with filtering, chunking, and quality enhancement",
@@ -391,12 +514,17 @@ async def crawl_enterprise_scale(
     processing_strategy: str = "adaptive",
     max_concurrent: int = 20,
     rate_limit: float = 10.0,
+    max_concurrent_per_host: int = 4,
     use_proxies: bool = False,
     proxy_rotation: str = "round_robin",
     monitoring_enabled: bool = True,
     extraction_strategy: str = "auto",
     css_selectors: Optional[Dict[str, str]] = None,
-    extraction_prompt: Optional[str] = None
+    extraction_prompt: Optional[str] = None,
+    output_jsonl: Optional[str] = None,
+    rate_limiter: Optional[DistributedRateLimiter] = None,
+    js_render: bool = True,
+    fetch_mode: str = "browser"
 ) -> Dict[str, Any]:
     """
     Perform enterprise-scale crawling with advanced performance management
@@ -405,13 +533,21 @@ async def crawl_enterprise_scale(
         urls: List of URLs to crawl (supports 1000+ URLs)
         processing_strategy: Strategy (adaptive, high_volume, balanced, quality_focused)
         max_concurrent: Maximum concurrent requests
-        rate_limit: Requests per second limit
+        rate_limit: Requests per second limit for each host
+        max_concurrent_per_host: Maximum concurrent requests to a single host
         use_proxies: Whether to use proxy rotation
         proxy_rotation: Proxy strategy (round_robin, weighted, failover)
         monitoring_enabled: Enable real-time monitoring
         extraction_strategy: Content extraction method
         css_selectors: CSS selectors for extraction
         extraction_prompt: LLM extraction prompt
+        output_jsonl: Stream full results to this JSON Lines file instead of
+            returning them, keeping memory flat for very large jobs
+        rate_limiter: Shared limiter that enforces global and per-host budgets
+            across every replica crawling the same sites
+        js_render: Whether to render JavaScript (see crawl_web)
+        fetch_mode: 'browser', 'auto' or 'http' (see crawl_web); 'auto' with
+            js_render=False keeps static pages off the browser
         
     Returns:
         Dictionary with enterprise crawling results and analytics
@@ -425,29 +561,217 @@ async def crawl_enterprise_scale(
                 "analytics": {}
             }
         
-        start_time = time.time()
+        run = _EnterpriseCrawlRun(
+            urls=urls,
+            processing_strategy=processing_strategy,
+            max_concurrent=max_concurrent,
+            rate_limit=rate_limit,
+            max_concurrent_per_host=max_concurrent_per_host,
+            use_proxies=use_proxies,
+            proxy_rotation=proxy_rotation,
+            monitoring_enabled=monitoring_enabled,
+            extraction_strategy=extraction_strategy,
+            css_selectors=css_selectors,
+            extraction_prompt=extraction_prompt,
+            rate_limiter=rate_limiter,
+            js_render=js_render,
+            fetch_mode=fetch_mode
+        )
+        
+        sink = JSONLFileSink(output_jsonl) if output_jsonl else None
+        results_dict = {}
+        
+        await run.start()
+        try:
+            async for result in run.stream():
+                if sink:
+                    await sink.write(result)
+                    # Keep only a small status record per URL
+                    results_dict[result.get("url")] = {
+                        "success": result.get("success", False),
+                        "error": result.get("error")
+                    }
+                else:
+                    results_dict[result.get("url")] = result
+        finally:
+            analytics = await run.stop()
+            if sink:
+                await sink.close()
+        
+        # Results arrive in completion order; flag anything that never finished
+        for url in urls:
+            if url not in results_dict:
+                results_dict[url] = {
+                    "success": False,
+                    "error": "Crawl task did not complete"
+                }
+        
+        return {
+            "success": run.successful > 0,
+            "results": results_dict,
+            "analytics": analytics,
+            "performance_insights": {
+                "optimal_concurrency": analytics["dispatcher_stats"].get("current_concurrency", run.max_concurrent),
+                "rate_limit_effectiveness": analytics["rate_limiter_stats"].get("success_rate", 1.0),
+                "recommended_batch_size": min(len(urls), run.max_concurrent * 5),
+                "scaling_recommendation": "increase_concurrency" if analytics["success_rate"] > 0.95 else "optimize_reliability"
+            },
+            "metadata": {
+                "processing_strategy": processing_strategy,
+                "max_concurrent": run.max_concurrent,
+                "rate_limit": rate_limit,
+                "max_concurrent_per_host": max_concurrent_per_host,
+                "proxy_rotation": proxy_rotation if use_proxies else None,
+                "monitoring_enabled": monitoring_enabled,
+                "output_jsonl": output_jsonl
+            }
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "results": {},
+            "analytics": {}
+        }
+
+
+async def crawl_enterprise_scale_stream(
+    urls: List[str],
+    processing_strategy: str = "adaptive",
+    max_concurrent: int = 20,
+    rate_limit: float = 10.0,
+    max_concurrent_per_host: int = 4,
+    use_proxies: bool = False,
+    proxy_rotation: str = "round_robin",
+    monitoring_enabled: bool = False,
+    extraction_strategy: str = "auto",
+    css_selectors: Optional[Dict[str, str]] = None,
+    extraction_prompt: Optional[str] = None,
+    sink: Optional[ResultSink] = None,
+    max_in_flight: Optional[int] = None,
+    rate_limiter: Optional[DistributedRateLimiter] = None,
+    js_render: bool = True,
+    fetch_mode: str = "browser"
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of crawl_enterprise_scale
+    
+    Yields each crawl_web result as soon as it completes. At most
+    ``max_in_flight`` crawls run at once and a new crawl only starts after
+    the consumer takes a result, so memory stays flat regardless of how many
+    URLs are submitted. If a sink is given, every result is written to it
+    before being yielded.
+    
+    Usage:
+        async for result in crawl_enterprise_scale_stream(urls, sink=JSONLFileSink("out.jsonl")):
+            print(result["url"], result["success"])
+    """
+    if not urls:
+        return
+    
+    run = _EnterpriseCrawlRun(
+        urls=urls,
+        processing_strategy=processing_strategy,
+        max_concurrent=max_concurrent,
+        rate_limit=rate_limit,
+        max_concurrent_per_host=max_concurrent_per_host,
+        use_proxies=use_proxies,
+        proxy_rotation=proxy_rotation,
+        monitoring_enabled=monitoring_enabled,
+        extraction_strategy=extraction_strategy,
+        css_selectors=css_selectors,
+        extraction_prompt=extraction_prompt,
+        rate_limiter=rate_limiter,
+        js_render=js_render,
+        fetch_mode=fetch_mode
+    )
+    
+    await run.start()
+    try:
+        async for result in run.stream(max_in_flight):
+            if sink:
+                await sink.write(result)
+            yield result
+    finally:
+        await run.stop()
+        if sink:
+            await sink.close()
+
+
+class _EnterpriseCrawlRun:
+    """Shared setup, per-URL crawling and analytics for enterprise-scale crawls"""
+    
+    def __init__(
+        self,
+        urls: List[str],
+        processing_strategy: str,
+        max_concurrent: int,
+        rate_limit: float,
+        max_concurrent_per_host: int,
+        use_proxies: bool,
+        proxy_rotation: str,
+        monitoring_enabled: bool,
+        extraction_strategy: str,
+        css_selectors: Optional[Dict[str, str]],
+        extraction_prompt: Optional[str],
+        rate_limiter: Optional[DistributedRateLimiter] = None,
+        js_render: bool = True,
+        fetch_mode: str = "browser"
+    ):
+        self.urls = urls
+        self.processing_strategy = processing_strategy
+        self.max_concurrent = max_concurrent
+        self.rate_limit = rate_limit
+        self.use_proxies = use_proxies
+        self.proxy_rotation = proxy_rotation
+        self.monitoring_enabled = monitoring_enabled
+        self.extraction_strategy = extraction_strategy
+        self.css_selectors = css_selectors
+        self.extraction_prompt = extraction_prompt
+        self.js_render = js_render
+        self.fetch_mode = fetch_mode
         
         # Configure strategy-specific settings
+        if processing_strategy == "high_volume":
+            self.max_concurrent = min(max_concurrent * 2, 50)  # Increase for high volume
+        
+        dispatcher_config = DispatcherConfig(max_concurrent=self.max_concurrent)
         if processing_strategy == "adaptive":
-            dispatcher = MemoryAdaptiveDispatcher()
-            rate_limiter = AdaptiveRateLimiter()
-        elif processing_strategy == "high_volume":
-            dispatcher = SemaphoreDispatcher()
-            rate_limiter = TokenBucketLimiter()
-            max_concurrent = min(max_concurrent * 2, 50)  # Increase for high volume
-        else:  # balanced, quality_focused
-            dispatcher = SemaphoreDispatcher()
-            rate_limiter = TokenBucketLimiter()
+            self.dispatcher = MemoryAdaptiveDispatcher(dispatcher_config)
+        else:  # high_volume, balanced, quality_focused
+            self.dispatcher = SemaphoreDispatcher(dispatcher_config)
+        
+        # Per-host politeness: each host gets its own bucket, concurrency cap
+        # and adaptive rate, so slow hosts don't hold back fast ones
+        self.scheduler = HostAwareScheduler(HostSchedulerConfig(
+            requests_per_second=rate_limit,
+            burst_size=max(1, int(rate_limit * 2)),
+            max_concurrent_per_host=max_concurrent_per_host,
+            adaptive=processing_strategy != "quality_focused",
+            max_requests_per_second=rate_limit * 2
+        ), rate_limiter=rate_limiter)
+        
+        self.monitor = None
+        self.proxy_manager = None
+        
+        # Running counters instead of retained result lists
+        self.successful = 0
+        self.failed = 0
+        self.start_time = 0.0
+    
+    async def start(self):
+        """Start monitoring, proxies and queue the URLs"""
+        self.start_time = time.time()
+        self.scheduler.add_urls(self.urls)
         
         # Initialize monitoring if enabled
-        monitor = None
-        if monitoring_enabled:
-            monitor = CrawlerMonitor()
-            await monitor.start()
+        if self.monitoring_enabled:
+            self.monitor = CrawlerMonitor()
+            await self.monitor.start()
         
         # Initialize proxy manager if needed
-        proxy_manager = None
-        if use_proxies:
+        if self.use_proxies:
             # Mock proxy configuration - in production, load from config
             from .performance.proxy_manager import ProxyConfig
             mock_proxies = [
@@ -462,154 +786,137 @@ async def crawl_enterprise_scale(
                 "failover": RoundRobinProxyStrategy()  # Simplified
             }
             
-            proxy_manager = ProxyManager(
+            self.proxy_manager = ProxyManager(
                 proxies=mock_proxies,
-                strategy=strategy_map.get(proxy_rotation, RoundRobinProxyStrategy())
+                strategy=strategy_map.get(self.proxy_rotation, RoundRobinProxyStrategy())
             )
-            await proxy_manager.start()
-        
-        # Create crawling tasks
-        async def crawl_with_enterprise_features(url: str):
-            task_start = time.time()
+            await self.proxy_manager.start()
+    
+    async def stream(self, max_in_flight: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield results in completion order with bounded in-flight work"""
+        # One lazily created task slot per URL; each slot pulls whichever URL is ready next
+        tasks = (self.crawl_next for _ in range(len(self.urls)))
+        
+        async for result in self.dispatcher.dispatch_iter(tasks, max_in_flight=max_in_flight):
+            if result is None:
+                continue
+            if isinstance(result, Exception):
+                self.failed += 1
+                continue
+            if result.get("success", False):
+                self.successful += 1
+            else:
+                self.failed += 1
+            yield result
+    
+    async def crawl_next(self) -> Optional[Dict[str, Any]]:
+        """Crawl the next URL whose host is ready"""
+        url = await self.scheduler.next_url()
+        if url is None:
+            return None
+        
+        task_start = time.time()
+        proxy_config = None
+        
+        try:
+            # Get proxy if available
+            proxy = None
+            if self.proxy_manager:
+                proxy_config = self.proxy_manager.get_proxy()
+                if proxy_config:
+                    proxy = proxy_config.url
             
-            try:
-                # Rate limiting
-                await rate_limiter.wait_for_tokens(1)
-                
-                # Get proxy if available
-                proxy = None
-                if proxy_manager:
-                    proxy_config = proxy_manager.get_proxy()
-                    if proxy_config:
-                        proxy = proxy_config.url
-                
-                # Record crawler start
-                if monitor:
-                    monitor.record_crawler_start()
-                
-                # Perform crawl
-                result = await crawl_web(
-                    url=url,
-                    strategy=extraction_strategy,
-                    css_selectors=css_selectors,
-                    extraction_prompt=extraction_prompt,
-                    proxy=proxy
+            # Record crawler start
+            if self.monitor:
+                self.monitor.record_crawler_start()
+            
+            # Perform crawl
+            result = await crawl_web(
+                url=url,
+                strategy=self.extraction_strategy,
+                css_selectors=self.css_selectors,
+                extraction_prompt=self.extraction_prompt,
+                js_render=self.js_render,
+                proxy=proxy,
+                fetch_mode=self.fetch_mode
+            )
+            
+            task_time = time.time() - task_start
+            
+            # Record results
+            if self.monitor:
+                self.monitor.record_request(
+                    success=result.get("success", False),
+                    response_time=task_time,
+                    bytes_downloaded=result.get("metadata", {}).get("content_length", 0)
                 )
-                
-                task_time = time.time() - task_start
-                
-                # Record results
-                if monitor:
-                    monitor.record_request(
-                        success=result.get("success", False),
-                        response_time=task_time,
-                        bytes_downloaded=result.get("metadata", {}).get("content_length", 0)
-                    )
-                    monitor.record_page_processed()
-                    monitor.record_crawler_stop()
-                
-                # Record proxy usage
-                if proxy_manager and proxy_config:
-                    proxy_manager.record_usage(
-                        proxy_config,
-                        result.get("success", False),
-                        task_time
-                    )
-                
-                # Record rate limiter result
-                if hasattr(rate_limiter, 'record_success'):
-                    rate_limiter.record_success(result.get("success", False))
-                
-                return result
-                
-            except Exception as e:
-                task_time = time.time() - task_start
-                
-                if monitor:
-                    monitor.record_request(False, task_time, 0)
-                    monitor.record_crawler_stop()
-                
-                if proxy_manager and proxy_config:
-                    proxy_manager.record_usage(proxy_config, False, task_time)
-                
-                return {
-                    "success": False,
-                    "url": url,
-                    "error": str(e),
-                    "metadata": {"task_time": task_time}
-                }
-        
-        # Create task functions
-        tasks = [lambda u=url: crawl_with_enterprise_features(u) for url in urls]
-        
-        # Execute with dispatcher
-        results = await dispatcher.dispatch(tasks)
-        
-        execution_time = time.time() - start_time
-        
-        # Organize results
-        successful_results = [r for r in results if isinstance(r, dict) and r.get("success", False)]
-        failed_results = [r for r in results if isinstance(r, dict) and not r.get("success", False)]
-        error_results = [r for r in results if isinstance(r, Exception)]
+                self.monitor.record_page_processed()
+                self.monitor.record_crawler_stop()
+            
+            # Record proxy usage
+            if self.proxy_manager and proxy_config:
+                self.proxy_manager.record_usage(
+                    proxy_config,
+                    result.get("success", False),
+                    task_time
+                )
+            
+            # Feed the host's own outcome back into its rate
+            self.scheduler.release(
+                url,
+                success=result.get("success", False),
+                status_code=result.get("metadata", {}).get("status_code"),
+                latency=task_time
+            )
+            
+            return result
+            
+        except Exception as e:
+            task_time = time.time() - task_start
+            
+            if self.monitor:
+                self.monitor.record_request(False, task_time, 0)
+                self.monitor.record_crawler_stop()
+            
+            if self.proxy_manager and proxy_config:
+                self.proxy_manager.record_usage(proxy_config, False, task_time)
+            
+            self.scheduler.release(url, success=False, latency=task_time)
+            
+            return {
+                "success": False,
+                "url": url,
+                "error": str(e),
+                "metadata": {"task_time": task_time}
+            }
+    
+    async def stop(self) -> Dict[str, Any]:
+        """Stop background services and return analytics"""
+        self.scheduler.close()
+        execution_time = time.time() - self.start_time
+        processed = self.successful + self.failed
         
-        # Collect analytics
         analytics = {
             "execution_time": execution_time,
-            "total_urls": len(urls),
-            "successful_crawls": len(successful_results),
-            "failed_crawls": len(failed_results) + len(error_results),
-            "success_rate": len(successful_results) / len(urls) if urls else 0,
-            "avg_requests_per_second": len(urls) / execution_time if execution_time > 0 else 0,
-            "processing_strategy": processing_strategy,
-            "dispatcher_stats": dispatcher.get_statistics(),
-            "rate_limiter_stats": rate_limiter.get_statistics()
+            "total_urls": len(self.urls),
+            "successful_crawls": self.successful,
+            "failed_crawls": self.failed,
+            "success_rate": self.successful / len(self.urls) if self.urls else 0,
+            "avg_requests_per_second": processed / execution_time if execution_time > 0 else 0,
+            "processing_strategy": self.processing_strategy,
+            "dispatcher_stats": self.dispatcher.get_statistics(),
+            "rate_limiter_stats": self.scheduler.get_statistics()
         }
         
-        if proxy_manager:
-            analytics["proxy_stats"] = proxy_manager.get_statistics()
-            await proxy_manager.stop()
+        if self.proxy_manager:
+            analytics["proxy_stats"] = self.proxy_manager.get_statistics()
+            await self.proxy_manager.stop()
         
-        if monitor:
-            analytics["monitoring_data"] = monitor.get_dashboard_data()
-            await monitor.stop()
-        
-        # Format results for return
-        results_dict = {}
-        for i, (url, result) in enumerate(zip(urls, results)):
-            if isinstance(result, Exception):
-                results_dict[url] = {
-                    "success": False,
-                    "error": str(result)
-                }
-            else:
-                results_dict[url] = result
+        if self.monitor:
+            analytics["monitoring_data"] = self.monitor.get_dashboard_data()
+            await self.monitor.stop()
         
-        return {
-            "success": len(successful_results) > 0,
-            "results": results_dict,
-            "analytics": analytics,
-            "performance_insights": {
-                "optimal_concurrency": analytics["dispatcher_stats"].get("current_concurrency", max_concurrent),
-                "rate_limit_effectiveness": analytics["rate_limiter_stats"].get("success_rate", 1.0),
-                "recommended_batch_size": min(len(urls), max_concurrent * 5),
-                "scaling_recommendation": "increase_concurrency" if analytics["success_rate"] > 0.95 else "optimize_reliability"
-            },
-            "metadata": {
-                "processing_strategy": processing_strategy,
-                "max_concurrent": max_concurrent,
-                "rate_limit": rate_limit,
-                "proxy_rotation": proxy_rotation if use_proxies else None,
-                "monitoring_enabled": monitoring_enabled
-            }
-        }
-        
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "results": {},
-            "analytics": {}
-        }
+        return analytics
 
 
 # NEW: Deep Crawling Capabilities
@@ -658,7 +965,9 @@ async def deep_crawl_bfs(
     include_patterns: Optional[List[str]] = None,
     exclude_patterns: Optional[List[str]] = None,
     allowed_domains: Optional[List[str]] = None,
-    delay_between_requests: float = 1.0
+    delay_between_requests: float = 1.0,
+    state_path: Optional[str] = None,
+    resume_job_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Perform deep crawling using BFS strategy to discover and explore websites
@@ -673,10 +982,13 @@ async def deep_crawl_bfs(
         exclude_patterns: URL patterns to exclude (e.g., ["*/admin*", "*/api/*"])
         allowed_domains: Restrict crawling to specific domains
         delay_between_requests: Delay between requests in seconds
+        state_path: SQLite file to checkpoint crawl progress to, enabling resume
+        resume_job_id: Resume this checkpointed job instead of starting a new crawl
         
     Returns:
         Dictionary with discovered pages, site map, and crawling statistics
     """
+    crawler = None
     try:
         # Configure deep crawling
         config = DeepCrawlConfig(
@@ -686,7 +998,8 @@ async def deep_crawl_bfs(
             delay_between_requests=delay_between_requests,
             include_patterns=include_patterns or [],
             exclude_patterns=exclude_patterns or [],
-            allowed_domains=allowed_domains or []
+            allowed_domains=allowed_domains or [],
+            state_path=state_path
         )
         
         # Set up URL filtering based on purpose
@@ -729,8 +1042,11 @@ async def deep_crawl_bfs(
         
         crawler._should_crawl_url = enhanced_should_crawl
         
-        # Perform deep crawling
-        crawl_results = await crawler.crawl(starting_url)
+        # Perform deep crawling, or pick up a checkpointed job
+        if resume_job_id:
+            crawl_results = await crawler.resume(resume_job_id)
+        else:
+            crawl_results = await crawler.crawl(starting_url)
         
         # Generate comprehensive results
         site_map = crawler.get_site_map()
@@ -792,7 +1108,8 @@ async def deep_crawl_bfs(
                     "purpose": purpose
                 },
                 "execution_time": sum(r.crawl_time for r in crawl_results),
-                "total_requests": len(crawl_results)
+                "total_requests": len(crawl_results),
+                "job_id": crawler.job_id
             }
         }
         
@@ -803,6 +1120,10 @@ async def deep_crawl_bfs(
             "error": str(e),
             "purpose": purpose
         }
+    finally:
+        # Release the checkpoint database and spill store once results are built
+        if crawler is not None:
+            crawler.close()
 
 
 @ai_tool(
@@ -845,7 +1166,9 @@ async def deep_crawl_dfs(
     max_concurrent: int = 8,
     include_patterns: Optional[List[str]] = None,
     exclude_patterns: Optional[List[str]] = None,
-    focus_strategy: str = "depth"  # "depth" or "quality"
+    focus_strategy: str = "depth",  # "depth" or "quality"
+    state_path: Optional[str] = None,
+    resume_job_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Perform deep crawling using DFS strategy for thorough exploration
@@ -859,10 +1182,13 @@ async def deep_crawl_dfs(
         include_patterns: URL patterns to include
         exclude_patterns: URL patterns to exclude
         focus_strategy: "depth" for maximum depth, "quality" for balanced approach
+        state_path: SQLite file to checkpoint crawl progress to, enabling resume
+        resume_job_id: Resume this checkpointed job instead of starting a new crawl
         
     Returns:
         Dictionary with deep exploration results and path analysis
     """
+    crawler = None
     try:
         # Configure for deep exploration
         if focus_strategy == "depth":
@@ -872,7 +1198,8 @@ async def deep_crawl_dfs(
                 max_concurrent=max_concurrent,
                 delay_between_requests=0.8,  # Slightly faster for deep exploration
                 include_patterns=include_patterns or [],
-                exclude_patterns=exclude_patterns or []
+                exclude_patterns=exclude_patterns or [],
+                state_path=state_path
             )
         else:  # quality focus
             config = DeepCrawlConfig(
@@ -881,7 +1208,8 @@ async def deep_crawl_dfs(
                 max_concurrent=max_concurrent + 2,  # More concurrent for efficiency
                 delay_between_requests=1.0,
                 include_patterns=include_patterns or [],
-                exclude_patterns=exclude_patterns or []
+                exclude_patterns=exclude_patterns or [],
+                state_path=state_path
             )
         
         # Set up filtering based on purpose
@@ -906,8 +1234,11 @@ async def deep_crawl_dfs(
         
         crawler._should_crawl_url = enhanced_should_crawl
         
-        # Perform deep crawling
-        crawl_results = await crawler.crawl(starting_url)
+        # Perform deep crawling, or pick up a checkpointed job
+        if resume_job_id:
+            crawl_results = await crawler.resume(resume_job_id)
+        else:
+            crawl_results = await crawler.crawl(starting_url)
         
         # Get DFS-specific analysis
         dfs_statistics = crawler.get_dfs_statistics()
@@ -925,6 +1256,7 @@ async def deep_crawl_dfs(
             "purpose": purpose,
             "strategy": "depth_first_search",
             "focus_strategy": focus_strategy,
+            "job_id": crawler.job_id,
             "discovered_pages": {
                 "successful": [
                     {
@@ -974,6 +1306,10 @@ async def deep_crawl_dfs(
             "error": str(e),
             "strategy": "depth_first_search"
         }
+    finally:
+        # Release the checkpoint database and spill store once results are built
+        if crawler is not None:
+            crawler.close()
 
 
 @ai_tool(
@@ -1201,7 +1537,9 @@ async def deep_crawl_bfs(
     include_patterns: Optional[List[str]] = None,
     exclude_patterns: Optional[List[str]] = None,
     allowed_domains: Optional[List[str]] = None,
-    delay_between_requests: float = 1.0
+    delay_between_requests: float = 1.0,
+    state_path: Optional[str] = None,
+    resume_job_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Perform deep crawling using BFS strategy to discover and explore websites
@@ -1216,10 +1554,13 @@ async def deep_crawl_bfs(
         exclude_patterns: URL patterns to exclude (e.g., ["*/admin*", "*/api/*"])
         allowed_domains: Restrict crawling to specific domains
         delay_between_requests: Delay between requests in seconds
+        state_path: SQLite file to checkpoint crawl progress to, enabling resume
+        resume_job_id: Resume this checkpointed job instead of starting a new crawl
         
     Returns:
         Dictionary with discovered pages, site map, and crawling statistics
     """
+    crawler = None
     try:
         # Configure deep crawling
         config = DeepCrawlConfig(
@@ -1229,7 +1570,8 @@ async def deep_crawl_bfs(
             delay_between_requests=delay_between_requests,
             include_patterns=include_patterns or [],
             exclude_patterns=exclude_patterns or [],
-            allowed_domains=allowed_domains or []
+            allowed_domains=allowed_domains or [],
+            state_path=state_path
         )
         
         # Set up URL filtering based on purpose
@@ -1272,8 +1614,11 @@ async def deep_crawl_bfs(
         
         crawler._should_crawl_url = enhanced_should_crawl
         
-        # Perform deep crawling
-        crawl_results = await crawler.crawl(starting_url)
+        # Perform deep crawling, or pick up a checkpointed job
+        if resume_job_id:
+            crawl_results = await crawler.resume(resume_job_id)
+        else:
+            crawl_results = await crawler.crawl(starting_url)
         
         # Generate comprehensive results
         site_map = crawler.get_site_map()
@@ -1335,7 +1680,8 @@ async def deep_crawl_bfs(
                     "purpose": purpose
                 },
                 "execution_time": sum(r.crawl_time for r in crawl_results),
-                "total_requests": len(crawl_results)
+                "total_requests": len(crawl_results),
+                "job_id": crawler.job_id
             }
         }
         
@@ -1346,6 +1692,10 @@ async def deep_crawl_bfs(
             "error": str(e),
             "purpose": purpose
         }
+    finally:
+        # Release the checkpoint database and spill store once results are built
+        if crawler is not None:
+            crawler.close()
 
 
 @ai_tool(
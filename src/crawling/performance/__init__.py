@@ -12,7 +12,13 @@ from .dispatchers import (
 from .rate_limiter import (
     RateLimiter,
     TokenBucketLimiter,
-    SlidingWindowLimiter
+    SlidingWindowLimiter,
+    DistributedRateLimiter,
+    DistributedRateLimitConfig,
+    RateLimitBackend,
+    InMemoryRateLimitBackend,
+    SQLiteRateLimitBackend,
+    RedisRateLimitBackend
 )
 
 from .proxy_manager import (
@@ -28,6 +34,52 @@ from .monitor import (
     ResourceTracker
 )
 
+from .browser_pool import (
+    BrowserPool,
+    BrowserPoolConfig,
+    get_browser_pool,
+    retain_browser_pool,
+    release_browser_pool,
+    close_browser_pool
+)
+
+from .fetch_tier import (
+    FetchTierEngine,
+    FetchTierConfig,
+    FetchResult,
+    get_fetch_tier,
+    retain_fetch_tier,
+    release_fetch_tier,
+    close_fetch_tier
+)
+
+from .host_scheduler import (
+    HostAwareScheduler,
+    HostSchedulerConfig
+)
+
+from .result_sinks import (
+    ResultSink,
+    JSONLFileSink,
+    CallbackSink,
+    ExternalAPISink,
+    MultiSink
+)
+
+from .crawl_store import (
+    SeenStore,
+    ExactSeenStore,
+    FingerprintSeenStore,
+    ScalableBloomFilterSeenStore,
+    ContentSpillStore,
+    create_seen_store
+)
+
+from .crawl_state import (
+    CrawlStateStore,
+    FrontierEntry
+)
+
 __all__ = [
     "MemoryAdaptiveDispatcher",
     "SemaphoreDispatcher", 
@@ -35,11 +87,45 @@ __all__ = [
     "RateLimiter",
     "TokenBucketLimiter",
     "SlidingWindowLimiter",
+    "DistributedRateLimiter",
+    "DistributedRateLimitConfig",
+    "RateLimitBackend",
+    "InMemoryRateLimitBackend",
+    "SQLiteRateLimitBackend",
+    "RedisRateLimitBackend",
     "ProxyRotationStrategy",
     "RoundRobinProxyStrategy",
     "ProxyConfig",
     "ProxyManager",
     "CrawlerMonitor",
     "PerformanceMetrics",
-    "ResourceTracker"
+    "ResourceTracker",
+    "BrowserPool",
+    "BrowserPoolConfig",
+    "get_browser_pool",
+    "retain_browser_pool",
+    "release_browser_pool",
+    "close_browser_pool",
+    "FetchTierEngine",
+    "FetchTierConfig",
+    "FetchResult",
+    "get_fetch_tier",
+    "retain_fetch_tier",
+    "release_fetch_tier",
+    "close_fetch_tier",
+    "HostAwareScheduler",
+    "HostSchedulerConfig",
+    "ResultSink",
+    "JSONLFileSink",
+    "CallbackSink",
+    "ExternalAPISink",
+    "MultiSink",
+    "SeenStore",
+    "ExactSeenStore",
+    "FingerprintSeenStore",
+    "ScalableBloomFilterSeenStore",
+    "ContentSpillStore",
+    "create_seen_store",
+    "CrawlStateStore",
+    "FrontierEntry"
 ]
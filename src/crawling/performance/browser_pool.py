@@ -0,0 +1,414 @@
+"""
+Shared Browser Pool
+Process-wide, size-bounded pool of AsyncWebCrawler instances with lease/return semantics
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, AsyncIterator
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BrowserPoolConfig:
+    """Configuration for the browser pool"""
+    max_browsers: int = 4
+    max_leases_per_browser: int = 5
+    max_pages_per_browser: int = 200
+    max_idle_seconds: float = 300.0
+    lease_timeout: float = 60.0
+    health_check_interval: float = 30.0
+    stop_timeout: float = 60.0  # Wait for active leases to be returned before closing
+
+
+@dataclass
+class PooledBrowser:
+    """A started crawler owned by the pool"""
+    key: str
+    crawler: Any
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    pages_served: int = 0
+    active_leases: int = 0
+    healthy: bool = True
+    retiring: bool = False
+
+    @property
+    def idle_seconds(self) -> float:
+        """Seconds since the browser was last returned"""
+        if self.active_leases > 0:
+            return 0.0
+        return time.time() - self.last_used
+
+
+class BrowserPool:
+    """
+    Pool of started AsyncWebCrawler instances keyed by BrowserConfig
+
+    Crawlers are leased for a single page (or a short sequence of pages) and
+    returned afterwards. Each browser can serve several concurrent leases,
+    is recycled after ``max_pages_per_browser`` pages and is replaced when a
+    health check or a lease reports it as broken.
+    """
+
+    def __init__(self, config: BrowserPoolConfig = None):
+        self.config = config or BrowserPoolConfig()
+        self._browsers: Dict[str, List[PooledBrowser]] = {}
+        self._starting = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._health_check_task: Optional[asyncio.Task] = None
+        self._closing_tasks: set = set()  # Closes of evicted browsers
+        self._running = False
+        self._stopping = False
+
+        # Statistics
+        self.browsers_started = 0
+        self.browsers_recycled = 0
+        self.total_leases = 0
+        self.lease_wait_time = 0.0
+
+    async def start(self):
+        """Start background health checking"""
+        if self._running:
+            return
+        self._running = True
+        self._health_check_task = asyncio.create_task(self._health_monitor())
+        logger.info(f"BrowserPool started (max {self.config.max_browsers} browsers)")
+
+    async def stop(self):
+        """
+        Stop health checking and close every pooled browser
+
+        New leases are refused while stopping, and browsers are only closed
+        once their active leases are returned (or ``stop_timeout`` passes).
+        """
+        condition = self._get_condition()
+        async with condition:
+            self._stopping = True
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: self._starting == 0 and self._active_leases() == 0),
+                    timeout=self.config.stop_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"BrowserPool stopping with {self._active_leases()} leases still active")
+
+        self._running = False
+        if self._health_check_task:
+            self._health_check_task.cancel()
+            try:
+                await self._health_check_task
+            except asyncio.CancelledError:
+                pass
+            self._health_check_task = None
+
+        browsers = [b for group in self._browsers.values() for b in group]
+        self._browsers.clear()
+        for browser in browsers:
+            await self._close_browser(browser)
+        if self._closing_tasks:
+            await asyncio.gather(*self._closing_tasks, return_exceptions=True)
+        self._stopping = False
+        logger.info("BrowserPool stopped")
+
+    @asynccontextmanager
+    async def lease(self, browser_config: Any = None) -> AsyncIterator[Any]:
+        """
+        Lease a started crawler for the given BrowserConfig
+
+        Usage:
+            async with pool.lease(browser_config) as crawler:
+                result = await crawler.arun(url=url, config=run_config)
+        """
+        pooled = await self.acquire(browser_config)
+        healthy = True
+        try:
+            yield pooled.crawler
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # arun reports page-level failures through result.success, so an
+            # exception escaping the lease usually means the browser is broken
+            healthy = False
+            raise
+        finally:
+            await self.release(pooled, healthy=healthy)
+
+    async def acquire(self, browser_config: Any = None) -> PooledBrowser:
+        """Acquire a pooled browser, starting one if the pool has capacity"""
+        if self._stopping:
+            raise RuntimeError("BrowserPool is stopping")
+        if not self._running:
+            await self.start()
+
+        key = self._config_key(browser_config)
+        condition = self._get_condition()
+        wait_start = time.time()
+        deadline = wait_start + self.config.lease_timeout
+
+        async with condition:
+            while True:
+                if self._stopping:
+                    raise RuntimeError("BrowserPool is stopping")
+                pooled = self._find_available(key)
+                if pooled:
+                    pooled.active_leases += 1
+                    self.total_leases += 1
+                    self.lease_wait_time += time.time() - wait_start
+                    return pooled
+
+                if self._total_browsers() + self._starting >= self.config.max_browsers:
+                    self._evict_idle(exclude_key=key)
+
+                if self._total_browsers() + self._starting < self.config.max_browsers:
+                    self._starting += 1
+                    break
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Timed out after {self.config.lease_timeout}s waiting for a pooled browser"
+                    )
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    continue
+
+        # Start the new browser outside the lock so other leases are not blocked
+        try:
+            crawler = await self._start_crawler(browser_config)
+        except Exception:
+            async with condition:
+                self._starting -= 1
+                condition.notify_all()
+            raise
+
+        async with condition:
+            self._starting -= 1
+            pooled = PooledBrowser(key=key, crawler=crawler, active_leases=1)
+            self._browsers.setdefault(key, []).append(pooled)
+            self.browsers_started += 1
+            self.total_leases += 1
+            self.lease_wait_time += time.time() - wait_start
+            return pooled
+
+    async def release(self, pooled: PooledBrowser, healthy: bool = True):
+        """Return a leased browser to the pool"""
+        condition = self._get_condition()
+        to_close = None
+
+        async with condition:
+            pooled.active_leases = max(0, pooled.active_leases - 1)
+            pooled.pages_served += 1
+            pooled.last_used = time.time()
+
+            if not healthy:
+                pooled.healthy = False
+            if not pooled.healthy or pooled.pages_served >= self.config.max_pages_per_browser:
+                pooled.retiring = True
+
+            if pooled.retiring and pooled.active_leases == 0:
+                self._remove(pooled)
+                to_close = pooled
+
+            condition.notify_all()
+
+        if to_close:
+            self.browsers_recycled += 1
+            await self._close_browser(to_close)
+
+    def _find_available(self, key: str) -> Optional[PooledBrowser]:
+        """Find the least loaded usable browser for a key"""
+        candidates = [
+            b for b in self._browsers.get(key, [])
+            if b.healthy and not b.retiring and b.active_leases < self.config.max_leases_per_browser
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda b: b.active_leases)
+
+    def _evict_idle(self, exclude_key: str = None):
+        """Retire the longest-idle browser of another key to make room"""
+        idle = [
+            b for key, group in self._browsers.items() if key != exclude_key
+            for b in group if b.active_leases == 0
+        ]
+        if not idle:
+            return
+        victim = max(idle, key=lambda b: b.idle_seconds)
+        self._remove(victim)
+        self.browsers_recycled += 1
+        task = asyncio.create_task(self._close_browser(victim))
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    def _remove(self, pooled: PooledBrowser):
+        """Remove a browser from the pool bookkeeping"""
+        group = self._browsers.get(pooled.key, [])
+        if pooled in group:
+            group.remove(pooled)
+        if not group:
+            self._browsers.pop(pooled.key, None)
+
+    def _active_leases(self) -> int:
+        """Number of leases currently held across all browsers"""
+        return sum(b.active_leases for group in self._browsers.values() for b in group)
+
+    def _total_browsers(self) -> int:
+        """Number of browsers currently owned by the pool"""
+        return sum(len(group) for group in self._browsers.values())
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Create the condition lazily so it binds to the running loop"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _start_crawler(self, browser_config: Any):
+        """Start a new AsyncWebCrawler"""
+        from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+        if browser_config is None:
+            browser_config = BrowserConfig(headless=True, verbose=False)
+
+        crawler = AsyncWebCrawler(config=browser_config)
+        await crawler.start()
+        logger.debug("Started pooled browser")
+        return crawler
+
+    async def _close_browser(self, pooled: PooledBrowser):
+        """Close a pooled browser, ignoring shutdown errors"""
+        try:
+            await pooled.crawler.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {e}")
+
+    def _is_alive(self, pooled: PooledBrowser) -> bool:
+        """Check whether the underlying browser process is still connected"""
+        strategy = getattr(pooled.crawler, "crawler_strategy", None)
+        manager = getattr(strategy, "browser_manager", None)
+        browser = getattr(manager, "browser", None)
+        if browser is not None and hasattr(browser, "is_connected"):
+            try:
+                return bool(browser.is_connected())
+            except Exception:
+                return False
+        return bool(getattr(pooled.crawler, "ready", True))
+
+    async def _health_monitor(self):
+        """Periodically drop dead and long-idle browsers"""
+        while self._running:
+            try:
+                await self._check_browser_health()
+                await asyncio.sleep(self.config.health_check_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Browser pool health check error: {e}")
+                await asyncio.sleep(5.0)
+
+    async def _check_browser_health(self):
+        """Retire browsers that are disconnected or idle for too long"""
+        condition = self._get_condition()
+        to_close = []
+
+        async with condition:
+            for group in list(self._browsers.values()):
+                for pooled in list(group):
+                    if not self._is_alive(pooled):
+                        pooled.healthy = False
+                        pooled.retiring = True
+                    elif pooled.idle_seconds > self.config.max_idle_seconds:
+                        pooled.retiring = True
+
+                    if pooled.retiring and pooled.active_leases == 0:
+                        self._remove(pooled)
+                        to_close.append(pooled)
+
+            if to_close:
+                condition.notify_all()
+
+        for pooled in to_close:
+            self.browsers_recycled += 1
+            await self._close_browser(pooled)
+
+        if to_close:
+            logger.info(f"BrowserPool retired {len(to_close)} browsers")
+
+    @staticmethod
+    def _config_key(browser_config: Any) -> str:
+        """Build a stable key for a BrowserConfig"""
+        if browser_config is None:
+            return "default"
+        if hasattr(browser_config, "to_dict"):
+            data = browser_config.to_dict()
+        else:
+            data = getattr(browser_config, "__dict__", {"repr": repr(browser_config)})
+        serialized = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get browser pool statistics"""
+        browsers = [b for group in self._browsers.values() for b in group]
+        return {
+            "open_browsers": len(browsers),
+            "starting_browsers": self._starting,
+            "active_leases": sum(b.active_leases for b in browsers),
+            "config_keys": len(self._browsers),
+            "browsers_started": self.browsers_started,
+            "browsers_recycled": self.browsers_recycled,
+            "total_leases": self.total_leases,
+            "avg_lease_wait": self.lease_wait_time / max(self.total_leases, 1),
+            "config": self.config.__dict__
+        }
+
+
+# Process-wide pool shared by crawl_web, deep crawl strategies and the analyzer
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool(config: BrowserPoolConfig = None) -> BrowserPool:
+    """Get the process-wide browser pool, creating it on first use"""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(config)
+    return _browser_pool
+
+
+_browser_pool_users = 0
+
+
+def retain_browser_pool(config: BrowserPoolConfig = None) -> BrowserPool:
+    """
+    Register a long-lived user of the process-wide browser pool
+
+    Components that own crawling resources (analyzers, executors) retain the
+    pool when they start and release it when they shut down; the pool is
+    closed when its last user releases it. One-off callers just use
+    get_browser_pool().
+    """
+    global _browser_pool_users
+    _browser_pool_users += 1
+    return get_browser_pool(config)
+
+
+async def release_browser_pool():
+    """Release a retain_browser_pool() registration, closing the pool after the last one"""
+    global _browser_pool_users
+    _browser_pool_users = max(0, _browser_pool_users - 1)
+    if _browser_pool_users == 0:
+        await close_browser_pool()
+
+
+async def close_browser_pool():
+    """Close the process-wide browser pool regardless of its users (application shutdown)"""
+    global _browser_pool
+    if _browser_pool is not None:
+        pool, _browser_pool = _browser_pool, None
+        await pool.stop()
@@ -0,0 +1,285 @@
+"""
+Persistent Crawl State
+SQLite-backed checkpoints of frontier, seen fingerprints, completed URLs and counters
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Iterator, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    counters TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    checkpoints INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    depth INTEGER NOT NULL DEFAULT 0,
+    parent_url TEXT NOT NULL DEFAULT '',
+    priority REAL NOT NULL DEFAULT 0,
+    context TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE TABLE IF NOT EXISTS seen (
+    job_id TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    PRIMARY KEY (job_id, fingerprint)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS completed (
+    job_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    record TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (job_id, url)
+);
+"""
+
+
+@dataclass
+class FrontierEntry:
+    """A pending URL in a checkpointed frontier"""
+    url: str
+    depth: int = 0
+    parent_url: str = ""
+    priority: float = 0.0
+    context: Dict[str, Any] = field(default_factory=dict)
+
+
+def _to_signed(fingerprint: int) -> int:
+    """Map an unsigned 64-bit fingerprint onto SQLite's signed INTEGER"""
+    return fingerprint - (1 << 64) if fingerprint >= (1 << 63) else fingerprint
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class CrawlStateStore:
+    """
+    Local on-disk store for resumable crawl jobs
+
+    Each checkpoint is written in a single transaction: the frontier snapshot
+    replaces the previous one, while seen fingerprints and completed results
+    are appended, so a job can be resumed exactly as of its last checkpoint.
+
+    Usage:
+        store = CrawlStateStore("crawl_state.db")
+        store.create_job(job_id, "BFSDeepCrawlStrategy", {"starting_url": url})
+        store.checkpoint(job_id, frontier=entries, seen=fingerprints,
+                         completed=records, counters={"pages": 10})
+        job = store.load_job(job_id)
+    """
+
+    def __init__(self, db_path: str = "crawl_state.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def create_job(self, job_id: str, kind: str, params: Dict[str, Any],
+                   status: str = "running"):
+        """Register a new job"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, status, params, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, status, json.dumps(params, default=str), now, now)
+            )
+
+    def checkpoint(self, job_id: str,
+                   frontier: Optional[Iterable[FrontierEntry]] = None,
+                   seen: Iterable[int] = (),
+                   completed: Iterable[Dict[str, Any]] = (),
+                   counters: Optional[Dict[str, Any]] = None,
+                   status: Optional[str] = None):
+        """
+        Persist a checkpoint atomically
+
+        Args:
+            job_id: Job to checkpoint
+            frontier: Full frontier snapshot, or None to keep the stored one
+            seen: URL fingerprints marked as seen since the last checkpoint
+            completed: Result records (with a "url" key) completed since the last checkpoint
+            counters: Job counters to store
+            status: New job status
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            if frontier is not None:
+                self._conn.execute("DELETE FROM frontier WHERE job_id = ?", (job_id,))
+                self._conn.executemany(
+                    "INSERT INTO frontier (job_id, seq, url, depth, parent_url, priority, context) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (job_id, seq, e.url, e.depth, e.parent_url, e.priority,
+                         json.dumps(e.context, default=str) if e.context else None)
+                        for seq, e in enumerate(frontier)
+                    )
+                )
+
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen (job_id, fingerprint) VALUES (?, ?)",
+                ((job_id, _to_signed(fp)) for fp in seen)
+            )
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO completed (job_id, url, success, record, completed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (job_id, record["url"], int(bool(record.get("success"))),
+                     json.dumps(record, default=str), now)
+                    for record in completed
+                )
+            )
+
+            updates = ["updated_at = ?", "checkpoints = checkpoints + 1"]
+            values: List[Any] = [now]
+            if counters is not None:
+                updates.append("counters = ?")
+                values.append(json.dumps(counters, default=str))
+            if status is not None:
+                updates.append("status = ?")
+                values.append(status)
+            values.append(job_id)
+            self._conn.execute(f"UPDATE jobs SET {', '.join(updates)} WHERE job_id = ?", values)
+
+    def set_status(self, job_id: str, status: str):
+        """Update a job's status"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?",
+                (status, time.time(), job_id)
+            )
+
+    def load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load a job's metadata, or None if it does not exist"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, kind, status, params, counters, created_at, updated_at, checkpoints "
+                "FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            completed, successful = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(success), 0) FROM completed WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+
+        return {
+            "job_id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "params": json.loads(row[3]),
+            "counters": json.loads(row[4]),
+            "created_at": row[5],
+            "updated_at": row[6],
+            "checkpoints": row[7],
+            "completed_urls": completed,
+            "successful_urls": successful
+        }
+
+    def list_jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List jobs, optionally filtered by status"""
+        query = "SELECT job_id, kind, status, created_at, updated_at FROM jobs"
+        args: tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            args = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at", args).fetchall()
+        return [
+            {"job_id": r[0], "kind": r[1], "status": r[2], "created_at": r[3], "updated_at": r[4]}
+            for r in rows
+        ]
+
+    def load_frontier(self, job_id: str) -> List[FrontierEntry]:
+        """Load the frontier snapshot in its stored order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, depth, parent_url, priority, context FROM frontier "
+                "WHERE job_id = ? ORDER BY seq",
+                (job_id,)
+            ).fetchall()
+        return [
+            FrontierEntry(url=r[0], depth=r[1], parent_url=r[2], priority=r[3],
+                          context=json.loads(r[4]) if r[4] else {})
+            for r in rows
+        ]
+
+    def iter_seen(self, job_id: str, chunk_size: int = 10000) -> Iterator[int]:
+        """Iterate over seen URL fingerprints"""
+        last = None
+        while True:
+            with self._lock:
+                if last is None:
+                    rows = self._conn.execute(
+                        "SELECT fingerprint FROM seen WHERE job_id = ? ORDER BY fingerprint LIMIT ?",
+                        (job_id, chunk_size)
+                    ).fetchall()
+                else:
+                    rows = self._conn.execute(
+                        "SELECT fingerprint FROM seen WHERE job_id = ? AND fingerprint > ? "
+                        "ORDER BY fingerprint LIMIT ?",
+                        (job_id, last, chunk_size)
+                    ).fetchall()
+            if not rows:
+                return
+            for (value,) in rows:
+                yield _to_unsigned(value)
+            last = rows[-1][0]
+
+    def iter_completed(self, job_id: str, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Iterate over completed result records in completion order"""
+        offset_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, record FROM completed WHERE job_id = ? AND rowid > ? "
+                    "ORDER BY rowid LIMIT ?",
+                    (job_id, offset_rowid, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for _, record in rows:
+                yield json.loads(record)
+            offset_rowid = rows[-1][0]
+
+    def completed_urls(self, job_id: str) -> set:
+        """Set of URLs already completed for a job"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM completed WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def delete_job(self, job_id: str):
+        """Remove a job and all of its state"""
+        with self._lock, self._conn:
+            for table in ("frontier", "seen", "completed", "jobs"):
+                self._conn.execute(f"DELETE FROM {table} WHERE job_id = ?", (job_id,))
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,324 @@
+"""
+Compact Crawl Stores
+Memory-bounded visited-URL sets and on-disk page content storage for deep crawls
+"""
+
+import hashlib
+import math
+import os
+import tempfile
+import threading
+import zlib
+import logging
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def url_fingerprint(url: str) -> int:
+    """64-bit fingerprint of a URL"""
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class SeenStore(ABC):
+    """Set-like store of URLs that have already been queued or crawled"""
+
+    @abstractmethod
+    def add(self, url: str):
+        """Mark a URL as seen"""
+        pass
+
+    @abstractmethod
+    def __contains__(self, url: str) -> bool:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def memory_bytes(self) -> int:
+        """Approximate memory used by the store"""
+        pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        return {
+            "store": self.__class__.__name__,
+            "entries": len(self),
+            "memory_bytes": self.memory_bytes()
+        }
+
+
+class ExactSeenStore(SeenStore):
+    """Plain set of full URL strings, exact but the most memory hungry"""
+
+    def __init__(self):
+        self._urls: set = set()
+
+    def add(self, url: str):
+        self._urls.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __iter__(self):
+        return iter(self._urls)
+
+    def memory_bytes(self) -> int:
+        return (self._urls.__sizeof__() +
+                sum(url.__sizeof__() for url in self._urls))
+
+
+class FingerprintSeenStore(SeenStore):
+    """
+    Open-addressing hash table of 64-bit URL fingerprints
+
+    Uses 8 bytes per slot (about 16 bytes per URL at the default load
+    factor). Two distinct URLs collide with probability about n / 2^64,
+    which is negligible for crawls of a few billion URLs.
+    """
+
+    def __init__(self, expected_items: int = 100_000, max_load: float = 0.6):
+        self.max_load = max_load
+        capacity = 1 << max(4, math.ceil(math.log2(max(expected_items, 1) / max_load)))
+        self._slots = array("Q", bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._count = 0
+
+    def add(self, url: str):
+        self.add_fingerprint(url_fingerprint(url))
+
+    def add_fingerprint(self, fingerprint: int):
+        """Mark a precomputed url_fingerprint() as seen, e.g. when restoring a checkpoint"""
+        if self._insert(fingerprint or 1):
+            self._count += 1
+            if self._count > len(self._slots) * self.max_load:
+                self._grow()
+
+    def __contains__(self, url: str) -> bool:
+        fingerprint = self._fingerprint(url)
+        slots, mask = self._slots, self._mask
+        index = fingerprint & mask
+        while True:
+            value = slots[index]
+            if value == 0:
+                return False
+            if value == fingerprint:
+                return True
+            index = (index + 1) & mask
+
+    def __len__(self) -> int:
+        return self._count
+
+    def memory_bytes(self) -> int:
+        return self._slots.buffer_info()[1] * self._slots.itemsize
+
+    @staticmethod
+    def _fingerprint(url: str) -> int:
+        # 0 marks an empty slot
+        return url_fingerprint(url) or 1
+
+    def _insert(self, fingerprint: int) -> bool:
+        """Insert a fingerprint, returning False if it was already present"""
+        slots, mask = self._slots, self._mask
+        index = fingerprint & mask
+        while True:
+            value = slots[index]
+            if value == 0:
+                slots[index] = fingerprint
+                return True
+            if value == fingerprint:
+                return False
+            index = (index + 1) & mask
+
+    def _grow(self):
+        """Double the table and rehash"""
+        old_slots = self._slots
+        self._slots = array("Q", bytes(8 * len(old_slots) * 2))
+        self._mask = len(self._slots) - 1
+        for value in old_slots:
+            if value:
+                self._insert(value)
+
+
+class _BloomFilter:
+    """Fixed-capacity Bloom filter over a bytearray"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, h1: int, h2: int):
+        # Kirsch-Mitzenmacher double hashing
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, h1: int, h2: int):
+        for position in self._positions(h1, h2):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, hashes: Tuple[int, int]) -> bool:
+        h1, h2 = hashes
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(h1, h2))
+
+
+class ScalableBloomFilterSeenStore(SeenStore):
+    """
+    Scalable Bloom filter that grows as URLs are added
+
+    A chain of Bloom filters with geometrically increasing capacity and
+    tightening error rates keeps the overall false-positive rate below
+    ``error_rate`` without knowing the crawl size in advance. False
+    positives mean an unseen URL may occasionally be skipped; there are no
+    false negatives, so no URL is ever crawled twice.
+    """
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.001,
+                 growth_factor: int = 2, tightening_ratio: float = 0.5):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth_factor = growth_factor
+        self.tightening_ratio = tightening_ratio
+        self._filters: List[_BloomFilter] = []
+        self._count = 0
+        self._add_filter()
+
+    def add(self, url: str):
+        hashes = self._hashes(url)
+        if any(hashes in f for f in self._filters):
+            return
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            self._add_filter()
+            current = self._filters[-1]
+        current.add(*hashes)
+        self._count += 1
+
+    def __contains__(self, url: str) -> bool:
+        hashes = self._hashes(url)
+        return any(hashes in f for f in self._filters)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def memory_bytes(self) -> int:
+        return sum(len(f.bits) for f in self._filters)
+
+    def _add_filter(self):
+        """Append a larger, stricter filter to the chain"""
+        level = len(self._filters)
+        capacity = self.initial_capacity * (self.growth_factor ** level)
+        error_rate = self.error_rate * (1 - self.tightening_ratio) * (self.tightening_ratio ** level)
+        self._filters.append(_BloomFilter(capacity, error_rate))
+
+    @staticmethod
+    def _hashes(url: str) -> Tuple[int, int]:
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        stats = super().get_statistics()
+        stats["filters"] = len(self._filters)
+        stats["target_error_rate"] = self.error_rate
+        return stats
+
+
+def create_seen_store(kind: str = "exact", expected_items: int = 100_000,
+                      error_rate: float = 0.001) -> SeenStore:
+    """
+    Create a seen store by name
+
+    Args:
+        kind: "exact" (set of URLs), "fingerprint" (64-bit hashes) or "bloom"
+        expected_items: Expected number of URLs, used to size the store
+        error_rate: Target false-positive rate for the Bloom filter
+    """
+    if kind == "exact":
+        return ExactSeenStore()
+    if kind == "fingerprint":
+        return FingerprintSeenStore(expected_items)
+    if kind == "bloom":
+        return ScalableBloomFilterSeenStore(expected_items, error_rate)
+    raise ValueError(f"Unknown seen store: {kind}")
+
+
+class ContentSpillStore:
+    """
+    Append-only on-disk store for page content
+
+    Content is zlib-compressed into a single file and addressed by an
+    (offset, length) reference, so crawl results only keep metadata in memory.
+    """
+
+    def __init__(self, directory: Optional[str] = None, compress: bool = True):
+        self.directory = directory or tempfile.gettempdir()
+        os.makedirs(self.directory, exist_ok=True)
+        fd, self.filepath = tempfile.mkstemp(prefix="crawl_content_", suffix=".bin", dir=self.directory)
+        self._file = os.fdopen(fd, "w+b")
+        self.compress = compress
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.pages_stored = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def put(self, content: str) -> Tuple[int, int]:
+        """Store content and return its (offset, length) reference"""
+        data = content.encode("utf-8")
+        self.raw_bytes += len(data)
+        if self.compress:
+            data = zlib.compress(data, 6)
+
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(data)
+
+        self.pages_stored += 1
+        self.stored_bytes += len(data)
+        return offset, len(data)
+
+    def get(self, ref: Tuple[int, int]) -> str:
+        """Load content by reference"""
+        offset, length = ref
+        with self._lock:
+            self._file.flush()
+            self._file.seek(offset)
+            data = self._file.read(length)
+        if self.compress:
+            data = zlib.decompress(data)
+        return data.decode("utf-8")
+
+    def close(self, delete: bool = True):
+        """Close the backing file, deleting it by default"""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if delete:
+            try:
+                os.remove(self.filepath)
+            except OSError as e:
+                logger.warning(f"Failed to remove content spill file {self.filepath}: {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get spill store statistics"""
+        return {
+            "filepath": self.filepath,
+            "pages_stored": self.pages_stored,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "compression_ratio": self.stored_bytes / max(self.raw_bytes, 1)
+        }
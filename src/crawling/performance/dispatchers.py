@@ -8,7 +8,7 @@ import psutil
 import logging
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Callable, Awaitable
+from typing import Dict, Any, List, Optional, Callable, Awaitable, AsyncIterator, Iterable
 from dataclasses import dataclass
 from collections import deque
 import statistics
@@ -43,6 +43,66 @@ class BaseDispatcher(ABC):
         """Dispatch tasks for execution"""
         pass
     
+    async def dispatch_iter(self, tasks: Iterable[Callable[[], Awaitable]],
+                            max_in_flight: Optional[int] = None, **kwargs) -> AsyncIterator[Any]:
+        """
+        Dispatch tasks lazily and yield results in completion order
+        
+        Tasks are pulled from ``tasks`` (which may be a generator) only when a
+        slot frees up, and a new task is started only after the consumer has
+        taken a result, so memory stays bounded by the in-flight limit.
+        Failed tasks yield their exception instead of raising.
+        """
+        task_iter = iter(tasks)
+        in_flight = set()
+        exhausted = False
+        
+        def fill_slots():
+            nonlocal exhausted
+            limit = max_in_flight or self._current_limit()
+            while not exhausted and len(in_flight) < limit:
+                try:
+                    task_func = next(task_iter)
+                except StopIteration:
+                    exhausted = True
+                    return
+                in_flight.add(asyncio.ensure_future(self._execute_tracked(task_func)))
+        
+        try:
+            fill_slots()
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    in_flight.discard(future)
+                    yield future.result()
+                fill_slots()
+        finally:
+            # Consumer stopped early - don't leave orphaned work behind
+            for future in in_flight:
+                future.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+    
+    async def _execute_tracked(self, task_func: Callable[[], Awaitable]) -> Any:
+        """Run one task, updating counters and returning exceptions as values"""
+        self.active_tasks += 1
+        try:
+            result = await task_func()
+            self.completed_tasks += 1
+            return result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed_tasks += 1
+            logger.error(f"Task failed: {e}")
+            return e
+        finally:
+            self.active_tasks -= 1
+    
+    def _current_limit(self) -> int:
+        """Current concurrency limit used by dispatch_iter"""
+        return self.config.max_concurrent
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get dispatcher statistics"""
         runtime = time.time() - self.start_time
@@ -90,8 +150,26 @@ class SemaphoreDispatcher(BaseDispatcher):
         return results
 
 
+class _DispatchRun:
+    """Worker pool state of one MemoryAdaptiveDispatcher.dispatch() call"""
+    
+    def __init__(self, tasks: List[Callable[[], Awaitable]]):
+        self.queue = deque(enumerate(tasks))
+        self.results: List[Any] = [None] * len(tasks)
+        self.workers: set = set()
+        self.done = asyncio.Event()
+
+
 class MemoryAdaptiveDispatcher(BaseDispatcher):
-    """Memory-adaptive dispatcher that scales concurrency based on resource usage"""
+    """
+    Memory-adaptive dispatcher that scales concurrency based on resource usage
+    
+    Tasks are pulled from a shared queue by a resizable set of workers, so a
+    slot is refilled as soon as any task finishes (no batch barriers). When
+    _adjust_concurrency changes the level, workers are spawned immediately or
+    retire after their current task. Each dispatch() call has its own queue
+    and workers, so concurrent calls are independent.
+    """
     
     def __init__(self, config: DispatcherConfig = None):
         super().__init__(config)
@@ -101,65 +179,66 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
         self.adjustment_history = deque(maxlen=20)
         self.last_adjustment = time.time()
         
+        # Worker pools of the dispatch() calls in progress
+        self._runs: set = set()
+        
     async def dispatch(self, tasks: List[Callable[[], Awaitable]], **kwargs) -> List[Any]:
-        """Dispatch tasks with adaptive concurrency"""
+        """Dispatch tasks with adaptive concurrency and continuous refill"""
         if not tasks:
             return []
         
+        run = _DispatchRun(tasks)
+        self._runs.add(run)
+        
         # Start monitoring task
         monitor_task = asyncio.create_task(self._monitor_resources())
         
         try:
-            # Process tasks in batches
-            results = []
-            task_queue = deque(tasks)
-            
-            while task_queue:
-                # Determine current batch size
-                batch_size = min(len(task_queue), self.current_concurrent)
-                current_batch = [task_queue.popleft() for _ in range(batch_size)]
-                
-                # Execute batch
-                batch_results = await self._execute_batch(current_batch)
-                results.extend(batch_results)
-                
-                # Brief pause to allow monitoring
-                if task_queue:
-                    await asyncio.sleep(0.1)
-            
-            return results
+            self._spawn_workers(run)
+            await run.done.wait()
+            return run.results
             
         finally:
+            self._runs.discard(run)
             monitor_task.cancel()
             try:
                 await monitor_task
             except asyncio.CancelledError:
                 pass
+            
+            # Only reached with live workers if dispatch() itself was cancelled
+            workers = list(run.workers)
+            for worker in workers:
+                worker.cancel()
+            if workers:
+                await asyncio.gather(*workers, return_exceptions=True)
     
-    async def _execute_batch(self, tasks: List[Callable[[], Awaitable]]) -> List[Any]:
-        """Execute a batch of tasks"""
-        semaphore = asyncio.Semaphore(len(tasks))
-        
-        async def execute_with_tracking(task_func):
-            async with semaphore:
-                self.active_tasks += 1
-                try:
-                    result = await task_func()
-                    self.completed_tasks += 1
-                    return result
-                except Exception as e:
-                    self.failed_tasks += 1
-                    logger.error(f"Task failed: {e}")
-                    return e
-                finally:
-                    self.active_tasks -= 1
-        
-        results = await asyncio.gather(
-            *[execute_with_tracking(task) for task in tasks],
-            return_exceptions=True
-        )
+    def _spawn_workers(self, run: _DispatchRun):
+        """Grow a run's worker set up to the current concurrency level"""
+        missing = min(self.current_concurrent - len(run.workers), len(run.queue))
+        for _ in range(max(0, missing)):
+            worker = asyncio.create_task(self._worker_loop(run))
+            run.workers.add(worker)
+    
+    async def _worker_loop(self, run: _DispatchRun):
+        """Pull tasks until the queue is empty or the pool shrinks below this worker"""
+        worker = asyncio.current_task()
         
-        return results
+        try:
+            while run.queue:
+                # Retire surplus workers as soon as concurrency is reduced
+                if len(run.workers) > self.current_concurrent:
+                    break
+                
+                index, task_func = run.queue.popleft()
+                run.results[index] = await self._execute_tracked(task_func)
+        finally:
+            run.workers.discard(worker)
+            if not run.workers and run in self._runs:
+                if run.queue:
+                    self._spawn_workers(run)
+                else:
+                    run.done.set()
     
     async def _monitor_resources(self):
         """Monitor system resources and adjust concurrency"""
@@ -232,6 +311,11 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
             adjustment = self.current_concurrent - old_concurrent
             self.adjustment_history.append(adjustment)
             self.last_adjustment = current_time
+            
+            # Apply immediately: extra workers start now, surplus ones retire
+            # after their current task
+            for run in list(self._runs):
+                self._spawn_workers(run)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get enhanced statistics for adaptive dispatcher"""
@@ -243,10 +327,30 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
             "avg_memory_mb": statistics.mean(self.memory_history) if self.memory_history else 0,
             "avg_cpu_percent": statistics.mean(self.cpu_history) if self.cpu_history else 0,
             "recent_adjustments": list(self.adjustment_history)[-5:],
-            "total_adjustments": len(self.adjustment_history)
+            "total_adjustments": len(self.adjustment_history),
+            "live_workers": sum(len(run.workers) for run in self._runs),
+            "queued_tasks": sum(len(run.queue) for run in self._runs)
         }
         
         return {**base_stats, **adaptive_stats}
+    
+    async def dispatch_iter(self, tasks: Iterable[Callable[[], Awaitable]],
+                            max_in_flight: Optional[int] = None, **kwargs) -> AsyncIterator[Any]:
+        """Stream results while monitoring resources to adapt concurrency"""
+        monitor_task = asyncio.create_task(self._monitor_resources())
+        try:
+            async for result in super().dispatch_iter(tasks, max_in_flight, **kwargs):
+                yield result
+        finally:
+            monitor_task.cancel()
+            try:
+                await monitor_task
+            except asyncio.CancelledError:
+                pass
+    
+    def _current_limit(self) -> int:
+        """Use the adaptive concurrency level"""
+        return self.current_concurrent
 
 
 class PriorityDispatcher(BaseDispatcher):
@@ -0,0 +1,383 @@
+"""
+HTTP Fetch Tier
+Fetches raw HTML over a pooled aiohttp session and only escalates to the browser when needed
+"""
+
+import asyncio
+import re
+import time
+import logging
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+# Markers that indicate the served HTML is a shell that needs JavaScript to render
+SPA_ROOT_PATTERNS = [
+    re.compile(r'<div[^>]+id=["\'](root|app|__nuxt|svelte)["\'][^>]*>\s*</div>', re.IGNORECASE),
+    re.compile(r'<app-root[^>]*>\s*</app-root>', re.IGNORECASE),
+]
+
+NOSCRIPT_PATTERN = re.compile(
+    r'<noscript[^>]*>[^<]*(enable javascript|javascript is required|requires javascript)',
+    re.IGNORECASE
+)
+
+CHALLENGE_MARKERS = [
+    "cf-browser-verification", "cf-challenge", "challenge-platform",
+    "checking your browser", "ddos-guard", "_incapsula_resource", "px-captcha"
+]
+
+SCRIPT_PATTERN = re.compile(r'<script\b', re.IGNORECASE)
+STRIP_PATTERN = re.compile(r'<(script|style|noscript)[^>]*>.*?</\1>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+ESCALATE_STATUS_CODES = {403, 429, 503}
+
+
+@dataclass
+class FetchTierConfig:
+    """Configuration for the HTTP fetch tier"""
+    timeout: float = 15.0
+    max_connections: int = 100
+    max_connections_per_host: int = 10
+    max_content_bytes: int = 5 * 1024 * 1024
+    min_text_length: int = 500
+    max_scripts_for_static: int = 40
+    decision_ttl_seconds: float = 3600.0
+    user_agent: str = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    )
+
+
+@dataclass
+class FetchResult:
+    """Result of an HTTP fetch attempt"""
+    url: str
+    success: bool
+    needs_browser: bool
+    html: str = ""
+    status_code: int = 0
+    final_url: str = ""
+    content_type: str = ""
+    fetch_time: float = 0.0
+    reason: str = ""
+    error: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    truncated: bool = False  # Body exceeded max_content_bytes; html is incomplete
+
+
+@dataclass
+class DomainDecision:
+    """Cached rendering decision for a domain"""
+    needs_browser: bool
+    reason: str
+    decided_at: float = field(default_factory=time.time)
+    source: str = "heuristic"
+
+
+class FetchTierEngine:
+    """
+    Fetch-first engine that keeps static pages off the browser
+
+    Every page is first requested over a shared keep-alive aiohttp session.
+    A cheap heuristic (or IntelligentAnalyzer signals, when available) decides
+    whether the HTML is complete or needs JavaScript rendering, and the
+    decision is cached per domain so JS-heavy sites skip the HTTP attempt.
+    """
+
+    def __init__(self, config: FetchTierConfig = None):
+        self.config = config or FetchTierConfig()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.domain_decisions: Dict[str, DomainDecision] = {}
+        self._session_lock: Optional[asyncio.Lock] = None
+
+        # Statistics
+        self.http_served = 0
+        self.browser_escalations = 0
+        self.cached_escalations = 0
+        self.fetch_errors = 0
+
+    async def initialize(self):
+        """Initialize the pooled HTTP session"""
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+
+        async with self._session_lock:
+            if not self.session or self.session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.config.max_connections,
+                    limit_per_host=self.config.max_connections_per_host
+                )
+                self.session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                    headers={
+                        "User-Agent": self.config.user_agent,
+                        "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                        "Accept-Language": "en-US,en;q=0.9"
+                    }
+                )
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    proxy: Optional[str] = None, use_cached_decision: bool = True) -> FetchResult:
+        """
+        Fetch a page over HTTP and decide whether it needs the browser
+
+        Returns a FetchResult; when ``needs_browser`` is True the caller should
+        render the URL with the browser instead of using ``html``. With
+        ``use_cached_decision`` False the page is fetched even if its domain
+        is known to need the browser.
+        """
+        domain = self._extract_domain(url)
+        cached = self.get_domain_decision(domain) if use_cached_decision else None
+        if cached and cached.needs_browser:
+            self.cached_escalations += 1
+            return FetchResult(
+                url=url,
+                success=False,
+                needs_browser=True,
+                reason=f"cached:{cached.reason}"
+            )
+
+        await self.initialize()
+        start_time = time.time()
+
+        try:
+            async with self.session.get(url, headers=headers, proxy=proxy,
+                                        allow_redirects=True) as response:
+                content_type = response.headers.get("Content-Type", "")
+                raw, truncated = await self._read_body(response)
+                charset = response.charset or "utf-8"
+                html = raw.decode(charset, errors="replace")
+
+                result = FetchResult(
+                    url=url,
+                    success=200 <= response.status < 400,
+                    needs_browser=False,
+                    html=html,
+                    status_code=response.status,
+                    final_url=str(response.url),
+                    content_type=content_type,
+                    fetch_time=time.time() - start_time,
+                    headers=dict(response.headers),
+                    truncated=truncated
+                )
+
+        except Exception as e:
+            self.fetch_errors += 1
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+            return FetchResult(
+                url=url,
+                success=False,
+                needs_browser=True,
+                fetch_time=time.time() - start_time,
+                reason="fetch_error",
+                error=str(e)
+            )
+
+        needs_browser, reason = self._classify_response(result)
+        result.needs_browser = needs_browser
+        result.reason = reason
+
+        if needs_browser:
+            self.browser_escalations += 1
+        elif result.success:
+            self.http_served += 1
+
+        # Only cache decisions derived from real, complete page content
+        if (result.success and not result.truncated) or reason == "anti_bot_challenge":
+            self._record_decision(domain, needs_browser, reason, source="heuristic")
+
+        return result
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> Tuple[bytes, bool]:
+        """Read a response body up to max_content_bytes, returning it and whether it was cut off"""
+        limit = self.config.max_content_bytes
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                return b"".join(chunks)[:limit], True
+        return b"".join(chunks), False
+
+    def _classify_response(self, result: FetchResult) -> Tuple[bool, str]:
+        """Decide whether a fetched response needs browser rendering"""
+        html = result.html
+        lowered = html[:20000].lower()
+
+        if any(marker in lowered for marker in CHALLENGE_MARKERS):
+            return True, "anti_bot_challenge"
+
+        if result.status_code in ESCALATE_STATUS_CODES:
+            return True, f"status_{result.status_code}"
+
+        if not result.success:
+            # 404s and similar will not improve in a browser
+            return False, f"status_{result.status_code}"
+
+        if result.content_type and "html" not in result.content_type.lower():
+            return False, "non_html"
+
+        if result.truncated:
+            # A partial document would be parsed as if it were the whole page
+            return True, "content_truncated"
+
+        return self.needs_browser(html)
+
+    def needs_browser(self, html: str) -> Tuple[bool, str]:
+        """Cheap heuristic for whether HTML requires JavaScript to show its content"""
+        if not html:
+            return True, "empty_document"
+
+        if any(pattern.search(html) for pattern in SPA_ROOT_PATTERNS):
+            return True, "spa_root"
+
+        if NOSCRIPT_PATTERN.search(html):
+            return True, "noscript_notice"
+
+        text = STRIP_PATTERN.sub(" ", html)
+        text = WHITESPACE_PATTERN.sub(" ", TAG_PATTERN.sub(" ", text)).strip()
+        script_count = len(SCRIPT_PATTERN.findall(html))
+
+        if len(text) < self.config.min_text_length:
+            if script_count > 0:
+                return True, "thin_content_with_scripts"
+            return False, "thin_static_content"
+
+        if script_count > self.config.max_scripts_for_static and len(text) < self.config.min_text_length * 4:
+            return True, "script_heavy"
+
+        return False, "static_content"
+
+    def record_analysis(self, analysis: Any):
+        """
+        Seed the per-domain decision from an IntelligentAnalyzer WebsiteAnalysis
+
+        Sites that are dynamically loaded or have infinite scroll are rendered
+        in the browser; everything else is tried over HTTP first.
+        """
+        url = getattr(analysis, "url", "")
+        if not url:
+            return
+
+        needs_browser = bool(
+            getattr(analysis, "content_dynamically_loaded", False) or
+            getattr(analysis, "has_infinite_scroll", False)
+        )
+        reason = "analyzer_dynamic_content" if needs_browser else "analyzer_static_content"
+        self._record_decision(self._extract_domain(url), needs_browser, reason, source="analyzer")
+
+    def record_browser_outcome(self, url: str, http_result: FetchResult, browser_html: str):
+        """
+        Learn from a browser render that followed an HTTP fetch
+
+        If the rendered page carries much more text than the raw HTML, the
+        domain is marked as needing the browser.
+        """
+        if not http_result.html or not browser_html:
+            return
+
+        http_text = len(TAG_PATTERN.sub(" ", STRIP_PATTERN.sub(" ", http_result.html)))
+        browser_text = len(TAG_PATTERN.sub(" ", STRIP_PATTERN.sub(" ", browser_html)))
+        if browser_text > max(http_text * 2, self.config.min_text_length):
+            self._record_decision(
+                self._extract_domain(url), True, "rendered_content_larger", source="browser"
+            )
+
+    def get_domain_decision(self, domain: str) -> Optional[DomainDecision]:
+        """Get a non-expired cached decision for a domain"""
+        decision = self.domain_decisions.get(domain)
+        if not decision:
+            return None
+        if time.time() - decision.decided_at > self.config.decision_ttl_seconds:
+            del self.domain_decisions[domain]
+            return None
+        return decision
+
+    def _record_decision(self, domain: str, needs_browser: bool, reason: str, source: str):
+        """Store a per-domain decision, letting analyzer signals win over heuristics"""
+        existing = self.get_domain_decision(domain)
+        if existing and existing.source == "analyzer" and source == "heuristic":
+            return
+        self.domain_decisions[domain] = DomainDecision(
+            needs_browser=needs_browser,
+            reason=reason,
+            source=source
+        )
+
+    @staticmethod
+    def _extract_domain(url: str) -> str:
+        """Extract domain from URL"""
+        return urlparse(url).netloc.lower()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get fetch tier statistics"""
+        total = self.http_served + self.browser_escalations + self.cached_escalations
+        browser_domains = sum(1 for d in self.domain_decisions.values() if d.needs_browser)
+        return {
+            "http_served": self.http_served,
+            "browser_escalations": self.browser_escalations,
+            "cached_escalations": self.cached_escalations,
+            "fetch_errors": self.fetch_errors,
+            "http_share": self.http_served / max(total, 1),
+            "domains_cached": len(self.domain_decisions),
+            "browser_domains": browser_domains,
+            "static_domains": len(self.domain_decisions) - browser_domains
+        }
+
+    async def cleanup(self):
+        """Close the HTTP session"""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+
+# Process-wide fetch tier shared by crawl_web, deep crawl strategies and the analyzer
+_fetch_tier: Optional[FetchTierEngine] = None
+
+
+def get_fetch_tier(config: FetchTierConfig = None) -> FetchTierEngine:
+    """Get the process-wide fetch tier, creating it on first use"""
+    global _fetch_tier
+    if _fetch_tier is None:
+        _fetch_tier = FetchTierEngine(config)
+    return _fetch_tier
+
+
+_fetch_tier_users = 0
+
+
+def retain_fetch_tier(config: FetchTierConfig = None) -> FetchTierEngine:
+    """
+    Register a long-lived user of the process-wide fetch tier
+
+    Paired with release_fetch_tier(); the HTTP session is closed when the
+    last user releases it. One-off callers just use get_fetch_tier().
+    """
+    global _fetch_tier_users
+    _fetch_tier_users += 1
+    return get_fetch_tier(config)
+
+
+async def release_fetch_tier():
+    """Release a retain_fetch_tier() registration, closing the tier after the last one"""
+    global _fetch_tier_users
+    _fetch_tier_users = max(0, _fetch_tier_users - 1)
+    if _fetch_tier_users == 0:
+        await close_fetch_tier()
+
+
+async def close_fetch_tier():
+    """Close the process-wide fetch tier regardless of its users (application shutdown)"""
+    global _fetch_tier
+    if _fetch_tier is not None:
+        tier, _fetch_tier = _fetch_tier, None
+        await tier.cleanup()
@@ -0,0 +1,343 @@
+"""
+Host-Aware Politeness Scheduler
+Per-host token buckets and concurrency caps with adaptive rates
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+import logging
+from typing import Dict, Any, List, Optional, Iterable
+from dataclasses import dataclass, field
+from collections import deque
+from urllib.parse import urlparse
+
+try:
+    import tldextract
+except ImportError:
+    tldextract = None
+
+logger = logging.getLogger(__name__)
+
+# Registered-domain lookup from tldextract's bundled public suffix snapshot;
+# the default extractor downloads the list on first use, blocking the event loop
+_domain_extractor = tldextract.TLDExtract(suffix_list_urls=()) if tldextract is not None else None
+
+
+@dataclass
+class HostSchedulerConfig:
+    """Configuration for the host-aware scheduler"""
+    requests_per_second: float = 2.0
+    burst_size: int = 4
+    max_concurrent_per_host: int = 4
+    adaptive: bool = True
+    min_requests_per_second: float = 0.1
+    max_requests_per_second: float = 10.0
+    target_latency_seconds: float = 5.0
+    throttle_backoff_factor: float = 0.5
+    error_backoff_factor: float = 0.8
+    recovery_increment: float = 0.1
+    throttle_cooldown_seconds: float = 30.0
+    max_cooldown_seconds: float = 300.0
+
+
+@dataclass
+class HostState:
+    """Scheduling state for a single host"""
+    host: str
+    rate: float
+    tokens: float
+    max_concurrent: int
+    last_refill: float = field(default_factory=time.monotonic)
+    pending: deque = field(default_factory=deque)
+    active: int = 0
+    cooldown_until: float = 0.0
+    heap_seq: int = -1
+    total_requests: int = 0
+    successful_requests: int = 0
+    throttled_responses: int = 0
+    server_errors: int = 0
+    avg_latency: float = 0.0
+
+    def refill(self, now: float, burst_size: int):
+        """Add tokens accrued since the last refill"""
+        elapsed = now - self.last_refill
+        self.tokens = min(float(burst_size), self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def ready_at(self, now: float) -> float:
+        """Earliest monotonic time at which this host may be requested again"""
+        token_wait = 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / max(self.rate, 1e-6)
+        return max(self.cooldown_until, now + token_wait)
+
+
+class HostAwareScheduler:
+    """
+    Scheduler that hands out the next URL whose host is ready
+
+    URLs are queued per registered domain. Each host has its own token bucket
+    and concurrency cap, and its rate adapts to that host's own 429/5xx and
+    latency feedback, so one slow host never holds back the others.
+
+    When a DistributedRateLimiter is given, every handed-out URL also draws
+    from its shared global and per-host budgets, so several replicas
+    crawling the same sites stay within one combined budget.
+    
+    Usage:
+        scheduler = HostAwareScheduler(config)
+        scheduler.add_urls(urls)
+        url = await scheduler.next_url()
+        ...
+        scheduler.release(url, success=True, status_code=200, latency=0.8)
+    """
+
+    def __init__(self, config: HostSchedulerConfig = None, rate_limiter: Any = None):
+        self.config = config or HostSchedulerConfig()
+        self.rate_limiter = rate_limiter
+        self.hosts: Dict[str, HostState] = {}
+        self._ready_heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._pending_count = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._closed = False
+
+    def add_urls(self, urls: Iterable[str]):
+        """Queue URLs for scheduling"""
+        now = time.monotonic()
+        for url in urls:
+            state = self._get_host_state(self.host_key(url))
+            state.pending.append(url)
+            self._pending_count += 1
+            if state.heap_seq < 0 and state.active < state.max_concurrent:
+                self._schedule(state, state.ready_at(now))
+        self._notify()
+
+    def add_url(self, url: str):
+        """Queue a single URL for scheduling"""
+        self.add_urls([url])
+
+    async def next_url(self) -> Optional[str]:
+        """
+        Wait for and return the next URL whose host is ready
+
+        Returns None once every queued URL has been handed out, or after
+        close() has been called.
+        """
+        url = await self._next_local_url()
+        
+        # Wait for the shared budget outside the lock so other hosts keep flowing
+        if url is not None and self.rate_limiter is not None:
+            try:
+                await self.rate_limiter.wait_for_tokens(host=self.host_key(url))
+            except (asyncio.CancelledError, Exception):
+                # The caller never gets the URL: give back its host slot and requeue it
+                self._requeue(url)
+                raise
+        return url
+    
+    async def _next_local_url(self) -> Optional[str]:
+        """Wait for a URL whose host is ready under this scheduler's own budgets"""
+        condition = self._get_condition()
+
+        async with condition:
+            while True:
+                if self._closed or self._pending_count == 0:
+                    return None
+
+                url = self._pop_ready_url()
+                if url is not None:
+                    return url
+
+                timeout = None
+                if self._ready_heap:
+                    timeout = max(0.0, self._ready_heap[0][0] - time.monotonic())
+                try:
+                    await asyncio.wait_for(condition.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    def release(self, url: str, success: bool = True, status_code: Optional[int] = None,
+                latency: Optional[float] = None, retry_after: Optional[float] = None):
+        """
+        Report the outcome of a request and free its host slot
+
+        Args:
+            url: URL that was handed out by next_url()
+            success: Whether the request succeeded
+            status_code: HTTP status code, used to detect throttling and server errors
+            latency: Request latency in seconds
+            retry_after: Retry-After hint from the server, in seconds
+        """
+        state = self.hosts.get(self.host_key(url))
+        if state is None:
+            return
+
+        state.active = max(0, state.active - 1)
+        state.total_requests += 1
+        if success:
+            state.successful_requests += 1
+        if latency is not None:
+            state.avg_latency = latency if state.avg_latency == 0 else state.avg_latency * 0.8 + latency * 0.2
+
+        if self.config.adaptive:
+            self._adapt_rate(state, success, status_code, latency, retry_after)
+
+        if state.pending and state.heap_seq < 0:
+            self._schedule(state, state.ready_at(time.monotonic()))
+        self._notify()
+
+    def _requeue(self, url: str):
+        """Return a handed-out but unused URL to the front of its host's queue"""
+        state = self.hosts.get(self.host_key(url))
+        if state is None:
+            return
+
+        state.active = max(0, state.active - 1)
+        state.tokens = min(float(self.config.burst_size), state.tokens + 1.0)
+        state.pending.appendleft(url)
+        self._pending_count += 1
+        if state.heap_seq < 0:
+            self._schedule(state, state.ready_at(time.monotonic()))
+        self._notify()
+
+    def close(self):
+        """Stop handing out URLs and wake up all waiters"""
+        self._closed = True
+        self._notify()
+
+    def host_key(self, url: str) -> str:
+        """Group URLs by registered domain"""
+        netloc = urlparse(url).netloc.lower()
+        if _domain_extractor is not None:
+            extracted = _domain_extractor(url)
+            if extracted.domain and extracted.suffix:
+                return f"{extracted.domain}.{extracted.suffix}"
+        return netloc.split(':')[0]
+
+    def _get_host_state(self, host: str) -> HostState:
+        """Get or create state for a host"""
+        state = self.hosts.get(host)
+        if state is None:
+            state = HostState(
+                host=host,
+                rate=self.config.requests_per_second,
+                tokens=float(self.config.burst_size),
+                max_concurrent=self.config.max_concurrent_per_host
+            )
+            self.hosts[host] = state
+        return state
+
+    def _pop_ready_url(self) -> Optional[str]:
+        """Pop a URL from the first host that is ready right now"""
+        now = time.monotonic()
+
+        while self._ready_heap and self._ready_heap[0][0] <= now:
+            _, seq, host = heapq.heappop(self._ready_heap)
+            state = self.hosts[host]
+            if seq != state.heap_seq:
+                continue  # Stale entry, host was rescheduled
+            state.heap_seq = -1
+
+            if not state.pending or state.active >= state.max_concurrent:
+                # Re-added by add_urls() or release() when it can make progress
+                continue
+
+            state.refill(now, self.config.burst_size)
+            if state.tokens < 1.0 or state.cooldown_until > now:
+                self._schedule(state, state.ready_at(now))
+                continue
+
+            state.tokens -= 1.0
+            state.active += 1
+            url = state.pending.popleft()
+            self._pending_count -= 1
+
+            if state.pending and state.active < state.max_concurrent:
+                self._schedule(state, state.ready_at(now))
+            return url
+
+        return None
+
+    def _schedule(self, state: HostState, ready_at: float):
+        """Place a host on the ready heap"""
+        seq = next(self._seq)
+        state.heap_seq = seq
+        heapq.heappush(self._ready_heap, (ready_at, seq, state.host))
+
+    def _adapt_rate(self, state: HostState, success: bool, status_code: Optional[int],
+                    latency: Optional[float], retry_after: Optional[float]):
+        """Adjust a host's rate from its own feedback (AIMD)"""
+        old_rate = state.rate
+        now = time.monotonic()
+
+        if status_code in (429, 503):
+            state.throttled_responses += 1
+            state.rate = max(self.config.min_requests_per_second,
+                             state.rate * self.config.throttle_backoff_factor)
+            cooldown = retry_after if retry_after is not None else (
+                self.config.throttle_cooldown_seconds * min(state.throttled_responses, 10)
+            )
+            state.cooldown_until = now + min(cooldown, self.config.max_cooldown_seconds)
+            state.tokens = 0.0
+        elif (status_code is not None and status_code >= 500) or not success:
+            if status_code is not None and status_code >= 500:
+                state.server_errors += 1
+            state.rate = max(self.config.min_requests_per_second,
+                             state.rate * self.config.error_backoff_factor)
+        elif latency is not None and latency > self.config.target_latency_seconds:
+            state.rate = max(self.config.min_requests_per_second, state.rate * 0.9)
+        else:
+            state.rate = min(self.config.max_requests_per_second,
+                             state.rate + self.config.recovery_increment)
+
+        if abs(state.rate - old_rate) / max(old_rate, 1e-6) > 0.25:
+            logger.info(f"Host {state.host} rate adjusted from {old_rate:.2f} to {state.rate:.2f} rps")
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Create the condition lazily so it binds to the running loop"""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _notify(self):
+        """Wake up waiters in next_url()"""
+        if self._condition is None:
+            return
+
+        async def _do_notify():
+            async with self._condition:
+                self._condition.notify_all()
+
+        try:
+            asyncio.get_running_loop().create_task(_do_notify())
+        except RuntimeError:
+            pass
+
+    @property
+    def pending_count(self) -> int:
+        """Number of URLs still waiting to be handed out"""
+        return self._pending_count
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get scheduler statistics"""
+        total = sum(s.total_requests for s in self.hosts.values())
+        successful = sum(s.successful_requests for s in self.hosts.values())
+        slowest = sorted(self.hosts.values(), key=lambda s: s.avg_latency, reverse=True)[:5]
+
+        return {
+            "hosts": len(self.hosts),
+            "pending_urls": self._pending_count,
+            "active_requests": sum(s.active for s in self.hosts.values()),
+            "total_requests": total,
+            "success_rate": successful / max(total, 1),
+            "throttled_responses": sum(s.throttled_responses for s in self.hosts.values()),
+            "server_errors": sum(s.server_errors for s in self.hosts.values()),
+            "hosts_in_cooldown": sum(1 for s in self.hosts.values() if s.cooldown_until > time.monotonic()),
+            "aggregate_rate": sum(s.rate for s in self.hosts.values()),
+            "slowest_hosts": [
+                {"host": s.host, "avg_latency": s.avg_latency, "rate": s.rate}
+                for s in slowest
+            ],
+            "config": self.config.__dict__
+        }
@@ -4,13 +4,22 @@ Token bucket, sliding window, and adaptive rate limiting
 """
 
 import asyncio
+import math
+import sqlite3
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from collections import deque
 import statistics
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -237,33 +246,324 @@ class AdaptiveRateLimiter(RateLimiter):
         return {**base_stats, **adaptive_stats}
 
 
+# Token bucket over one or more keys, taken atomically: the grant is limited
+# by the emptiest bucket and deducted from all of them. Uses the server clock
+# so every node agrees on refill time.
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local requested = tonumber(ARGV[1])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local levels = {}
+local granted = requested
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i])
+    local burst = tonumber(ARGV[2 * i + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if tokens == nil then
+        tokens = burst
+        ts = now
+    end
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    granted = math.min(granted, math.floor(tokens))
+end
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i])
+    local burst = tonumber(ARGV[2 * i + 1])
+    local tokens = levels[i] - granted
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil(burst / rate * 1000) + 1000)
+    if granted == 0 and tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+end
+return {granted, tostring(wait)}
+"""
+
+
+@dataclass
+class BucketSpec:
+    """A shared token bucket: key, refill rate and capacity"""
+    key: str
+    rate: float
+    burst: float
+
+
+def _take_from_buckets(states: Dict[str, List[float]], buckets: List[BucketSpec],
+                       requested: int, now: float) -> Tuple[int, float]:
+    """Token-bucket take over several buckets; ``states`` maps key -> [tokens, ts]"""
+    levels = []
+    granted = requested
+    for bucket in buckets:
+        tokens, ts = states.get(bucket.key, (bucket.burst, now))
+        tokens = min(bucket.burst, tokens + max(0.0, now - ts) * bucket.rate)
+        levels.append(tokens)
+        granted = min(granted, int(math.floor(tokens)))
+    
+    wait = 0.0
+    for bucket, tokens in zip(buckets, levels):
+        tokens -= granted
+        states[bucket.key] = [tokens, now]
+        if granted == 0 and tokens < 1:
+            wait = max(wait, (1 - tokens) / bucket.rate)
+    return granted, wait
+
+
+class RateLimitBackend(ABC):
+    """Shared store that hands out tokens from named buckets atomically"""
+    
+    @abstractmethod
+    async def take(self, buckets: List[BucketSpec], requested: int) -> Tuple[int, float]:
+        """
+        Take up to ``requested`` tokens from every bucket at once
+        
+        Returns (granted, wait): the number of tokens granted, and when none
+        were granted, how long to wait before a token becomes available.
+        """
+        pass
+    
+    async def close(self):
+        """Release backend resources"""
+        pass
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local backend; limiters sharing one instance share budgets (useful for tests)"""
+    
+    def __init__(self):
+        self._states: Dict[str, List[float]] = {}
+        self._lock = asyncio.Lock()
+    
+    async def take(self, buckets: List[BucketSpec], requested: int) -> Tuple[int, float]:
+        async with self._lock:
+            return _take_from_buckets(self._states, buckets, requested, time.time())
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """Backend shared by worker processes on one node through a SQLite file"""
+    
+    def __init__(self, db_path: str = "rate_limits.db", busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, ts REAL NOT NULL)"
+        )
+    
+    async def take(self, buckets: List[BucketSpec], requested: int) -> Tuple[int, float]:
+        return await asyncio.to_thread(self._take_sync, buckets, requested)
+    
+    def _take_sync(self, buckets: List[BucketSpec], requested: int) -> Tuple[int, float]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                keys = [b.key for b in buckets]
+                rows = self._conn.execute(
+                    f"SELECT key, tokens, ts FROM buckets WHERE key IN ({','.join('?' * len(keys))})",
+                    keys
+                ).fetchall()
+                states = {key: [tokens, ts] for key, tokens, ts in rows}
+                granted, wait = _take_from_buckets(states, buckets, requested, time.time())
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, ts) VALUES (?, ?, ?)",
+                    [(key, tokens, ts) for key, (tokens, ts) in states.items()]
+                )
+                self._conn.execute("COMMIT")
+                return granted, wait
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    async def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Backend shared across nodes through Redis, using an atomic Lua script"""
+    
+    def __init__(self, redis_url: str = "redis://localhost:6379/0", client: Any = None):
+        if client is None:
+            if aioredis is None:
+                raise ImportError("RedisRateLimitBackend requires the 'redis' package")
+            client = aioredis.from_url(redis_url)
+        self.client = client
+        self._script = client.register_script(REDIS_TOKEN_BUCKET_SCRIPT)
+    
+    async def take(self, buckets: List[BucketSpec], requested: int) -> Tuple[int, float]:
+        args: List[Any] = [requested]
+        for bucket in buckets:
+            args.extend([bucket.rate, bucket.burst])
+        granted, wait = await self._script(keys=[b.key for b in buckets], args=args)
+        return int(granted), float(wait)
+    
+    async def close(self):
+        await self.client.close()
+
+
+@dataclass
+class DistributedRateLimitConfig(RateLimitConfig):
+    """Configuration for the distributed rate limiter"""
+    namespace: str = "crawl4ai:ratelimit"
+    per_host_requests_per_second: Optional[float] = None
+    per_host_burst_size: int = 4
+    lease_size: int = 5
+    lease_ttl_seconds: float = 1.0
+
+
+@dataclass
+class TokenLease:
+    """Tokens taken from the shared backend and held locally"""
+    tokens: int
+    expires_at: float
+
+
 class DistributedRateLimiter(RateLimiter):
-    """Distributed rate limiter using Redis-like backend (simplified)"""
+    """
+    Rate limiter that enforces global and per-host budgets across processes and nodes
+    
+    Tokens are taken atomically from a shared RateLimitBackend (Redis, a
+    SQLite file, or an in-process fake). To avoid a round trip per request,
+    each instance leases up to ``lease_size`` tokens at a time and spends
+    them locally until they expire after ``lease_ttl_seconds``. Leased
+    tokens are already deducted from the shared budget, so leasing can
+    only under-use the budget, never overrun it. Requests for the same host
+    are serialized, so they share one lease refill; different hosts go to
+    the backend concurrently.
     
-    def __init__(self, config: RateLimitConfig = None, instance_id: str = None):
+    If the backend is unreachable the limiter falls back to a local token
+    bucket with the same budget.
+    """
+    
+    def __init__(self, config: RateLimitConfig = None, backend: RateLimitBackend = None,
+                 instance_id: str = None):
+        config = config or DistributedRateLimitConfig()
+        if not isinstance(config, DistributedRateLimitConfig):
+            config = DistributedRateLimitConfig(**config.__dict__)
         super().__init__(config)
         self.instance_id = instance_id or f"instance_{time.time()}"
+        self.backend = backend or InMemoryRateLimitBackend()
         self.local_limiter = TokenBucketLimiter(config)
+        self._leases: Dict[Optional[str], TokenLease] = {}
+        self._host_locks: Dict[Optional[str], asyncio.Lock] = {}
         
-        # In a real implementation, this would connect to Redis/database
-        self.shared_state = {}
+        # Statistics
+        self.backend_round_trips = 0
+        self.lease_hits = 0
+        self.backend_errors = 0
+        self.expired_tokens = 0
+        self._wait_hints: Dict[Optional[str], float] = {}
     
-    async def acquire(self, tokens: int = 1) -> bool:
-        """Acquire with distributed coordination"""
-        # For this simplified version, we'll just use local limiting
-        # In production, this would coordinate with other instances via Redis
+    async def acquire(self, tokens: int = 1, host: Optional[str] = None) -> bool:
+        """Acquire tokens from the global budget and, if given, the host's budget"""
+        lock = self._host_locks.get(host)
+        if lock is None:
+            lock = self._host_locks[host] = asyncio.Lock()
         
-        result = await self.local_limiter.acquire(tokens)
-        
-        self.total_requests = self.local_limiter.total_requests
-        self.denied_requests = self.local_limiter.denied_requests
-        
-        return result
+        async with lock:
+            self.total_requests += 1
+            now = time.time()
+            
+            lease = self._leases.get(host)
+            if lease and lease.expires_at <= now:
+                self.expired_tokens += lease.tokens
+                lease = None
+                self._leases.pop(host, None)
+            
+            if lease and lease.tokens >= tokens:
+                lease.tokens -= tokens
+                self.lease_hits += 1
+                self._record_grant(now)
+                return True
+            
+            held = lease.tokens if lease else 0
+            requested = max(tokens - held, min(self.config.lease_size, self._max_lease(host)))
+            try:
+                self.backend_round_trips += 1
+                granted, wait = await self.backend.take(self._buckets(host), requested)
+            except Exception as e:
+                self.backend_errors += 1
+                logger.warning(f"Rate limit backend unavailable, using local budget: {e}")
+                allowed = await self.local_limiter.acquire(tokens)
+                if allowed:
+                    self._record_grant(now)
+                else:
+                    self.denied_requests += 1
+                return allowed
+            
+            available = held + granted
+            if available >= tokens:
+                self._leases[host] = TokenLease(
+                    tokens=available - tokens,
+                    expires_at=now + self.config.lease_ttl_seconds
+                )
+                self._record_grant(now)
+                return True
+            
+            # Keep partial grants for the next attempt
+            if available > 0:
+                self._leases[host] = TokenLease(tokens=available, expires_at=now + self.config.lease_ttl_seconds)
+            self._wait_hints[host] = wait
+            self.denied_requests += 1
+            return False
     
-    def _sync_with_distributed_state(self):
-        """Sync with distributed rate limiting state"""
-        # This would implement Redis Lua scripts for atomic operations
-        pass
+    async def wait_for_tokens(self, tokens: int = 1, host: Optional[str] = None) -> None:
+        """Wait until tokens are available"""
+        while not await self.acquire(tokens, host):
+            wait_time = self._wait_hints.get(host) or tokens / self.config.requests_per_second
+            await asyncio.sleep(min(max(wait_time, 0.01), 1.0))
+    
+    def _buckets(self, host: Optional[str]) -> List[BucketSpec]:
+        """Shared buckets that a request for ``host`` draws from"""
+        buckets = [BucketSpec(
+            key=f"{self.config.namespace}:global",
+            rate=self.config.requests_per_second,
+            burst=self.config.burst_size
+        )]
+        if host and self.config.per_host_requests_per_second:
+            buckets.append(BucketSpec(
+                key=f"{self.config.namespace}:host:{host}",
+                rate=self.config.per_host_requests_per_second,
+                burst=self.config.per_host_burst_size
+            ))
+        return buckets
+    
+    def _max_lease(self, host: Optional[str]) -> int:
+        """Never lease more than a bucket's burst"""
+        return max(1, int(min(b.burst for b in self._buckets(host))))
+    
+    def _record_grant(self, now: float):
+        """Track a granted request"""
+        self.request_times.append(now)
+        minute_ago = now - 60
+        while self.request_times and self.request_times[0] < minute_ago:
+            self.request_times.popleft()
+    
+    async def close(self):
+        """Close the backend"""
+        await self.backend.close()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get statistics including leasing efficiency"""
+        base_stats = super().get_statistics()
+        granted = self.total_requests - self.denied_requests
+        
+        return {
+            **base_stats,
+            "instance_id": self.instance_id,
+            "backend": self.backend.__class__.__name__,
+            "backend_round_trips": self.backend_round_trips,
+            "lease_hits": self.lease_hits,
+            "lease_hit_rate": self.lease_hits / max(granted, 1),
+            "backend_errors": self.backend_errors,
+            "expired_tokens": self.expired_tokens,
+            "held_tokens": sum(lease.tokens for lease in self._leases.values())
+        }
 
 
 # Usage example and testing
@@ -0,0 +1,196 @@
+"""
+Result Sinks
+Destinations that consume crawl results as they stream in, so nothing accumulates in memory
+"""
+
+import asyncio
+import json
+import time
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import asdict, is_dataclass
+from typing import Dict, Any, List, Optional, Callable, Union, Awaitable
+
+logger = logging.getLogger(__name__)
+
+
+def _to_record(result: Any) -> Dict[str, Any]:
+    """Convert a result (dict, dataclass or exception) to a plain dict"""
+    if isinstance(result, dict):
+        return result
+    if is_dataclass(result) and not isinstance(result, type):
+        return asdict(result)
+    if isinstance(result, Exception):
+        return {"success": False, "error": str(result)}
+    return {"result": result}
+
+
+class ResultSink(ABC):
+    """Base class for streaming result sinks"""
+
+    def __init__(self):
+        self.written = 0
+        self.failed = 0
+
+    @abstractmethod
+    async def write(self, result: Any):
+        """Consume a single result"""
+        pass
+
+    async def close(self):
+        """Flush and release resources"""
+        pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get sink statistics"""
+        return {
+            "sink": self.__class__.__name__,
+            "written": self.written,
+            "failed": self.failed
+        }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class JSONLFileSink(ResultSink):
+    """
+    Append results to a JSON Lines file
+
+    Results are serialized on the event loop and buffered; every
+    ``flush_every`` lines the buffer is written and flushed in a worker
+    thread, so file I/O never blocks the loop.
+    """
+
+    def __init__(self, filepath: str, flush_every: int = 100):
+        super().__init__()
+        self.filepath = filepath
+        self.flush_every = flush_every
+        self._file = None
+        self._buffer: List[str] = []
+        self._io_lock = asyncio.Lock()  # Keeps batches in order
+
+    async def write(self, result: Any):
+        """Append one result as a JSON line"""
+        try:
+            self._buffer.append(json.dumps(_to_record(result), default=str) + "\n")
+            self.written += 1
+        except (TypeError, ValueError) as e:
+            self.failed += 1
+            logger.error(f"Failed to serialize result for {self.filepath}: {e}")
+            return
+
+        if len(self._buffer) >= self.flush_every:
+            await self._write_buffer()
+
+    async def _write_buffer(self):
+        """Write and flush buffered lines in a worker thread"""
+        async with self._io_lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            await asyncio.to_thread(self._write_lines, lines)
+
+    def _write_lines(self, lines: List[str]):
+        if self._file is None:
+            self._file = open(self.filepath, "a", encoding="utf-8")
+        self._file.writelines(lines)
+        self._file.flush()
+
+    async def close(self):
+        """Write pending lines and close the file"""
+        await self._write_buffer()
+        async with self._io_lock:
+            if self._file is not None:
+                await asyncio.to_thread(self._file.close)
+                self._file = None
+
+
+class CallbackSink(ResultSink):
+    """Hand each result to a sync or async callback"""
+
+    def __init__(self, callback: Callable[[Any], Union[None, Awaitable[None]]]):
+        super().__init__()
+        self.callback = callback
+
+    async def write(self, result: Any):
+        """Invoke the callback with one result"""
+        try:
+            outcome = self.callback(result)
+            if asyncio.iscoroutine(outcome):
+                await outcome
+            self.written += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Result callback failed: {e}")
+
+
+class ExternalAPISink(ResultSink):
+    """Forward results to ExternalAPIService destinations"""
+
+    def __init__(self, api_service: Any, destinations: List[str] = None,
+                 max_pending: int = 10):
+        super().__init__()
+        self.api_service = api_service
+        self.destinations = destinations or ["webhook"]
+        self._semaphore = asyncio.Semaphore(max_pending)
+        self._pending: set = set()
+
+    async def write(self, result: Any):
+        """Send one result, keeping at most ``max_pending`` requests in flight"""
+        await self._semaphore.acquire()
+        task = asyncio.create_task(self._send(_to_record(result)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, record: Dict[str, Any]):
+        """Send a record and track the outcome"""
+        try:
+            payload = dict(record)
+            payload.setdefault("extracted_data", payload.get("data", {}))
+            responses = await self.api_service.send_extraction_results(payload, self.destinations)
+            if responses and all(r.success for r in responses.values()):
+                self.written += 1
+            else:
+                self.failed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Failed to forward result to external APIs: {e}")
+        finally:
+            self._semaphore.release()
+
+    async def close(self):
+        """Wait for in-flight requests"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+
+class MultiSink(ResultSink):
+    """Fan results out to several sinks"""
+
+    def __init__(self, sinks: List[ResultSink]):
+        super().__init__()
+        self.sinks = sinks
+
+    async def write(self, result: Any):
+        """Write one result to every sink"""
+        for sink in self.sinks:
+            await sink.write(result)
+        self.written += 1
+
+    async def close(self):
+        """Close every sink"""
+        for sink in self.sinks:
+            await sink.close()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get statistics for every sink"""
+        return {
+            "sink": "MultiSink",
+            "written": self.written,
+            "sinks": [sink.get_statistics() for sink in self.sinks],
+            "timestamp": time.time()
+        }
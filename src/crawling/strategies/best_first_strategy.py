@@ -5,8 +5,9 @@ Prioritizes URLs based on quality scores and strategic importance
 
 import asyncio
 import heapq
+import time
 from typing import List, Set, Dict, Any, Optional
-from .base_strategy import DeepCrawlStrategy, CrawlResult, DeepCrawlConfig
+from .base_strategy import DeepCrawlStrategy, CrawlResult, DeepCrawlConfig, FrontierEntry
 from .scorers import URLScorer, CommonScorers, ScoringEngine
 
 class BestFirstCrawlStrategy(DeepCrawlStrategy):
@@ -36,6 +37,8 @@ class BestFirstCrawlStrategy(DeepCrawlStrategy):
         self.priority_queue: List[tuple] = []
         self.url_scores: Dict[str, float] = {}
         self.discovery_context: Dict[str, Any] = {}
+        # In-flight tasks of the concurrent mode: task -> (queue entry, host)
+        self._in_flight: Dict[asyncio.Task, tuple] = {}
         
     async def crawl(self, starting_url: str) -> List[CrawlResult]:
         """
@@ -54,6 +57,7 @@ class BestFirstCrawlStrategy(DeepCrawlStrategy):
         
         # Initialize with starting URL
         normalized_start_url = self._normalize_url(starting_url)
+        self._begin_job(normalized_start_url)
         start_score = self.scorer.score_url(normalized_start_url, {"depth": 0})
         
         heapq.heappush(self.priority_queue, (
@@ -64,9 +68,38 @@ class BestFirstCrawlStrategy(DeepCrawlStrategy):
             {"is_starting_url": True}
         ))
         
-        self.visited_urls.add(normalized_start_url)
+        self._mark_seen(normalized_start_url)
         self.url_scores[normalized_start_url] = start_score
         
+        return await self._run()
+    
+    async def resume(self, job_id: str) -> List[CrawlResult]:
+        """Resume a checkpointed Best-First crawl and return all crawled pages"""
+        for entry in self._restore_job(job_id):
+            heapq.heappush(self.priority_queue, (
+                -entry.priority,
+                entry.url,
+                entry.depth,
+                entry.parent_url,
+                entry.context
+            ))
+            self.url_scores[entry.url] = entry.priority
+        
+        return await self._run()
+    
+    async def _run(self) -> List[CrawlResult]:
+        """Crawl the current priority queue until it is empty or limits are reached"""
+        if self.config.max_concurrent > 1:
+            await self._crawl_concurrent()
+        else:
+            await self._crawl_sequential()
+        
+        await self._finish_job()
+        self.logger.info(f"Best-First crawl complete. Crawled {len(self.crawled_pages)} pages")
+        return self.crawled_pages
+    
+    async def _crawl_sequential(self):
+        """Crawl one URL at a time in strict priority order"""
         crawl_iteration = 0
         
         # Process URLs by priority
@@ -81,64 +114,175 @@ class BestFirstCrawlStrategy(DeepCrawlStrategy):
             
             # Crawl current URL
             result = await self._crawl_single_page(current_url, current_depth, parent_url)
-            self.crawled_pages.append(result)
+            self._store_page(result)
             crawl_iteration += 1
             
-            # Update discovery context based on results
-            self._update_discovery_context(result, context)
+            await self._process_page_result(result, current_score, context, crawl_iteration)
+            await self._maybe_checkpoint()
             
-            # If successful and within depth limit, score and queue discovered links
-            if (result.success and 
-                current_depth < self.config.max_depth and
-                len(self.crawled_pages) < self.config.max_pages):
+            # Add delay between requests if configured
+            if self.config.delay_between_requests > 0:
+                await asyncio.sleep(self.config.delay_between_requests)
+    
+    async def _crawl_concurrent(self):
+        """
+        Keep up to max_concurrent top-scored URLs in flight
+        
+        As each page completes its links are scored and pushed onto the heap,
+        and the freed slot goes to the best URL whose host is ready. Per-host
+        politeness (concurrency cap and delay_between_requests spacing) may
+        skip a few higher-scored URLs, so priority order is approximate.
+        """
+        in_flight = self._in_flight
+        host_active: Dict[str, int] = {}
+        host_next_start: Dict[str, float] = {}
+        crawl_iteration = 0
+        
+        try:
+            while self.priority_queue or in_flight:
+                next_ready_at = self._fill_concurrent_slots(in_flight, host_active, host_next_start)
                 
-                # Score discovered links
-                discovered_links = [link for link in result.links 
-                                  if self._should_crawl_url(link, current_depth + 1)]
+                if not in_flight:
+                    if next_ready_at is None:
+                        break
+                    # Every queued URL is waiting on host politeness
+                    await asyncio.sleep(max(0.0, next_ready_at - time.monotonic()))
+                    continue
                 
-                if discovered_links:
-                    # Create context for scoring
-                    scoring_context = {
-                        "depth": current_depth + 1,
-                        "parent_url": current_url,
-                        "parent_score": current_score,
-                        "discovery_context": self.discovery_context,
-                        "crawl_iteration": crawl_iteration
-                    }
-                    
-                    # Score all discovered links
-                    link_scores = self.scoring_engine.score_urls(discovered_links, scoring_context)
-                    
-                    # Add high-scoring links to priority queue
-                    added_count = 0
-                    for link, score in link_scores.items():
-                        if link not in self.visited_urls:
-                            # Apply score boost based on parent quality
-                            boosted_score = self._apply_score_boost(score, current_score, scoring_context)
-                            
-                            heapq.heappush(self.priority_queue, (
-                                -boosted_score,
-                                link,
-                                current_depth + 1,
-                                current_url,
-                                {"parent_score": current_score, "original_score": score}
-                            ))
-                            
-                            self.visited_urls.add(link)
-                            self.url_scores[link] = boosted_score
-                            added_count += 1
+                timeout = None
+                if next_ready_at is not None:
+                    timeout = max(0.0, next_ready_at - time.monotonic())
+                done, _ = await asyncio.wait(in_flight.keys(), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    entry, host = in_flight.pop(task)
+                    current_score, context = -entry[0], entry[4]
+                    host_active[host] -= 1
                     
-                    self.logger.info(f"Added {added_count} high-scoring URLs to queue. Queue size: {len(self.priority_queue)}")
+                    result = task.result()
+                    self._store_page(result)
+                    crawl_iteration += 1
                     
-                    # Prune queue if it gets too large
-                    await self._prune_queue_if_needed()
+                    self.logger.info(f"Iteration {crawl_iteration}: Crawled {result.url} (score: {current_score:.3f}, depth: {result.depth})")
+                    await self._process_page_result(result, current_score, context, crawl_iteration)
+                
+                await self._maybe_checkpoint()
+        finally:
+            # Don't leave page fetches running after a failure or cancellation
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+    
+    def _fill_concurrent_slots(self, in_flight: Dict[asyncio.Task, tuple],
+                               host_active: Dict[str, int],
+                               host_next_start: Dict[str, float]) -> Optional[float]:
+        """
+        Start the best ready URLs until all slots are used
+        
+        Returns the earliest time a deferred host becomes ready, or None.
+        """
+        deferred = []
+        next_ready_at = None
+        now = time.monotonic()
+        
+        while (self.priority_queue and
+               len(in_flight) < self.config.max_concurrent and
+               len(self.crawled_pages) + len(in_flight) < self.config.max_pages and
+               len(deferred) < self.config.max_concurrent * 10):
             
-            # Add delay between requests if configured
-            if self.config.delay_between_requests > 0:
-                await asyncio.sleep(self.config.delay_between_requests)
+            entry = heapq.heappop(self.priority_queue)
+            neg_score, url, depth, parent_url, context = entry
+            host = self._extract_domain(url)
+            
+            if host_active.get(host, 0) >= self.config.max_concurrent_per_host:
+                deferred.append(entry)
+                continue
+            
+            ready_at = host_next_start.get(host, 0.0)
+            if ready_at > now:
+                deferred.append(entry)
+                next_ready_at = ready_at if next_ready_at is None else min(next_ready_at, ready_at)
+                continue
+            
+            host_active[host] = host_active.get(host, 0) + 1
+            host_next_start[host] = now + self.config.delay_between_requests
+            
+            task = asyncio.create_task(self._crawl_single_page(url, depth, parent_url))
+            in_flight[task] = (entry, host)
         
-        self.logger.info(f"Best-First crawl complete. Crawled {len(self.crawled_pages)} pages")
-        return self.crawled_pages
+        for entry in deferred:
+            heapq.heappush(self.priority_queue, entry)
+        
+        if len(self.crawled_pages) + len(in_flight) >= self.config.max_pages:
+            return None
+        return next_ready_at
+    
+    async def _process_page_result(self, result: CrawlResult, current_score: float,
+                                   context: Dict[str, Any], crawl_iteration: int):
+        """Update discovery context and queue scored links from a crawled page"""
+        current_url = result.url
+        current_depth = result.depth
+        
+        # Update discovery context based on results
+        self._update_discovery_context(result, context)
+        
+        # If successful and within depth limit, score and queue discovered links
+        if (result.success and 
+            current_depth < self.config.max_depth and
+            len(self.crawled_pages) < self.config.max_pages):
+            
+            # Score discovered links
+            discovered_links = [link for link in result.links 
+                              if self._should_crawl_url(link, current_depth + 1)]
+            
+            if discovered_links:
+                # Create context for scoring
+                scoring_context = {
+                    "depth": current_depth + 1,
+                    "parent_url": current_url,
+                    "parent_score": current_score,
+                    "discovery_context": self.discovery_context,
+                    "crawl_iteration": crawl_iteration
+                }
+                
+                # Score all discovered links
+                link_scores = self.scoring_engine.score_urls(discovered_links, scoring_context)
+                
+                # Add high-scoring links to priority queue
+                added_count = 0
+                for link, score in link_scores.items():
+                    if link not in self.visited_urls:
+                        # Apply score boost based on parent quality
+                        boosted_score = self._apply_score_boost(score, current_score, scoring_context)
+                        
+                        heapq.heappush(self.priority_queue, (
+                            -boosted_score,
+                            link,
+                            current_depth + 1,
+                            current_url,
+                            {"parent_score": current_score, "original_score": score}
+                        ))
+                        
+                        self._mark_seen(link)
+                        self.url_scores[link] = boosted_score
+                        added_count += 1
+                
+                self.logger.info(f"Added {added_count} high-scoring URLs to queue. Queue size: {len(self.priority_queue)}")
+                
+                # Prune queue if it gets too large
+                await self._prune_queue_if_needed()
+    
+    def _frontier_snapshot(self) -> List[FrontierEntry]:
+        """In-flight pages first, then the queue in priority order"""
+        entries = [entry for entry, _ in self._in_flight.values()]
+        entries.extend(sorted(self.priority_queue, key=lambda e: e[0]))
+        return [
+            FrontierEntry(url=url, depth=depth, parent_url=parent_url,
+                          priority=-neg_score, context=context)
+            for neg_score, url, depth, parent_url, context in entries
+        ]
     
     def _update_discovery_context(self, result: CrawlResult, context: Dict[str, Any]):
         """Update discovery context based on crawl results"""
@@ -163,14 +307,14 @@ class BestFirstCrawlStrategy(DeepCrawlStrategy):
         if "quality_scores" not in self.discovery_context:
             self.discovery_context["quality_scores"] = []
         
-        content_quality = len(result.content) / 1000  # Simple quality metric
+        content_quality = self._content_length(result) / 1000  # Simple quality metric
         self.discovery_context["quality_scores"].append(content_quality)
         
         # Track link density
         if "link_densities" not in self.discovery_context:
             self.discovery_context["link_densities"] = []
         
-        link_density = len(result.links) / max(len(result.content), 1) * 1000
+        link_density = len(result.links) / max(self._content_length(result), 1) * 1000
         self.discovery_context["link_densities"].append(link_density)
         
     def _apply_score_boost(self, base_score: float, parent_score: float, context: Dict[str, Any]) -> float:
@@ -247,7 +391,7 @@ class BestFirstCrawlStrategy(DeepCrawlStrategy):
                     "url": r.url,
                     "title": r.title,
                     "score": self.url_scores.get(r.url, 0.0),
-                    "content_length": len(r.content),
+                    "content_length": self._content_length(r),
                     "links_found": len(r.links)
                 }
                 for r in best_pages
@@ -292,7 +436,7 @@ class BestFirstCrawlStrategy(DeepCrawlStrategy):
                     "url": result.url,
                     "score": score,
                     "depth": result.depth,
-                    "content_quality": len(result.content) / 1000
+                    "content_quality": self._content_length(result) / 1000
                 })
         
         # Analyze adaptation patterns
@@ -4,14 +4,16 @@ Explores websites level by level, discovering site structure systematically
 """
 
 import asyncio
-from typing import List, Set
-from .base_strategy import DeepCrawlStrategy, CrawlResult, DeepCrawlConfig
+import heapq
+import itertools
+from typing import List, Set, Dict, Tuple, AsyncIterator
+from .base_strategy import DeepCrawlStrategy, CrawlResult, DeepCrawlConfig, FrontierEntry
 
 class BFSDeepCrawlStrategy(DeepCrawlStrategy):
     """
     Breadth-First Search deep crawling strategy
     
-    Explores websites level by level:
+    Explores websites in breadth-first order:
     - Level 0: Starting URL
     - Level 1: All links from starting URL  
     - Level 2: All links from Level 1 pages
@@ -25,19 +27,42 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
     
     def __init__(self, config: DeepCrawlConfig = None):
         super().__init__(config)
-        self.current_level_urls: List[str] = []
-        self.next_level_urls: List[str] = []
+        # Pending URLs ordered by (depth, discovery order)
+        self.frontier: List[Tuple[int, int, str, str]] = []
+        self._discovery_seq = itertools.count()
+        self._in_flight: Dict[asyncio.Task, Tuple[str, int, str]] = {}
         
     async def crawl(self, starting_url: str) -> List[CrawlResult]:
         """
         Perform BFS crawling starting from the given URL
         
+        Returns the full list of crawled pages once the crawl completes. Use
+        crawl_stream() to consume results as they arrive.
+        """
+        async for _ in self.crawl_stream(starting_url):
+            pass
+        return self.crawled_pages
+    
+    async def resume(self, job_id: str) -> List[CrawlResult]:
+        """Resume a checkpointed BFS crawl and return all crawled pages"""
+        async for _ in self.resume_stream(job_id):
+            pass
+        return self.crawled_pages
+    
+    async def crawl_stream(self, starting_url: str) -> AsyncIterator[CrawlResult]:
+        """
+        Perform pipelined BFS crawling, yielding results as pages complete
+        
         Algorithm:
         1. Start with initial URL at depth 0
-        2. Crawl all URLs at current depth level in parallel
-        3. Collect all links from crawled pages  
-        4. Move to next depth level
-        5. Repeat until max depth or max pages reached
+        2. Keep up to max_concurrent pages in flight, always starting the
+           shallowest pending URL first
+        3. As soon as a page completes, queue its links at depth + 1
+        4. Repeat until the frontier is empty or max pages reached
+        
+        There is no barrier between levels, so one slow page never idles the
+        other workers. Every started page counts against max_pages, which
+        makes the page count exact.
         """
         
         self.logger.info(f"Starting BFS crawl from: {starting_url}")
@@ -45,116 +70,121 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
         
         # Initialize with starting URL
         normalized_start_url = self._normalize_url(starting_url)
-        self.current_level_urls = [normalized_start_url]
-        self.visited_urls.add(normalized_start_url)
-        
-        current_depth = 0
+        self._begin_job(normalized_start_url)
+        self._mark_seen(normalized_start_url)
+        self._push_frontier(normalized_start_url, 0, "")
         
-        # Process each depth level
-        while (self.current_level_urls and 
-               current_depth <= self.config.max_depth and 
-               len(self.crawled_pages) < self.config.max_pages):
-            
-            self.logger.info(f"Processing depth {current_depth} with {len(self.current_level_urls)} URLs")
-            
-            # Crawl all URLs at current depth in parallel
-            level_results = await self._crawl_level(self.current_level_urls, current_depth)
-            
-            # Add results to our collection
-            self.crawled_pages.extend(level_results)
-            
-            # Collect URLs for next level
-            self.next_level_urls = []
-            for result in level_results:
-                if result.success:
-                    # Add all discovered links for next level
-                    for link in result.links:
-                        if self._should_crawl_url(link, current_depth + 1):
-                            self.next_level_urls.append(link)
-                            self.visited_urls.add(link)
-            
-            # Remove duplicates from next level
-            self.next_level_urls = list(dict.fromkeys(self.next_level_urls))
-            
-            # Limit next level size to respect max_pages limit
-            remaining_pages = self.config.max_pages - len(self.crawled_pages)
-            if len(self.next_level_urls) > remaining_pages:
-                self.next_level_urls = self.next_level_urls[:remaining_pages]
-            
-            self.logger.info(f"Depth {current_depth} complete. Found {len(self.next_level_urls)} URLs for next level")
-            
-            # Move to next level
-            self.current_level_urls = self.next_level_urls
-            current_depth += 1
-            
-            # Add delay between levels if configured
-            if self.config.delay_between_requests > 0 and self.current_level_urls:
-                await asyncio.sleep(self.config.delay_between_requests)
+        async for result in self._run_pipeline():
+            yield result
+    
+    async def resume_stream(self, job_id: str) -> AsyncIterator[CrawlResult]:
+        """Resume a checkpointed BFS crawl, yielding only newly crawled pages"""
+        for entry in self._restore_job(job_id):
+            self._push_frontier(entry.url, entry.depth, entry.parent_url)
         
-        self.logger.info(f"BFS crawl complete. Crawled {len(self.crawled_pages)} pages")
-        return self.crawled_pages
+        async for result in self._run_pipeline():
+            yield result
     
-    async def _crawl_level(self, urls: List[str], depth: int) -> List[CrawlResult]:
-        """
-        Crawl all URLs at a specific depth level in parallel
-        """
-        if not urls:
-            return []
-        
-        # Create semaphore to limit concurrent requests
-        semaphore = asyncio.Semaphore(self.config.max_concurrent)
-        
-        async def crawl_with_semaphore(url: str) -> CrawlResult:
-            async with semaphore:
-                # Determine parent URL for tracking
-                parent_url = ""
-                if depth > 0 and self.crawled_pages:
-                    # Find a parent from previous level that links to this URL
-                    for prev_result in reversed(self.crawled_pages):
-                        if url in prev_result.links:
-                            parent_url = prev_result.url
-                            break
+    async def _run_pipeline(self) -> AsyncIterator[CrawlResult]:
+        """Run the pipelined crawl loop over the current frontier"""
+        in_flight = self._in_flight
+        
+        try:
+            while self.frontier or in_flight:
+                # Fill free slots with the shallowest pending URLs
+                while (self.frontier and
+                       len(in_flight) < self.config.max_concurrent and
+                       len(self.crawled_pages) + len(in_flight) < self.config.max_pages):
+                    depth, _, url, parent_url = heapq.heappop(self.frontier)
+                    task = asyncio.create_task(self._crawl_with_delay(url, depth, parent_url))
+                    in_flight[task] = (url, depth, parent_url)
                 
-                result = await self._crawl_single_page(url, depth, parent_url)
+                if not in_flight:
+                    break
                 
-                # Add delay between individual requests if configured
-                if self.config.delay_between_requests > 0:
-                    await asyncio.sleep(self.config.delay_between_requests)
+                done, _ = await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
                 
-                return result
+                for task in done:
+                    url, depth, _ = in_flight.pop(task)
+                    result = self._task_result(task, url, depth)
+                    self._store_page(result)
+                    self._queue_links(result)
+                    yield result
+                
+                self._prune_frontier(len(in_flight))
+                await self._maybe_checkpoint()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight.keys(), return_exceptions=True)
+            in_flight.clear()
         
-        # Create tasks for all URLs in this level
-        tasks = [crawl_with_semaphore(url) for url in urls]
+        await self._finish_job()
+        self.logger.info(f"BFS crawl complete. Crawled {len(self.crawled_pages)} pages")
+    
+    async def _crawl_with_delay(self, url: str, depth: int, parent_url: str) -> CrawlResult:
+        """Crawl a page and hold its slot for the configured delay"""
+        result = await self._crawl_single_page(url, depth, parent_url)
         
-        # Execute all tasks in parallel
-        try:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results and handle any exceptions
-            level_results = []
-            for url, result in zip(urls, results):
-                if isinstance(result, Exception):
-                    self.logger.error(f"Exception crawling {url}: {result}")
-                    # Create failed result
-                    failed_result = CrawlResult(
-                        url=url,
-                        success=False,
-                        depth=depth,
-                        error=str(result)
-                    )
-                    level_results.append(failed_result)
-                else:
-                    level_results.append(result)
-            
-            return level_results
-            
-        except Exception as e:
-            self.logger.error(f"Failed to crawl level {depth}: {e}")
-            # Return failed results for all URLs in this level
-            return [
-                CrawlResult(url=url, success=False, depth=depth, error=str(e))
-                for url in urls
-            ]
+        # Add delay between individual requests if configured
+        if self.config.delay_between_requests > 0:
+            await asyncio.sleep(self.config.delay_between_requests)
+        
+        return result
+    
+    def _task_result(self, task: asyncio.Task, url: str, depth: int) -> CrawlResult:
+        """Get a task's CrawlResult, converting exceptions into failed results"""
+        exception = task.exception()
+        if exception is None:
+            return task.result()
+        
+        self.logger.error(f"Exception crawling {url}: {exception}")
+        return CrawlResult(
+            url=url,
+            success=False,
+            depth=depth,
+            error=str(exception)
+        )
+    
+    def _queue_links(self, result: CrawlResult):
+        """Queue the links of a completed page at the next depth"""
+        if not result.success:
+            return
+        
+        next_depth = result.depth + 1
+        for link in result.links:
+            if self._should_crawl_url(link, next_depth):
+                self._mark_seen(link)
+                self._push_frontier(link, next_depth, result.url)
+    
+    def _push_frontier(self, url: str, depth: int, parent_url: str):
+        """Add a URL to the frontier"""
+        heapq.heappush(self.frontier, (depth, next(self._discovery_seq), url, parent_url))
+    
+    def _frontier_snapshot(self) -> List[FrontierEntry]:
+        """In-flight pages first, then the frontier in crawl order"""
+        entries = [
+            FrontierEntry(url=url, depth=depth, parent_url=parent_url, priority=depth)
+            for url, depth, parent_url in self._in_flight.values()
+        ]
+        entries.extend(
+            FrontierEntry(url=url, depth=depth, parent_url=parent_url, priority=depth)
+            for depth, _, url, parent_url in sorted(self.frontier)
+        )
+        return entries
+    
+    def _prune_frontier(self, in_flight_count: int):
+        """
+        Drop frontier entries that can never be crawled
+        
+        Each pick takes the shallowest entry, so anything ranked beyond the
+        remaining page budget is unreachable and only costs memory.
+        """
+        remaining = self.config.max_pages - len(self.crawled_pages) - in_flight_count
+        if len(self.frontier) > max(2 * remaining, self.config.max_concurrent):
+            self.frontier = heapq.nsmallest(max(remaining, 0), self.frontier)
+            heapq.heapify(self.frontier)
     
     def get_site_map(self) -> dict:
         """
@@ -4,8 +4,28 @@ Explores websites by going deep into specific paths before exploring breadth
 """
 
 import asyncio
-from typing import List, Set, Dict, Any
-from .base_strategy import DeepCrawlStrategy, CrawlResult, DeepCrawlConfig
+from typing import List, Set, Dict, Any, Optional, Tuple
+from .base_strategy import DeepCrawlStrategy, CrawlResult, DeepCrawlConfig, FrontierEntry
+
+
+class PathNode:
+    """Parent-pointer node; siblings share their ancestors instead of copying the path"""
+    __slots__ = ("url", "parent")
+    
+    def __init__(self, url: str, parent: Optional["PathNode"] = None):
+        self.url = url
+        self.parent = parent
+    
+    def to_list(self) -> List[str]:
+        """Reconstruct the path from the root to this node"""
+        path = []
+        node = self
+        while node is not None:
+            path.append(node.url)
+            node = node.parent
+        path.reverse()
+        return path
+
 
 class DFSDeepCrawlStrategy(DeepCrawlStrategy):
     """
@@ -25,8 +45,9 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
     
     def __init__(self, config: DeepCrawlConfig = None):
         super().__init__(config)
-        self.crawl_stack: List[Dict[str, Any]] = []  # Stack for DFS traversal
-        self.path_history: List[str] = []  # Track current path
+        self.crawl_stack: List[Tuple[int, PathNode]] = []  # Stack of (depth, path node)
+        self.current_node: Optional[PathNode] = None  # Node of the page being crawled
+        self._max_stack_size = 0
         
     async def crawl(self, starting_url: str) -> List[CrawlResult]:
         """
@@ -44,31 +65,42 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
         
         # Initialize with starting URL
         normalized_start_url = self._normalize_url(starting_url)
-        self.crawl_stack.append({
-            "url": normalized_start_url,
-            "depth": 0,
-            "parent_url": "",
-            "path": [normalized_start_url]
-        })
-        self.visited_urls.add(normalized_start_url)
+        self._begin_job(normalized_start_url)
+        self.crawl_stack.append((0, PathNode(normalized_start_url)))
+        self._mark_seen(normalized_start_url)
+        
+        return await self._run()
+    
+    async def resume(self, job_id: str) -> List[CrawlResult]:
+        """
+        Resume a checkpointed DFS crawl and return all crawled pages
+        
+        Restored stack entries only know their direct parent, so paths
+        reported for them start at that parent.
+        """
+        for entry in self._restore_job(job_id):
+            parent = PathNode(entry.parent_url) if entry.parent_url else None
+            self.crawl_stack.append((entry.depth, PathNode(entry.url, parent)))
         
+        return await self._run()
+    
+    async def _run(self) -> List[CrawlResult]:
+        """Crawl the current stack until it is empty or limits are reached"""
         # Process URLs using DFS (stack-based)
         while (self.crawl_stack and 
                len(self.crawled_pages) < self.config.max_pages):
             
             # Pop from stack (LIFO - most recently added first)
-            current_item = self.crawl_stack.pop()
-            current_url = current_item["url"]
-            current_depth = current_item["depth"]
-            current_parent = current_item["parent_url"]
-            current_path = current_item["path"]
+            current_depth, current_node = self.crawl_stack.pop()
+            current_url = current_node.url
+            current_parent = current_node.parent.url if current_node.parent else ""
             
             self.logger.info(f"Crawling depth {current_depth}: {current_url}")
-            self.path_history = current_path
+            self.current_node = current_node
             
             # Crawl current URL
             result = await self._crawl_single_page(current_url, current_depth, current_parent)
-            self.crawled_pages.append(result)
+            self._store_page(result)
             
             # If successful and not at max depth, add discovered links to stack
             if (result.success and 
@@ -76,18 +108,13 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
                 len(self.crawled_pages) < self.config.max_pages):
                 
                 # Add links to stack in reverse order (so first link is processed first)
+                # Every URL on the current path is already visited, so this
+                # also rules out cycles
                 discovered_links = []
                 for link in reversed(result.links):
                     if self._should_crawl_url(link, current_depth + 1):
-                        # Check for cycles in current path
-                        if link not in current_path:
-                            discovered_links.append({
-                                "url": link,
-                                "depth": current_depth + 1,
-                                "parent_url": current_url,
-                                "path": current_path + [link]
-                            })
-                            self.visited_urls.add(link)
+                        discovered_links.append((current_depth + 1, PathNode(link, current_node)))
+                        self._mark_seen(link)
                 
                 # Add to stack (will be processed in LIFO order)
                 self.crawl_stack.extend(discovered_links)
@@ -95,17 +122,34 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
                 # Limit stack size to prevent memory issues
                 max_stack_size = self.config.max_pages * 2
                 if len(self.crawl_stack) > max_stack_size:
-                    self.crawl_stack = self.crawl_stack[-max_stack_size:]
+                    del self.crawl_stack[:-max_stack_size]
+                self._max_stack_size = max(self._max_stack_size, len(self.crawl_stack))
                 
                 self.logger.info(f"Added {len(discovered_links)} URLs to stack. Stack size: {len(self.crawl_stack)}")
             
+            await self._maybe_checkpoint()
+            
             # Add delay between requests if configured
             if self.config.delay_between_requests > 0:
                 await asyncio.sleep(self.config.delay_between_requests)
         
+        await self._finish_job()
         self.logger.info(f"DFS crawl complete. Crawled {len(self.crawled_pages)} pages")
         return self.crawled_pages
     
+    def _frontier_snapshot(self) -> List[FrontierEntry]:
+        """Stack entries from bottom to top"""
+        return [
+            FrontierEntry(url=node.url, depth=depth,
+                          parent_url=node.parent.url if node.parent else "")
+            for depth, node in self.crawl_stack
+        ]
+    
+    @property
+    def path_history(self) -> List[str]:
+        """Path from the starting URL to the page currently being crawled"""
+        return self.current_node.to_list() if self.current_node else []
+    
     def get_crawl_paths(self) -> List[Dict[str, Any]]:
         """
         Get the paths explored during DFS crawling
@@ -126,7 +170,7 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
                     "url": result.url,
                     "title": result.title,
                     "parent_url": result.parent_url,
-                    "content_length": len(result.content),
+                    "content_length": self._content_length(result),
                     "links_found": len(result.links)
                 })
         
@@ -156,7 +200,7 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
                 "final_title": result.title,
                 "depth_reached": result.depth,
                 "path_chain": path_chain,
-                "content_quality": len(result.content) / 1000,  # Simple quality metric
+                "content_quality": self._content_length(result) / 1000,  # Simple quality metric
                 "discovery_value": len(result.links)  # How many new links it provided
             })
         
@@ -166,10 +210,11 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
         """Reconstruct the full path chain to a specific result"""
         chain = []
         current = target_result
+        results_by_url = {r.url: r for r in self.crawled_pages}
         
         # Build chain backwards from target to root
         while current:
-            chain.insert(0, {
+            chain.append({
                 "url": current.url,
                 "title": current.title,
                 "depth": current.depth
@@ -177,12 +222,11 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
             
             # Find parent
             if current.parent_url:
-                parent = next((r for r in self.crawled_pages 
-                             if r.url == current.parent_url), None)
-                current = parent
+                current = results_by_url.get(current.parent_url)
             else:
                 break
         
+        chain.reverse()
         return chain
     
     def get_dfs_statistics(self) -> Dict[str, Any]:
@@ -204,7 +248,7 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
         avg_depth = sum(r.depth for r in successful_results) / len(successful_results) if successful_results else 0
         
         # Stack usage statistics
-        max_stack_size = getattr(self, '_max_stack_size', 0)
+        max_stack_size = self._max_stack_size
         
         dfs_stats = {
             "depth_distribution": depth_distribution,
@@ -240,12 +284,12 @@ class DFSDeepCrawlStrategy(DeepCrawlStrategy):
             
             depth_info = depth_analysis[depth]
             depth_info["page_count"] += 1
-            depth_info["total_content_length"] += len(result.content)
+            depth_info["total_content_length"] += self._content_length(result)
             depth_info["total_links_found"] += len(result.links)
             depth_info["pages"].append({
                 "url": result.url,
                 "title": result.title,
-                "content_length": len(result.content),
+                "content_length": self._content_length(result),
                 "links_count": len(result.links)
             })
         
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Embedding Batcher
+Micro-batching queue that groups concurrent embedding requests into batched calls
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, List, Tuple, Callable, Awaitable
+
+logger = logging.getLogger("embedding_batcher")
+
+EmbedBatchFn = Callable[[List[str], str], Awaitable[List[List[float]]]]
+
+
+class EmbeddingBatcher:
+    """
+    Groups concurrent embed() calls into batched embedding requests
+
+    Requests for the same model are collected until ``max_batch_size`` texts
+    are waiting or ``max_wait_seconds`` has passed since the first one, then
+    sent as one call to ``embed_batch``. Identical texts within a batch are
+    embedded once.
+
+    Usage:
+        batcher = EmbeddingBatcher(service.embed_texts, max_batch_size=32)
+        vectors = await asyncio.gather(*(batcher.embed(t, "nomic-embed-text") for t in texts))
+    """
+
+    def __init__(self, embed_batch: EmbedBatchFn, max_batch_size: int = 32,
+                 max_wait_seconds: float = 0.01):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._flushes: set = set()
+
+        # Statistics
+        self.texts_requested = 0
+        self.texts_embedded = 0
+        self.batches_sent = 0
+
+    async def embed(self, text: str, model: str) -> List[float]:
+        """Queue a text and wait for its embedding"""
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(model, [])
+        pending.append((text, future))
+        self.texts_requested += 1
+
+        if len(pending) >= self.max_batch_size:
+            self._start_flush(model)
+        elif model not in self._timers:
+            self._timers[model] = asyncio.create_task(self._flush_after_wait(model))
+
+        return await future
+
+    async def flush(self):
+        """Send all queued requests now and wait for in-progress batches"""
+        for model in list(self._pending):
+            self._start_flush(model)
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get batching statistics"""
+        return {
+            "texts_requested": self.texts_requested,
+            "texts_embedded": self.texts_embedded,
+            "batches_sent": self.batches_sent,
+            "avg_batch_size": self.texts_embedded / self.batches_sent if self.batches_sent else 0.0,
+            "queued": sum(len(p) for p in self._pending.values())
+        }
+
+    async def _flush_after_wait(self, model: str):
+        await asyncio.sleep(self.max_wait_seconds)
+        self._timers.pop(model, None)
+        self._start_flush(model)
+
+    def _start_flush(self, model: str):
+        """Detach the queued batch for a model and send it in the background"""
+        timer = self._timers.pop(model, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+        batch = self._pending.pop(model, None)
+        if not batch:
+            return
+        task = asyncio.create_task(self._send(model, batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send(self, model: str, batch: List[Tuple[str, asyncio.Future]]):
+        """Embed a batch and resolve its waiters"""
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            try:
+                embeddings = await self.embed_batch(unique_texts, model)
+                if len(embeddings) != len(unique_texts):
+                    raise ValueError(f"Expected {len(unique_texts)} embeddings, got {len(embeddings)}")
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            self.batches_sent += 1
+            self.texts_embedded += len(unique_texts)
+            by_text = dict(zip(unique_texts, embeddings))
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(by_text[text])
+        finally:
+            # Cancellation (or any BaseException) must not leave waiters hanging
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
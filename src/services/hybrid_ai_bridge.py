@@ -8,6 +8,7 @@ import json
 import logging
 from typing import Dict, Any, List, Optional
 from ai_core.core.hybrid_ai_service import HybridAIService, create_production_ai_service
+from ai_core.core.response_cache import make_cache_key
 
 logger = logging.getLogger("hybrid_ai_bridge")
 
@@ -18,6 +19,7 @@ class HybridAIBridge:
     
     def __init__(self, hybrid_service: HybridAIService = None):
         self.hybrid_service = hybrid_service or create_production_ai_service()
+        self.response_cache = self.hybrid_service.response_cache
     
     async def initialize(self) -> bool:
         """Initialize the bridge service"""
@@ -178,6 +180,23 @@ Provide analysis as JSON with these fields:
                                  schema: Dict[str, Any] = None) -> Dict[str, Any]:
         """Extract specific data from HTML using AI"""
         
+        cache_key = make_cache_key(
+            "hybrid_ai", "hybrid_ai", html_content[:4000], schema=schema,
+            instruction=extraction_instruction, kind="extract_data"
+        )
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        result = await self._extract_data_uncached(html_content, extraction_instruction, schema)
+        if isinstance(result, dict) and "error" not in result:
+            self.response_cache.set(cache_key, result)
+        return result
+    
+    async def _extract_data_uncached(self, html_content: str, extraction_instruction: str,
+                                     schema: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run the AI extraction without consulting the response cache"""
+        
         if schema:
             prompt = f"""
 Extract data from this HTML content according to the instruction and schema:
@@ -250,6 +269,7 @@ Return the extracted data in JSON format.
                 "provider_status": provider_status,
                 "health_status": health_status,
                 "total_providers": len(provider_status),
+                "response_cache": self.response_cache.get_statistics(),
                 "healthy_providers": len([p for p in health_status.values() if p.get('status') == 'healthy'])
             }
         except Exception as e:
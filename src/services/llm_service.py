@@ -12,6 +12,11 @@ from dataclasses import dataclass
 import aiohttp
 import time
 
+from ai_core.core.response_cache import get_response_cache, make_cache_key
+from ai_core.core.embedding_cache import EmbeddingCache, get_embedding_cache
+from ai_core.core.provider_limits import get_provider_limiter, DEFAULT_MAX_CONCURRENT_REQUESTS
+from .embedding_batcher import EmbeddingBatcher
+
 logger = logging.getLogger("llm_service")
 
 @dataclass
@@ -24,6 +29,13 @@ class LLMConfig:
     max_retries: int = 3
     temperature: float = 0.7
     max_tokens: int = 2048
+    enable_response_cache: bool = True
+    embedding_batch_size: int = 32
+    embedding_batch_wait_ms: float = 10.0
+    enable_embedding_cache: bool = True
+    embedding_cache_dir: Optional[str] = "./embedding_cache"
+    # Generations in flight to Ollama, shared with every other Ollama caller in the process
+    max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS
 
 @dataclass
 class LLMResponse:
@@ -46,9 +58,18 @@ class LLMService:
         self.config = config or LLMConfig()
         self.session = None
         self.available_models = []
+        self.model_digests: Dict[str, str] = {}
         self.model_cache = {}
         self.request_count = 0
         self.error_count = 0
+        self.response_cache = get_response_cache() if self.config.enable_response_cache else None
+        self.embedding_batcher = EmbeddingBatcher(
+            self.embed_texts,
+            max_batch_size=self.config.embedding_batch_size,
+            max_wait_seconds=self.config.embedding_batch_wait_ms / 1000
+        )
+        self._batch_embed_supported = True
+        self._embedding_caches: Dict[str, EmbeddingCache] = {}
         
     async def initialize(self) -> bool:
         """Initialize the LLM service with health checks"""
@@ -93,6 +114,10 @@ class LLMService:
                 if response.status == 200:
                     data = await response.json()
                     self.available_models = [model["name"] for model in data.get("models", [])]
+                    self.model_digests = {
+                        model["name"]: model["digest"]
+                        for model in data.get("models", []) if model.get("digest")
+                    }
                     return self.available_models
                 else:
                     logger.warning(f"Failed to get models: {response.status}")
@@ -145,7 +170,8 @@ class LLMService:
     
     async def generate(self, prompt: str, model: str = None, 
                       format: str = None, system: str = None,
-                      temperature: float = None, max_tokens: int = None) -> LLMResponse:
+                      temperature: float = None, max_tokens: int = None,
+                      use_cache: bool = True) -> LLMResponse:
         """Generate text with comprehensive error handling and monitoring"""
         
         start_time = time.time()
@@ -155,6 +181,23 @@ class LLMService:
         temperature = temperature if temperature is not None else self.config.temperature
         max_tokens = max_tokens if max_tokens is not None else self.config.max_tokens
         
+        cache_key = None
+        if use_cache and self.response_cache is not None:
+            cache_key = make_cache_key(
+                "ollama", model, prompt, temperature=temperature,
+                max_tokens=max_tokens, format=format, system=system
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return LLMResponse(
+                    content=cached["content"],
+                    model=model,
+                    success=True,
+                    processing_time=time.time() - start_time,
+                    tokens_used=cached.get("tokens_used"),
+                    metadata={**(cached.get("metadata") or {}), "cached": True}
+                )
+        
         try:
             # Validate model availability
             if not await self._ensure_model_available(model):
@@ -176,9 +219,10 @@ class LLMService:
                 request_data["system"] = system
             
             # Execute with retries
+            limiter = get_provider_limiter("local_ollama", self.config.max_concurrent_requests)
             for attempt in range(self.config.max_retries):
                 try:
-                    async with self.session.post(
+                    async with limiter, self.session.post(
                         f"{self.config.base_url}/api/generate",
                         json=request_data
                     ) as response:
@@ -186,7 +230,7 @@ class LLMService:
                             result = await response.json()
                             processing_time = time.time() - start_time
                             
-                            return LLMResponse(
+                            llm_response = LLMResponse(
                                 content=result.get("response", ""),
                                 model=model,
                                 success=True,
@@ -198,6 +242,13 @@ class LLMService:
                                     "attempt": attempt + 1
                                 }
                             )
+                            if cache_key is not None:
+                                self.response_cache.set(cache_key, {
+                                    "content": llm_response.content,
+                                    "tokens_used": llm_response.tokens_used,
+                                    "metadata": llm_response.metadata
+                                })
+                            return llm_response
                         else:
                             error_text = await response.text()
                             if attempt == self.config.max_retries - 1:
@@ -244,13 +295,23 @@ Requirements:
         
         model = model or self.config.default_model
         
+        # Cache only schema-valid results, so retries below still reach the model
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = make_cache_key("ollama", model, structured_prompt, schema=schema,
+                                       temperature=0.3, kind="structured")
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         for attempt in range(max_retries):
             try:
                 response = await self.generate(
                     prompt=structured_prompt,
                     model=model,
                     format="json",
-                    temperature=0.3  # Lower temperature for consistency
+                    temperature=0.3,  # Lower temperature for consistency
+                    use_cache=False
                 )
                 
                 if not response.success:
@@ -264,6 +325,8 @@ Requirements:
                     
                     # Validate against schema
                     if self._validate_schema(result, schema):
+                        if cache_key is not None:
+                            self.response_cache.set(cache_key, result)
                         return result
                     else:
                         logger.warning(f"Schema validation failed on attempt {attempt + 1}")
@@ -293,33 +356,122 @@ Requirements:
         return {"error": "All generation attempts failed"}
     
     async def embeddings(self, text: str, model: str = None) -> List[float]:
-        """Generate embeddings for text with error handling"""
+        """
+        Generate embeddings for text with error handling
+        
+        Concurrent calls are micro-batched into single embedding requests.
+        """
         
         model = model or self.config.embedding_model
         
+        cache = self._embedding_cache(model)
+        if cache is not None:
+            cached = cache.get(text, record_miss=False)
+            if cached is not None:
+                return cached
+        
         try:
-            if not await self._ensure_model_available(model):
-                raise Exception(f"Embedding model {model} is not available")
-            
-            request_data = {
-                "model": model,
-                "prompt": text
-            }
-            
+            return await self.embedding_batcher.embed(text, model)
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings: {e}")
+            raise
+    
+    async def embed_texts(self, texts: List[str], model: str = None) -> List[List[float]]:
+        """
+        Generate embeddings for many texts in one request
+        
+        Texts already in the embedding cache are not sent to the model.
+        """
+        
+        model = model or self.config.embedding_model
+        if not texts:
+            return []
+        
+        cache = self._embedding_cache(model)
+        embeddings = cache.get_many(texts) if cache is not None else [None] * len(texts)
+        missing = list(dict.fromkeys(text for text, e in zip(texts, embeddings) if e is None))
+        if not missing:
+            return embeddings
+        
+        if not await self._ensure_model_available(model):
+            raise Exception(f"Embedding model {model} is not available")
+        
+        batch_size = self.config.embedding_batch_size
+        generated = []
+        for start in range(0, len(missing), batch_size):
+            generated.extend(await self._embed_chunk(missing[start:start + batch_size], model))
+        
+        if cache is not None:
+            cache.put_many(missing, generated)
+        by_text = dict(zip(missing, generated))
+        return [e if e is not None else by_text[text] for text, e in zip(texts, embeddings)]
+    
+    def _embedding_cache(self, model: str) -> Optional[EmbeddingCache]:
+        """
+        Get the shared embedding cache for a model
+        
+        The cache key includes the model tag and, once known, its digest, so
+        re-pulling a model under the same tag does not reuse stale vectors.
+        """
+        
+        if not self.config.enable_embedding_cache:
+            return None
+        name = model if ":" in model else f"{model}:latest"
+        model_key = f"ollama:{name}"
+        digest = self.model_digests.get(name)
+        if digest:
+            model_key += f"@{digest[:12]}"
+        
+        cache = self._embedding_caches.get(model_key)
+        if cache is None:
+            cache = get_embedding_cache(model_key, self.config.embedding_cache_dir)
+            self._embedding_caches[model_key] = cache
+        return cache
+    
+    async def _embed_chunk(self, texts: List[str], model: str) -> List[List[float]]:
+        """Embed up to embedding_batch_size texts in one request"""
+        
+        if self._batch_embed_supported:
             async with self.session.post(
-                f"{self.config.base_url}/api/embeddings",
-                json=request_data
+                f"{self.config.base_url}/api/embed",
+                json={"model": model, "input": texts}
             ) as response:
                 if response.status == 200:
                     result = await response.json()
-                    return result.get("embedding", [])
+                    return result.get("embeddings", [])
+                error_text = await response.text()
+                if response.status == 404 and not self._is_api_error(error_text):
+                    # Older Ollama versions only provide the single-text endpoint; a
+                    # model that is not pulled is also a 404, but with a JSON error
+                    logger.info("Batch embedding endpoint not available, using per-text requests")
+                    self._batch_embed_supported = False
                 else:
-                    error_text = await response.text()
                     raise Exception(f"Embeddings failed: {response.status} - {error_text}")
-                    
-        except Exception as e:
-            logger.error(f"Failed to generate embeddings: {e}")
-            raise
+        
+        return await asyncio.gather(*(self._embed_single(text, model) for text in texts))
+    
+    @staticmethod
+    def _is_api_error(body: str) -> bool:
+        """Whether a response body is an Ollama API error rather than a missing route"""
+        try:
+            payload = json.loads(body)
+        except (ValueError, TypeError):
+            return False
+        return isinstance(payload, dict) and "error" in payload
+    
+    async def _embed_single(self, text: str, model: str) -> List[float]:
+        """Embed one text through the legacy single-text endpoint"""
+        
+        async with self.session.post(
+            f"{self.config.base_url}/api/embeddings",
+            json={"model": model, "prompt": text}
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result.get("embedding", [])
+            else:
+                error_text = await response.text()
+                raise Exception(f"Embeddings failed: {response.status} - {error_text}")
     
     async def analyze_website_content(self, url: str, html_content: str, 
                                     purpose: str) -> Dict[str, Any]:
@@ -518,6 +670,11 @@ Return only the improved selectors as a JSON array.
         return {
             "requests_processed": self.request_count,
             "errors_encountered": self.error_count,
+            "response_cache": self.response_cache.get_statistics() if self.response_cache else None,
+            "embedding_batching": self.embedding_batcher.get_statistics(),
+            "embedding_cache": {
+                model: cache.get_statistics() for model, cache in self._embedding_caches.items()
+            },
             "success_rate": (self.request_count - self.error_count) / max(self.request_count, 1),
             "available_models": self.available_models,
             "default_model": self.config.default_model,
@@ -527,6 +684,7 @@ Return only the improved selectors as a JSON array.
     
     async def cleanup(self):
         """Clean up resources"""
+        await self.embedding_batcher.flush()
         if self.session:
             await self.session.close()
     
@@ -8,8 +8,9 @@ import asyncio
 import json
 import logging
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import time
+import uuid
 import hashlib
 import struct
 
@@ -27,6 +28,21 @@ class VectorConfig:
     collection_prefix: str = "crawl4ai"
     max_collection_size: int = 100000
     embedding_dimension: int = 384
+    buffered_writes: bool = True
+    write_batch_size: int = 64
+    flush_interval: float = 2.0
+    max_write_retries: int = 3  # Failed batched writes are re-queued this many times
+
+@dataclass
+class PendingDocument:
+    """Document queued for a batched collection write"""
+    collection_id: str
+    document: str
+    metadata: Dict[str, Any]
+    document_id: str
+    embedding: Optional[List[float]] = None
+    upsert: bool = False
+    attempts: int = 0
 
 @dataclass 
 class SearchResult:
@@ -49,6 +65,15 @@ class VectorService:
         self.collections = {}
         self.collection_stats = {}
         
+        # Batched writes
+        self._pending_writes: List[PendingDocument] = []
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self.documents_written = 0
+        self.write_round_trips = 0
+        self.write_retries = 0
+        self.documents_dropped = 0
+        
     async def initialize(self) -> bool:
         """Initialize ChromaDB client and collections"""
         
@@ -161,9 +186,6 @@ class VectorService:
                 url, result, strategy_name, purpose
             )
             
-            # Generate embedding
-            embedding = await self._generate_embedding(embedding_text)
-            
             # Create document metadata
             metadata = {
                 "url": url,
@@ -178,15 +200,10 @@ class VectorService:
             }
             
             # Generate unique document ID
-            document_id = f"extraction_{int(time.time())}_{hash(url) % 10000}"
+            document_id = f"extraction_{uuid.uuid4().hex}"
             
             # Store in collection
-            self.collections["extraction_results"].add(
-                documents=[embedding_text],
-                embeddings=[embedding],
-                metadatas=[metadata],
-                ids=[document_id]
-            )
+            await self.queue_document("extraction_results", embedding_text, metadata, document_id)
             
             logger.debug(f"Stored extraction result for {url}")
             return True
@@ -211,16 +228,9 @@ Processing Time: {learning_data.get('processing_time', 0)}
 Data Quality: {learning_data.get('data_quality', 'unknown')}
 """
             
-            embedding = await self._generate_embedding(strategy_text)
+            document_id = f"strategy_{uuid.uuid4().hex}"
             
-            document_id = f"strategy_{int(time.time())}_{hash(learning_data.get('url', '')) % 10000}"
-            
-            self.collections["strategy_patterns"].add(
-                documents=[strategy_text],
-                embeddings=[embedding],
-                metadatas=[learning_data],
-                ids=[document_id]
-            )
+            await self.queue_document("strategy_patterns", strategy_text, learning_data, document_id)
             
             logger.debug(f"Stored strategy learning for {learning_data.get('url', 'unknown')}")
             return True
@@ -242,8 +252,6 @@ Technology Stack: {', '.join(analysis.get('technologies', []))}
 Complexity: {analysis.get('complexity', 'medium')}
 """
             
-            embedding = await self._generate_embedding(analysis_text)
-            
             metadata = {
                 **analysis,
                 "url": url,
@@ -251,14 +259,9 @@ Complexity: {analysis.get('complexity', 'medium')}
                 "analysis_version": "1.0"
             }
             
-            document_id = f"analysis_{int(time.time())}_{hash(url) % 10000}"
+            document_id = f"analysis_{uuid.uuid4().hex}"
             
-            self.collections["website_analysis"].add(
-                documents=[analysis_text],
-                embeddings=[embedding],
-                metadatas=[metadata],
-                ids=[document_id]
-            )
+            await self.queue_document("website_analysis", analysis_text, metadata, document_id)
             
             logger.debug(f"Stored website analysis for {url}")
             return True
@@ -272,6 +275,7 @@ Complexity: {analysis.get('complexity', 'medium')}
         """Query for similar successful strategies"""
         
         try:
+            await self.flush()
             query_text = f"Strategy for {purpose} on {website_type} websites"
             if complexity:
                 query_text += f" with {complexity} complexity"
@@ -312,6 +316,7 @@ Complexity: {analysis.get('complexity', 'medium')}
         """Find websites with similar characteristics"""
         
         try:
+            await self.flush()
             website_type = analysis.get("website_type", "unknown")
             patterns = analysis.get("content_patterns", [])
             
@@ -349,6 +354,7 @@ Complexity: {analysis.get('complexity', 'medium')}
         """Perform semantic search across collections"""
         
         try:
+            await self.flush()
             query_embedding = await self._generate_embedding(query)
             all_results = []
             
@@ -396,6 +402,7 @@ Complexity: {analysis.get('complexity', 'medium')}
         """Get the best CSS selectors for specific patterns"""
         
         try:
+            await self.flush()
             query_text = f"CSS selectors for {content_type} on {website_type} websites"
             query_embedding = await self._generate_embedding(query_text)
             
@@ -440,8 +447,6 @@ Success Rate: {success_rate}
 Context: {json.dumps(context or {}, indent=2)}
 """
             
-            embedding = await self._generate_embedding(selector_text)
-            
             metadata = {
                 "website_type": website_type,
                 "content_type": content_type,
@@ -451,14 +456,9 @@ Context: {json.dumps(context or {}, indent=2)}
                 "context": context or {}
             }
             
-            document_id = f"selectors_{int(time.time())}_{hash(website_type + content_type) % 10000}"
+            document_id = f"selectors_{uuid.uuid4().hex}"
             
-            self.collections["learned_selectors"].add(
-                documents=[selector_text],
-                embeddings=[embedding],
-                metadatas=[metadata],
-                ids=[document_id]
-            )
+            await self.queue_document("learned_selectors", selector_text, metadata, document_id)
             
             logger.debug(f"Stored successful selectors for {website_type} - {content_type}")
             return True
@@ -480,22 +480,15 @@ Data Quality: {metrics.get('data_quality', 'unknown')}
 Metrics: {json.dumps(metrics, indent=2)}
 """
             
-            embedding = await self._generate_embedding(performance_text)
-            
             metadata = {
                 **metrics,
                 "operation": operation,
                 "timestamp": time.time()
             }
             
-            document_id = f"perf_{int(time.time())}_{hash(operation) % 10000}"
+            document_id = f"perf_{uuid.uuid4().hex}"
             
-            self.collections["performance_logs"].add(
-                documents=[performance_text],
-                embeddings=[embedding],
-                metadatas=[metadata],
-                ids=[document_id]
-            )
+            await self.queue_document("performance_logs", performance_text, metadata, document_id)
             
             return True
             
@@ -503,6 +496,156 @@ Metrics: {json.dumps(metrics, indent=2)}
             logger.error(f"Failed to log performance data: {e}")
             return False
     
+    async def add_documents(self, collection_id: str, documents: List[str],
+                            metadatas: List[Dict[str, Any]], ids: List[str],
+                            embeddings: List[List[float]] = None) -> int:
+        """Add many documents, embedding and writing them in batches"""
+        
+        return await self._write_documents(collection_id, documents, metadatas, ids,
+                                           embeddings, upsert=False)
+    
+    async def upsert_documents(self, collection_id: str, documents: List[str],
+                               metadatas: List[Dict[str, Any]], ids: List[str],
+                               embeddings: List[List[float]] = None) -> int:
+        """Insert or update many documents, embedding and writing them in batches"""
+        
+        return await self._write_documents(collection_id, documents, metadatas, ids,
+                                           embeddings, upsert=True)
+    
+    async def queue_document(self, collection_id: str, document: str, metadata: Dict[str, Any],
+                             document_id: str, embedding: List[float] = None,
+                             upsert: bool = False) -> bool:
+        """
+        Queue a document for a batched write
+        
+        Queued documents are written once write_batch_size are waiting or
+        after flush_interval seconds, whichever comes first. Queries flush
+        pending writes first, so they always see earlier stores. Returns True
+        once the document is queued; a failed write is retried with the next
+        flush up to max_write_retries times before the document is dropped.
+        """
+        
+        if collection_id not in self.collections:
+            raise KeyError(f"Unknown collection: {collection_id}")
+        
+        if not self.config.buffered_writes:
+            await self._write_documents(collection_id, [document], [metadata], [document_id],
+                                        [embedding], upsert=upsert)
+            return True
+        
+        self._pending_writes.append(PendingDocument(
+            collection_id=collection_id,
+            document=document,
+            metadata=metadata,
+            document_id=document_id,
+            embedding=embedding,
+            upsert=upsert
+        ))
+        
+        if len(self._pending_writes) >= self.config.write_batch_size:
+            await self.flush()
+        else:
+            self._schedule_flush()
+        
+        return True
+    
+    def _schedule_flush(self):
+        """Start the periodic flush unless it is already running"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+    
+    async def flush(self) -> int:
+        """Write all queued documents, returning how many were written"""
+        
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        
+        async with self._flush_lock:
+            pending, self._pending_writes = self._pending_writes, []
+            if not pending:
+                return 0
+            
+            # Group by target collection and operation, keeping queue order
+            groups: Dict[Tuple[str, bool], List[PendingDocument]] = {}
+            for item in pending:
+                groups.setdefault((item.collection_id, item.upsert), []).append(item)
+            
+            written = 0
+            retry: List[PendingDocument] = []
+            for (collection_id, upsert), items in groups.items():
+                try:
+                    written += await self._write_documents(
+                        collection_id,
+                        [item.document for item in items],
+                        [item.metadata for item in items],
+                        [item.document_id for item in items],
+                        [item.embedding for item in items],
+                        upsert=upsert
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to write {len(items)} documents to {collection_id}: {e}")
+                    for item in items:
+                        item.attempts += 1
+                        if item.attempts <= self.config.max_write_retries:
+                            retry.append(item)
+                        else:
+                            self.documents_dropped += 1
+                            logger.error(f"Dropping document {item.document_id} after "
+                                         f"{item.attempts} failed writes to {collection_id}")
+            
+            # Failed documents go back to the front of the queue for the next flush
+            if retry:
+                self.write_retries += len(retry)
+                self._pending_writes[:0] = retry
+                self._schedule_flush()
+            
+            return written
+    
+    async def _flush_periodically(self):
+        """Flush queued writes every flush_interval while any are pending"""
+        
+        while self._pending_writes:
+            await asyncio.sleep(self.config.flush_interval)
+            await self.flush()
+    
+    async def _write_documents(self, collection_id: str, documents: List[str],
+                               metadatas: List[Dict[str, Any]], ids: List[str],
+                               embeddings: List[Optional[List[float]]] = None,
+                               upsert: bool = False) -> int:
+        """Embed missing vectors and write documents in write_batch_size round trips"""
+        
+        collection = self.collections[collection_id]
+        
+        # Duplicate ids in one request are rejected; the last write of an id wins
+        latest = {document_id: index for index, document_id in enumerate(ids)}
+        order = sorted(latest.values())
+        documents = [documents[i] for i in order]
+        metadatas = [metadatas[i] for i in order]
+        ids = [ids[i] for i in order]
+        embeddings = [embeddings[i] for i in order] if embeddings else [None] * len(order)
+        
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            generated = await self._generate_embeddings([documents[i] for i in missing])
+            for i, embedding in zip(missing, generated):
+                embeddings[i] = embedding
+        
+        write = collection.upsert if upsert else collection.add
+        batch_size = self.config.write_batch_size
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            write(
+                documents=documents[start:end],
+                embeddings=embeddings[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
+            )
+            self.write_round_trips += 1
+        
+        self.documents_written += len(ids)
+        logger.debug(f"Wrote {len(ids)} documents to {collection_id}")
+        return len(ids)
+    
     def _create_extraction_embedding_text(self, url: str, result: Dict[str, Any],
                                         strategy: str, purpose: str) -> str:
         """Create comprehensive text for extraction result embedding"""
@@ -538,6 +681,19 @@ Metrics: {json.dumps(metrics, indent=2)}
         # Fallback: deterministic hash-based embedding
         return self._create_hash_embedding(text)
     
+    async def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for many texts, batched when the LLM service supports it"""
+        
+        if self.llm_service and hasattr(self.llm_service, "embed_texts"):
+            try:
+                embeddings = await self.llm_service.embed_texts(texts)
+                if len(embeddings) == len(texts) and all(embeddings):
+                    return embeddings
+            except Exception as e:
+                logger.warning(f"Batch LLM embedding failed, embedding individually: {e}")
+        
+        return list(await asyncio.gather(*(self._generate_embedding(text) for text in texts)))
+    
     def _create_hash_embedding(self, text: str) -> List[float]:
         """Create a deterministic hash-based embedding"""
         
@@ -589,7 +745,14 @@ Metrics: {json.dumps(metrics, indent=2)}
                 "persistent_path": self.config.persistent_path,
                 "collection_prefix": self.config.collection_prefix
             },
-            "service_health": "healthy" if self.client else "disconnected"
+            "service_health": "healthy" if self.client else "disconnected",
+            "writes": {
+                "documents_written": self.documents_written,
+                "round_trips": self.write_round_trips,
+                "pending": len(self._pending_writes),
+                "retries": self.write_retries,
+                "dropped": self.documents_dropped
+            }
         }
     
     async def optimize_collections(self) -> Dict[str, Any]:
@@ -618,5 +781,14 @@ Metrics: {json.dumps(metrics, indent=2)}
     
     async def cleanup(self):
         """Clean up resources"""
+        await self.flush()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        if self._pending_writes:
+            self.documents_dropped += len(self._pending_writes)
+            logger.error(f"Discarding {len(self._pending_writes)} documents that could not be written")
+            self._pending_writes = []
         # ChromaDB client doesn't require explicit cleanup
         logger.info("Vector service cleanup completed")
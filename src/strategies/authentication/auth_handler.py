@@ -41,7 +41,7 @@ class AuthenticationStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Detect authentication requirements
             auth_info = self._detect_authentication_requirements(soup, html_content, url)
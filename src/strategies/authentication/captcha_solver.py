@@ -16,7 +16,7 @@ import logging
 from typing import Dict, Any, List, Optional
 from bs4 import BeautifulSoup
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
 
 logger = logging.getLogger("strategies.authentication.captcha")
 
@@ -60,7 +60,7 @@ class CaptchaStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Detect CAPTCHA types
             captcha_info = self._detect_captcha_types(soup, html_content)
@@ -289,7 +289,7 @@ class CaptchaStrategy(BaseExtractionStrategy):
         confidence = min(indicator_count * 0.3, 0.9)
         
         # Check for actual CAPTCHA elements
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         if soup.select(".g-recaptcha, .h-captcha"):
             confidence = 0.95
         
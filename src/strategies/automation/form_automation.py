@@ -16,7 +16,7 @@ from typing import Dict, Any, List, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
 
 logger = logging.getLogger("strategies.automation.form_automation")
 
@@ -72,7 +72,7 @@ class FormAutoStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Detect and analyze forms
             forms_data = self._analyze_forms(soup, url)
@@ -352,7 +352,7 @@ class FormAutoStrategy(BaseExtractionStrategy):
     def get_confidence_score(self, url: str, html_content: str, purpose: str) -> float:
         """Form strategy confidence based on form presence"""
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         forms = soup.find_all('form')
         
         if not forms:
@@ -12,6 +12,10 @@ from dataclasses import dataclass, asdict
 from typing import Dict, Any, List, Optional, Union
 from enum import Enum
 
+from ai_core.core.parsed_page import (
+    ParsedPage, parse_page, get_parsed_page, strip_parsed_page, PARSED_PAGE_KEY
+)
+
 logger = logging.getLogger("base_strategy")
 
 class StrategyType(Enum):
@@ -76,7 +80,13 @@ class BaseExtractionStrategy(ABC):
                      html_content: str,
                      purpose: str,
                      context: Dict[str, Any] = None) -> StrategyResult:
-        """Extract data from the given URL/content"""
+        """
+        Extract data from the given URL/content
+
+        Callers that already parsed the page pass it as
+        ``context["parsed_page"]`` (a ParsedPage of ``html_content``);
+        use get_page() to pick it up instead of parsing again.
+        """
         pass
     
     @abstractmethod
@@ -92,6 +102,11 @@ class BaseExtractionStrategy(ABC):
         """Check if this strategy supports the given extraction purpose"""
         pass
     
+    def get_page(self, html_content: str, context: Dict[str, Any] = None,
+                 url: Optional[str] = None) -> ParsedPage:
+        """Get the shared ParsedPage for html_content, parsing it only if no caller has"""
+        return get_parsed_page(html_content, context, url)
+    
     def calculate_confidence(self, 
                            extracted_data: Dict[str, Any],
                            expected_fields: List[str]) -> float:
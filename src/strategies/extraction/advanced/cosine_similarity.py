@@ -7,11 +7,10 @@ Similarity-based content clustering and extraction
 import time
 import numpy as np
 from typing import Dict, Any, List, Optional
-from bs4 import BeautifulSoup
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
 
 class CosineStrategy(BaseExtractionStrategy):
     """
@@ -46,16 +45,12 @@ class CosineStrategy(BaseExtractionStrategy):
         
         try:
             # Extract text content and split into sections
-            soup = BeautifulSoup(html_content, 'html.parser')
+            page = self.get_page(html_content, context)
             
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Split content into paragraphs/sections
+            # Split content into paragraphs/sections, ignoring script and style text
             paragraphs = []
-            for element in soup.find_all(['p', 'div', 'section', 'article']):
-                text = element.get_text(strip=True)
+            for element in page.soup.find_all(['p', 'div', 'section', 'article']):
+                text = page.element_text(element, strip=True)
                 if len(text.split()) >= self.word_count_threshold:
                     paragraphs.append({
                         'text': text,
@@ -202,16 +197,12 @@ class CosineStrategy(BaseExtractionStrategy):
     def analyze_content_similarity(self, html_content: str) -> Dict[str, Any]:
         """Analyze content similarity without extraction"""
         
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
+        page = parse_page(html_content)
         
-        # Extract paragraphs
+        # Extract paragraphs, ignoring script and style text
         paragraphs = []
-        for element in soup.find_all(['p', 'div', 'section', 'article']):
-            text = element.get_text(strip=True)
+        for element in page.soup.find_all(['p', 'div', 'section', 'article']):
+            text = page.element_text(element, strip=True)
             if len(text.split()) >= self.word_count_threshold:
                 paragraphs.append(text)
         
@@ -271,7 +262,7 @@ class CosineStrategy(BaseExtractionStrategy):
     
     def get_confidence_score(self, url: str, html_content: str, purpose: str) -> float:
         """Cosine strategy confidence based on content richness"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         
         # Count paragraphs/sections
         content_elements = soup.find_all(['p', 'div', 'section', 'article'])
@@ -7,9 +7,9 @@ Fast pattern-based extraction using pre-compiled regular expressions
 import re
 import time
 from typing import Dict, Any, List, Optional, Union
-from bs4 import BeautifulSoup
 
 from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from ai_core.core.text_scanner import MultiPatternScanner, DIGITS, EMAIL_ANCHORS, URL_ANCHORS, CURRENCY_ANCHORS
 
 class RegexExtractionStrategy(BaseExtractionStrategy):
     """
@@ -31,11 +31,28 @@ class RegexExtractionStrategy(BaseExtractionStrategy):
         'credit_card': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'
     }
     
-    def __init__(self, patterns: Union[str, List[str], Dict[str, str]] = None, **kwargs):
+    # Literals every match of a built-in pattern contains, for prefiltering
+    PATTERN_ANCHORS = {
+        'email': EMAIL_ANCHORS,
+        'phone': DIGITS,
+        'url': URL_ANCHORS,
+        'date': DIGITS,
+        'time': (':',),
+        'currency': CURRENCY_ANCHORS,
+        'social_security': ('-',),
+        'ip_address': ('.',),
+        'zip_code': DIGITS,
+        'credit_card': DIGITS
+    }
+    
+    def __init__(self, patterns: Union[str, List[str], Dict[str, str]] = None,
+                 scan_workers: int = 0, **kwargs):
         super().__init__(strategy_type=StrategyType.CSS, **kwargs)
         
         self.custom_patterns = {}
         self.compiled_patterns = {}
+        self.scan_workers = scan_workers
+        self._scanner = None
         
         if patterns:
             if isinstance(patterns, str):
@@ -70,19 +87,13 @@ class RegexExtractionStrategy(BaseExtractionStrategy):
         
         try:
             # Extract text content from HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            text_content = soup.get_text()
+            # Text without script and style elements
+            text_content = self.get_page(html_content, context).get_text()
             
             # Extract data using compiled patterns
             extracted_data = {}
             
-            for pattern_name, compiled_pattern in self.compiled_patterns.items():
-                matches = compiled_pattern.findall(text_content)
+            for pattern_name, matches in self._get_scanner().findall(text_content).items():
                 if matches:
                     # Remove duplicates while preserving order
                     unique_matches = list(dict.fromkeys(matches))
@@ -124,6 +135,7 @@ class RegexExtractionStrategy(BaseExtractionStrategy):
             compiled_pattern = re.compile(pattern, re.IGNORECASE)
             self.custom_patterns[name] = pattern
             self.compiled_patterns[name] = compiled_pattern
+            self._scanner = None
         except re.error as e:
             self.logger.error(f"Failed to add pattern '{name}': {e}")
             raise ValueError(f"Invalid regex pattern '{pattern}': {e}")
@@ -134,6 +146,21 @@ class RegexExtractionStrategy(BaseExtractionStrategy):
             del self.custom_patterns[name]
         if name in self.compiled_patterns:
             del self.compiled_patterns[name]
+        self._scanner = None
+    
+    def _get_scanner(self) -> MultiPatternScanner:
+        """Scanner over the compiled patterns, rebuilt after add/remove_pattern"""
+        if self._scanner is None:
+            # Anchors only hold for unmodified built-in patterns
+            anchors = {
+                name: self.PATTERN_ANCHORS[name]
+                for name, pattern in self.custom_patterns.items()
+                if name in self.PATTERN_ANCHORS and pattern == self.PATTERNS.get(name)
+            }
+            self._scanner = MultiPatternScanner(
+                self.compiled_patterns, anchors=anchors, max_workers=self.scan_workers
+            )
+        return self._scanner
     
     def get_patterns(self) -> Dict[str, str]:
         """Get all current patterns"""
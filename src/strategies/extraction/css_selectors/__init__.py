@@ -9,11 +9,15 @@ from .ecommerce_css import EcommerceCSSStrategy
 from .news_css import NewsCSSStrategy
 from .contact_css import ContactCSSStrategy
 from .social_css import SocialMediaCSSStrategy
+from .selector_plan import SelectorPlan, get_selector_plan, compile_selector
 
 __all__ = [
     "DirectoryCSSStrategy",
     "EcommerceCSSStrategy",
     "NewsCSSStrategy",
     "ContactCSSStrategy",
-    "SocialMediaCSSStrategy"
+    "SocialMediaCSSStrategy",
+    "SelectorPlan",
+    "get_selector_plan",
+    "compile_selector"
 ]
@@ -15,7 +15,8 @@ import logging
 from typing import Dict, Any, List
 from bs4 import BeautifulSoup
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
+from .selector_plan import SelectorPlan, get_selector_plan
 
 logger = logging.getLogger("strategies.extraction.css_selectors.contact")
 
@@ -64,14 +65,11 @@ class ContactCSSStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             extracted_data = {}
             
             # Extract all contact information
-            for field, selectors in self.contact_selectors.items():
-                values = self._extract_multiple_values(soup, selectors, field)
-                if values:
-                    extracted_data[field] = values
+            extracted_data.update(self._selector_plan().collect(soup))
             
             # Text-based extraction for emails and phones
             text_contacts = self._extract_from_text(html_content)
@@ -114,58 +112,48 @@ class ContactCSSStrategy(BaseExtractionStrategy):
                 error=str(e)
             )
     
-    def _extract_multiple_values(self, soup: BeautifulSoup, selectors: List[str], field_type: str) -> List[str]:
-        """Extract multiple values for a field type"""
-        values = []
-        
-        for selector in selectors:
-            try:
-                elements = soup.select(selector)
-                for element in elements:
-                    if field_type == "emails":
-                        href = element.get('href', '')
-                        if href.startswith('mailto:'):
-                            email = href.replace('mailto:', '').split('?')[0]
-                            if '@' in email:
-                                values.append(email)
-                        else:
-                            text = element.get_text(strip=True)
-                            if '@' in text:
-                                values.append(text)
-                    
-                    elif field_type == "phones":
-                        href = element.get('href', '')
-                        if href.startswith('tel:'):
-                            phone = href.replace('tel:', '')
-                            values.append(phone)
-                        else:
-                            text = element.get_text(strip=True)
-                            if text:
-                                values.append(text)
-                    
-                    elif field_type == "social_links":
-                        href = element.get('href', '')
-                        if href and any(platform in href for platform in 
-                                      ['facebook.com', 'twitter.com', 'linkedin.com', 
-                                       'instagram.com', 'youtube.com']):
-                            values.append(href)
-                    
-                    else:
-                        text = element.get_text(strip=True)
-                        if text:
-                            values.append(text)
-                            
-            except Exception:
-                continue
-        
-        # Remove duplicates while preserving order
-        return list(dict.fromkeys(values))
+    def _selector_plan(self) -> SelectorPlan:
+        """Compiled plan collecting every value for each contact_selectors field"""
+        return get_selector_plan(self.contact_selectors, {
+            "emails": self._email_value,
+            "phones": self._phone_value,
+            "social_links": self._social_link_value
+        }, default_extractor=self._text_value)
+    
+    @staticmethod
+    def _email_value(element, selector: str) -> str:
+        href = element.get('href', '')
+        if href.startswith('mailto:'):
+            email = href.replace('mailto:', '').split('?')[0]
+            return email if '@' in email else None
+        text = element.get_text(strip=True)
+        return text if '@' in text else None
+    
+    @staticmethod
+    def _phone_value(element, selector: str) -> str:
+        href = element.get('href', '')
+        if href.startswith('tel:'):
+            return href.replace('tel:', '')
+        return element.get_text(strip=True) or None
+    
+    @staticmethod
+    def _social_link_value(element, selector: str) -> str:
+        href = element.get('href', '')
+        if href and any(platform in href for platform in 
+                        ['facebook.com', 'twitter.com', 'linkedin.com', 
+                         'instagram.com', 'youtube.com']):
+            return href
+        return None
+    
+    @staticmethod
+    def _text_value(element, selector: str) -> str:
+        return element.get_text(strip=True) or None
     
     def _extract_from_text(self, html_content: str) -> Dict[str, List[str]]:
         """Extract emails and phones from plain text using regex"""
         
         # Get text content only
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         text = soup.get_text()
         
         contacts = {}
@@ -209,7 +197,7 @@ class ContactCSSStrategy(BaseExtractionStrategy):
         confidence += min(indicator_count * 0.1, 0.3)
         
         # Check for actual contact elements
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         
         if soup.select("a[href^='mailto:']"):
             confidence += 0.1
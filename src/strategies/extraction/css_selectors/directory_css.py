@@ -14,7 +14,8 @@ import logging
 from typing import Dict, Any, List
 from bs4 import BeautifulSoup
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
+from .selector_plan import SelectorPlan, get_selector_plan
 
 logger = logging.getLogger("strategies.extraction.css_selectors.directory")
 
@@ -82,7 +83,7 @@ class DirectoryCSSStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             extracted_data = {}
             
             # Extract business listings
@@ -138,13 +139,14 @@ class DirectoryCSSStrategy(BaseExtractionStrategy):
         ]
         
         listings = []
+        plan = self._selector_plan()
         
         for container_selector in listing_containers:
             containers = soup.select(container_selector)
             
             if len(containers) > 1:  # Multiple listings found
                 for container in containers[:50]:  # Limit to first 50
-                    business_data = self._extract_business_from_container(container)
+                    business_data = self._extract_business_from_container(container, plan)
                     if business_data:
                         listings.append(business_data)
                 
@@ -153,14 +155,9 @@ class DirectoryCSSStrategy(BaseExtractionStrategy):
         
         return listings
     
-    def _extract_business_from_container(self, container) -> Dict[str, Any]:
+    def _extract_business_from_container(self, container, plan: SelectorPlan = None) -> Dict[str, Any]:
         """Extract business data from a single container element"""
-        business = {}
-        
-        for field, selectors in self.business_selectors.items():
-            value = self._extract_field_value(container, selectors)
-            if value:
-                business[field] = value
+        business = (plan or self._selector_plan()).extract(container)
         
         # Only return if we have essential data
         if business.get("name") or business.get("phone") or business.get("address"):
@@ -169,50 +166,30 @@ class DirectoryCSSStrategy(BaseExtractionStrategy):
     
     def _extract_single_business(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """Extract single business data from entire page"""
-        business = {}
-        
-        for field, selectors in self.business_selectors.items():
-            value = self._extract_field_value(soup, selectors)
-            if value:
-                business[field] = value
-        
+        business = self._selector_plan().extract(soup)
         return business if business else None
     
-    def _extract_field_value(self, container, selectors: List[str]) -> str:
-        """Extract field value using multiple selector fallbacks"""
-        for selector in selectors:
-            try:
-                elements = container.select(selector)
-                for element in elements:
-                    # Get text content
-                    if selector.startswith("a[href"):
-                        # For links, extract href attribute
-                        href = element.get('href', '')
-                        if href and ('tel:' in href or 'mailto:' in href or 'http' in href):
-                            return href.replace('tel:', '').replace('mailto:', '')
-                    
-                    text = element.get_text(strip=True)
-                    if text and len(text) > 1:
-                        return text
-                        
-            except Exception:
-                continue
+    def _selector_plan(self) -> SelectorPlan:
+        """Compiled plan for business_selectors"""
+        return get_selector_plan(self.business_selectors, default_extractor=self._business_value)
+    
+    @staticmethod
+    def _business_value(element, selector: str) -> str:
+        """Link target for a[href...] selectors, otherwise element text"""
+        if selector.startswith("a[href"):
+            # For links, extract href attribute
+            href = element.get('href', '')
+            if href and ('tel:' in href or 'mailto:' in href or 'http' in href):
+                return href.replace('tel:', '').replace('mailto:', '')
+        
+        text = element.get_text(strip=True)
+        if text and len(text) > 1:
+            return text
         return None
     
     def _get_successful_selectors(self, soup: BeautifulSoup) -> Dict[str, str]:
         """Track which selectors were successful for learning"""
-        successful = {}
-        
-        for field, selectors in self.business_selectors.items():
-            for selector in selectors:
-                try:
-                    if soup.select(selector):
-                        successful[field] = selector
-                        break
-                except Exception:
-                    continue
-        
-        return successful
+        return self._selector_plan().matched_selectors(soup)
     
     def get_confidence_score(self, url: str, html_content: str, purpose: str) -> float:
         """Estimate confidence for directory extraction"""
@@ -233,7 +210,7 @@ class DirectoryCSSStrategy(BaseExtractionStrategy):
         confidence += min(indicator_count * 0.1, 0.4)
         
         # Check for multiple business names/phones (indicates listings)
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         business_names = soup.select("h1, h2, h3, .business-name, .company-name")
         phone_links = soup.select("a[href^='tel:']")
         
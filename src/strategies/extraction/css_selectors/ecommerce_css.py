@@ -14,7 +14,8 @@ import logging
 from typing import Dict, Any, List
 from bs4 import BeautifulSoup
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
+from .selector_plan import SelectorPlan, get_selector_plan, image_src
 
 logger = logging.getLogger("strategies.extraction.css_selectors.ecommerce")
 
@@ -83,7 +84,7 @@ class EcommerceCSSStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Check if it's a product listing page or single product
             products = self._find_product_listings(soup)
@@ -142,13 +143,14 @@ class EcommerceCSSStrategy(BaseExtractionStrategy):
         ]
         
         products = []
+        plan = self._selector_plan()
         
         for container_selector in listing_containers:
             containers = soup.select(container_selector)
             
             if len(containers) > 1:
                 for container in containers[:30]:  # Limit to first 30
-                    product_data = self._extract_product_from_container(container)
+                    product_data = self._extract_product_from_container(container, plan)
                     if product_data:
                         products.append(product_data)
                 
@@ -157,19 +159,9 @@ class EcommerceCSSStrategy(BaseExtractionStrategy):
         
         return products
     
-    def _extract_product_from_container(self, container) -> Dict[str, Any]:
+    def _extract_product_from_container(self, container, plan: SelectorPlan = None) -> Dict[str, Any]:
         """Extract product data from container"""
-        product = {}
-        
-        for field, selectors in self.product_selectors.items():
-            if field == "image":
-                # Special handling for images
-                value = self._extract_image_src(container, selectors)
-            else:
-                value = self._extract_field_value(container, selectors)
-            
-            if value:
-                product[field] = value
+        product = (plan or self._selector_plan()).extract(container)
         
         # Must have name or price to be valid
         if product.get("name") or product.get("price"):
@@ -178,44 +170,12 @@ class EcommerceCSSStrategy(BaseExtractionStrategy):
     
     def _extract_single_product(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """Extract single product from product detail page"""
-        product = {}
-        
-        for field, selectors in self.product_selectors.items():
-            if field == "image":
-                value = self._extract_image_src(soup, selectors)
-            else:
-                value = self._extract_field_value(soup, selectors)
-            
-            if value:
-                product[field] = value
-        
+        product = self._selector_plan().extract(soup)
         return product if product else None
     
-    def _extract_field_value(self, container, selectors: List[str]) -> str:
-        """Extract field value using multiple selector fallbacks"""
-        for selector in selectors:
-            try:
-                elements = container.select(selector)
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    if text and len(text) > 1:
-                        return text
-            except Exception:
-                continue
-        return None
-    
-    def _extract_image_src(self, container, selectors: List[str]) -> str:
-        """Extract image source URL"""
-        for selector in selectors:
-            try:
-                img_elements = container.select(selector)
-                for img in img_elements:
-                    src = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
-                    if src and src.startswith(('http', '//')):
-                        return src
-            except Exception:
-                continue
-        return None
+    def _selector_plan(self) -> SelectorPlan:
+        """Compiled plan for product_selectors (images use their src attribute)"""
+        return get_selector_plan(self.product_selectors, {"image": image_src})
     
     def extract_structured_data(self, html_content: str) -> Dict[str, Any]:
         """Extract JSON-LD structured data for products"""
@@ -263,7 +223,7 @@ class EcommerceCSSStrategy(BaseExtractionStrategy):
         confidence += min(indicator_count * 0.1, 0.5)
         
         # Check for product-specific elements
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         
         # Price indicators
         price_elements = soup.select(".price, [class*='price'], [data-price]")
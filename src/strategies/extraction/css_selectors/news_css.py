@@ -14,7 +14,8 @@ import logging
 from typing import Dict, Any, List
 from bs4 import BeautifulSoup
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
+from .selector_plan import SelectorPlan, get_selector_plan
 
 logger = logging.getLogger("strategies.extraction.css_selectors.news")
 
@@ -78,7 +79,7 @@ class NewsCSSStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Check for article listing vs single article
             articles = self._find_article_listings(soup)
@@ -137,13 +138,14 @@ class NewsCSSStrategy(BaseExtractionStrategy):
         ]
         
         articles = []
+        plan = self._selector_plan()
         
         for container_selector in article_containers:
             containers = soup.select(container_selector)
             
             if len(containers) > 1:
                 for container in containers[:20]:  # Limit to first 20
-                    article_data = self._extract_article_from_container(container)
+                    article_data = self._extract_article_from_container(container, plan)
                     if article_data:
                         articles.append(article_data)
                 
@@ -152,18 +154,12 @@ class NewsCSSStrategy(BaseExtractionStrategy):
         
         return articles
     
-    def _extract_article_from_container(self, container) -> Dict[str, Any]:
+    def _extract_article_from_container(self, container, plan: SelectorPlan = None) -> Dict[str, Any]:
         """Extract article data from container"""
-        article = {}
-        
-        for field, selectors in self.article_selectors.items():
-            value = self._extract_field_value(container, selectors)
-            if value:
-                if field == "content":
-                    # Clean up content
-                    article[field] = self._clean_article_content(value)
-                else:
-                    article[field] = value
+        article = (plan or self._selector_plan()).extract(container)
+        if "content" in article:
+            # Clean up content
+            article["content"] = self._clean_article_content(article["content"])
         
         # Must have headline to be valid
         if article.get("headline"):
@@ -172,33 +168,26 @@ class NewsCSSStrategy(BaseExtractionStrategy):
     
     def _extract_single_article(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """Extract single article from article page"""
-        article = {}
-        
-        for field, selectors in self.article_selectors.items():
-            value = self._extract_field_value(soup, selectors)
-            if value:
-                if field == "content":
-                    article[field] = self._clean_article_content(value)
-                else:
-                    article[field] = value
+        article = self._selector_plan().extract(soup)
+        if "content" in article:
+            article["content"] = self._clean_article_content(article["content"])
         
         return article if article else None
     
-    def _extract_field_value(self, container, selectors: List[str]) -> str:
-        """Extract field value using multiple selector fallbacks"""
-        for selector in selectors:
-            try:
-                elements = container.select(selector)
-                for element in elements:
-                    # Special handling for datetime
-                    if element.get('datetime'):
-                        return element.get('datetime')
-                    
-                    text = element.get_text(strip=True)
-                    if text and len(text) > 1:
-                        return text
-            except Exception:
-                continue
+    def _selector_plan(self) -> SelectorPlan:
+        """Compiled plan for article_selectors"""
+        return get_selector_plan(self.article_selectors, default_extractor=self._article_value)
+    
+    @staticmethod
+    def _article_value(element, selector: str) -> str:
+        """Datetime attribute if present, otherwise element text"""
+        # Special handling for datetime
+        if element.get('datetime'):
+            return element.get('datetime')
+        
+        text = element.get_text(strip=True)
+        if text and len(text) > 1:
+            return text
         return None
     
     def _clean_article_content(self, content: str) -> str:
@@ -257,7 +246,7 @@ class NewsCSSStrategy(BaseExtractionStrategy):
         confidence += min(indicator_count * 0.08, 0.4)
         
         # Check for article-specific elements
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         
         # Article structured data
         if 'Article' in html_content and 'application/ld+json' in html_content:
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Compiled Selector Plans
+Evaluates a strategy's field -> fallback selector lists in a single walk of the tree
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+
+import soupsieve
+from bs4 import Tag
+
+logger = logging.getLogger("selector_plan")
+
+# (element, selector) -> extracted value, or None to keep looking
+ValueExtractor = Callable[[Tag, str], Optional[Any]]
+
+# Index key for selectors that can match any element
+UNIVERSAL = None
+
+
+@lru_cache(maxsize=2048)
+def compile_selector(selector: str) -> Optional[soupsieve.SoupSieve]:
+    """Compile a CSS selector once per process; None if it is invalid"""
+    try:
+        return soupsieve.compile(selector)
+    except Exception as e:
+        logger.debug(f"Skipping invalid selector {selector!r}: {e}")
+        return None
+
+
+def text_value(element: Tag, selector: str) -> Optional[str]:
+    """Stripped element text of more than one character"""
+    text = element.get_text(strip=True)
+    return text if text and len(text) > 1 else None
+
+
+def image_src(element: Tag, selector: str) -> Optional[str]:
+    """Absolute or protocol-relative image source, including lazy-loading attributes"""
+    src = element.get('src') or element.get('data-src') or element.get('data-lazy-src')
+    return src if src and src.startswith(('http', '//')) else None
+
+
+def selector_keys(matcher: soupsieve.SoupSieve) -> List[Optional[tuple]]:
+    """
+    One index key per alternative of a compiled selector list
+
+    The key names something an element must have to match the alternative
+    (an id, class, attribute or tag name, most selective first), or is
+    UNIVERSAL when nothing cheap can be required.
+    """
+    keys = []
+    try:
+        for alternative in matcher.selectors:
+            attributes = [a.attribute for a in alternative.attributes if not a.inverse]
+            if alternative.ids:
+                keys.append(("id", alternative.ids[0].lower()))
+            elif alternative.classes:
+                keys.append(("class", alternative.classes[0].lower()))
+            elif attributes:
+                keys.append(("attr", attributes[0].lower()))
+            elif alternative.tag is not None and alternative.tag.name not in (None, "*"):
+                keys.append(("tag", alternative.tag.name.lower()))
+            else:
+                keys.append(UNIVERSAL)
+    except AttributeError:
+        # Unknown soupsieve internals: always run the full match
+        return [UNIVERSAL]
+    return keys
+
+
+def element_keys(element: Tag) -> Iterable[tuple]:
+    """Index keys an element can satisfy"""
+    yield ("tag", element.name.lower())
+    for name, value in element.attrs.items():
+        yield ("attr", name.lower())
+        if name == "class":
+            for cls in (value.split() if isinstance(value, str) else value):
+                yield ("class", cls.lower())
+        elif name == "id" and isinstance(value, str):
+            yield ("id", value.lower())
+
+
+class SelectorPlan:
+    """
+    Compiled extraction plan for a ``{field: [fallback selectors]}`` dict
+
+    extract() returns, for every field, the value of the first element (in
+    document order) matched by the earliest selector in its fallback list
+    that yields a value - the same result as calling ``root.select()`` for
+    each selector in turn - but walks the tree once for all fields and
+    stops as soon as every field is resolved by its first selector.
+
+    Selectors are indexed by a tag, id, class or attribute they require, so
+    for each element only the few selectors that can possibly match it are
+    evaluated.
+
+    Usage:
+        plan = get_selector_plan(self.product_selectors, {"image": image_src})
+        products = plan.extract_all(containers)
+    """
+
+    def __init__(self, fields: Dict[str, List[str]],
+                 extractors: Optional[Dict[str, ValueExtractor]] = None,
+                 default_extractor: ValueExtractor = text_value):
+        extractors = extractors or {}
+        self.fields: List[Tuple[str, ValueExtractor, List[Tuple[str, soupsieve.SoupSieve]]]] = []
+        index: Dict[Optional[tuple], set] = {}
+
+        for position, (field, selectors) in enumerate(fields.items()):
+            compiled = [(selector, compile_selector(selector)) for selector in selectors]
+            compiled = [(selector, matcher) for selector, matcher in compiled if matcher is not None]
+            self.fields.append((field, extractors.get(field, default_extractor), compiled))
+            for rank, (_, matcher) in enumerate(compiled):
+                for key in selector_keys(matcher):
+                    index.setdefault(key, set()).add((position, rank))
+
+        self._universal = sorted(index.pop(UNIVERSAL, ()))
+        self._index = {key: sorted(entries) for key, entries in index.items()}
+
+    def extract(self, root: Tag) -> Dict[str, Any]:
+        """First value per field under root; fields without a value are omitted"""
+        best_rank = [len(selectors) for _, _, selectors in self.fields]
+        unresolved = sum(1 for rank in best_rank if rank > 0)
+        results: Dict[str, Any] = {}
+
+        for element in root.descendants:
+            if not unresolved:
+                break
+            if not isinstance(element, Tag):
+                continue
+
+            for position, ranks in self._candidates(element).items():
+                field, extractor, selectors = self.fields[position]
+                for rank in ranks:
+                    # Only selectors ranked above the current best can improve the result
+                    if rank >= best_rank[position]:
+                        break
+                    selector, matcher = selectors[rank]
+                    if not matcher.match(element):
+                        continue
+                    value = extractor(element, selector)
+                    if value:
+                        best_rank[position] = rank
+                        results[field] = value
+                        if rank == 0:
+                            unresolved -= 1
+                        break
+
+        return results
+
+    def extract_all(self, containers: Iterable[Tag]) -> List[Dict[str, Any]]:
+        """extract() for each container, e.g. the items of a listing page"""
+        return [self.extract(container) for container in containers]
+
+    def matched_selectors(self, root: Tag) -> Dict[str, str]:
+        """Earliest-ranked selector per field that matches anything under root"""
+        best_rank = [len(selectors) for _, _, selectors in self.fields]
+        unresolved = sum(1 for rank in best_rank if rank > 0)
+
+        for element in root.descendants:
+            if not unresolved:
+                break
+            if not isinstance(element, Tag):
+                continue
+            for position, ranks in self._candidates(element).items():
+                selectors = self.fields[position][2]
+                for rank in ranks:
+                    if rank >= best_rank[position]:
+                        break
+                    if selectors[rank][1].match(element):
+                        best_rank[position] = rank
+                        if rank == 0:
+                            unresolved -= 1
+                        break
+
+        return {
+            field: selectors[best_rank[position]][0]
+            for position, (field, _, selectors) in enumerate(self.fields)
+            if best_rank[position] < len(selectors)
+        }
+
+    def collect(self, root: Tag) -> Dict[str, List[Any]]:
+        """
+        All values per field under root, in one walk
+
+        Values are ordered by selector rank, then document order (as
+        concatenating ``root.select()`` results would be) and deduplicated.
+        """
+        buckets = [[[] for _ in selectors] for _, _, selectors in self.fields]
+
+        for element in root.descendants:
+            if not isinstance(element, Tag):
+                continue
+            for position, ranks in self._candidates(element).items():
+                _, extractor, selectors = self.fields[position]
+                for rank in ranks:
+                    selector, matcher = selectors[rank]
+                    if matcher.match(element):
+                        value = extractor(element, selector)
+                        if value:
+                            buckets[position][rank].append(value)
+
+        results = {}
+        for position, (field, _, _) in enumerate(self.fields):
+            values = list(dict.fromkeys(value for bucket in buckets[position] for value in bucket))
+            if values:
+                results[field] = values
+        return results
+
+    def _candidates(self, element: Tag) -> Dict[int, List[int]]:
+        """Selectors that can match an element: field position -> ascending ranks"""
+        candidates: Dict[int, set] = {}
+        for position, rank in self._universal:
+            candidates.setdefault(position, set()).add(rank)
+        for key in element_keys(element):
+            for position, rank in self._index.get(key, ()):
+                candidates.setdefault(position, set()).add(rank)
+        return {position: sorted(ranks) for position, ranks in candidates.items()}
+
+
+# Process-wide plans, keyed by selector lists and extractors
+_plans: "OrderedDict[tuple, SelectorPlan]" = OrderedDict()
+_plans_lock = threading.Lock()
+MAX_CACHED_PLANS = 256
+
+
+def get_selector_plan(fields: Dict[str, List[str]],
+                      extractors: Optional[Dict[str, ValueExtractor]] = None,
+                      default_extractor: ValueExtractor = text_value) -> SelectorPlan:
+    """Get the compiled plan for a selector dict, compiling it on first use"""
+    extractors = extractors or {}
+    key = (
+        tuple((field, tuple(selectors)) for field, selectors in fields.items()),
+        tuple(sorted((field, id(fn)) for field, fn in extractors.items())),
+        id(default_extractor)
+    )
+    with _plans_lock:
+        plan = _plans.get(key)
+        if plan is not None:
+            _plans.move_to_end(key)
+            return plan
+
+    plan = SelectorPlan(fields, extractors, default_extractor)
+    with _plans_lock:
+        _plans[key] = plan
+        while len(_plans) > MAX_CACHED_PLANS:
+            _plans.popitem(last=False)
+    return plan
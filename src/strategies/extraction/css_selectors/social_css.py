@@ -15,6 +15,7 @@ from typing import Dict, Any, List
 from bs4 import BeautifulSoup
 
 from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from .selector_plan import SelectorPlan, get_selector_plan, image_src
 
 logger = logging.getLogger("strategies.extraction.css_selectors.social")
 
@@ -74,7 +75,7 @@ class SocialMediaCSSStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Extract profile data
             profile_data = self._extract_profile_data(soup)
@@ -120,44 +121,11 @@ class SocialMediaCSSStrategy(BaseExtractionStrategy):
     
     def _extract_profile_data(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """Extract general profile data"""
-        profile = {}
-        
-        for field, selectors in self.profile_selectors.items():
-            if field == "avatar":
-                value = self._extract_image_src(soup, selectors)
-            else:
-                value = self._extract_field_value(soup, selectors)
-            
-            if value:
-                profile[field] = value
-        
-        return profile
+        return self._selector_plan().extract(soup)
     
-    def _extract_field_value(self, container, selectors: List[str]) -> str:
-        """Extract field value using multiple selector fallbacks"""
-        for selector in selectors:
-            try:
-                elements = container.select(selector)
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    if text and len(text) > 1:
-                        return text
-            except Exception:
-                continue
-        return None
-    
-    def _extract_image_src(self, container, selectors: List[str]) -> str:
-        """Extract image source URL"""
-        for selector in selectors:
-            try:
-                img_elements = container.select(selector)
-                for img in img_elements:
-                    src = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
-                    if src and src.startswith(('http', '//')):
-                        return src
-            except Exception:
-                continue
-        return None
+    def _selector_plan(self) -> SelectorPlan:
+        """Compiled plan for profile_selectors (the avatar uses its src attribute)"""
+        return get_selector_plan(self.profile_selectors, {"avatar": image_src})
     
     def _detect_platform(self, url: str) -> str:
         """Detect social media platform from URL"""
@@ -10,6 +10,7 @@ import logging
 from typing import Dict, Any, List, Optional
 
 from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from ai_core.core.text_scanner import MultiPatternScanner, DIGITS, EMAIL_ANCHORS, URL_ANCHORS
 
 logger = logging.getLogger("strategies.extraction.regex")
 
@@ -22,7 +23,7 @@ class RegexExtractionStrategy(BaseExtractionStrategy):
     Extracts: emails, phones, URLs, social handles, addresses
     """
     
-    def __init__(self):
+    def __init__(self, scan_workers: int = 0):
         super().__init__(strategy_type=StrategyType.SPECIALIZED)
         
         # Pre-compiled regex patterns for performance
@@ -52,6 +53,16 @@ class RegexExtractionStrategy(BaseExtractionStrategy):
                 re.IGNORECASE
             )
         }
+        
+        # All patterns in one pass, each only where its literal anchors occur
+        self.scanner = MultiPatternScanner(self.patterns, anchors={
+            'emails': EMAIL_ANCHORS,
+            'phones_us': DIGITS,
+            'urls': URL_ANCHORS,
+            'linkedin': ('linkedin.com/in/',),
+            'addresses': DIGITS,
+            'companies': ('inc', 'llc', 'co', 'ltd', 'limited')
+        }, max_workers=scan_workers)
     
     async def extract(self, 
                      url: str, 
@@ -62,21 +73,12 @@ class RegexExtractionStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            from bs4 import BeautifulSoup
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            text_content = soup.get_text()
+            # Text without script and style elements
+            text_content = self.get_page(html_content, context).get_text()
             extracted_data = {}
             
             # Apply regex patterns
-            for pattern_name, pattern in self.patterns.items():
-                matches = pattern.findall(text_content)
-                
+            for pattern_name, matches in self.scanner.findall(text_content).items():
                 if matches:
                     # Clean and deduplicate matches
                     cleaned_matches = list(set([
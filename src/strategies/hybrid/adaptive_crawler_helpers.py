@@ -9,9 +9,10 @@ import hashlib
 import logging
 import time
 from typing import Dict, Any, List, Optional, Tuple
-from bs4 import BeautifulSoup
 import re
 
+from ai_core.core.parsed_page import parse_page
+
 logger = logging.getLogger("adaptive_crawler_helpers")
 
 class AdaptiveCrawlerHelpers:
@@ -67,7 +68,7 @@ class AdaptiveCrawlerHelpers:
         """Extract quantitative features from HTML content"""
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = parse_page(html_content).soup
             
             features = {
                 # Structure features
@@ -119,7 +120,7 @@ class AdaptiveCrawlerHelpers:
         """Create a concise summary for embedding generation"""
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = parse_page(html_content).soup
             
             # Extract key text elements
             title = soup.find('title')
@@ -11,11 +11,12 @@ import logging
 import json
 from typing import Dict, Any, List, Optional, Tuple, Union
 from dataclasses import dataclass
-from bs4 import BeautifulSoup
 import re
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
 from ai_core.core.hybrid_ai_service import HybridAIService
+from ai_core.core.response_cache import LLMResponseCache, ResponseCacheConfig, make_cache_key
+from ai_core.core.context_builder import ContextBuilder, ContextBuilderConfig
 from services.vector_service import VectorService
 from .ai_enhanced_helpers import AIEnhancedHelpers
 
@@ -33,6 +34,9 @@ class AIEnhancementConfig:
     max_ai_attempts: int = 3
     temperature: float = 0.3
     enable_caching: bool = True
+    cache_max_entries: int = 1000
+    cache_ttl_seconds: float = 3600.0
+    summary_context_tokens: int = 100  # Relevant page content included in the content summary
 
 @dataclass
 class AIExtractionPlan:
@@ -59,10 +63,20 @@ class AIEnhancedStrategy(BaseExtractionStrategy):
         self.vector_service = vector_service
         self.config = config or AIEnhancementConfig()
         
-        # Caching for optimization
-        self.extraction_cache = {}
-        self.selector_cache = {}
-        self.schema_cache = {}
+        # Bounded caches for optimization; raw LLM responses are also cached process-wide
+        cache_config = ResponseCacheConfig(
+            enabled=self.config.enable_caching,
+            max_entries=self.config.cache_max_entries,
+            ttl_seconds=self.config.cache_ttl_seconds
+        )
+        self.extraction_cache = LLMResponseCache(cache_config)
+        self.selector_cache = LLMResponseCache(cache_config)
+        self.schema_cache = LLMResponseCache(cache_config)
+        
+        # Relevant page content for content understanding prompts
+        self.context_builder = ContextBuilder(
+            ContextBuilderConfig(max_tokens=self.config.summary_context_tokens)
+        )
         
         # Performance tracking
         self.ai_performance_stats = {
@@ -147,13 +161,15 @@ class AIEnhancedStrategy(BaseExtractionStrategy):
         """Use AI to understand content structure and context"""
         
         # Check cache first
-        cache_key = f"content_{hash(url + purpose)}"
-        if self.config.enable_caching and cache_key in self.extraction_cache:
-            return self.extraction_cache[cache_key]
+        cache_key = make_cache_key("ai_enhanced", "content_understanding", url, purpose=purpose)
+        if self.config.enable_caching:
+            cached = self.extraction_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         try:
             # Create content summary for AI analysis
-            content_summary = self._create_content_summary(html_content)
+            content_summary = self._create_content_summary(html_content, purpose)
             
             analysis_prompt = f"""
 Perform deep content analysis for web extraction:
@@ -195,8 +211,8 @@ Focus on understanding the semantic structure and optimal extraction strategy.
             )
             
             # Cache the result
-            if self.config.enable_caching:
-                self.extraction_cache[cache_key] = analysis
+            if self.config.enable_caching and "error" not in analysis:
+                self.extraction_cache.set(cache_key, analysis)
             
             return analysis
             
@@ -209,11 +225,12 @@ Focus on understanding the semantic structure and optimal extraction strategy.
                 "confidence": 0.5
             }
     
-    def _create_content_summary(self, html_content: str) -> str:
+    def _create_content_summary(self, html_content: str, purpose: str = "") -> str:
         """Create intelligent content summary for AI analysis"""
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            page = parse_page(html_content)
+            soup = page.soup
             
             # Extract key structural elements
             title = soup.find('title')
@@ -247,10 +264,10 @@ Structured Data: {'Yes' if has_structured_data else 'No'}
 Main Content Area: {'Identified' if main_content else 'Not clearly identified'}
 """
             
-            # Add sample content from main areas
-            if main_content:
-                sample_text = main_content.get_text()[:300]
-                summary += f"\nSample Content: {sample_text}"
+            # Add the page content most relevant to the purpose, without navigation and banners
+            relevant = self.context_builder.build(page, purpose)
+            if relevant.text:
+                summary += f"\nRelevant Content:\n{relevant.text}"
             
             return summary.strip()
             
@@ -270,7 +287,7 @@ Main Content Area: {'Identified' if main_content else 'Not clearly identified'}
             
             # Generate optimized selectors
             css_selectors = await AIEnhancedHelpers.ai_generate_css_selectors(
-                self.llm_service, content_analysis, purpose, self.config
+                self.llm_service, content_analysis, purpose, self.config, self.selector_cache
             )
             
             # Create extraction instructions
@@ -376,7 +393,7 @@ Return practical validation rules for data quality assurance.
         """Execute extraction using AI-enhanced plan"""
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             return await AIEnhancedHelpers.execute_ai_enhanced_extraction(
                 soup, html_content, plan, self.llm_service, self.config, context
@@ -434,6 +451,7 @@ Return practical validation rules for data quality assurance.
             stats["success_rate"] = 0.0
         
         stats["ai_enhancement_rate"] = stats.get("ai_improvements_applied", 0) / max(stats["extractions_performed"], 1)
+        stats["llm_context"] = self.context_builder.get_statistics()
         
         return stats
     
@@ -482,5 +500,8 @@ Return practical validation rules for data quality assurance.
             "extraction_cache_size": len(self.extraction_cache),
             "selector_cache_size": len(self.selector_cache),
             "schema_cache_size": len(self.schema_cache),
+            "extraction_cache": self.extraction_cache.get_statistics(),
+            "selector_cache": self.selector_cache.get_statistics(),
+            "schema_cache": self.schema_cache.get_statistics(),
             "caching_enabled": self.config.enable_caching
         }
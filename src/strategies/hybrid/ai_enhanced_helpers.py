@@ -12,6 +12,8 @@ from typing import Dict, Any, List, Optional, Tuple
 from bs4 import BeautifulSoup
 import re
 
+from ai_core.core.response_cache import make_cache_key
+
 logger = logging.getLogger("ai_enhanced_helpers")
 
 class AIEnhancedHelpers:
@@ -19,15 +21,17 @@ class AIEnhancedHelpers:
     
     @staticmethod
     async def ai_infer_data_schema(llm_service, content_analysis: Dict[str, Any], 
-                                  purpose: str, config, schema_cache: Dict[str, Any]) -> Dict[str, Any]:
+                                  purpose: str, config, schema_cache) -> Dict[str, Any]:
         """Use AI to infer expected data schema"""
         
         if not config.enable_schema_inference:
             return {}
         
-        cache_key = f"schema_{purpose}_{hash(str(content_analysis))}"
-        if config.enable_caching and cache_key in schema_cache:
-            return schema_cache[cache_key]
+        cache_key = make_cache_key("ai_enhanced", "schema_inference", purpose, schema=content_analysis)
+        if config.enable_caching:
+            cached = schema_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         try:
             schema_prompt = f"""
@@ -72,8 +76,8 @@ Focus on practical extraction needs for the stated purpose.
             )
             
             # Cache the result
-            if config.enable_caching:
-                schema_cache[cache_key] = schema_result
+            if config.enable_caching and "error" not in schema_result:
+                schema_cache.set(cache_key, schema_result)
             
             return schema_result
             
@@ -83,12 +87,23 @@ Focus on practical extraction needs for the stated purpose.
     
     @staticmethod
     async def ai_generate_css_selectors(llm_service, content_analysis: Dict[str, Any],
-                                       purpose: str, config) -> Dict[str, List[str]]:
+                                       purpose: str, config, selector_cache) -> Dict[str, List[str]]:
         """Generate optimized CSS selectors using AI"""
         
         if not config.enable_selector_optimization:
             return {}
         
+        selector_inputs = {
+            "content_type": content_analysis.get("content_type", "unknown"),
+            "key_content_areas": content_analysis.get("key_content_areas", []),
+            "data_patterns": content_analysis.get("data_patterns", [])
+        }
+        cache_key = make_cache_key("ai_enhanced", "css_selectors", purpose, schema=selector_inputs)
+        if config.enable_caching:
+            cached = selector_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
             selector_prompt = f"""
 Generate optimal CSS selectors for data extraction:
@@ -123,7 +138,13 @@ Focus on semantic selectors that are likely to be stable.
                 schema=selector_schema
             )
             
-            return selector_result.get("selectors", {})
+            selectors = selector_result.get("selectors", {})
+            
+            # Cache the result
+            if config.enable_caching and "error" not in selector_result and selectors:
+                selector_cache.set(cache_key, selectors)
+            
+            return selectors
             
         except Exception as e:
             logger.warning(f"CSS selector generation failed: {e}")
@@ -32,6 +32,10 @@ class FallbackStrategy(BaseExtractionStrategy):
         attempts = []
         final_result = None
         
+        # Parse once and share the page with every strategy in the chain
+        context = context if context is not None else {}
+        self.get_page(html_content, context, url)
+        
         # Try each strategy in order until success
         for i, strategy in enumerate(self.strategies):
             try:
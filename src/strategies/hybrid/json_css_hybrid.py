@@ -8,10 +8,11 @@ import asyncio
 import json
 import time
 import logging
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from bs4 import BeautifulSoup
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
+from ai_core.core.context_builder import ContextBuilder, ContextBuilderConfig, BuiltContext
 
 class JSONCSSHybridStrategy(BaseExtractionStrategy):
     """
@@ -23,10 +24,13 @@ class JSONCSSHybridStrategy(BaseExtractionStrategy):
     - Handle sites with partial structured data coverage
     """
     
-    def __init__(self, ollama_client=None, **kwargs):
+    def __init__(self, ollama_client=None, context_builder: ContextBuilderConfig = None, **kwargs):
         super().__init__(strategy_type=StrategyType.HYBRID, **kwargs)
         self.ollama_client = ollama_client
         
+        # Page content for LLM enhancement, pruned to the blocks relevant to missing fields
+        self.context_builder = ContextBuilder(context_builder or ContextBuilderConfig(max_tokens=1000))
+        
         # Mapping of structured data types to CSS fallbacks
         self.structured_fallbacks = {
             "Product": {
@@ -74,8 +78,11 @@ class JSONCSSHybridStrategy(BaseExtractionStrategy):
             final_data = self._merge_data_sources(structured_data, css_data, purpose)
             
             # Phase 4: LLM enhancement if available and needed
+            llm_enhancement_used = False
+            llm_context: Dict[str, Any] = {}
             if self.ollama_client and self._needs_llm_enhancement(final_data, purpose):
-                enhanced_data = await self._llm_enhance_data(url, html_content, final_data, purpose)
+                llm_enhancement_used = True
+                enhanced_data, llm_context = await self._llm_enhance_data(url, html_content, final_data, purpose)
                 if enhanced_data:
                     final_data = self._merge_data_sources(final_data, enhanced_data, purpose)
             
@@ -92,7 +99,8 @@ class JSONCSSHybridStrategy(BaseExtractionStrategy):
                 metadata={
                     "structured_data_found": bool(structured_data),
                     "css_fallbacks_used": bool(css_data),
-                    "llm_enhancement_used": hasattr(self, '_llm_enhanced'),
+                    "llm_enhancement_used": llm_enhancement_used,
+                    "llm_context": llm_context,
                     "data_sources": self._get_data_source_breakdown(structured_data, css_data)
                 }
             )
@@ -110,7 +118,7 @@ class JSONCSSHybridStrategy(BaseExtractionStrategy):
     
     def _extract_all_structured_data(self, html_content: str) -> Dict[str, Any]:
         """Extract all structured data from HTML"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         structured_data = {}
         
         # Extract JSON-LD
@@ -207,7 +215,7 @@ class JSONCSSHybridStrategy(BaseExtractionStrategy):
     
     def _extract_css_fallbacks(self, html_content: str, structured_data: Dict[str, Any], purpose: str) -> Dict[str, Any]:
         """Extract data using CSS selectors as fallbacks"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         css_data = {}
         
         # Determine which structured data types are relevant
@@ -346,12 +354,13 @@ class JSONCSSHybridStrategy(BaseExtractionStrategy):
         # Need enhancement if we have less than 60% of required fields
         return found_requirements / len(purpose_requirements) < 0.6
     
-    async def _llm_enhance_data(self, url: str, html_content: str, existing_data: Dict[str, Any], purpose: str) -> Dict[str, Any]:
-        """Use LLM to enhance incomplete data"""
+    async def _llm_enhance_data(self, url: str, html_content: str, existing_data: Dict[str, Any],
+                                purpose: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Use LLM to enhance incomplete data; returns the additional fields and the prompt context metadata"""
         if not self.ollama_client:
-            return {}
+            return {}, {}
         
-        self._llm_enhanced = True  # Mark for metadata
+        built = self._get_relevant_content_sections(html_content, existing_data, purpose)
         
         # Create enhancement prompt
         prompt = f"""
@@ -362,7 +371,7 @@ Purpose: {purpose}
 Current Data: {json.dumps(existing_data, indent=2)}
 
 HTML Content (relevant sections):
-{self._get_relevant_content_sections(html_content, existing_data)[:4000]}
+{built.text}
 
 INSTRUCTIONS:
 1. Fill in missing information that would be valuable for: {purpose}
@@ -383,34 +392,23 @@ Return JSON with ONLY the additional fields to add:
             )
             
             enhancement_data = json.loads(response)
-            return enhancement_data if isinstance(enhancement_data, dict) else {}
+            return (enhancement_data if isinstance(enhancement_data, dict) else {}), built.to_metadata()
             
         except Exception as e:
             self.logger.warning(f"LLM enhancement failed: {e}")
-            return {}
+            return {}, built.to_metadata()
     
-    def _get_relevant_content_sections(self, html_content: str, existing_data: Dict[str, Any]) -> str:
+    def _get_relevant_content_sections(self, html_content: str, existing_data: Dict[str, Any],
+                                       purpose: str) -> BuiltContext:
         """Get relevant content sections for LLM enhancement"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Remove already processed structured data scripts
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text content
-        text = soup.get_text(separator='\n', strip=True)
-        
-        # Basic content filtering based on existing data
-        lines = text.split('\n')
-        relevant_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and len(line) > 20:  # Filter out very short lines
-                # Include lines that might contain additional info
-                relevant_lines.append(line)
-        
-        return '\n'.join(relevant_lines)
+        # Score page blocks against the fields the structured data and CSS passes did not fill
+        missing_fields = [
+            field
+            for data_type in self._get_relevant_structured_types(purpose)
+            for field in self.structured_fallbacks.get(data_type, {})
+            if field not in existing_data
+        ]
+        return self.context_builder.build(parse_page(html_content), purpose, extra_terms=missing_fields)
     
     def _calculate_hybrid_confidence(self, structured_data: Dict[str, Any], css_data: Dict[str, Any], final_data: Dict[str, Any]) -> float:
         """Calculate confidence based on data source quality"""
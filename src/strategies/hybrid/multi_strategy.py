@@ -75,6 +75,9 @@ class MultiStrategyCoordinator(BaseExtractionStrategy):
         start_time = time.time()
         context = context or {}
         
+        # Parse once and share the page with every coordinated strategy
+        self.get_page(html_content, context, url)
+        
         try:
             # Select coordination mode
             coordination_mode = await self._select_coordination_mode(url, html_content, purpose)
@@ -9,9 +9,8 @@ import json
 import time
 import logging
 from typing import Dict, Any, List, Optional, Union
-from bs4 import BeautifulSoup
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
 
 class SmartHybridStrategy(BaseExtractionStrategy):
     """
@@ -45,8 +44,12 @@ class SmartHybridStrategy(BaseExtractionStrategy):
     
     async def extract(self, url: str, html_content: str, purpose: str, context: Dict[str, Any] = None) -> StrategyResult:
         start_time = time.time()
+        context = context if context is not None else {}
         
         try:
+            # Parse once and share the page with the planned strategies
+            self.get_page(html_content, context, url)
+            
             # Phase 1: Analyze content to determine optimal strategy mix
             strategy_plan = await self._analyze_and_plan_extraction(url, html_content, purpose)
             
@@ -188,7 +191,7 @@ Return JSON plan:
         # For now, return a basic CSS extraction since we don't have the full strategies imported
         # In the full implementation, this would use the actual CSS strategies
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = parse_page(html_content).soup
             basic_data = {}
             
             # Basic extraction patterns
@@ -8,10 +8,11 @@ import asyncio
 import json
 import time
 import logging
-from typing import Dict, Any, List, Optional
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Optional, Callable, Tuple
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page, strip_parsed_page
+from ai_core.core.llm_chunking import ChunkingConfig, chunk_with_config, estimate_tokens, merge_extractions
+from ai_core.core.context_builder import ContextBuilder, ContextBuilderConfig, BuiltContext
 
 class IntelligentLLMStrategy(BaseExtractionStrategy):
     """
@@ -23,11 +24,18 @@ class IntelligentLLMStrategy(BaseExtractionStrategy):
     - Handle unstructured content intelligently
     """
     
-    def __init__(self, ollama_client, **kwargs):
+    def __init__(self, ollama_client, chunking: ChunkingConfig = None,
+                 context_builder: ContextBuilderConfig = None, **kwargs):
         super().__init__(strategy_type=StrategyType.LLM, **kwargs)
         self.ollama_client = ollama_client
         self.max_retries = kwargs.get('max_retries', 2)
         
+        # Long pages are extracted chunk by chunk and the results merged
+        self.chunking = chunking or ChunkingConfig()
+        
+        # Page content is pruned to the blocks most relevant to the purpose
+        self.context_builder = ContextBuilder(context_builder)
+        
         # Define extraction schemas for different purposes
         self.purpose_schemas = {
             "company_info": {
@@ -111,17 +119,26 @@ class IntelligentLLMStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            # Clean and prepare content for LLM
-            cleaned_content = self._prepare_content_for_llm(html_content)
-            
             # Get appropriate schema for purpose
             schema = self.purpose_schemas.get(purpose, self._get_generic_schema())
             
-            # Create extraction prompt
-            prompt = self._create_extraction_prompt(url, cleaned_content, purpose, schema, context)
+            # Clean, prune and (for long pages) chunk content for LLM
+            contents, built_context = self._prepare_llm_contents(html_content, purpose, schema, context, url)
+            cleaned_content = "\n".join(contents)
             
-            # Execute LLM extraction
-            extracted_data = await self._llm_extract(prompt, schema)
+            if len(contents) > 1:
+                # Map-reduce: extract each chunk, then merge the partial results
+                extracted_data = await self._extract_chunks(
+                    contents,
+                    lambda chunk: self._create_extraction_prompt(url, chunk, purpose, schema, context),
+                    schema
+                )
+            else:
+                # Create extraction prompt
+                prompt = self._create_extraction_prompt(url, cleaned_content, purpose, schema, context)
+                
+                # Execute LLM extraction
+                extracted_data = await self._llm_extract(prompt, schema)
             
             # Validate and clean results
             if extracted_data:
@@ -141,7 +158,9 @@ class IntelligentLLMStrategy(BaseExtractionStrategy):
                 metadata={
                     "content_length": len(cleaned_content),
                     "schema_used": purpose,
-                    "llm_model": "llama3.1"
+                    "llm_model": "llama3.1",
+                    "chunks": len(contents),
+                    "llm_context": built_context.to_metadata() if built_context else {}
                 }
             )
             
@@ -158,43 +177,88 @@ class IntelligentLLMStrategy(BaseExtractionStrategy):
     
     def _prepare_content_for_llm(self, html_content: str) -> str:
         """Clean and prepare HTML content for LLM processing"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "noscript"]):
-            script.decompose()
-        
-        # Get text content with basic structure preserved
-        text = soup.get_text(separator='\n', strip=True)
-        
-        # Clean up excessive whitespace
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        cleaned = '\n'.join(lines)
+        # Text without script/style/noscript, one non-empty line per text node
+        cleaned = parse_page(html_content).llm_text
         
         # Limit content length for LLM processing (8000 chars for context)
         if len(cleaned) > 8000:
-            # Try to keep important sections
-            sections = cleaned.split('\n\n')
+            # Keep whole lines from the top of the page
+            lines = cleaned.split('\n')
             important_content = []
             current_length = 0
             
-            for section in sections:
-                if current_length + len(section) < 7500:
-                    important_content.append(section)
-                    current_length += len(section)
+            for line in lines:
+                if current_length + len(line) < 7500:
+                    important_content.append(line)
+                    current_length += len(line) + 1
                 else:
                     break
             
-            cleaned = '\n\n'.join(important_content)
+            cleaned = '\n'.join(important_content)
             cleaned += "\n\n[Content truncated for processing...]"
         
         return cleaned
     
+    def _prepare_llm_contents(self, html_content: str, purpose: str, schema: Dict[str, Any],
+                              context: Dict[str, Any] = None,
+                              url: str = None) -> Tuple[List[str], Optional[BuiltContext]]:
+        """
+        Page content to send: a single prompt's content, or chunks for map-reduce extraction
+        
+        With the context builder enabled, navigation and cookie banners are
+        dropped and, if the rest exceeds the context builder's max_tokens,
+        the blocks least relevant to the purpose schema go first. That budget
+        covers all chunks together unless chunked_max_tokens opts in to a
+        larger one. Long content is split into chunks at section boundaries
+        when chunking is enabled.
+        """
+        page = self.get_page(html_content, context, url)
+        
+        if not self.context_builder.config.enabled:
+            if self.chunking.enabled and estimate_tokens(page.llm_text) > self.chunking.max_chunk_tokens:
+                return chunk_with_config((s.text for s in page.sections), self.chunking), None
+            return [self._prepare_content_for_llm(html_content)], None
+        
+        config = self.context_builder.config
+        max_tokens = config.max_tokens
+        if self.chunking.enabled and config.chunked_max_tokens:
+            max_tokens = config.chunked_max_tokens
+        built = self.context_builder.build(page, purpose, schema, max_tokens=max_tokens)
+        
+        if not self.chunking.enabled or estimate_tokens(built.text) <= self.chunking.max_chunk_tokens:
+            return [built.text], built
+        return chunk_with_config(built.blocks, self.chunking), built
+    
+    async def _extract_chunks(self, chunks: List[str], build_prompt: Callable[[str], str],
+                              schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run one extraction per chunk concurrently and merge the partial results
+        
+        Requests in flight are capped per provider by the client's provider
+        limiter, shared with every other strategy and page. A chunk may
+        legitimately hold only a few of the schema's fields, so the schema
+        threshold is applied to the merged result rather than to each chunk.
+        """
+        async def extract_chunk(chunk: str) -> Dict[str, Any]:
+            return await self._llm_extract(build_prompt(chunk), schema, min_valid_properties=0)
+        
+        parts = await asyncio.gather(*(extract_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        for part in parts:
+            if isinstance(part, Exception):
+                self.logger.warning(f"Chunk extraction failed: {part}")
+        
+        merged = merge_extractions(part for part in parts if isinstance(part, dict))
+        if not self._validate_extraction_schema(merged, schema):
+            self.logger.warning(f"Merged extraction of {len(chunks)} chunks failed schema validation")
+            return {}
+        return merged
+    
     def _create_extraction_prompt(self, url: str, content: str, purpose: str, 
                                 schema: Dict[str, Any], context: Dict[str, Any] = None) -> str:
         """Create detailed extraction prompt for LLM"""
         
         context_info = ""
+        context = strip_parsed_page(context)
         if context:
             context_info = f"\nAdditional Context: {json.dumps(context, indent=2)}"
         
@@ -232,7 +296,8 @@ Return ONLY valid JSON following the schema exactly. No explanations or addition
         
         return prompt
     
-    async def _llm_extract(self, prompt: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    async def _llm_extract(self, prompt: str, schema: Dict[str, Any],
+                           min_valid_properties: int = 2) -> Dict[str, Any]:
         """Execute LLM extraction with error handling and retries"""
         
         for attempt in range(self.max_retries):
@@ -249,7 +314,7 @@ Return ONLY valid JSON following the schema exactly. No explanations or addition
                 extracted_data = json.loads(response)
                 
                 # Validate against schema (basic validation)
-                if self._validate_extraction_schema(extracted_data, schema):
+                if self._validate_extraction_schema(extracted_data, schema, min_valid_properties):
                     return extracted_data
                 else:
                     self.logger.warning(f"Schema validation failed on attempt {attempt + 1}")
@@ -266,7 +331,8 @@ Return ONLY valid JSON following the schema exactly. No explanations or addition
         
         return {}
     
-    def _validate_extraction_schema(self, data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
+    def _validate_extraction_schema(self, data: Dict[str, Any], schema: Dict[str, Any],
+                                    min_valid_properties: int = 2) -> bool:
         """Basic schema validation for extracted data"""
         if not isinstance(data, dict):
             return False
@@ -288,8 +354,8 @@ Return ONLY valid JSON following the schema exactly. No explanations or addition
                 elif prop_type == "object" and isinstance(value, dict) and value:
                     valid_properties += 1
         
-        # Consider valid if we have at least 2 valid properties
-        return valid_properties >= 2
+        # Consider valid if we have enough valid properties (2 by default)
+        return valid_properties >= min_valid_properties
     
     def _post_process_extraction(self, data: Dict[str, Any], purpose: str) -> Dict[str, Any]:
         """Post-process extracted data for quality and consistency"""
@@ -10,7 +10,8 @@ import logging
 from typing import Dict, Any, List, Optional
 
 from .adaptive_learning import AdaptiveLLMStrategy
-from core.base_strategy import StrategyResult
+from core.base_strategy import StrategyResult, parse_page, strip_parsed_page
+from ai_core.core.llm_chunking import page_outline
 
 class MultiPassLLMStrategy(AdaptiveLLMStrategy):
     """
@@ -90,7 +91,8 @@ class MultiPassLLMStrategy(AdaptiveLLMStrategy):
     async def _pass_1_structure_analysis(self, url: str, html_content: str, purpose: str) -> Dict[str, Any]:
         """First pass: analyze content structure and identify key sections"""
         
-        cleaned_content = self._prepare_content_for_llm(html_content)
+        # An outline of the whole page, so sections below the fold are represented
+        outline = page_outline(parse_page(html_content, url).sections, max_tokens=1000)
         
         structure_prompt = f"""
 Analyze this webpage content and identify the structure and key sections relevant to: {purpose}
@@ -98,8 +100,8 @@ Analyze this webpage content and identify the structure and key sections relevan
 URL: {url}
 Purpose: {purpose}
 
-CONTENT (First 4000 chars for analysis):
-{cleaned_content[:4000]}
+PAGE OUTLINE (headings and the first line of each section):
+{outline}
 
 Your task is to identify and categorize the webpage structure for optimal data extraction.
 
@@ -156,7 +158,11 @@ Focus on providing actionable insights for the extraction phase.
                                         structure_data: Dict[str, Any], context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Second pass: detailed extraction using structure insights"""
         
-        cleaned_content = self._prepare_content_for_llm(html_content)
+        # Get appropriate schema
+        schema = self.purpose_schemas.get(purpose, self._get_generic_schema())
+        
+        # Relevant page content; long pages are extracted chunk by chunk with the same prompt
+        contents, _ = self._prepare_llm_contents(html_content, purpose, schema, context, url)
         
         # Use structure data to guide extraction
         extraction_targets = structure_data.get("extraction_targets", [])
@@ -164,11 +170,9 @@ Focus on providing actionable insights for the extraction phase.
         content_complexity = structure_data.get("content_complexity", "moderate")
         recommended_approach = structure_data.get("recommended_approach", "comprehensive")
         
-        # Get appropriate schema
-        schema = self.purpose_schemas.get(purpose, self._get_generic_schema())
-        
         # Create context-aware extraction prompt
         context_info = ""
+        context = strip_parsed_page(context)
         if context:
             context_info = f"\nAdditional Context: {json.dumps(context, indent=2)}"
         
@@ -182,7 +186,8 @@ STRUCTURE INSIGHTS:
 - Extraction Targets: {json.dumps(extraction_targets, indent=2)}
 """
         
-        detailed_prompt = f"""
+        def build_prompt(content: str) -> str:
+            return f"""
 Based on the structure analysis, perform detailed extraction for: {purpose}
 
 URL: {url}
@@ -191,7 +196,7 @@ URL: {url}
 {structure_guidance}
 
 WEBPAGE CONTENT:
-{cleaned_content}
+{content}
 
 EXTRACTION STRATEGY:
 1. Use the structure insights to focus on high-priority areas
@@ -213,10 +218,13 @@ FOCUSED EXTRACTION INSTRUCTIONS:
 Return detailed extracted data following the schema exactly.
 """
         
+        if len(contents) > 1:
+            return await self._extract_chunks(contents, build_prompt, schema)
+        
         try:
             response = await self.ollama_client.generate(
                 model="llama3.1",
-                prompt=detailed_prompt,
+                prompt=build_prompt(contents[0]),
                 format="json",
                 temperature=0.3  # Balanced temperature for detailed extraction
             )
@@ -39,7 +39,7 @@ class InfiniteScrollStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Detect infinite scroll indicators
             scroll_info = self._detect_infinite_scroll(soup, html_content)
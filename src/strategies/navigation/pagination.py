@@ -17,7 +17,7 @@ from typing import Dict, Any, List, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
 
 logger = logging.getLogger("strategies.navigation.pagination")
 
@@ -71,7 +71,7 @@ class PaginationStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Analyze pagination structure
             pagination_info = self._analyze_pagination(soup, url)
@@ -313,7 +313,7 @@ class PaginationStrategy(BaseExtractionStrategy):
     def get_confidence_score(self, url: str, html_content: str, purpose: str) -> float:
         """Pagination strategy confidence"""
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         
         # Check for pagination indicators
         pagination_indicators = [
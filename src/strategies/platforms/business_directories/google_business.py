@@ -80,7 +80,7 @@ class GoogleBusinessStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             extracted_data = {}
             
             # Extract business information
@@ -79,7 +79,7 @@ class YellowPagesStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Determine if search results or business page
             if '/search/' in url or 'find_loc=' in url:
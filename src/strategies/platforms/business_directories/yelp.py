@@ -17,7 +17,7 @@ from typing import Dict, Any, List, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse, parse_qs
 
-from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType
+from core.base_strategy import BaseExtractionStrategy, StrategyResult, StrategyType, parse_page
 
 logger = logging.getLogger("strategies.platforms.business_directories.yelp")
 
@@ -92,7 +92,7 @@ class YelpStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Determine if this is a business page or search results
             if self._is_business_page(url):
@@ -375,7 +375,7 @@ class YelpStrategy(BaseExtractionStrategy):
         structured = {}
         
         # Look for Yelp's JSON data in script tags
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_page(html_content).soup
         script_tags = soup.find_all('script')
         
         for script in script_tags:
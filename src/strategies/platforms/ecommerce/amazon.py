@@ -84,7 +84,7 @@ class AmazonStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Determine if this is a product page or search results
             if '/dp/' in url or '/gp/product/' in url:
@@ -66,7 +66,7 @@ class FacebookStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             extracted_data = {}
             
             # Extract page information
@@ -99,7 +99,7 @@ class LinkedInStrategy(BaseExtractionStrategy):
         start_time = time.time()
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = self.get_page(html_content, context).soup
             
             # Determine if this is a profile or company page
             if '/in/' in url:
@@ -0,0 +1,53 @@
+"""
+Tests for chunking page content and merging per-chunk extraction results
+"""
+
+from ai_core.core.llm_chunking import chunk_sections, estimate_tokens, merge_extractions
+
+
+def test_records_sharing_only_a_title_are_kept_apart():
+    merged = merge_extractions([
+        {"contacts": [{"name": "Alice", "email": "a@x.com", "title": "Engineer"}]},
+        {"contacts": [{"name": "Bob", "email": "b@x.com", "title": "Engineer"}]},
+    ])
+
+    assert [c["name"] for c in merged["contacts"]] == ["Alice", "Bob"]
+
+
+def test_same_record_from_two_chunks_is_merged():
+    merged = merge_extractions([
+        {"contacts": [{"name": "Alice", "title": "Engineer"}]},
+        {"contacts": [{"name": "alice ", "email": "a@x.com", "phone": "555-0100"}]},
+    ])
+
+    assert merged["contacts"] == [
+        {"name": "Alice", "title": "Engineer", "email": "a@x.com", "phone": "555-0100"}
+    ]
+
+
+def test_records_disagreeing_on_a_shared_field_are_kept_apart():
+    merged = merge_extractions([
+        {"contacts": [{"name": "Alex Smith", "email": "alex@x.com"}]},
+        {"contacts": [{"name": "Alex Smith", "email": "asmith@y.com"}]},
+    ])
+
+    assert len(merged["contacts"]) == 2
+
+
+def test_scalars_keep_first_value_and_strings_are_deduplicated():
+    merged = merge_extractions([
+        {"company_name": "Acme", "emails": ["sales@acme.com"]},
+        {"company_name": "Acme Inc", "emails": ["Sales@Acme.com", "info@acme.com"]},
+    ])
+
+    assert merged == {"company_name": "Acme", "emails": ["sales@acme.com", "info@acme.com"]}
+
+
+def test_chunks_fit_the_budget_and_overlap():
+    sections = [f"Section {i} " + "word " * 40 for i in range(30)]
+    chunks = chunk_sections(sections, max_tokens=200, overlap_tokens=60)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 200 for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.split("\n", 1)[0] in previous
@@ -0,0 +1,91 @@
+"""
+Tests for plan cache templating and lookups
+"""
+
+from ai_core.core.plan_cache import (
+    PlanCache, PlanCacheConfig, extract_slots, fill_plan, template_plan
+)
+
+SCOPE = "v1:test"
+
+
+def crawl_plan(url: str, limit: int, export_format: str = "csv"):
+    return {
+        "steps": [
+            {"id": "step_1", "tool": "crawl_web", "parameters": {"url": url, "max_pages": limit}},
+            {"id": "step_2", "tool": "export_data", "depends_on": ["step_1"],
+             "parameters": {"data": "{step_1}", "format": export_format}},
+        ]
+    }
+
+
+def test_extract_slots():
+    template, slots = extract_slots('Crawl https://a.com/shop, get 10 items tagged "big sale"')
+
+    assert template == "crawl <url>, get <number> items tagged <text>"
+    assert slots == {"url_0": "https://a.com/shop", "text_0": "big sale", "number_0": "10"}
+
+
+def test_template_and_fill_round_trip():
+    _, slots = extract_slots("crawl https://a.com and get 10 pages")
+    templated = template_plan(crawl_plan("https://a.com", 10), slots)
+
+    assert templated["steps"][0]["parameters"] == {"url": "{slot:url_0}", "max_pages": "{slot:number_0:int}"}
+    assert templated["steps"][1]["depends_on"] == ["step_1"]
+
+    _, new_slots = extract_slots("crawl https://b.org and get 25 pages")
+    assert fill_plan(templated, new_slots) == crawl_plan("https://b.org", 25)
+
+
+def test_template_plan_rejects_ambiguous_slots():
+    _, slots = extract_slots("crawl https://a.com with 10 pages and 10 retries")
+    plan = crawl_plan("https://a.com", 10)
+
+    assert template_plan(plan, slots) is None
+
+
+def test_fill_plan_with_missing_slot():
+    _, slots = extract_slots("crawl https://a.com and get 10 pages")
+    templated = template_plan(crawl_plan("https://a.com", 10), slots)
+
+    assert fill_plan(templated, {"url_0": "https://b.org"}) is None
+
+
+def test_exact_template_hit():
+    cache = PlanCache()
+    cache.set("crawl https://a.com and get 10 pages", SCOPE, crawl_plan("https://a.com", 10))
+
+    assert cache.get("Crawl https://b.org and get 3 pages", SCOPE) == crawl_plan("https://b.org", 3)
+    assert cache.get("crawl https://b.org and get 3 pages", "v2:test") is None
+
+
+def test_similar_request_differing_in_stopwords_hits():
+    cache = PlanCache()
+    cache.set("crawl https://a.com and extract all contact emails then export them to csv", SCOPE,
+              crawl_plan("https://a.com", 1))
+
+    plan = cache.get("crawl https://b.org and extract all contact emails then export to csv", SCOPE)
+
+    assert plan is not None
+    assert plan["steps"][0]["parameters"]["url"] == "https://b.org"
+    assert cache.get_statistics()["similar_hits"] == 1
+
+
+def test_similar_request_differing_in_a_content_word_misses():
+    cache = PlanCache()
+    cache.set("crawl https://a.com and extract all contact emails then export them to csv", SCOPE,
+              crawl_plan("https://a.com", 1))
+    cache.set("crawl https://a.com and extract product prices and export to csv", SCOPE,
+              crawl_plan("https://a.com", 1))
+
+    assert cache.get("crawl https://b.org and extract all contact emails then export them to excel",
+                     SCOPE) is None
+    assert cache.get("crawl https://b.org and extract product names and export to csv", SCOPE) is None
+    assert cache.get_statistics()["rejected_similar"] >= 2
+
+
+def test_similarity_tier_can_be_disabled():
+    cache = PlanCache(PlanCacheConfig(similarity_enabled=False))
+    cache.set("crawl https://a.com and export them to csv", SCOPE, crawl_plan("https://a.com", 1))
+
+    assert cache.get("crawl https://b.org and export to csv", SCOPE) is None
@@ -0,0 +1,102 @@
+"""
+Tests for dependency-graph plan execution
+"""
+
+import asyncio
+from datetime import datetime
+
+from ai_core.core.planner import ExecutionPlan, PlanExecutor, PlanStatus, PlanStep
+
+
+class FakeRegistry:
+    """Tool registry returning the given callables"""
+
+    def __init__(self, tools):
+        self.tools = tools
+
+    def get_tool(self, name):
+        return self.tools.get(name)
+
+
+def make_plan(*steps: PlanStep) -> ExecutionPlan:
+    return ExecutionPlan(
+        plan_id="plan", request="request", description="", steps=list(steps),
+        created_at=datetime.now().isoformat(), confidence=1.0
+    )
+
+
+def make_executor(calls, fail=()):
+    async def tool(name, **params):
+        calls.append(("start", name))
+        await asyncio.sleep(0.01)
+        calls.append(("end", name))
+        if name in fail:
+            raise RuntimeError(f"{name} failed")
+        return {"tool": name, "params": params}
+
+    def named(name):
+        return lambda **params: tool(name, **params)
+
+    executor = PlanExecutor(planner=None)
+    executor.registry = FakeRegistry({name: named(name) for name in ("crawl", "analyze", "export")})
+    return executor
+
+
+async def test_steps_without_dependencies_run_in_order():
+    calls = []
+    plan = make_plan(
+        PlanStep(1, "crawl", {}, "", depends_on=[]),
+        PlanStep(2, "analyze", {}, "", depends_on=[]),
+        PlanStep(3, "export", {}, "", depends_on=[]),
+    )
+
+    await make_executor(calls).execute_plan(plan)
+
+    assert plan.status == PlanStatus.COMPLETED
+    assert calls == [("start", "crawl"), ("end", "crawl"), ("start", "analyze"),
+                     ("end", "analyze"), ("start", "export"), ("end", "export")]
+
+
+async def test_step_references_order_steps_and_pass_results():
+    calls = []
+    plan = make_plan(
+        PlanStep(1, "export", {"data": "{step_2.params}"}, ""),
+        PlanStep(2, "analyze", {"data": "{step_3}"}, ""),
+        PlanStep(3, "crawl", {"url": "https://a.com"}, ""),
+    )
+
+    await make_executor(calls).execute_plan(plan)
+
+    assert [name for event, name in calls if event == "start"] == ["crawl", "analyze", "export"]
+    assert plan.steps[0].result["params"]["data"]["data"]["params"] == {"url": "https://a.com"}
+
+
+async def test_independent_steps_run_concurrently():
+    calls = []
+    plan = make_plan(
+        PlanStep(1, "crawl", {}, ""),
+        PlanStep(2, "analyze", {}, ""),
+        PlanStep(3, "export", {}, "", depends_on=[1, 2]),
+    )
+
+    await make_executor(calls).execute_plan(plan)
+
+    assert calls[:2] == [("start", "crawl"), ("start", "analyze")]
+    assert calls[-2:] == [("start", "export"), ("end", "export")]
+
+
+async def test_dependents_of_a_failed_step_are_skipped():
+    calls = []
+    plan = make_plan(
+        PlanStep(1, "crawl", {}, "", error_handling="continue"),
+        PlanStep(2, "analyze", {"data": "{step_1}"}, ""),
+        PlanStep(3, "export", {}, "", depends_on=[2]),
+    )
+
+    await make_executor(calls, fail={"crawl"}).execute_plan(plan)
+
+    assert plan.status == PlanStatus.FAILED
+    assert [step.status for step in plan.steps] == [
+        PlanStatus.FAILED, PlanStatus.SKIPPED, PlanStatus.SKIPPED
+    ]
+    assert calls == [("start", "crawl"), ("end", "crawl")]
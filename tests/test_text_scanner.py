@@ -0,0 +1,72 @@
+"""
+Tests for the multi-pattern text scanner
+"""
+
+import random
+import re
+
+from ai_core.core.text_scanner import MultiPatternScanner, DIGITS, EMAIL_ANCHORS
+
+# Patterns of RegexExtractionStrategy, including its unbounded greedy ones
+PATTERNS = {
+    "emails": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+    "phones_us": r"(\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})",
+    "addresses": r"\d+\s+[\w\s]+(?:street|st|avenue|ave|road|rd|drive|dr|lane|ln)\b",
+    "companies": r"\b[\w\s&]+(?:inc|llc|corp|corporation|company|co|ltd|limited)\b",
+}
+ANCHORS = {
+    "emails": EMAIL_ANCHORS,
+    "phones_us": DIGITS,
+    "addresses": DIGITS,
+    "companies": ("inc", "llc", "co", "ltd", "limited"),
+}
+WORDS = ["alpha", "beta", "gamma", "delta", "sales", "office", "team", "the", "and", "of"]
+
+
+def long_text(length: int, seed: int = 7) -> str:
+    """Text with long runs of words between the entities the patterns look for"""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < length:
+        run = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 400)))
+        entity = rng.choice([
+            f"{run} Holdings Inc",
+            f"{rng.randint(1, 999)} {run} street",
+            f"contact {rng.choice(WORDS)}{rng.randint(1, 99)}@example.com",
+            f"call (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            run,
+        ])
+        parts.append(entity)
+        size += len(entity) + 2
+    return ". ".join(parts)
+
+
+def expected(text: str):
+    found = {}
+    for name, pattern in PATTERNS.items():
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        if matches:
+            found[name] = matches
+    return found
+
+
+def test_findall_matches_re_findall_on_long_text():
+    text = long_text(100_000)
+    scanner = MultiPatternScanner(PATTERNS, anchors=ANCHORS)
+
+    assert scanner.findall(text) == expected(text)
+
+
+def test_findall_matches_re_findall_with_small_chunks():
+    text = long_text(50_000, seed=11)
+    scanner = MultiPatternScanner(PATTERNS, anchors=ANCHORS, chunk_size=1024, overlap=32)
+
+    assert scanner.findall(text) == expected(text)
+    assert scanner.get_statistics()["chunks_scanned"] > 1
+
+
+def test_unbounded_patterns_are_not_chunked():
+    scanner = MultiPatternScanner(PATTERNS, anchors=ANCHORS)
+
+    assert scanner.get_statistics()["full_text_patterns"] == 3